@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Cubo analítico em memória: país × ano × (setor | fonte)
+-------------------------------------------------------
+Para análise exploratória sem refazer consultas no banco. Cada tabela de
+fatos é lida uma única vez e vira arrays NumPy densos indexados por códigos
+inteiros (posição do país, ano − primeiro ano, posição do setor/fonte), com
+uma máscara booleana de presença ao lado de cada medida (False = linha
+ausente ou valor nulo).
+
+Medidas (MEASURES) e eixos:
+  country × year            indicadores de Development, Investment,
+                            Environmental Indicator, Power Consumed e Demography
+  country × year × sector   sector_co2 (Sector_Country)
+  country × year × source   power_generation, power_co2 (Power Source_Country)
+
+As operações (`get`, `rollup`, `top`, `ratio`) são fatias e reduções
+vetorizadas sobre esses arrays, ex.: o gCO2_per_kWh da segunda consulta é
+`cube.ratio("power_co2", "power_generation", 1000)`.
+
+O cubo é salvo como um diretório de arquivos .npy + meta.json (padrão
+.cache/cube) e reaberto com memory-map: outro processo o abre sem ler os
+dados nem falar com o PostgreSQL. meta.json guarda as versões das tabelas
+(public.table_versions) do momento da montagem; `Cube.load` remonta o cubo
+quando alguma tabela foi recarregada.
+
+Uso (a partir da raiz do repositório):
+    python Consultas/cube.py build [--path DIR]
+    python Consultas/cube.py info
+    python Consultas/cube.py top co2 --year 2020 [-n 10] [--by country]
+    python Consultas/cube.py rollup sector_co2 --keep year sector [--countries Brazil]
+    python Consultas/cube.py ratio power_co2 power_generation --scale 1000 --year 2020
+"""
+
+from __future__ import annotations
+import argparse, json, os, shutil, tempfile, time
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+CUBE_DIR = Path(os.getenv("CUBE_DIR", Path(__file__).resolve().parent.parent / ".cache" / "cube"))
+
+
+@dataclass(frozen=True)
+class Fact:
+    keys: tuple[str, ...]           # colunas de país, ano e (opcional) setor/fonte
+    measures: dict[str, str]        # medida → coluna
+    axes: tuple[str, ...] = ("country", "year")
+
+
+FACTS: dict[str, Fact] = {
+    "Sector_Country": Fact(
+        ("Country_ID_Country", "Year", "Sector_ID_Sector"),
+        {"sector_co2": "CO2_Emission"}, ("country", "year", "sector")),
+    "Power Source_Country": Fact(
+        ("Country_ID_Country", "Year", "Power Source_ID_Power"),
+        {"power_generation": "Power_Generation", "power_co2": "CO2_Emission"},
+        ("country", "year", "source")),
+    "Development": Fact(
+        ("Country_ID", "Ano"),
+        {"idh": "IDH", "electricity": "Electricity", "sanitation": "Sanitation",
+         "health": "Health", "standard_living": "Standard_Living"}),
+    "Investment": Fact(
+        ("Country_ID", "Year"),
+        {"gdp": "GDP", "investment_energy": "Investment_Energy",
+         "health_expenditure": "Health_Expenditure"}),
+    "Environmental Indicator": Fact(("Country_ID", "Year"), {"co2": "CO2_Emision"}),
+    "Power Consumed": Fact(
+        ("Country_ID", "Year"),
+        {"gwh": "GWH", "power_import": "PowerImport", "renewable_share": "Renewable_Energy"}),
+    "Demography": Fact(("Country_ID", "Year"), {"population": "Population"}),
+}
+MEASURES: dict[str, tuple[str, ...]] = {m: f.axes for f in FACTS.values() for m in f.measures}
+
+DIMENSIONS = {   # eixo → (tabela, coluna de ID, colunas de rótulo)
+    "country": ("Country", "ID_Country", ["Name"]),
+    "sector":  ("Sector", "ID_Sector", ["Name"]),
+    "source":  ("Power Source", "ID_Power", ["Name", "Renewable"]),
+}
+# tabelas lidas pelo cubo: as versões de todas vão para o meta.json
+TABLES: tuple[str, ...] = tuple(sorted([t for t, _, _ in DIMENSIONS.values()] + list(FACTS)))
+
+
+# ───────────────────────────────────────────────────────────────
+# Resultado de uma operação
+# ───────────────────────────────────────────────────────────────
+@dataclass
+class Slice:
+    """Valores + máscara de presença, com os eixos que restaram."""
+    values: np.ndarray
+    mask: np.ndarray
+    axes: tuple[str, ...]
+    labels: dict[str, np.ndarray]   # eixo → rótulos das posições restantes
+
+    def frame(self, name: str = "value") -> pd.DataFrame:
+        """Formato longo (um rótulo por eixo + valor), só as células presentes."""
+        pos = np.nonzero(self.mask)
+        out = {axis: self.labels[axis][p] for axis, p in zip(self.axes, pos)}
+        out[name] = self.values[pos]
+        return pd.DataFrame(out)
+
+
+# ───────────────────────────────────────────────────────────────
+# Cubo
+# ───────────────────────────────────────────────────────────────
+class Cube:
+    def __init__(self, dims: dict[str, pd.DataFrame], years: np.ndarray,
+                 arrays: dict[str, np.ndarray], masks: dict[str, np.ndarray],
+                 versions: dict[str, int] | None = None):
+        """
+        `dims`: eixo → DataFrame com ID e rótulos, na ordem das posições;
+        `years`: anos consecutivos do eixo year.
+        """
+        self.dims = dims
+        self.years = years
+        self.arrays = arrays
+        self.masks = masks
+        self.versions = versions or {}
+        self._pos = {axis: self._positions(axis) for axis in dims}
+
+    def _positions(self, axis: str) -> dict:
+        """ID e nome → posição no eixo (busca O(1) dos rótulos)."""
+        table, id_col, labels = DIMENSIONS[axis]
+        df = self.dims[axis]
+        pos = {int(i): p for p, i in enumerate(df[id_col])}
+        pos.update({n: p for p, n in enumerate(df[labels[0]]) if isinstance(n, str)})
+        return pos
+
+    # ── montagem ────────────────────────────────────────────────
+    @classmethod
+    def from_frames(cls, tables: dict[str, pd.DataFrame],
+                    versions: dict[str, int] | None = None) -> "Cube":
+        """`tables`: nome da tabela → DataFrame (dimensões e fatos de FACTS)."""
+        dims = {axis: tables[t].sort_values(i).reset_index(drop=True)
+                for axis, (t, i, _) in DIMENSIONS.items()}
+        ids = {axis: dims[axis][DIMENSIONS[axis][1]].to_numpy(np.int64) for axis in dims}
+        year_cols = [tables[t][f.keys[1]] for t, f in FACTS.items() if len(tables[t])]
+        y0, y1 = ((int(min(c.min() for c in year_cols)), int(max(c.max() for c in year_cols)))
+                  if year_cols else (0, -1))
+        years = np.arange(y0, y1 + 1, dtype=np.int64)
+        shape = {"country": len(ids["country"]), "year": len(years),
+                 "sector": len(ids["sector"]), "source": len(ids["source"])}
+
+        arrays, masks = {}, {}
+        for table, fact in FACTS.items():
+            df = tables[table]
+            codes, known = [], np.ones(len(df), dtype=bool)
+            for axis, col in zip(fact.axes, fact.keys):
+                key = df[col].to_numpy(np.int64)
+                if axis == "year":
+                    code = key - y0
+                else:
+                    code = np.searchsorted(ids[axis], key).clip(max=len(ids[axis]) - 1)
+                    known &= ids[axis][code] == key if len(ids[axis]) else False
+                codes.append(code)
+            codes = tuple(c[known] for c in codes)
+            for measure, col in fact.measures.items():
+                values = pd.to_numeric(df[col], errors="coerce").to_numpy(np.float64)[known]
+                arr = np.zeros(tuple(shape[a] for a in fact.axes), dtype=np.float64)
+                mask = np.zeros(arr.shape, dtype=bool)
+                arr[codes] = np.nan_to_num(values)
+                mask[codes] = ~np.isnan(values)
+                arrays[measure], masks[measure] = arr, mask
+        return cls(dims, years, arrays, masks, versions)
+
+    @classmethod
+    def from_db(cls, engine) -> "Cube":
+        """Lê as dimensões e as tabelas de fatos (uma consulta por tabela)."""
+        import result_cache
+        # sem public.table_versions grava 0 em todas: o load nunca casa com
+        # None e remonta até as versões existirem
+        stamp = result_cache.versions(engine, set(TABLES)) or dict.fromkeys(TABLES, 0)
+        frames = {}
+        with engine.connect() as conn:
+            for t, id_col, labels in DIMENSIONS.values():
+                cols = ", ".join(f'"{c}"' for c in [id_col, *labels])
+                frames[t] = pd.read_sql(f'SELECT {cols} FROM public."{t}"', conn)
+            for t, fact in FACTS.items():
+                cols = ", ".join(f'"{c}"' for c in [*fact.keys, *fact.measures.values()])
+                frames[t] = pd.read_sql(f'SELECT {cols} FROM public."{t}"', conn)
+        return cls.from_frames(frames, stamp)
+
+    # ── persistência ────────────────────────────────────────────
+    def save(self, path: Path = CUBE_DIR) -> Path:
+        """Grava num diretório temporário e troca pelo destino (atômico)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".cube-"))
+        np.save(tmp / "years.npy", self.years)
+        for m in self.arrays:
+            np.save(tmp / f"{m}.npy", self.arrays[m])
+            np.save(tmp / f"{m}.mask.npy", self.masks[m])
+        meta = {"versions": self.versions,
+                "dims": {axis: df.to_dict("list") for axis, df in self.dims.items()}}
+        (tmp / "meta.json").write_text(json.dumps(meta, default=str))
+        old = path.with_name(path.name + ".old")
+        if path.exists():
+            path.rename(old)
+        tmp.rename(path)
+        shutil.rmtree(old, ignore_errors=True)
+        return path
+
+    @classmethod
+    def open(cls, path: Path = CUBE_DIR) -> "Cube":
+        """Abre um cubo salvo com memory-map (os dados só são lidos quando usados)."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        dims = {axis: pd.DataFrame(cols) for axis, cols in meta["dims"].items()}
+        load = lambda name: np.load(path / f"{name}.npy", mmap_mode="r")
+        return cls(dims, load("years"), {m: load(m) for m in MEASURES},
+                   {m: load(f"{m}.mask") for m in MEASURES}, meta["versions"])
+
+    @classmethod
+    def load(cls, engine, path: Path = CUBE_DIR) -> "Cube":
+        """Cubo salvo, se as tabelas não mudaram desde a montagem; senão remonta e salva."""
+        import result_cache
+        if (Path(path) / "meta.json").exists():
+            cube = cls.open(path)
+            if result_cache.versions(engine, set(TABLES)) == cube.versions:
+                return cube
+        cube = cls.from_db(engine)
+        cube.save(path)
+        return cube
+
+    # ── consultas ───────────────────────────────────────────────
+    def labels(self, axis: str) -> np.ndarray:
+        if axis == "year":
+            return np.asarray(self.years)
+        return self.dims[axis][DIMENSIONS[axis][2][0]].to_numpy()
+
+    def code(self, axis: str, label) -> int:
+        """Posição de um rótulo (ano; ID ou nome de país/setor/fonte)."""
+        if axis == "year":
+            p = int(label) - int(self.years[0]) if len(self.years) else -1
+            if not 0 <= p < len(self.years):
+                raise KeyError(f"Ano fora do cubo: {label}")
+            return p
+        try:
+            return self._pos[axis][label if isinstance(label, str) else int(label)]
+        except KeyError:
+            raise KeyError(f"{axis} desconhecido: {label}") from None
+
+    def get(self, measure: str, **sel) -> Slice:
+        """
+        Fatia de uma medida. `sel`: eixo → rótulo (o eixo some) ou lista de
+        rótulos (o eixo fica, na ordem dada); eixos omitidos ficam inteiros.
+        """
+        if measure not in MEASURES:
+            raise KeyError(f"Medida desconhecida: {measure} (ver MEASURES)")
+        axes = MEASURES[measure]
+        unknown = set(sel) - set(axes)
+        if unknown:
+            raise KeyError(f"'{measure}' não tem os eixos: {', '.join(sorted(unknown))}")
+        fixed, picks, kept, labels = [], [], [], {}
+        for axis in axes:
+            chosen = sel.get(axis)
+            if chosen is None:
+                fixed.append(slice(None))
+                picks.append(None)
+                kept.append(axis)
+                labels[axis] = self.labels(axis)
+            elif isinstance(chosen, (list, tuple, np.ndarray, pd.Series)):
+                codes = np.array([self.code(axis, c) for c in chosen], dtype=np.intp)
+                fixed.append(slice(None))
+                picks.append(codes)
+                kept.append(axis)
+                labels[axis] = self.labels(axis)[codes]
+            else:
+                fixed.append(self.code(axis, chosen))
+        # rótulos únicos primeiro (view); depois as listas, eixo a eixo na
+        # ordem de `kept`: com np.ix_ o resultado nunca reordena os eixos
+        values, mask = self.arrays[measure][tuple(fixed)], self.masks[measure][tuple(fixed)]
+        lists = [p for p in picks if p is not None]
+        if len(lists) == 1:
+            idx = tuple(slice(None) if p is None else p for p in picks)
+            values, mask = values[idx], mask[idx]
+        elif lists:
+            idx = np.ix_(*(np.arange(n) if p is None else p
+                           for p, n in zip(picks, values.shape)))
+            values, mask = values[idx], mask[idx]
+        return Slice(np.asarray(values), np.asarray(mask), tuple(kept), labels)
+
+    def rollup(self, measure: str, keep: tuple[str, ...] = (), **sel) -> Slice:
+        """Soma sobre os eixos fora de `keep`; presente se alguma célula somada estava."""
+        part = self.get(measure, **sel)
+        drop = tuple(i for i, a in enumerate(part.axes) if a not in keep)
+        values = np.where(part.mask, part.values, 0.0).sum(axis=drop)
+        mask = part.mask.any(axis=drop)
+        axes = tuple(a for a in part.axes if a in keep)
+        return Slice(values, mask, axes, {a: part.labels[a] for a in axes})
+
+    def top(self, measure: str, n: int = 10, by: str = "country", **sel) -> pd.DataFrame:
+        """Os `n` maiores valores da medida somada por `by`, em ordem decrescente."""
+        part = self.rollup(measure, keep=(by,), **sel)
+        values = np.where(part.mask, part.values, -np.inf)
+        n = min(n, int(part.mask.sum()))
+        best = np.argpartition(-values, n - 1)[:n] if n else np.array([], dtype=np.intp)
+        best = best[np.argsort(-values[best], kind="stable")]
+        return pd.DataFrame({by: part.labels[by][best], measure: part.values[best]})
+
+    def ratio(self, num: str, den: str, scale: float = 1.0, **sel) -> Slice:
+        """
+        scale × num / den célula a célula (ex.: gCO2/kWh = 1000 × Mt / TWh).
+        O denominador pode ter menos eixos (é repetido nos que faltam); a
+        célula fica ausente se um dos lados faltar ou o denominador for 0.
+        """
+        a = self.get(num, **sel)
+        b = self.get(den, **{k: v for k, v in sel.items() if k in MEASURES[den]})
+        if not set(b.axes) <= set(a.axes):
+            raise ValueError(f"'{den}' tem eixos que '{num}' não tem")
+        expand = [a.axes.index(ax) for ax in b.axes]
+        shape = [1] * len(a.axes)
+        for i, ax in zip(expand, b.axes):
+            shape[i] = b.values.shape[b.axes.index(ax)]
+        order = np.argsort(expand)
+        bv = np.transpose(b.values, order).reshape(shape)
+        bm = np.transpose(b.mask, order).reshape(shape)
+        mask = a.mask & bm & (bv != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(mask, scale * a.values / np.where(bv != 0, bv, 1.0), 0.0)
+        return Slice(values, mask, a.axes, a.labels)
+
+
+# ───────────────────────────────────────────────────────────────
+# CLI
+# ───────────────────────────────────────────────────────────────
+def _selection(args) -> dict:
+    sel = {}
+    if getattr(args, "year", None) is not None:
+        sel["year"] = args.year
+    if getattr(args, "countries", None):
+        sel["country"] = args.countries
+    if getattr(args, "sources", None):
+        sel["source"] = args.sources
+    if getattr(args, "sectors", None):
+        sel["sector"] = args.sectors
+    return sel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cubo analítico país × ano em memória.")
+    parser.add_argument("--path", type=Path, default=CUBE_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="lê as tabelas do banco e salva o cubo")
+    sub.add_parser("info", help="eixos, medidas e células presentes")
+    for name, help_ in (("top", "maiores valores somados por um eixo"),
+                        ("rollup", "soma mantendo os eixos de --keep"),
+                        ("ratio", "razão célula a célula entre duas medidas")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("measure", choices=sorted(MEASURES))
+        if name == "ratio":
+            p.add_argument("den", choices=sorted(MEASURES))
+            p.add_argument("--scale", type=float, default=1.0)
+        if name == "top":
+            p.add_argument("-n", type=int, default=10)
+            p.add_argument("--by", default="country")
+        if name == "rollup":
+            p.add_argument("--keep", nargs="+", default=["year"])
+        p.add_argument("--year", type=int)
+        p.add_argument("--countries", nargs="+")
+        p.add_argument("--sources", nargs="+")
+        p.add_argument("--sectors", nargs="+")
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        from queries import get_engine
+        t0 = time.perf_counter()
+        cube = Cube.from_db(get_engine())
+        print(f"✅ cubo salvo em {cube.save(args.path)} ({time.perf_counter() - t0:.2f}s)")
+        return
+
+    t0 = time.perf_counter()
+    if args.cmd != "info" and not (args.path / "meta.json").exists():
+        from queries import get_engine
+        cube = Cube.load(get_engine(), args.path)
+    else:
+        cube = Cube.open(args.path)
+    opened = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if args.cmd == "info":
+        print(f"anos {cube.years[0]}–{cube.years[-1]}, "
+              + ", ".join(f"{len(df)} {axis}" for axis, df in cube.dims.items()))
+        for m, axes in MEASURES.items():
+            print(f"  {m:<20}{' × '.join(axes):<28}{int(cube.masks[m].sum()):>10} células")
+        return
+    if args.cmd == "top":
+        out = cube.top(args.measure, args.n, args.by, **_selection(args))
+    elif args.cmd == "rollup":
+        out = cube.rollup(args.measure, tuple(args.keep), **_selection(args)).frame(args.measure)
+    else:
+        out = cube.ratio(args.measure, args.den, args.scale, **_selection(args)).frame(
+            f"{args.measure}/{args.den}")
+    took = time.perf_counter() - t0
+    print(out.to_string(index=False, max_rows=50))
+    print(f"\naberto em {opened * 1000:.1f}ms, consulta em {took * 1e6:.0f}µs")
+
+
+if __name__ == "__main__":
+    main()
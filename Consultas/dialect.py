@@ -0,0 +1,173 @@
+"""
+Backend embutido das Consultas (DuckDB ou SQLite)
+-------------------------------------------------
+As consultas de queries.py são escritas para o PostgreSQL. Para rodá-las numa
+cópia local do banco (gerada por populate_scripts/embedded.py, sem servidor)
+o SQL passa por uma camada fina de tradução:
+
+  • `public.` sai (as tabelas ficam no esquema padrão do arquivo);
+  • `x = ANY(:lista)` vira `list_contains($lista, x)` no DuckDB e
+    `x IN (SELECT value FROM json_each(:lista))` no SQLite (lista em JSON);
+  • parâmetros `:nome` viram `$nome` no DuckDB;
+  • no SQLite, `LIMIT NULL` vira `LIMIT -1` e `SELECT DISTINCT ON (chaves)`
+    vira `ROW_NUMBER() OVER (PARTITION BY chaves ORDER BY ...)` numa
+    subconsulta, com o mesmo ORDER BY da consulta original.
+
+O DuckDB (colunar, agregação vetorizada) é o preferido; o SQLite, que vem
+com o Python, é a alternativa sem dependências. O tipo é escolhido pela
+extensão do arquivo (.duckdb / .sqlite, .db).
+"""
+
+from __future__ import annotations
+import json, re, sqlite3
+from pathlib import Path
+
+try:
+    import duckdb
+except ImportError:  # dependência opcional
+    duckdb = None
+
+KINDS = ("duckdb", "sqlite")
+SUFFIXES = {".duckdb": "duckdb", ".sqlite": "sqlite", ".sqlite3": "sqlite", ".db": "sqlite"}
+
+COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+ANY_RE = re.compile(r'((?:\w+\.)?(?:"[^"]+"|\w+))\s*=\s*ANY\(\s*:(\w+)\s*\)')
+PARAM_RE = re.compile(r"(?<![:\w]):(\w+)")
+DISTINCT_ON_RE = re.compile(r"\bSELECT\s+DISTINCT\s+ON\s*\(", re.I)
+
+# OID do PostgreSQL equivalente (runner._PG_ARROW escolhe o tipo do Parquet)
+_DUCK_OIDS = {"BOOLEAN": 16, "BIGINT": 20, "HUGEINT": 20, "SMALLINT": 21, "INTEGER": 23,
+              "FLOAT": 700, "DOUBLE": 701, "DECIMAL": 1700}
+_PY_OIDS = {bool: 16, int: 20, float: 701}
+
+
+def kind_of(path: Path | str) -> str:
+    kind = SUFFIXES.get(Path(path).suffix.lower())
+    if kind is None:
+        raise SystemExit(f"Extensão desconhecida para o banco embutido: {path} "
+                         f"(use {', '.join(SUFFIXES)})")
+    return kind
+
+
+# ───────────────────────────────────────────────────────────────
+# Tradução
+# ───────────────────────────────────────────────────────────────
+def _close(sql: str, start: int) -> int:
+    """Índice do parêntese que fecha o aberto em `start - 1`."""
+    depth = 1
+    for i in range(start, len(sql)):
+        depth += {"(": 1, ")": -1}.get(sql[i], 0)
+        if depth == 0:
+            return i
+    raise ValueError("parênteses desbalanceados")
+
+
+def _top_level(sql: str, start: int, end: int, word: str) -> list[int]:
+    """Posições de `word` em sql[start:end] fora de parênteses."""
+    out, depth = [], 0
+    pattern = re.compile(r"\b" + word.replace(" ", r"\s+") + r"\b", re.I)
+    i = start
+    while i < end:
+        ch = sql[i]
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif depth == 0 and (m := pattern.match(sql, i)):
+            out.append(i)
+            i = m.end()
+            continue
+        i += 1
+    return out
+
+
+def _distinct_on(sql: str) -> str:
+    """SELECT DISTINCT ON (k) ... ORDER BY o → primeira linha de cada k por ROW_NUMBER()."""
+    while m := DISTINCT_ON_RE.search(sql):
+        keys_end = _close(sql, m.end())
+        keys = sql[m.end():keys_end]
+        # fim do SELECT: o parêntese que fecha a CTE (ou o fim do texto)
+        depth, end = 0, len(sql)
+        for i in range(keys_end + 1, len(sql)):
+            depth += {"(": 1, ")": -1}.get(sql[i], 0)
+            if depth < 0 or (depth == 0 and sql[i] == ";"):
+                end = i
+                break
+        body = sql[keys_end + 1:end]
+        frm = _top_level(body, 0, len(body), "FROM")[0]
+        order = _top_level(body, 0, len(body), "ORDER BY")
+        order_by = body[order[-1]:].split(None, 2)[2].strip() if order else keys
+        rest = body[frm:order[-1]] if order else body[frm:]
+        inner = (f"SELECT {body[:frm].rstrip()},\n"
+                 f"ROW_NUMBER() OVER (PARTITION BY {keys} ORDER BY {order_by}) AS _rn\n{rest}")
+        sql = f"{sql[:m.start()]}SELECT * FROM (\n{inner}) WHERE _rn = 1\n{sql[end:]}"
+    return sql
+
+
+def translate(sql: str, kind: str) -> str:
+    """SQL do PostgreSQL (queries.py) → SQL do banco embutido."""
+    sql = COMMENT_RE.sub(" ", sql).replace("public.", "")
+    if kind == "duckdb":
+        sql = ANY_RE.sub(r"list_contains(:\2, \1)", sql)
+        return PARAM_RE.sub(r"$\1", sql)
+    sql = ANY_RE.sub(r"\1 IN (SELECT value FROM json_each(:\2))", sql)
+    return _distinct_on(sql)
+
+
+def bind(params: dict, kind: str) -> dict:
+    """Valores dos parâmetros no formato do banco embutido."""
+    if kind == "duckdb":
+        return dict(params)
+    out = {k: json.dumps(list(v)) if isinstance(v, (list, tuple)) else v
+           for k, v in params.items()}
+    if "limit" in out and out["limit"] is None:
+        out["limit"] = -1
+    return out
+
+
+# ───────────────────────────────────────────────────────────────
+# Conexão
+# ───────────────────────────────────────────────────────────────
+class EmbeddedDB:
+    """Arquivo DuckDB/SQLite gerado por populate_scripts/embedded.py (só leitura)."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.kind = kind_of(self.path)
+        if not self.path.exists():
+            raise SystemExit(f"💥  {self.path} não existe: rode "
+                             f"python populate_scripts/embedded.py --path {self.path}")
+        if self.kind == "duckdb" and duckdb is None:
+            raise SystemExit("💥  duckdb não está instalado (pip install duckdb)")
+        self._conn = None
+
+    def connect(self):
+        if self._conn is None:
+            if self.kind == "duckdb":
+                self._conn = duckdb.connect(str(self.path), read_only=True)
+            else:
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                             check_same_thread=False)
+        return self._conn
+
+    def execute(self, sql: str, params: dict | None = None):
+        """Cursor já executado com o SQL traduzido."""
+        sql, params = translate(sql, self.kind), bind(params or {}, self.kind)
+        conn = self.connect()
+        if self.kind == "duckdb":
+            # o DuckDB recusa parâmetros que o SQL não usa
+            used = set(re.findall(r"\$(\w+)", sql))
+            return conn.execute(sql, {k: v for k, v in params.items() if k in used})
+        return conn.execute(sql, params)
+
+    def type_codes(self, cursor, first: list) -> list:
+        """OIDs equivalentes do PostgreSQL para cada coluna do resultado."""
+        if self.kind == "duckdb":
+            return [_DUCK_OIDS.get(str(d[1]).split("(")[0], 25) for d in cursor.description]
+        sample = first[0] if first else [None] * len(cursor.description)
+        return [_PY_OIDS.get(type(v), 25) for v in sample]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Advisor de índices das Consultas
+--------------------------------
+Roda EXPLAIN (ANALYZE, BUFFERS, VERBOSE, FORMAT JSON) em cada consulta de
+queries.py e aponta, no plano, os caminhos de acesso sem índice:
+  • Seq Scan com filtro de intervalo em "Year"  → BRIN em "Year";
+  • Seq Scan com filtro de igualdade             → B-tree nas colunas do filtro;
+  • Seq Scan com filtro IS NOT NULL              → índice parcial;
+  • tabela lida inteira só para um Hash Join     → B-tree nas colunas do join,
+                                                   com INCLUDE das colunas lidas;
+  • Sort de colunas de uma tabela sob um LIMIT   → B-tree na ordem do ORDER BY.
+Sugestões cujas colunas iniciais já têm índice são omitidas.
+
+As sugestões aceitas viram migrações versionadas em Modelos/migrations/;
+`--apply` aplica as pendentes e compara plano e latência antes/depois.
+
+Uso (a partir da raiz do repositório):
+    python Consultas/index_advisor.py [--apply] [--views] [--json arquivo]
+"""
+
+from __future__ import annotations
+import argparse, json, re, sys
+from collections import Counter
+from pathlib import Path
+from sqlalchemy import text
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import migrations  # noqa: E402
+from queries import QUERIES, VIEW_QUERIES, bind, get_engine  # noqa: E402
+
+EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS, VERBOSE, FORMAT JSON) "
+COL_RE = re.compile(r'(\w+)\."([^"]+)"')
+RANGE_RE = re.compile(r'(\w+)\."Year" [<>]=? ')
+
+
+# ───────────────────────────────────────────────────────────────
+# Planos
+# ───────────────────────────────────────────────────────────────
+def explain(engine, sql: str, params: dict | None = None) -> dict:
+    """Plano executado (JSON) de uma consulta; a transação é desfeita."""
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            out = conn.execute(text(EXPLAIN + sql.strip().rstrip(";")), params or {}).scalar_one()
+        finally:
+            trans.rollback()
+    return (json.loads(out) if isinstance(out, str) else out)[0]
+
+
+def walk(node: dict, parents: tuple = ()):
+    """(nó, ancestrais) de todo o plano, em pré-ordem."""
+    yield node, parents
+    for child in node.get("Plans", []):
+        yield from walk(child, parents + (node,))
+
+
+def summarize(plan: dict) -> dict:
+    """Latência, buffers e tipos de nó de um plano."""
+    root = plan["Plan"]
+    scans = Counter(n["Node Type"] for n, _ in walk(root) if "Relation Name" in n)
+    return {
+        "execution_ms": plan["Execution Time"],
+        "planning_ms": plan["Planning Time"],
+        "shared_hit": root.get("Shared Hit Blocks", 0),
+        "shared_read": root.get("Shared Read Blocks", 0),
+        "scans": dict(scans),
+    }
+
+
+# ───────────────────────────────────────────────────────────────
+# Sugestões
+# ───────────────────────────────────────────────────────────────
+def _cols(expr: str, alias: str) -> list[str]:
+    return list(dict.fromkeys(c for a, c in COL_RE.findall(expr or "") if a == alias))
+
+def _suggestion(table, columns, reason, method="btree", include=(), where=None) -> dict:
+    return {"table": table, "columns": list(columns), "method": method,
+            "include": [c for c in include if c not in columns], "where": where,
+            "reason": reason}
+
+def _only_not_null(flt: str) -> bool:
+    parts = [p for p in re.split(r"\s+AND\s+", flt.strip("()")) if p]
+    return bool(parts) and all(p.strip("() ").endswith("IS NOT NULL") for p in parts)
+
+def suggest(plan: dict) -> list[dict]:
+    out = []
+    for node, parents in walk(plan["Plan"]):
+        parent = parents[-1] if parents else None
+        table, alias = node.get("Relation Name"), node.get("Alias")
+        if node["Node Type"] == "Seq Scan" and table:
+            flt = node.get("Filter", "")
+            read = _cols(" ".join(node.get("Output", [])), alias)
+            if RANGE_RE.search(flt):
+                out.append(_suggestion(table, ["Year"], f"filtro de intervalo: {flt}", "brin"))
+            eq = [c for c in _cols(flt, alias) if f'{alias}."{c}" = ' in flt]
+            if eq:
+                out.append(_suggestion(table, eq, f"filtro: {flt}", include=read))
+            # tabela inteira lida para montar o hash de um join; se o filtro
+            # é só IS NOT NULL, o índice pode ser parcial
+            if parent and parent["Node Type"] == "Hash" and len(parents) > 1:
+                cond = parents[-2].get("Hash Cond", "")
+                keys = _cols(cond, alias)
+                where = re.sub(rf"\b{alias}\.", "", flt) if flt and _only_not_null(flt) else None
+                if keys:
+                    out.append(_suggestion(table, keys, f"hash join: {cond}",
+                                           include=read, where=where))
+        if node["Node Type"] == "Sort" and parent and parent["Node Type"] == "Limit":
+            keys = node.get("Sort Key", [])
+            parsed = [re.fullmatch(r'(\w+)\."([^"]+)"( DESC)?', k) for k in keys]
+            if parsed and all(parsed) and len({m.group(1) for m in parsed}) == 1:
+                rel = next((n["Relation Name"] for n, _ in walk(node)
+                            if n.get("Alias") == parsed[0].group(1)), None)
+                if rel:
+                    out.append(_suggestion(
+                        rel, [m.group(2) + (m.group(3) or "") for m in parsed],
+                        f"top-N: ORDER BY {', '.join(keys)}"))
+    return out
+
+
+def existing_indexes(engine) -> dict[str, list[list[str]]]:
+    """{tabela: [colunas de cada índice]}."""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT t.relname, array_agg(a.attname ORDER BY k.ord)
+            FROM pg_index i
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace AND n.nspname = 'public'
+            CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+            WHERE k.ord <= i.indnkeyatts
+            GROUP BY t.relname, i.indexrelid
+        """))
+        found: dict[str, list[list[str]]] = {}
+        for table, cols in rows:
+            found.setdefault(table, []).append(list(cols))
+        return found
+
+
+def covered(s: dict, indexes: dict[str, list[list[str]]]) -> bool:
+    cols = [c.removesuffix(" DESC") for c in s["columns"]]
+    return any(idx[:len(cols)] == cols for idx in indexes.get(s["table"], []))
+
+
+def ddl(s: dict) -> str:
+    slug = "_".join(re.sub(r"\W+", "_", c.removesuffix(" DESC")).lower() for c in s["columns"])
+    table = re.sub(r"\W+", "_", s["table"]).lower()
+    name = f"{'brin' if s['method'] == 'brin' else 'ix'}_{table}_{slug}"
+    cols = ", ".join(f'"{c.removesuffix(" DESC")}"' + (" DESC" if c.endswith(" DESC") else "")
+                     for c in s["columns"])
+    sql = f'CREATE INDEX IF NOT EXISTS "{name}" ON public."{s["table"]}"'
+    sql += f" USING brin ({cols})" if s["method"] == "brin" else f" ({cols})"
+    if s["include"] and s["method"] != "brin":
+        sql += " INCLUDE (" + ", ".join(f'"{c}"' for c in s["include"]) + ")"
+    if s["where"]:
+        sql += f" WHERE {s['where']}"
+    return sql + ";"
+
+
+# ───────────────────────────────────────────────────────────────
+# Relatório
+# ───────────────────────────────────────────────────────────────
+def workload(use_views: bool) -> dict[str, str]:
+    out = dict(QUERIES)
+    if use_views:
+        out.update({f"{k}_views": v for k, v in VIEW_QUERIES.items()})
+    return out
+
+
+def analyze(engine, queries: dict[str, str]) -> dict[str, dict]:
+    report = {}
+    for name, sql in queries.items():
+        # parâmetros padrão (os valores das consultas originais)
+        plan = explain(engine, sql, bind(name.removesuffix("_views")))
+        report[name] = {**summarize(plan), "suggestions": suggest(plan)}
+    return report
+
+
+def fmt_scans(scans: dict) -> str:
+    return ", ".join(f"{k}×{v}" for k, v in sorted(scans.items())) or "-"
+
+
+def print_plans(report: dict[str, dict], indexes: dict) -> None:
+    print(f"{'Consulta':<14}{'exec.':>10}{'plan.':>9}{'hit':>9}{'read':>8}  acessos")
+    print("─" * 90)
+    for name, r in report.items():
+        print(f"{name:<14}{r['execution_ms']:>8.1f}ms{r['planning_ms']:>7.1f}ms"
+              f"{r['shared_hit']:>9}{r['shared_read']:>8}  {fmt_scans(r['scans'])}")
+
+    seen, pending = set(), []
+    for name, r in report.items():
+        for s in r["suggestions"]:
+            stmt = ddl(s)
+            if stmt in seen or covered(s, indexes):
+                continue
+            seen.add(stmt)
+            pending.append((name, s["reason"], stmt))
+    print("\nÍndices sugeridos:" if pending else "\nNenhum caminho sem índice encontrado.")
+    for name, reason, stmt in pending:
+        print(f"\n-- {name}: {reason}\n{stmt}")
+
+
+def print_comparison(before: dict[str, dict], after: dict[str, dict]) -> None:
+    print(f"{'Consulta':<14}{'antes':>10}{'depois':>10}{'ganho':>8}  acessos (antes → depois)")
+    print("─" * 100)
+    for name in before:
+        b, a = before[name], after[name]
+        gain = b["execution_ms"] / a["execution_ms"] if a["execution_ms"] else float("inf")
+        print(f"{name:<14}{b['execution_ms']:>8.1f}ms{a['execution_ms']:>8.1f}ms{gain:>7.1f}×"
+              f"  {fmt_scans(b['scans'])} → {fmt_scans(a['scans'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sugere e aplica índices para as Consultas.")
+    parser.add_argument("--apply", action="store_true",
+                        help="aplica as migrações pendentes e compara antes/depois")
+    parser.add_argument("--views", action="store_true",
+                        help="inclui as versões sobre as views materializadas")
+    parser.add_argument("--json", type=Path, help="grava o relatório em JSON")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    queries = workload(args.views)
+    before = analyze(engine, queries)
+    print_plans(before, existing_indexes(engine))
+    result = {"before": before}
+
+    if args.apply:
+        print()
+        if not migrations.apply(engine):
+            print("Nenhuma migração pendente")
+        after = analyze(engine, queries)
+        print()
+        print_comparison(before, after)
+        result["after"] = after
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2, default=str))
+        print(f"\nRelatório gravado em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
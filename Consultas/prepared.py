@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Consultas como prepared statements
+----------------------------------
+API para chamadas repetidas das consultas de queries.py com parâmetros
+diferentes (ex.: a mesma consulta para vários anos ou países).
+
+Cada consulta vira um `PREPARE` no servidor, com os parâmetros tipados de
+queries.PARAMS, feito uma única vez por conexão do pool; as chamadas
+seguintes enviam só `EXECUTE nome(valores)`, sem reenviar nem reanalisar o
+SQL. O nome do statement inclui o hash do SQL, então uma consulta alterada
+é preparada de novo.
+
+No modo PgBouncer (DB_PGBOUNCER=1, ver populate_scripts/db.py) não há sessão
+fixa por conexão e a consulta roda sem PREPARE (queries.run).
+
+O resultado volta inteiro como DataFrame (o PostgreSQL não abre cursor do
+servidor sobre um EXECUTE); para exportar resultados grandes use runner.py.
+
+    from prepared import execute
+    df, secs = execute(engine, "first", year=2020, countries=["Brazil", "Chile"])
+
+Uso (a partir da raiz do repositório):
+    python Consultas/prepared.py <consulta> [--views] [--repeat N]
+                                 [--year N] [--year-from N] [--year-to N]
+                                 [--countries ...] [--sources ...] [--limit N]
+"""
+
+from __future__ import annotations
+import argparse, hashlib, re, time
+from decimal import Decimal
+import pandas as pd
+
+from queries import (DEFAULTS, PARAMS, QUERIES, add_param_arguments, bind, db, get_engine,
+                     params_from_args, run, sql_for)
+
+PLACEHOLDER_RE = re.compile(r"(?<![:\w]):(\w+)")
+
+
+def statement(name: str, use_views: bool = False) -> tuple[str, str, list[str]]:
+    """(nome do statement, comando PREPARE, parâmetros na ordem $1, $2, ...)."""
+    sql = sql_for(name, use_views).strip().rstrip(";")
+    order = [p for p in DEFAULTS[name] if re.search(rf"(?<![:\w]):{p}\b", sql)]
+    body = PLACEHOLDER_RE.sub(
+        lambda m: f"${order.index(m.group(1)) + 1}" if m.group(1) in order else m.group(0), sql)
+    digest = hashlib.sha256(sql.encode()).hexdigest()[:8]
+    stmt = f"consultas_{name}{'_views' if use_views else ''}_{digest}"
+    types = f" ({', '.join(PARAMS[p].pg_type for p in order)})" if order else ""
+    return stmt, f"PREPARE {stmt}{types} AS {body}", order
+
+
+def execute(engine, name: str, use_views: bool = False,
+            **params) -> tuple[pd.DataFrame, float]:
+    """Executa a consulta preparada; devolve (resultado, segundos)."""
+    if db.config().pgbouncer:
+        # transaction pooling: o PREPARE ficaria numa sessão do servidor que
+        # a próxima transação talvez não receba
+        return run(engine, name, use_views, **params)
+    stmt, prepare, order = statement(name, use_views)
+    values = bind(name, **params)
+    t0 = time.perf_counter()
+    with engine.connect() as conn:
+        dbapi = conn.connection
+        # statements preparados vivem na sessão: guardados junto da conexão do pool
+        prepared = dbapi.info.setdefault("prepared", set())
+        with dbapi.cursor() as cur:
+            if stmt not in prepared:
+                cur.execute(prepare)
+                prepared.add(stmt)
+            args = f" ({', '.join(['%s'] * len(order))})" if order else ""
+            cur.execute(f"EXECUTE {stmt}{args}", [values[p] for p in order])
+            columns = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+        conn.rollback()
+    df = pd.DataFrame([[float(v) if isinstance(v, Decimal) else v for v in r] for r in rows],
+                      columns=columns)
+    return df, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Executa uma consulta como prepared statement.")
+    parser.add_argument("query", choices=list(QUERIES), help="consulta")
+    parser.add_argument("--views", action="store_true",
+                        help="lê das views materializadas (Modelos/views.sql)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="nº de execuções (mostra a latência de cada uma)")
+    add_param_arguments(parser)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    params = params_from_args(args.query, args)
+    with db.stage(f"consultas/{args.query}"):
+        for i in range(args.repeat):
+            df, secs = execute(engine, args.query, args.views, **params)
+            print(f"⏱  execução {i + 1}: {secs * 1000:.1f}ms ({len(df)} linhas)")
+    print(df.to_string(index=False))
+    print(db.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,606 @@
+"""
+Consultas analíticas
+--------------------
+SQL das consultas executadas pelos scripts Consultas/execute_*.py.
+
+QUERIES guarda a versão original, calculada a partir das tabelas de fatos;
+VIEW_QUERIES guarda, para as consultas mais pesadas, a versão que lê das
+views materializadas de Modelos/views.sql (mantidas pelos loaders).
+
+As consultas recebem parâmetros nomeados e tipados (PARAMS): ano, intervalo
+de anos, conjunto de países, conjunto de fontes e top-N. DEFAULTS guarda os
+valores que reproduzem as consultas originais.
+
+A execução (em streaming, para CSV/Parquet) fica em runner.py; os scripts
+execute_*.py são atalhos para `python Consultas/runner.py <consulta>`.
+Chamadas repetidas com parâmetros diferentes usam prepared.py (PREPARE no
+servidor, uma vez por conexão do pool).
+
+A conexão vem do mesmo pool dos loaders (populate_scripts/db.py), com o
+application_name `<prefixo>/consultas/<consulta>` e as métricas do pool
+impressas ao final da execução.
+"""
+
+from __future__ import annotations
+import argparse, sys, time
+from dataclasses import dataclass
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "populate_scripts"))
+import db  # noqa: E402  (engine e pool compartilhados com os loaders)
+
+
+# ───────────────────────────────────────────────────────────────
+# Consultas sobre as tabelas de fatos
+# ───────────────────────────────────────────────────────────────
+# Query para analisar qual Setor possui a maior emissão de CO2 no ano :year (padrão 2023)
+FIRST = '''
+WITH country_totals AS (
+    SELECT
+        scy."Country_ID_Country",
+        SUM(scy."CO2_Emission")          AS total_emission
+    FROM public."Sector_Country" scy
+    WHERE scy."Year" = :year
+    GROUP BY scy."Country_ID_Country"
+    ORDER BY total_emission DESC
+),
+top_sectors AS (
+    SELECT DISTINCT ON (scy."Country_ID_Country")
+        scy."Country_ID_Country",
+        scy."Sector_ID_Sector",
+        scy."CO2_Emission"               AS sector_emission
+    FROM public."Sector_Country" scy
+    WHERE scy."Year" = :year
+      AND scy."Country_ID_Country" IN (SELECT "Country_ID_Country" FROM country_totals)
+    ORDER BY scy."Country_ID_Country", scy."CO2_Emission" DESC   -- pega o maior setor de cada país
+)
+SELECT
+    c."Name"                    AS "Country",
+    ct.total_emission           AS "Total CO₂ (Mt)",
+    s."Name"                    AS "Top Sector",
+    ts.sector_emission          AS "Sector CO₂ (Mt)",
+    ROUND(100.0 * ts.sector_emission / ct.total_emission, 1) || '%' AS "Share"
+FROM country_totals  ct
+JOIN top_sectors     ts ON ts."Country_ID_Country" = ct."Country_ID_Country"
+JOIN public."Country" c ON c."ID_Country"          = ct."Country_ID_Country"
+JOIN public."Sector"  s ON s."ID_Sector"           = ts."Sector_ID_Sector"
+WHERE (:countries IS NULL OR c."Name" = ANY(:countries))
+ORDER BY ct.total_emission DESC
+LIMIT :limit;
+'''
+
+
+# Query com o intuito de analisar a relação entre Country e Power Generation, conseguindo observar qual energia mais emite CO2
+SECOND = '''
+SELECT
+    C."Name"                AS "Country",
+    CPS."Year",
+    PS."Name"               AS "Energy Source",
+    PS."Renewable",
+    CPS."Power_Generation"  AS "Generation_TWh",
+    CPS."CO2_Emission"      AS "Emissions_Mt",
+    /*  g CO₂/kWh = (Mt × 10¹²) / (TWh × 10⁹) = (Mt / TWh) × 10³  */
+    ROUND(
+        (CPS."CO2_Emission" * 1000.0) / NULLIF(CPS."Power_Generation", 0),
+        1
+    )                       AS "gCO2_per_kWh"
+FROM   "Power Source_Country" CPS
+JOIN   "Country"      C  ON C."ID_Country"   = CPS."Country_ID_Country"
+JOIN   "Power Source" PS ON PS."ID_Power"    = CPS."Power Source_ID_Power"
+WHERE  (:year_from IS NULL OR CPS."Year" >= :year_from)
+  AND  (:year_to   IS NULL OR CPS."Year" <= :year_to)
+  AND  (:countries IS NULL OR C."Name"  = ANY(:countries))
+  AND  (:sources   IS NULL OR PS."Name" = ANY(:sources))
+ORDER  BY CPS."Year" DESC, "Emissions_Mt" DESC, "Generation_TWh" DESC
+LIMIT :limit;
+'''
+
+
+# Analisar a ameissão de CO2 por pais e suas areas
+# Cada tabela de fatos é somada por (país, ano) antes do join: juntar as linhas
+# de Power Source_Country com as de Sector_Country multiplicaria cada soma
+# pelo nº de linhas da outra tabela.
+THIRD = '''
+WITH power AS (
+    SELECT PSC."Country_ID_Country" AS "Country_ID", PSC."Year",
+           SUM(PSC."CO2_Emission")  AS co2_power
+    FROM   "Power Source_Country" PSC
+    WHERE  (:year_from IS NULL OR PSC."Year" >= :year_from)
+      AND  (:year_to   IS NULL OR PSC."Year" <= :year_to)
+    GROUP BY PSC."Country_ID_Country", PSC."Year"
+),
+sector AS (
+    SELECT SC."Country_ID_Country" AS "Country_ID", SC."Year",
+           SUM(SC."CO2_Emission")  AS co2_sector
+    FROM   "Sector_Country" SC
+    WHERE  (:year_from IS NULL OR SC."Year" >= :year_from)
+      AND  (:year_to   IS NULL OR SC."Year" <= :year_to)
+    GROUP BY SC."Country_ID_Country", SC."Year"
+)
+SELECT C."Name"           AS "Country",
+       PS."Year",
+       E."CO2_Emision"    AS "Total Emission",
+       PS.co2_power       AS "Emission Power",
+       SC.co2_sector      AS "Emission Sector"
+FROM power PS
+JOIN "Country" C ON PS."Country_ID" = C."ID_Country"
+JOIN "Environmental Indicator" E ON E."Country_ID" = C."ID_Country"  AND PS."Year" = E."Year"
+JOIN sector SC ON SC."Country_ID" = C."ID_Country"  AND PS."Year" = SC."Year"
+WHERE (:countries IS NULL OR C."Name" = ANY(:countries))
+ORDER BY PS."Year" DESC, "Total Emission" DESC, "Emission Power" DESC,"Emission Sector" DESC
+LIMIT :limit;
+'''
+
+
+# Fazer uma analise global da emissão de CO2, do desenvolvimento e do investimento, procurando indicar qual o maior causador de cada tipo de emissao
+FOURTH = '''
+WITH CO2_sector AS (
+    -- uma linha por ano: setor que mais emite + total do ano (janela sobre os grupos)
+    SELECT DISTINCT ON (CS."Year")
+            CS."Year",
+            S."Name"                                              AS sector,
+            SUM(SUM(CS."CO2_Emission")) OVER (PARTITION BY CS."Year") AS co2_total_sector
+    FROM    "Sector_Country" CS
+    JOIN    "Sector"         S  ON S."ID_Sector" = CS."Sector_ID_Sector"
+    WHERE   (:year_from IS NULL OR CS."Year" >= :year_from)
+      AND   (:year_to   IS NULL OR CS."Year" <= :year_to)
+    GROUP BY S."Name", CS."Year"
+    ORDER BY CS."Year", SUM(CS."CO2_Emission") DESC
+),
+
+CO2_energy AS (
+    SELECT DISTINCT ON (PSC."Year")
+           PSC."Year",
+           PS."Name" AS energy_name,
+           SUM(SUM(PSC."CO2_Emission")) OVER (PARTITION BY PSC."Year") AS co2_total_energia
+    FROM "Power Source_Country" PSC
+    JOIN "Power Source" PS ON PS."ID_Power" = PSC."Power Source_ID_Power"
+    WHERE (:year_from IS NULL OR PSC."Year" >= :year_from)
+      AND (:year_to   IS NULL OR PSC."Year" <= :year_to)
+    GROUP BY PS."Name", PS."Renewable", PSC."Year"
+    ORDER BY PSC."Year", SUM(PSC."CO2_Emission") DESC
+),
+
+CO2_country AS (
+    SELECT DISTINCT ON (EI."Year")
+            EI."Year",
+            C."Name"            AS country,
+            SUM(EI."CO2_Emision") OVER (PARTITION BY EI."Year") AS co2_total_country
+    FROM    "Country" C
+    JOIN    "Environmental Indicator" EI  ON C."ID_Country" = EI."Country_ID"
+    WHERE   (:year_from IS NULL OR EI."Year" >= :year_from)
+      AND   (:year_to   IS NULL OR EI."Year" <= :year_to)
+    ORDER BY EI."Year", EI."CO2_Emision" DESC
+),
+
+IDH_total AS (
+    SELECT SUM(D."IDH") AS total_idh,
+           D."Ano"      AS "Year"
+    FROM "Development" D
+    GROUP BY D."Ano"
+),
+
+GDP_total AS (
+    SELECT SUM(I."GDP") AS total_gdp,
+           I."Year"
+    FROM "Investment" I
+    GROUP BY I."Year"
+),
+
+year AS (
+    SELECT DISTINCT "Year" FROM "Sector_Country"
+    UNION
+    SELECT DISTINCT "Year" FROM "Power Source_Country"
+    UNION
+    SELECT DISTINCT "Ano" AS "Year" FROM "Development"
+    UNION
+    SELECT DISTINCT "Year" FROM "Investment"
+)
+
+SELECT  y."Year"               AS "Year",
+        cs.co2_total_sector,
+        cs.sector              AS sector_maior_emissao,
+        ce.co2_total_energia,
+        ce.energy_name         AS energia_maior_emissao,
+        cc.co2_total_country,
+        cc.country             AS country_maior_emissao,
+        i.total_idh            AS total_IDH,
+        g.total_gdp            AS total_GDP
+FROM year AS y
+LEFT JOIN CO2_sector  AS cs ON cs."Year" = y."Year"
+LEFT JOIN CO2_energy  AS ce ON ce."Year" = y."Year"
+LEFT JOIN CO2_country AS cc ON cc."Year" = y."Year"
+LEFT JOIN IDH_total   AS i  ON i."Year"  = y."Year"
+LEFT JOIN GDP_total   AS g  ON g."Year"  = y."Year"
+WHERE cs.co2_total_sector IS NOT NULL
+  AND ce.co2_total_energia IS NOT NULL
+  AND cc.co2_total_country IS NOT NULL
+  AND i.total_idh IS NOT NULL
+  AND g.total_gdp IS NOT NULL
+  AND (:year_from IS NULL OR y."Year" >= :year_from)
+  AND (:year_to   IS NULL OR y."Year" <= :year_to)
+ORDER BY y."Year" DESC, cc.co2_total_country DESC, ce.co2_total_energia DESC, cs.co2_total_sector DESC
+LIMIT :limit;
+'''
+
+# Versão anterior da quarta consulta: nove subconsultas correlacionadas por ano
+# (cada `ORDER BY ... LIMIT 1` relê a CTE inteira). Fica só como referência
+# para a checagem de equivalência de benchmarks/bench_fourth_window.py.
+FOURTH_CORRELATED = '''
+WITH CO2_sector AS (
+    SELECT  S."Name"                 AS sector,
+            CS."Year",
+            SUM(CS."CO2_Emission")    AS co2_sector
+    FROM    "Sector_Country" CS
+    JOIN    "Sector"         S  ON S."ID_Sector" = CS."Sector_ID_Sector"  
+    GROUP BY sector, CS."Year"
+),
+
+CO2_energy AS (
+    SELECT PS."Name" AS energy_name,
+           PS."Renewable",
+           PSC."Year",
+           SUM(PSC."CO2_Emission") AS co2_energy
+    FROM "Power Source_Country" PSC
+    JOIN "Power Source" PS ON PS."ID_Power" = PSC."Power Source_ID_Power"
+    GROUP BY PS."Name", PS."Renewable", PSC."Year"
+),
+
+CO2_country AS (
+    SELECT  C."Name"            AS country,
+            EI."Year",
+            EI."CO2_Emision"   AS co2_country
+    FROM    "Country" C
+    JOIN    "Environmental Indicator" EI  ON C."ID_Country" = EI."Country_ID"
+),
+
+IDH_total AS (
+    SELECT SUM(D."IDH") AS total_idh,
+           D."Ano"      AS "Year"
+    FROM "Development" D
+    GROUP BY D."Ano"
+),
+
+GDP_total AS (
+    SELECT SUM(I."GDP") AS total_gdp,
+           I."Year"
+    FROM "Investment" I
+    GROUP BY I."Year"
+),
+             
+
+year AS (
+    SELECT DISTINCT "Year" FROM "Sector_Country"
+    UNION
+    SELECT DISTINCT "Year" FROM "Power Source_Country"
+    UNION
+    SELECT DISTINCT "Ano" AS "Year" FROM "Development"
+    UNION
+    SELECT DISTINCT "Year" FROM "Investment"
+),
+
+resultados AS (
+    SELECT 
+        y."Year" AS "Year",
+        (SELECT SUM(co2_sector) FROM co2_sector AS cs WHERE cs."Year" = y."Year") AS co2_total_sector,
+        (SELECT sector FROM co2_sector  AS cs WHERE cs."Year" = y."Year" ORDER BY co2_sector DESC LIMIT 1) AS sector_maior_emissao,
+        (SELECT SUM(co2_energy) FROM co2_energy AS ce WHERE ce."Year" = y."Year") AS co2_total_energia,
+        (SELECT energy_name FROM co2_energy AS ce WHERE ce."Year" = y."Year" ORDER BY co2_energy DESC LIMIT 1) AS energia_maior_emissao,
+        (SELECT SUM(co2_country) FROM co2_country  AS cc WHERE cc."Year" = y."Year") AS co2_total_country,
+        (SELECT country FROM co2_country  AS cc WHERE cc."Year" = y."Year" ORDER BY co2_country DESC LIMIT 1) AS country_maior_emissao,
+        (SELECT total_idh FROM IDH_total AS i WHERE i."Year" = y."Year") AS total_IDH,
+        (SELECT total_gdp FROM GDP_total AS g  WHERE g."Year" = y."Year") AS total_GDP
+    FROM year AS y
+)
+
+SELECT *
+FROM resultados
+WHERE co2_total_sector IS NOT NULL 
+  AND co2_total_energia IS NOT NULL 
+  AND co2_total_country IS NOT NULL 
+  AND total_IDH IS NOT NULL 
+  AND total_GDP IS NOT NULL
+  AND (:year_from IS NULL OR "Year" >= :year_from)
+  AND (:year_to   IS NULL OR "Year" <= :year_to)
+ORDER BY "Year" DESC, co2_total_country DESC, co2_total_energia DESC, co2_total_sector DESC
+LIMIT :limit;
+'''
+
+
+# Saber de quanto que o pais investe reflete no seu desenvolvimento
+# (geração e emissões somadas por país/ano antes do join, como na terceira)
+FIFTH = '''
+WITH power AS (
+    SELECT PSC."Country_ID_Country"     AS "Country_ID", PSC."Year",
+           SUM(PSC."Power_Generation")  AS power_generation,
+           SUM(PSC."CO2_Emission")      AS co2_power
+    FROM   "Power Source_Country" PSC
+    WHERE  (:year_from IS NULL OR PSC."Year" >= :year_from)
+      AND  (:year_to   IS NULL OR PSC."Year" <= :year_to)
+    GROUP BY PSC."Country_ID_Country", PSC."Year"
+),
+sector AS (
+    SELECT SC."Country_ID_Country" AS "Country_ID", SC."Year",
+           SUM(SC."CO2_Emission")  AS co2_sector
+    FROM   "Sector_Country" SC
+    WHERE  (:year_from IS NULL OR SC."Year" >= :year_from)
+      AND  (:year_to   IS NULL OR SC."Year" <= :year_to)
+    GROUP BY SC."Country_ID_Country", SC."Year"
+)
+SELECT  C."Name"            AS "country",
+        I."Year",
+        D."IDH",
+        I."GDP",
+        D."Electricity"     AS "electricity index",
+        I."Investment_Energy" AS  "eletricity investiment",
+        D."Health"          AS "health index",
+        I."Health_Expenditure" AS "helth investiment",
+        CP.power_generation AS "total_power_generation",
+        P."Renewable_Energy" AS "renewable share pct",
+        P."PowerImport"      AS "import_gwh",
+        E."CO2_Emision"      AS "total_emission",
+        SC.co2_sector        AS "sector emission",
+        CP.co2_power         AS "emission energy"
+FROM    "Country"  C
+JOIN "Investment"     I  ON I."Country_ID" =  C."ID_Country"
+JOIN "Development"     D  ON D."Country_ID" =  C."ID_Country" AND I."Year" = D."Ano"
+JOIN "Environmental Indicator" E ON E."Country_ID" = C."ID_Country"  AND I."Year" = E."Year"
+JOIN "Power Consumed" P ON P."Country_ID" = C."ID_Country"  AND I."Year" = P."Year"
+JOIN power  CP ON CP."Country_ID" = C."ID_Country" AND I."Year" = CP."Year"
+JOIN sector SC ON SC."Country_ID" = C."ID_Country" AND I."Year" = SC."Year"
+WHERE D."IDH" IS NOT NULL AND I."GDP" IS NOT NULL AND D."Electricity" IS NOT NULL AND D."Health" IS NOT NULL
+  AND (:year_from IS NULL OR I."Year" >= :year_from)
+  AND (:year_to   IS NULL OR I."Year" <= :year_to)
+  AND (:countries IS NULL OR C."Name" = ANY(:countries))
+ORDER BY D."IDH" DESC, I."GDP" DESC, total_emission DESC, I."Year" DESC
+LIMIT :limit;
+'''
+
+
+# Query para analisar quanto a produção de energia reflete na sua utilização
+SIXTH = '''
+SELECT  C."Name" AS country,
+        CP."Year",
+        I."Investment_Energy",
+        SUM(CASE WHEN PS."Renewable" = TRUE THEN CP."Power_Generation" ELSE 0 END) AS renewable_power,
+    	SUM(CASE WHEN PS."Renewable" = FALSE THEN CP."Power_Generation" ELSE 0 END) AS non_renewable_power,
+        P."GWH"                AS power_consumed,
+		P."Renewable_Energy"   AS renewable_share_pct,
+		P."PowerImport"        AS power_import_consumed,
+        D."Electricity" 		   AS access_to_energy
+FROM    "Country"  C
+JOIN "Power Source_Country" CP ON  CP."Country_ID_Country" = C."ID_Country"
+JOIN "Development"         D  ON D."Country_ID" = C."ID_Country" AND D."Ano" = CP."Year"
+JOIN "Investment"         I  ON I."ID_Investment" = C."ID_Country" AND I."Year" = CP."Year"
+JOIN "Power Consumed" P ON P."Country_ID" = C."ID_Country" AND P."Year" = CP."Year"
+JOIN "Power Source" PS ON CP."Power Source_ID_Power" = PS."ID_Power"
+WHERE (:year_from IS NULL OR CP."Year" >= :year_from)
+  AND (:year_to   IS NULL OR CP."Year" <= :year_to)
+  AND (:countries IS NULL OR C."Name"  = ANY(:countries))
+  AND (:sources   IS NULL OR PS."Name" = ANY(:sources))
+GROUP BY C."Name", CP."Year", D."Electricity", I."Investment_Energy", P."Renewable_Energy", P."PowerImport", P."GWH"
+ORDER BY I."Investment_Energy" DESC, renewable_power DESC, D."Electricity" DESC
+LIMIT :limit;
+'''
+
+
+# Versões anteriores da terceira e da quinta consultas: o join direto de
+# Power Source_Country com Sector_Country soma cada linha de uma tabela uma vez
+# para cada linha da outra no mesmo país/ano. Ficam só como referência para
+# benchmarks/bench_fanout.py.
+THIRD_FANOUT = '''
+SELECT C."Name"           AS "Country",
+       PS."Year",
+       E."CO2_Emision"    AS "Total Emission",
+       SUM(PS."CO2_Emission")  AS "Emission Power",
+       SUM(SC."CO2_Emission")  AS "Emission Sector"
+FROM "Power Source_Country" PS
+JOIN "Country" C ON PS."Country_ID_Country" = C."ID_Country"
+JOIN "Environmental Indicator" E ON E."Country_ID" = C."ID_Country"  AND PS."Year" = E."Year"
+JOIN "Sector_Country" SC ON SC."Country_ID_Country" = C."ID_Country"  AND PS."Year" = SC."Year"
+WHERE (:year_from IS NULL OR PS."Year" >= :year_from)
+  AND (:year_to   IS NULL OR PS."Year" <= :year_to)
+  AND (:countries IS NULL OR C."Name" = ANY(:countries))
+GROUP BY "Country", "Total Emission", PS."Year"
+ORDER BY PS."Year" DESC, "Total Emission" DESC, "Emission Power" DESC,"Emission Sector" DESC
+LIMIT :limit;
+'''
+
+FIFTH_FANOUT = '''
+SELECT  C."Name"            AS "country",
+        I."Year",
+        D."IDH",
+        I."GDP",
+        D."Electricity"     AS "electricity index",
+        I."Investment_Energy" AS  "eletricity investiment",
+        D."Health"          AS "health index",
+        I."Health_Expenditure" AS "helth investiment",
+        SUM(CP."Power_Generation") AS "total_power_generation",
+        P."Renewable_Energy" AS "renewable share pct",
+        P."PowerImport"      AS "import_gwh",
+        E."CO2_Emision"      AS "total_emission",
+        SUM(SC."CO2_Emission") AS "sector emission", 
+        SUM(CP."CO2_Emission") AS "emission energy"
+FROM    "Country"  C
+JOIN "Investment"     I  ON I."Country_ID" =  C."ID_Country"
+JOIN "Development"     D  ON D."Country_ID" =  C."ID_Country" AND I."Year" = D."Ano"
+JOIN "Environmental Indicator" E ON E."Country_ID" = C."ID_Country"  AND I."Year" = E."Year"
+JOIN "Power Consumed" P ON P."Country_ID" = C."ID_Country"  AND I."Year" = P."Year"
+JOIN "Power Source_Country" CP ON  CP."Country_ID_Country" = C."ID_Country"  AND I."Year" = CP."Year"
+JOIN "Sector_Country" SC ON SC."Country_ID_Country" = C."ID_Country" AND I."Year" = SC."Year"
+WHERE D."IDH" IS NOT NULL AND I."GDP" IS NOT NULL AND D."Electricity" IS NOT NULL AND D."Health" IS NOT NULL
+  AND (:year_from IS NULL OR I."Year" >= :year_from)
+  AND (:year_to   IS NULL OR I."Year" <= :year_to)
+  AND (:countries IS NULL OR C."Name" = ANY(:countries))
+GROUP BY C."Name", I."Year", D."IDH", D."Health", D."Electricity",
+         I."GDP", I."Health_Expenditure", I."Investment_Energy", 
+         P."Renewable_Energy", P."PowerImport", E."CO2_Emision"
+ORDER BY D."IDH" DESC, I."GDP" DESC, total_emission DESC, I."Year" DESC
+LIMIT :limit;
+'''
+
+
+# ───────────────────────────────────────────────────────────────
+# Versões sobre as views materializadas
+# ───────────────────────────────────────────────────────────────
+# Os rollups por país/ano são as mesmas somas que a terceira e a quinta
+# consultas calculam antes do join.
+
+THIRD_VIEWS = '''
+SELECT C."Name"           AS "Country",
+       PS."Year",
+       E."CO2_Emision"    AS "Total Emission",
+       PS."CO2_Power"     AS "Emission Power",
+       SC."CO2_Sector"    AS "Emission Sector"
+FROM mv_power_country_year PS
+JOIN "Country" C ON PS."Country_ID" = C."ID_Country"
+JOIN "Environmental Indicator" E ON E."Country_ID" = C."ID_Country"  AND PS."Year" = E."Year"
+JOIN mv_sector_country_year SC ON SC."Country_ID" = C."ID_Country"  AND PS."Year" = SC."Year"
+WHERE (:year_from IS NULL OR PS."Year" >= :year_from)
+  AND (:year_to   IS NULL OR PS."Year" <= :year_to)
+  AND (:countries IS NULL OR C."Name" = ANY(:countries))
+ORDER BY PS."Year" DESC, "Total Emission" DESC, "Emission Power" DESC,"Emission Sector" DESC
+LIMIT :limit;
+'''
+
+FOURTH_VIEWS = '''
+SELECT *
+FROM mv_global_year
+WHERE co2_total_sector IS NOT NULL
+  AND co2_total_energia IS NOT NULL
+  AND co2_total_country IS NOT NULL
+  AND total_IDH IS NOT NULL
+  AND total_GDP IS NOT NULL
+  AND (:year_from IS NULL OR "Year" >= :year_from)
+  AND (:year_to   IS NULL OR "Year" <= :year_to)
+ORDER BY "Year" DESC, co2_total_country DESC, co2_total_energia DESC, co2_total_sector DESC
+LIMIT :limit;
+'''
+
+FIFTH_VIEWS = '''
+SELECT  C."Name"            AS "country",
+        I."Year",
+        D."IDH",
+        I."GDP",
+        D."Electricity"     AS "electricity index",
+        I."Investment_Energy" AS  "eletricity investiment",
+        D."Health"          AS "health index",
+        I."Health_Expenditure" AS "helth investiment",
+        CP."Power_Generation" AS "total_power_generation",
+        P."Renewable_Energy" AS "renewable share pct",
+        P."PowerImport"      AS "import_gwh",
+        E."CO2_Emision"      AS "total_emission",
+        SC."CO2_Sector"      AS "sector emission",
+        CP."CO2_Power"       AS "emission energy"
+FROM    "Country"  C
+JOIN "Investment"     I  ON I."Country_ID" =  C."ID_Country"
+JOIN "Development"     D  ON D."Country_ID" =  C."ID_Country" AND I."Year" = D."Ano"
+JOIN "Environmental Indicator" E ON E."Country_ID" = C."ID_Country"  AND I."Year" = E."Year"
+JOIN "Power Consumed" P ON P."Country_ID" = C."ID_Country"  AND I."Year" = P."Year"
+JOIN mv_power_country_year CP ON  CP."Country_ID" = C."ID_Country"  AND I."Year" = CP."Year"
+JOIN mv_sector_country_year SC ON SC."Country_ID" = C."ID_Country" AND I."Year" = SC."Year"
+WHERE D."IDH" IS NOT NULL AND I."GDP" IS NOT NULL AND D."Electricity" IS NOT NULL AND D."Health" IS NOT NULL
+  AND (:year_from IS NULL OR I."Year" >= :year_from)
+  AND (:year_to   IS NULL OR I."Year" <= :year_to)
+  AND (:countries IS NULL OR C."Name" = ANY(:countries))
+ORDER BY D."IDH" DESC, I."GDP" DESC, total_emission DESC, I."Year" DESC
+LIMIT :limit;
+'''
+
+QUERIES = {
+    "first": FIRST, "second": SECOND, "third": THIRD,
+    "fourth": FOURTH, "fifth": FIFTH, "sixth": SIXTH,
+}
+VIEW_QUERIES = {"third": THIRD_VIEWS, "fourth": FOURTH_VIEWS, "fifth": FIFTH_VIEWS}
+
+
+# ───────────────────────────────────────────────────────────────
+# Parâmetros
+# ───────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Param:
+    pg_type: str            # tipo declarado no PREPARE
+    cast: type              # conversão dos valores vindos da linha de comando
+    many: bool = False      # lista (text[])
+    help: str = ""
+
+
+PARAMS: dict[str, Param] = {
+    "year":      Param("integer", int, help="ano"),
+    "year_from": Param("integer", int, help="ano inicial (inclusive)"),
+    "year_to":   Param("integer", int, help="ano final (inclusive)"),
+    "countries": Param("text[]", str, many=True, help='países (coluna "Name" de Country)'),
+    "sources":   Param("text[]", str, many=True, help='fontes (coluna "Name" de Power Source)'),
+    "limit":     Param("bigint", int, help="top-N (LIMIT); vazio = todas as linhas"),
+}
+
+# consulta → {parâmetro: valor padrão}; os padrões reproduzem as consultas
+# originais (None = sem filtro / sem LIMIT). As versões sobre as views
+# aceitam os mesmos parâmetros.
+DEFAULTS: dict[str, dict] = {
+    "first":  {"year": 2023, "countries": None, "limit": None},
+    "second": {"year_from": None, "year_to": None, "countries": None, "sources": None,
+               "limit": 100},
+    "third":  {"year_from": None, "year_to": None, "countries": None, "limit": 100},
+    "fourth": {"year_from": None, "year_to": None, "limit": 30},
+    "fifth":  {"year_from": None, "year_to": None, "countries": None, "limit": 50},
+    "sixth":  {"year_from": 2011, "year_to": None, "countries": None, "sources": None,
+               "limit": None},
+}
+
+
+def bind(name: str, **params) -> dict:
+    """Parâmetros completos da consulta: os padrões sobrepostos por `params`."""
+    unknown = set(params) - set(DEFAULTS[name])
+    if unknown:
+        raise ValueError(f"A consulta '{name}' não aceita: {', '.join(sorted(unknown))}")
+    bound = {**DEFAULTS[name], **params}
+    for key, value in bound.items():
+        if value is not None and PARAMS[key].many:
+            bound[key] = [PARAMS[key].cast(v) for v in value]
+        elif value is not None:
+            bound[key] = PARAMS[key].cast(value)
+    return bound
+
+
+def add_param_arguments(parser) -> None:
+    """--year, --year-from, --countries ... para as linhas de comando."""
+    group = parser.add_argument_group("parâmetros das consultas")
+    for key, p in PARAMS.items():
+        group.add_argument("--" + key.replace("_", "-"), dest=key, type=p.cast,
+                           nargs="+" if p.many else None, default=argparse.SUPPRESS,
+                           metavar=key.upper(), help=p.help)
+
+
+def params_from_args(name: str, args) -> dict:
+    given = {k: getattr(args, k) for k in PARAMS if hasattr(args, k)}
+    try:
+        return bind(name, **given)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+
+# ───────────────────────────────────────────────────────────────
+# Execução
+# ───────────────────────────────────────────────────────────────
+def get_engine():
+    """Engine do processo, com o pool configurado em populate_scripts/db.py."""
+    return db.get_engine()
+
+
+def sql_for(name: str, use_views: bool = False) -> str:
+    if use_views:
+        if name not in VIEW_QUERIES:
+            raise SystemExit(f"A consulta '{name}' não tem versão sobre as views")
+        return VIEW_QUERIES[name]
+    return QUERIES[name]
+
+
+def run(engine, name: str, use_views: bool = False, **params) -> tuple[pd.DataFrame, float]:
+    """Executa a consulta; devolve (resultado, segundos)."""
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        df = pd.read_sql(text(sql_for(name, use_views)), conn, params=bind(name, **params))
+    return df, time.perf_counter() - t0
@@ -0,0 +1,166 @@
+"""
+Cache de resultados das Consultas
+---------------------------------
+O resultado de cada consulta executada pelo runner é guardado em Parquet no
+disco local, identificado pelo SQL normalizado (sem comentários e com os
+espaços colapsados) + parâmetros. Uma leitura repetida vira a leitura de um
+arquivo, sem refazer os joins e agregações no banco.
+
+Invalidação: os loaders incrementam a versão de cada tabela que gravam em
+public.table_versions (manifest.bump_version), e o refresh de uma view
+materializada incrementa a versão da view. Cada entrada guarda, nos
+metadados do Parquet, as versões das tabelas lidas pela consulta no momento
+em que ela rodou; se alguma mudou, a entrada é descartada e a consulta volta
+ao banco.
+
+O tamanho total é limitado: ao gravar uma entrada, as menos usadas
+recentemente (mtime, atualizado a cada acerto) são apagadas até caber.
+
+Variáveis de ambiente:
+    RESULT_CACHE_DIR    = diretório do cache (padrão: <repo>/.cache/results)
+    RESULT_CACHE        = 0 desativa o cache
+    RESULT_CACHE_MAX_MB = tamanho máximo do cache (padrão: 256)
+
+Sem `pyarrow` instalado o cache fica desativado.
+"""
+
+from __future__ import annotations
+import hashlib, json, os, re, tempfile
+from pathlib import Path
+from sqlalchemy import exc, text
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional
+    pq = None
+
+CACHE_DIR = Path(os.getenv("RESULT_CACHE_DIR",
+                           Path(__file__).resolve().parent.parent / ".cache" / "results"))
+MAX_BYTES = int(float(os.getenv("RESULT_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+META_KEY = b"table_versions"
+COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+(?:public\.)?(?:"([^"]+)"|(\w+))', re.I)
+CTE_RE = re.compile(r'(?:\bWITH|,)\s*(\w+)\s+AS\s*\(', re.I)
+
+
+# ───────────────────────────────────────────────────────────────
+# Chave e dependências
+# ───────────────────────────────────────────────────────────────
+def normalize(sql: str) -> str:
+    return " ".join(COMMENT_RE.sub(" ", sql).split()).rstrip(";").strip()
+
+
+def key(sql: str, params: dict | None = None) -> str:
+    raw = json.dumps([normalize(sql), params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+def tables_read(sql: str) -> set[str]:
+    """Tabelas e views citadas em FROM/JOIN (os nomes de CTE ficam de fora)."""
+    sql = COMMENT_RE.sub(" ", sql)
+    ctes = {c.lower() for c in CTE_RE.findall(sql)}
+    found = set()
+    for quoted, bare in TABLE_RE.findall(sql):
+        if quoted:
+            found.add(quoted)
+        elif bare.lower() not in ctes:
+            found.add(bare.lower())     # sem aspas o PostgreSQL usa minúsculas
+    return found
+
+
+def versions(engine, tables: set[str]) -> dict[str, int] | None:
+    """{tabela: versão} atual (0 = nunca gravada); None sem public.table_versions."""
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT "Table", "Version" FROM public.table_versions
+                WHERE "Table" = ANY(:tables)
+            """), {"tables": sorted(tables)})
+            found = dict(rows.all())
+    except exc.ProgrammingError:
+        print("⚠️  public.table_versions não existe: cache de resultados desativado")
+        return None
+    return {t: int(found.get(t, 0)) for t in sorted(tables)}
+
+
+def enabled() -> bool:
+    return pq is not None and os.getenv("RESULT_CACHE", "1") != "0"
+
+
+# ───────────────────────────────────────────────────────────────
+# Entradas
+# ───────────────────────────────────────────────────────────────
+def _path(k: str) -> Path:
+    return CACHE_DIR / f"{k}.parquet"
+
+
+def _stored_versions(path: Path) -> dict[str, int] | None:
+    meta = pq.read_schema(path).metadata or {}
+    return json.loads(meta[META_KEY]) if META_KEY in meta else None
+
+
+def lookup(engine, sql: str, params: dict | None = None) -> Path | None:
+    """Arquivo da entrada válida para a consulta, ou None."""
+    path = _path(key(sql, params))
+    if not path.exists():
+        return None
+    current = versions(engine, tables_read(sql))
+    try:
+        valid = current is not None and _stored_versions(path) == current
+    except (OSError, ValueError):   # arquivo truncado/corrompido
+        valid = False
+    if not valid:
+        path.unlink(missing_ok=True)
+        return None
+    os.utime(path)                  # marca como usada recentemente (LRU)
+    return path
+
+
+class Entry:
+    """
+    Entrada em construção: o runner grava o Parquet em `tmp` (com `metadata`
+    no esquema) e chama `commit()`; em caso de erro, `discard()`.
+    As versões são lidas antes da consulta: uma carga que termine durante a
+    execução deixa a entrada já vencida.
+    """
+
+    def __init__(self, engine, sql: str, params: dict | None = None):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.path = _path(key(sql, params))
+        stamp = versions(engine, tables_read(sql))
+        self.metadata = None if stamp is None else {META_KEY: json.dumps(stamp).encode()}
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        self.tmp = Path(tmp)
+
+    def commit(self) -> None:
+        if self.metadata is None:
+            return self.discard()
+        os.replace(self.tmp, self.path)
+        evict()
+
+    def discard(self) -> None:
+        self.tmp.unlink(missing_ok=True)
+
+
+def evict(max_bytes: int = MAX_BYTES) -> list[Path]:
+    """Apaga as entradas usadas há mais tempo até o cache caber em `max_bytes`."""
+    entries = sorted(CACHE_DIR.glob("*.parquet"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in entries)
+    removed = []
+    for path in entries:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
+        removed.append(path)
+    return removed
+
+
+def clear() -> int:
+    n = 0
+    for path in CACHE_DIR.glob("*.parquet"):
+        path.unlink(missing_ok=True)
+        n += 1
+    return n
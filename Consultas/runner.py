@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Executor de consultas em streaming
+----------------------------------
+Ponto de entrada único para as consultas registradas em queries.py.
+
+A consulta roda num cursor nomeado do lado do servidor (`stream_results`);
+as linhas chegam em lotes de `--batch` e vão direto para o CSV (ou Parquet),
+sem montar o DataFrame do resultado inteiro. A memória fica constante mesmo
+em consultas sem LIMIT, como a sexta.
+
+Ao final são impressos o tempo até a primeira linha, o total de linhas e a
+vazão (linhas/s).
+
+Os resultados ficam no cache de result_cache.py; a repetição de uma consulta
+cujas tabelas não foram recarregadas lê o Parquet do cache (`--no-cache`
+força a ida ao banco).
+
+Com `--db arquivo.duckdb` (ou .sqlite) a consulta roda na cópia embutida
+gerada por populate_scripts/embedded.py, sem servidor; o SQL passa pela
+tradução de dialect.py e o cache de resultados não é usado.
+
+Uso (a partir da raiz do repositório):
+    python Consultas/runner.py <consulta> [--views] [--format csv|parquet]
+                               [--output arquivo] [--batch N] [--head N]
+                               [--no-cache] [--year N] [--year-from N] [--year-to N]
+                               [--countries ...] [--sources ...] [--limit N]
+                               [--db arquivo.duckdb|arquivo.sqlite]
+    python Consultas/runner.py --list
+"""
+
+from __future__ import annotations
+import argparse, csv, shutil, time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import text
+
+import dialect, result_cache
+from queries import (QUERIES, VIEW_QUERIES, add_param_arguments, bind, db, get_engine,
+                     params_from_args, sql_for)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional (só para --format parquet)
+    pa = None
+
+BATCH_ROWS = 10_000
+HEAD_ROWS = 100
+
+# OID do tipo no PostgreSQL → tipo Arrow (o resto vira texto)
+_PG_ARROW = {16: "bool", 20: "int64", 21: "int64", 23: "int64",
+             700: "float64", 701: "float64", 1700: "float64"}
+
+
+@dataclass
+class RunStats:
+    rows: int = 0
+    first_row_s: float | None = None
+    total_s: float = 0.0
+    cached: bool = False
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.total_s if self.total_s else 0.0
+
+    def __str__(self) -> str:
+        first = f"{self.first_row_s * 1000:.1f}ms" if self.first_row_s is not None else "-"
+        return (f"{self.rows} linhas em {self.total_s:.3f}s "
+                f"({self.rows_per_s:,.0f} linhas/s, primeira linha em {first})")
+
+
+# ───────────────────────────────────────────────────────────────
+# Destinos
+# ───────────────────────────────────────────────────────────────
+def _plain(v):
+    # mesmo tratamento do pd.read_sql (coerce_float): numeric vira float
+    return float(v) if isinstance(v, Decimal) else v
+
+
+class CsvSink:
+    """CSV no mesmo formato do df.to_csv() (com a coluna de índice)."""
+
+    def __init__(self, path: Path):
+        self.f = open(path, "w", newline="")
+        self.w = csv.writer(self.f)
+        self.n = 0
+
+    def start(self, columns: list[str], type_codes: list) -> None:
+        self.w.writerow([""] + columns)
+
+    def write(self, rows: list) -> None:
+        self.w.writerows([i, *(_plain(v) for v in row)]
+                         for i, row in enumerate(rows, self.n))
+        self.n += len(rows)
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class ParquetSink:
+    """Parquet gravado um row group por lote, com o esquema vindo do cursor."""
+
+    def __init__(self, path: Path, metadata: dict | None = None):
+        if pa is None:
+            raise SystemExit("pyarrow não instalado: use --format csv")
+        self.path = path
+        self.metadata = metadata
+        self.writer = None
+
+    def start(self, columns: list[str], type_codes: list) -> None:
+        self.schema = pa.schema([(c, pa.type_for_alias(_PG_ARROW.get(t, "string")))
+                                 for c, t in zip(columns, type_codes)],
+                                metadata=self.metadata)
+        self.writer = pq.ParquetWriter(self.path, self.schema)
+
+    def write(self, rows: list) -> None:
+        cols = list(zip(*rows))
+        arrays = [pa.array([_plain(v) if f.type != pa.string() or v is None else str(v)
+                            for v in col], type=f.type)
+                  for f, col in zip(self.schema, cols)]
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+class TeeSink:
+    """Repassa os mesmos lotes a vários destinos (saída + cache)."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def start(self, columns: list[str], type_codes: list) -> None:
+        for s in self.sinks:
+            s.start(columns, type_codes)
+
+    def write(self, rows: list) -> None:
+        for s in self.sinks:
+            s.write(rows)
+
+    def close(self) -> None:
+        for s in self.sinks:
+            s.close()
+
+
+SINKS = {"csv": CsvSink, "parquet": ParquetSink}
+
+
+# ───────────────────────────────────────────────────────────────
+# Execução
+# ───────────────────────────────────────────────────────────────
+@contextmanager
+def _cursor(engine, sql: str, params: dict, batch: int):
+    """(colunas, OIDs dos tipos, iterador de lotes) do PostgreSQL ou do banco embutido."""
+    if isinstance(engine, dialect.EmbeddedDB):
+        cur = engine.execute(sql, params)
+        first = cur.fetchmany(batch)
+
+        def parts():
+            if first:
+                yield first
+            yield from iter(lambda: cur.fetchmany(batch), [])
+        yield [d[0] for d in cur.description], engine.type_codes(cur, first), parts()
+        return
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch) \
+                     .execute(text(sql), params)
+        yield (list(result.keys()), [d[1] for d in result.cursor.description],
+               result.partitions(batch))
+
+
+def stream_query(engine, sql: str, sink, batch: int = BATCH_ROWS,
+                 head: int = 0, params: dict | None = None) -> tuple[RunStats, pd.DataFrame]:
+    """
+    Executa `sql` num cursor do servidor (ou do banco embutido) e grava os
+    lotes em `sink`. Devolve as estatísticas e as primeiras `head` linhas.
+    """
+    stats, preview = RunStats(), []
+    t0 = time.perf_counter()
+    with _cursor(engine, sql, params or {}, batch) as (columns, type_codes, parts):
+        sink.start(columns, type_codes)
+        try:
+            for part in parts:
+                if stats.first_row_s is None:
+                    stats.first_row_s = time.perf_counter() - t0
+                sink.write(part)
+                if len(preview) < head:
+                    preview.extend(part[:head - len(preview)])
+                stats.rows += len(part)
+        finally:
+            sink.close()
+    stats.total_s = time.perf_counter() - t0
+    return stats, pd.DataFrame([[_plain(v) for v in r] for r in preview], columns=columns)
+
+
+def replay(path: Path, output: Path, fmt: str, batch: int = BATCH_ROWS,
+           head: int = 0) -> tuple[RunStats, pd.DataFrame]:
+    """Grava em `output` um resultado guardado no cache (sem ir ao banco)."""
+    stats, preview = RunStats(cached=True), []
+    t0 = time.perf_counter()
+    pf = pq.ParquetFile(path)
+    columns = pf.schema_arrow.names
+    if fmt == "parquet":
+        shutil.copyfile(path, output)
+        batches = pf.iter_batches(batch_size=max(head, 1))
+        first = next(batches, None)
+        preview = list(zip(*(c.to_pylist() for c in first.columns))) if first else []
+        preview = preview[:head]
+        stats.rows = pf.metadata.num_rows
+        stats.first_row_s = time.perf_counter() - t0 if stats.rows else None
+    else:
+        sink = SINKS[fmt](output)
+        sink.start(columns, [])
+        try:
+            for rb in pf.iter_batches(batch_size=batch):
+                if stats.first_row_s is None:
+                    stats.first_row_s = time.perf_counter() - t0
+                part = list(zip(*(c.to_pylist() for c in rb.columns)))
+                sink.write(part)
+                if len(preview) < head:
+                    preview.extend(part[:head - len(preview)])
+                stats.rows += len(part)
+        finally:
+            sink.close()
+    stats.total_s = time.perf_counter() - t0
+    return stats, pd.DataFrame(preview, columns=columns)
+
+
+def run_to_file(engine, name: str, output: Path, fmt: str = "csv", use_views: bool = False,
+                batch: int = BATCH_ROWS, head: int = 0, cache: bool = True,
+                params: dict | None = None) -> tuple[RunStats, pd.DataFrame]:
+    sql, params = sql_for(name, use_views), bind(name, **(params or {}))
+    if isinstance(engine, dialect.EmbeddedDB) or not (cache and result_cache.enabled()):
+        return stream_query(engine, sql, SINKS[fmt](output), batch, head, params)
+
+    hit = result_cache.lookup(engine, sql, params)
+    if hit is not None:
+        return replay(hit, output, fmt, batch, head)
+    entry = result_cache.Entry(engine, sql, params)
+    try:
+        result = stream_query(engine, sql, TeeSink(SINKS[fmt](output),
+                                                   ParquetSink(entry.tmp, entry.metadata)),
+                              batch, head, params)
+    except BaseException:
+        entry.discard()
+        raise
+    entry.commit()
+    return result
+
+
+def main(name: str | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Executa uma consulta registrada em streaming.")
+    if name is None:
+        parser.add_argument("query", nargs="?", choices=list(QUERIES), help="consulta")
+        parser.add_argument("--list", action="store_true", help="lista as consultas")
+    parser.add_argument("--views", action="store_true",
+                        help="lê das views materializadas (Modelos/views.sql)")
+    parser.add_argument("--format", choices=list(SINKS), default="csv")
+    parser.add_argument("--output", type=Path,
+                        help="arquivo de saída (padrão: ./Consultas/<consulta>Query.<formato>)")
+    parser.add_argument("--batch", type=int, default=BATCH_ROWS, help="linhas por lote")
+    parser.add_argument("--head", type=int, default=HEAD_ROWS,
+                        help="linhas exibidas no terminal")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache de resultados (result_cache.py)")
+    parser.add_argument("--db", type=Path,
+                        help="roda na cópia embutida (.duckdb ou .sqlite) em vez do PostgreSQL")
+    add_param_arguments(parser)
+    args = parser.parse_args()
+
+    if name is None:
+        if args.list or not args.query:
+            for q in QUERIES:
+                print(q + ("  (--views)" if q in VIEW_QUERIES else ""))
+            return
+        name = args.query
+
+    output = args.output or Path(f"./Consultas/{name}Query.{args.format}")
+    engine = dialect.EmbeddedDB(args.db) if args.db else get_engine()
+    with db.stage(f"consultas/{name}"):
+        stats, head = run_to_file(engine, name, output, args.format, args.views,
+                                  args.batch, args.head, cache=not args.no_cache,
+                                  params=params_from_args(name, args))
+
+    print(head.to_string(index=False))
+    if stats.rows > len(head):
+        print(f"… (+{stats.rows - len(head)} linhas em {output})")
+    source = "cache" if stats.cached else ("views" if args.views else "tabelas")
+    if args.db:
+        source += f", {engine.kind}"
+    print(f"\n⏱  {stats} ({source})")
+    if not args.db:
+        print(db.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+-- Chave primária de "Power Source_Country" passa a incluir "Year"
+-- O loader grava uma linha por (fonte, país, ano) e faz o upsert com
+-- ON CONFLICT ("Country_ID_Country", "Power Source_ID_Power", "Year"),
+-- que exige um índice único com essas colunas. Bancos criados com o modelo
+-- antigo (PK só em fonte + país) são corrigidos aqui. Em bancos novos o
+-- modeloFisico.sql já cria a chave correta e nada é feito.
+
+DO $$
+BEGIN
+    IF (SELECT cardinality(conkey) FROM pg_constraint
+        WHERE conname = 'pk_power_source_country') = 2 THEN
+        DELETE FROM public."Power Source_Country" WHERE "Year" IS NULL;
+        ALTER TABLE public."Power Source_Country" DROP CONSTRAINT "pk_power_source_country";
+        ALTER TABLE public."Power Source_Country"
+            ADD CONSTRAINT "pk_power_source_country"
+            PRIMARY KEY ("Power Source_ID_Power", "Country_ID_Country", "Year");
+    END IF;
+END $$;
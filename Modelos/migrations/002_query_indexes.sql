@@ -0,0 +1,40 @@
+-- Índices para os caminhos de acesso das Consultas
+-- Sugeridos por Consultas/index_advisor.py a partir dos planos de execução.
+
+-- Sector_Country: filtro por ano + maior setor por país (primeira consulta).
+-- Cobre o DISTINCT ON (país) ORDER BY emissão DESC sem ler a tabela.
+CREATE INDEX IF NOT EXISTS "ix_sector_country_year_country_co2"
+    ON public."Sector_Country" ("Year", "Country_ID_Country", "CO2_Emission" DESC)
+    INCLUDE ("Sector_ID_Sector");
+
+-- Sector_Country: joins por (país, ano) nas consultas 3 e 5 (index-only scan).
+CREATE INDEX IF NOT EXISTS "ix_sector_country_country_year"
+    ON public."Sector_Country" ("Country_ID_Country", "Year")
+    INCLUDE ("CO2_Emission");
+
+-- Power Source_Country: joins por (país, ano) nas consultas 3, 5 e 6.
+CREATE INDEX IF NOT EXISTS "ix_psc_country_year"
+    ON public."Power Source_Country" ("Country_ID_Country", "Year")
+    INCLUDE ("Power Source_ID_Power", "CO2_Emission", "Power_Generation");
+
+-- Power Source_Country: top-N da segunda consulta, já na ordem do ORDER BY.
+CREATE INDEX IF NOT EXISTS "ix_psc_year_co2_generation"
+    ON public."Power Source_Country" ("Year" DESC, "CO2_Emission" DESC, "Power_Generation" DESC);
+
+-- Filtros por intervalo de ano (ex.: "Year" > 2010): BRIN é minúsculo e
+-- basta, já que as cargas gravam os anos em blocos contíguos.
+CREATE INDEX IF NOT EXISTS "brin_psc_year"
+    ON public."Power Source_Country" USING brin ("Year");
+
+CREATE INDEX IF NOT EXISTS "brin_sector_country_year"
+    ON public."Sector_Country" USING brin ("Year");
+
+-- Development: só as linhas completas entram na quinta consulta.
+CREATE INDEX IF NOT EXISTS "ix_development_complete"
+    ON public."Development" ("Country_ID", "Ano")
+    INCLUDE ("IDH", "Electricity", "Health")
+    WHERE "IDH" IS NOT NULL AND "Electricity" IS NOT NULL AND "Health" IS NOT NULL;
+
+ANALYZE public."Sector_Country";
+ANALYZE public."Power Source_Country";
+ANALYZE public."Development";
@@ -0,0 +1,84 @@
+-- mv_global_year passa a ser calculada em uma passada (DISTINCT ON + SUM(...) OVER)
+-- em vez de nove subconsultas correlacionadas por ano. Bancos com a definição
+-- antiga recriam a view aqui; o resultado é o mesmo, só o REFRESH fica mais
+-- barato. Cópia da definição de Modelos/views.sql no momento desta migração.
+
+DROP MATERIALIZED VIEW IF EXISTS public.mv_global_year;
+
+CREATE MATERIALIZED VIEW public.mv_global_year AS
+WITH CO2_sector AS (
+    -- uma linha por ano: setor que mais emite + total do ano (janela sobre os grupos)
+    SELECT DISTINCT ON (CS."Year")
+            CS."Year",
+            S."Name"                                              AS sector,
+            SUM(SUM(CS."CO2_Emission")) OVER (PARTITION BY CS."Year") AS co2_total_sector
+    FROM    public."Sector_Country" CS
+    JOIN    public."Sector"         S  ON S."ID_Sector" = CS."Sector_ID_Sector"
+    GROUP BY S."Name", CS."Year"
+    ORDER BY CS."Year", SUM(CS."CO2_Emission") DESC
+),
+
+CO2_energy AS (
+    SELECT DISTINCT ON (PSC."Year")
+           PSC."Year",
+           PS."Name" AS energy_name,
+           SUM(SUM(PSC."CO2_Emission")) OVER (PARTITION BY PSC."Year") AS co2_total_energia
+    FROM public."Power Source_Country" PSC
+    JOIN public."Power Source" PS ON PS."ID_Power" = PSC."Power Source_ID_Power"
+    GROUP BY PS."Name", PS."Renewable", PSC."Year"
+    ORDER BY PSC."Year", SUM(PSC."CO2_Emission") DESC
+),
+
+CO2_country AS (
+    SELECT DISTINCT ON (EI."Year")
+            EI."Year",
+            C."Name"            AS country,
+            SUM(EI."CO2_Emision") OVER (PARTITION BY EI."Year") AS co2_total_country
+    FROM    public."Country" C
+    JOIN    public."Environmental Indicator" EI  ON C."ID_Country" = EI."Country_ID"
+    ORDER BY EI."Year", EI."CO2_Emision" DESC
+),
+
+IDH_total AS (
+    SELECT SUM(D."IDH") AS total_idh,
+           D."Ano"      AS "Year"
+    FROM public."Development" D
+    GROUP BY D."Ano"
+),
+
+GDP_total AS (
+    SELECT SUM(I."GDP") AS total_gdp,
+           I."Year"
+    FROM public."Investment" I
+    GROUP BY I."Year"
+),
+
+year AS (
+    SELECT DISTINCT "Year" FROM public."Sector_Country"
+    UNION
+    SELECT DISTINCT "Year" FROM public."Power Source_Country"
+    UNION
+    SELECT DISTINCT "Ano" AS "Year" FROM public."Development"
+    UNION
+    SELECT DISTINCT "Year" FROM public."Investment"
+)
+
+SELECT  y."Year"               AS "Year",
+        cs.co2_total_sector,
+        cs.sector              AS sector_maior_emissao,
+        ce.co2_total_energia,
+        ce.energy_name         AS energia_maior_emissao,
+        cc.co2_total_country,
+        cc.country             AS country_maior_emissao,
+        i.total_idh            AS total_IDH,
+        g.total_gdp            AS total_GDP
+FROM year AS y
+LEFT JOIN CO2_sector  AS cs ON cs."Year" = y."Year"
+LEFT JOIN CO2_energy  AS ce ON ce."Year" = y."Year"
+LEFT JOIN CO2_country AS cc ON cc."Year" = y."Year"
+LEFT JOIN IDH_total   AS i  ON i."Year"  = y."Year"
+LEFT JOIN GDP_total   AS g  ON g."Year"  = y."Year"
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS "ux_mv_global_year"
+    ON public.mv_global_year ("Year");
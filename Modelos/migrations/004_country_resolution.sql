@@ -0,0 +1,35 @@
+-- Resolução de nomes de país (populate_scripts/countries.py)
+-- "Country" ganha o código ISO3 (coluna "Country Code" do WDICountry.csv),
+-- usado antes do nome quando a fonte traz código. country_alias guarda os
+-- nomes alternativos (seed: Modelos/country_aliases.csv; manual; fuzzy: aceitos
+-- pela busca por trigramas; "Country_ID" nulo marca um nome que não é país) e
+-- country_unresolved os nomes que nenhuma regra
+-- resolveu na última carga de cada fonte. Em bancos novos o modeloFisico.sql
+-- já cria as colunas e tabelas e só o índice único de ISO3 é criado aqui.
+
+ALTER TABLE public."Country" ADD COLUMN IF NOT EXISTS "ISO3" character(3);
+
+CREATE UNIQUE INDEX IF NOT EXISTS "uq_country_iso3"
+    ON public."Country" ("ISO3") WHERE "ISO3" IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS public.country_alias
+(
+    "Alias" character varying(150) PRIMARY KEY,
+    "Name" character varying(150) NOT NULL,
+    "Country_ID" integer,
+    "Source" character varying(10) NOT NULL DEFAULT 'manual',
+    "Score" numeric(4, 3),
+    "Created_At" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "fk_alias_country" FOREIGN KEY ("Country_ID") REFERENCES public."Country" ("ID_Country"),
+    CONSTRAINT "ck_alias_source" CHECK ("Source" IN ('seed', 'manual', 'fuzzy'))
+);
+
+CREATE TABLE IF NOT EXISTS public.country_unresolved
+(
+    "Loader" character varying(100) NOT NULL,
+    "Source" character varying(255) NOT NULL,
+    "Name" text NOT NULL,
+    "Rows" bigint NOT NULL,
+    "Seen_At" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "pk_country_unresolved" PRIMARY KEY ("Loader", "Source", "Name")
+);
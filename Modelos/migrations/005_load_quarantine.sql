@@ -0,0 +1,17 @@
+-- Quarentena da validação da carga (populate_scripts/quality.py)
+-- Linhas que violaram alguma regra antes do COPY: loader, tabela de destino,
+-- regras violadas e a linha em JSON. Cada gravação de (loader, tabela)
+-- substitui as suas linhas. Em bancos novos o modeloFisico.sql já cria a
+-- tabela e só o índice é criado aqui.
+
+CREATE TABLE IF NOT EXISTS public.load_quarantine
+(
+    "Loader" character varying(100) NOT NULL,
+    "Table" character varying(100) NOT NULL,
+    "Rules" text NOT NULL,
+    "Row" text NOT NULL,
+    "Seen_At" timestamp with time zone DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS "ix_load_quarantine_loader_table"
+    ON public.load_quarantine ("Loader", "Table");
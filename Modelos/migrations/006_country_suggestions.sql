@@ -0,0 +1,16 @@
+-- Sugestões de país em vez de aliases fuzzy (populate_scripts/countries.py)
+-- A busca por trigramas deixa de gravar aliases: o candidato vira sugestão
+-- do nome em country_unresolved ("Suggested_ID", "Score") e só passa a valer
+-- quando aprovado com `countries.py alias`. Os aliases fuzzy já gravados são
+-- apagados (alguns juntavam agregados diferentes, como 'East Asia and the
+-- Pacific (UNDP)' e 'East Asia & Pacific'); na próxima carga voltam como
+-- sugestões. Em bancos novos o modeloFisico.sql já cria as colunas.
+
+DELETE FROM public.country_alias WHERE "Source" = 'fuzzy';
+
+ALTER TABLE public.country_alias DROP CONSTRAINT IF EXISTS "ck_alias_source";
+ALTER TABLE public.country_alias
+    ADD CONSTRAINT "ck_alias_source" CHECK ("Source" IN ('seed', 'manual'));
+
+ALTER TABLE public.country_unresolved ADD COLUMN IF NOT EXISTS "Suggested_ID" integer;
+ALTER TABLE public.country_unresolved ADD COLUMN IF NOT EXISTS "Score" numeric(4, 3);
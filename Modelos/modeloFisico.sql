@@ -3,7 +3,8 @@ BEGIN;
 CREATE TABLE IF NOT EXISTS public."Country"
 (
     "ID_Country" serial PRIMARY KEY,
-    "Name" character varying(100)
+    "Name" character varying(100),
+    "ISO3" character(3)
 );
 
 CREATE TABLE IF NOT EXISTS public."Environmental Indicator"
@@ -12,7 +13,8 @@ CREATE TABLE IF NOT EXISTS public."Environmental Indicator"
     "CO2_Emision" numeric(15, 10),
     "Year" integer,
     "Country_ID" integer NOT NULL,
-    CONSTRAINT "fk_env_country" FOREIGN KEY ("Country_ID") REFERENCES public."Country" ("ID_Country")
+    CONSTRAINT "fk_env_country" FOREIGN KEY ("Country_ID") REFERENCES public."Country" ("ID_Country"),
+    CONSTRAINT "uq_environmental_country_year" UNIQUE ("Country_ID", "Year")
 );
 
 CREATE TABLE IF NOT EXISTS public."Investment"
@@ -23,7 +25,8 @@ CREATE TABLE IF NOT EXISTS public."Investment"
     "Health_Expenditure" numeric(15, 2),
     "Year" integer,
     "Country_ID" integer NOT NULL,
-    CONSTRAINT "fk_inv_country" FOREIGN KEY ("Country_ID") REFERENCES public."Country" ("ID_Country")
+    CONSTRAINT "fk_inv_country" FOREIGN KEY ("Country_ID") REFERENCES public."Country" ("ID_Country"),
+    CONSTRAINT "uq_investment_country_year" UNIQUE ("Country_ID", "Year")
 );
 
 CREATE TABLE IF NOT EXISTS public."Development"
@@ -80,10 +83,10 @@ CREATE TABLE IF NOT EXISTS public."Power Source_Country"
 (
     "Power Source_ID_Power" integer NOT NULL,
     "Country_ID_Country" integer NOT NULL,
-    "Year" integer,
+    "Year" integer NOT NULL,
     "CO2_Emission" numeric(12, 4),
     "Power_Generation" numeric(12, 4),
-    CONSTRAINT "pk_power_source_country" PRIMARY KEY ("Power Source_ID_Power", "Country_ID_Country"),
+    CONSTRAINT "pk_power_source_country" PRIMARY KEY ("Power Source_ID_Power", "Country_ID_Country", "Year"),
     CONSTRAINT "fk_psc_power" FOREIGN KEY ("Power Source_ID_Power") REFERENCES public."Power Source" ("ID_Power"),
     CONSTRAINT "fk_psc_country" FOREIGN KEY ("Country_ID_Country") REFERENCES public."Country" ("ID_Country")
 );
@@ -98,13 +101,55 @@ CREATE TABLE IF NOT EXISTS public."Demography"
     CONSTRAINT "uq_population_country_year" UNIQUE ("Country_ID", "Year")
 );
 
-ALTER TABLE "Investment"
-ADD CONSTRAINT uq_investment_country_year
-UNIQUE ("Country_ID", "Year");
+CREATE TABLE IF NOT EXISTS public.load_manifest
+(
+    "Loader" character varying(100) NOT NULL,
+    "Source" character varying(255) NOT NULL,
+    "Kind" character varying(10) NOT NULL,
+    "Content_Hash" character(64) NOT NULL,
+    "Row_Count" bigint,
+    "Loaded_At" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "pk_load_manifest" PRIMARY KEY ("Loader", "Source")
+);
 
-ALTER TABLE "Environmental Indicator"
-ADD CONSTRAINT uq_environmental_country_year
-UNIQUE ("Country_ID", "Year");
+CREATE TABLE IF NOT EXISTS public.table_versions
+(
+    "Table" character varying(100) PRIMARY KEY,
+    "Version" bigint NOT NULL DEFAULT 1,
+    "Updated_At" timestamp with time zone DEFAULT now()
+);
 
+CREATE TABLE IF NOT EXISTS public.country_alias
+(
+    "Alias" character varying(150) PRIMARY KEY,
+    "Name" character varying(150) NOT NULL,
+    "Country_ID" integer,
+    "Source" character varying(10) NOT NULL DEFAULT 'manual',
+    "Score" numeric(4, 3),
+    "Created_At" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "fk_alias_country" FOREIGN KEY ("Country_ID") REFERENCES public."Country" ("ID_Country"),
+    CONSTRAINT "ck_alias_source" CHECK ("Source" IN ('seed', 'manual'))
+);
+
+CREATE TABLE IF NOT EXISTS public.country_unresolved
+(
+    "Loader" character varying(100) NOT NULL,
+    "Source" character varying(255) NOT NULL,
+    "Name" text NOT NULL,
+    "Rows" bigint NOT NULL,
+    "Suggested_ID" integer,
+    "Score" numeric(4, 3),
+    "Seen_At" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "pk_country_unresolved" PRIMARY KEY ("Loader", "Source", "Name")
+);
+
+CREATE TABLE IF NOT EXISTS public.load_quarantine
+(
+    "Loader" character varying(100) NOT NULL,
+    "Table" character varying(100) NOT NULL,
+    "Rules" text NOT NULL,
+    "Row" text NOT NULL,
+    "Seen_At" timestamp with time zone DEFAULT now()
+);
 
 END;
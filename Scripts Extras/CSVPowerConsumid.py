@@ -1,4 +1,17 @@
-import pandas as pd
+"""
+Gera Datasets/PowerGenerationEmission.csv a partir do long format do Ember
+-------------------------------------------------------------------------
+O arquivo de entrada é lido em streaming (ver stream_csv.py): os filtros e a
+seleção de colunas são aplicados na leitura e a saída é gravada bloco a bloco,
+então o arquivo inteiro nunca fica em memória.
+
+Uso (a partir da raiz do repositório):
+    python "Scripts Extras/CSVPowerConsumid.py" [--input ...] [--output ...]
+                                                [--chunksize N] [--engine auto|arrow|pandas]
+"""
+
+import argparse
+from stream_csv import CHUNK_ROWS, EMBER_DTYPES, iter_filtered, write_csv
 
 # Caminho para o arquivo original
 input_path = './Datasets/yearly_full_release_long_format.csv'  # ajuste conforme o local do seu arquivo
@@ -17,22 +30,34 @@ indicadores_Variable = [
 indicadores_Subcategory= ["Fuel"]
 indicadores_Unit= ["TWh", "mtCO2"]
 
-# Carregar o arquivo CSV original
-df = pd.read_csv(input_path)
-
-# Filtrar apenas as linhas com os indicadores desejados
-df_filtrado = df[df["Category"].isin(indicadores_desejados)]
-df_filtrado2 = df_filtrado[df_filtrado["Variable"].isin(indicadores_Variable)]
-df_filtrado3 = df_filtrado2[df_filtrado2["Subcategory"].isin(indicadores_Subcategory)]
-db_filtrado4 = df_filtrado3[df_filtrado3["Unit"].isin(indicadores_Unit)]
-
-
-# Criar a lista de colunas desejadas
-colunas_desejadas = ["Area", "Year", "Category", "Variable", "Value"] + [str(ano) for ano in range(2000, 2025)]
-
-# Selecionar apenas as colunas desejadas (se existirem no DataFrame)
-colunas_existentes = [col for col in colunas_desejadas if col in df_filtrado.columns]
-df_resultado = db_filtrado4[colunas_existentes]
-
-df_resultado.to_csv(output_path, index=False)
-print("Sucesso")
+# Criar a lista de colunas desejadas (só as que existirem no arquivo são lidas)
+colunas_desejadas = ["Area", "ISO 3 code", "Year", "Category", "Variable", "Value"] + [str(ano) for ano in range(2000, 2025)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", default=input_path)
+    parser.add_argument("--output", default=output_path)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS,
+                        help="linhas por bloco de leitura")
+    parser.add_argument("--engine", choices=("auto", "arrow", "pandas"), default="auto")
+    args = parser.parse_args()
+
+    # Filtrar apenas as linhas com os indicadores desejados, bloco a bloco
+    blocos = iter_filtered(
+        args.input,
+        filters={"Category": indicadores_desejados,
+                 "Variable": indicadores_Variable,
+                 "Subcategory": indicadores_Subcategory,
+                 "Unit": indicadores_Unit},
+        columns=colunas_desejadas,
+        dtypes=EMBER_DTYPES,
+        chunksize=args.chunksize,
+        engine=args.engine,
+    )
+    linhas = write_csv(blocos, args.output)
+    print(f"Sucesso ({linhas} linhas em {args.output})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,18 @@
+"""
+Gera Datasets/EnergyData.csv a partir do long format do Ember
+------------------------------------------------------------
+O arquivo de entrada é lido em streaming (ver stream_csv.py), com filtros e
+seleção de colunas aplicados na leitura. Só as linhas já filtradas ficam em
+memória até o pivot final, que depende delas todas.
+
+Uso (a partir da raiz do repositório):
+    python "Scripts Extras/limpacsv.py" [--input ...] [--output ...]
+                                        [--chunksize N] [--engine auto|arrow|pandas]
+"""
+
+import argparse
 import pandas as pd
+from stream_csv import CHUNK_ROWS, EMBER_DTYPES, iter_filtered
 
 # Caminho para o arquivo original
 input_path = './Datasets/yearly_full_release_long_format.csv'  # ajuste conforme o local do seu arquivo
@@ -26,34 +40,48 @@ indicadores_desejados3 = [
     "TWh", "mtCO2"
 ]
 
-# Carregar o arquivo CSV original
-df = pd.read_csv(input_path)
-
-# Filtrar apenas as linhas com os indicadores desejados
-df_filtrado = df[df["Category"].isin(indicadores_desejados)]
-df_filtrado2 = df_filtrado[df_filtrado["Variable"].isin(indicadores_desejados2)]
-df_filtrado3 = df_filtrado2[df_filtrado2["Unit"].isin(indicadores_desejados3)]
-
-# Criar a lista de colunas desejadas
+# Criar a lista de colunas desejadas (só as que existirem no arquivo são lidas)
 colunas_desejadas = [
     "Country","Year","Category","Variable","Value"]
 
-# Selecionar apenas as colunas desejadas (se existirem no DataFrame)
-colunas_existentes = [col for col in colunas_desejadas if col in df_filtrado3.columns]
-df_resultado = df_filtrado3[colunas_existentes]
 
-# Pivotear a tabela para transformar a coluna Category em colunas separadas
-pivoted_df = df_resultado.pivot_table(
-    index=['Country', 'Year', 'Variable'],
-    columns='Category',
-    values='Value',
-    aggfunc='first'  # assumindo que não há duplicatas
-).reset_index()
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", default=input_path)
+    parser.add_argument("--output", default=output_path)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS,
+                        help="linhas por bloco de leitura")
+    parser.add_argument("--engine", choices=("auto", "arrow", "pandas"), default="auto")
+    args = parser.parse_args()
+
+    # Filtrar apenas as linhas com os indicadores desejados, bloco a bloco
+    df_resultado = pd.concat(iter_filtered(
+        args.input,
+        filters={"Category": indicadores_desejados,
+                 "Variable": indicadores_desejados2,
+                 "Unit": indicadores_desejados3},
+        columns=colunas_desejadas,
+        dtypes=EMBER_DTYPES,
+        chunksize=args.chunksize,
+        engine=args.engine,
+    ), ignore_index=True)
+
+    # Pivotear a tabela para transformar a coluna Category em colunas separadas
+    pivoted_df = df_resultado.pivot_table(
+        index=['Country', 'Year', 'Variable'],
+        columns='Category',
+        values='Value',
+        aggfunc='first'  # assumindo que não há duplicatas
+    ).reset_index()
+
+    # Renomear as colunas para remover o nome 'Category'
+    pivoted_df.columns.name = None
+
+    # Salvar o resultado em um novo arquivo CSV
+    pivoted_df.to_csv(args.output, index=False)
 
-# Renomear as colunas para remover o nome 'Category'
-pivoted_df.columns.name = None
+    print("Novo arquivo CSV criado com sucesso:", args.output)
 
-# Salvar o resultado em um novo arquivo CSV
-pivoted_df.to_csv(output_path, index=False)
 
-print("Novo arquivo CSV criado com sucesso:", output_path)
+if __name__ == "__main__":
+    main()
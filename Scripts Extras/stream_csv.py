@@ -0,0 +1,107 @@
+"""
+Leitura em streaming de CSVs grandes
+------------------------------------
+Usado pelos pré-processadores do long format do Ember
+(`yearly_full_release_long_format.csv`), que cresce a cada release.
+
+`iter_filtered` lê o arquivo em blocos, aplicando os filtros `isin` e a
+projeção de colunas já na leitura, e devolve só as linhas que interessam;
+`write_csv` grava esses blocos à medida que chegam. Assim o pico de memória
+depende do tamanho do bloco, e não do tamanho do arquivo de entrada.
+
+Com `pyarrow` instalado a leitura usa o leitor de CSV em streaming do Arrow
+(`pyarrow.csv.open_csv`, com projeção e filtro feitos no Arrow antes de virar
+DataFrame); sem ele, `pd.read_csv(chunksize=...)`.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable, Iterator
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # dependência opcional
+    pa = None
+
+CHUNK_ROWS = 200_000
+
+# Tipos fixos das colunas do Ember: todos os blocos saem com o mesmo dtype
+# (e o CSV gerado fica igual ao da leitura completa com pd.read_csv)
+EMBER_DTYPES = {"Year": "int64", "Value": "float64"}
+
+_ARROW_TYPES = {"int64": "int64", "float64": "float64", "str": "string"}
+
+
+def header(path: Path | str) -> list[str]:
+    """Nomes das colunas do CSV (lê só a primeira linha)."""
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def _arrow_batches(path, filters: dict[str, list], columns: list[str],
+                   dtypes: dict[str, str], chunksize: int) -> Iterator[pd.DataFrame]:
+    # open_csv só lê o próximo bloco quando o anterior foi consumido; o
+    # tamanho do bloco (em bytes) é o padrão do Arrow, `chunksize` não se aplica
+    include = list(dict.fromkeys(columns + list(filters)))
+    reader = pacsv.open_csv(path, convert_options=pacsv.ConvertOptions(
+        include_columns=include,
+        column_types={c: pa.type_for_alias(_ARROW_TYPES.get(t, "string"))
+                      for c, t in dtypes.items() if c in include}))
+    values = {col: pa.array(v) for col, v in filters.items()}
+    for batch in reader:
+        mask = None
+        for col, arr in values.items():
+            cond = pc.is_in(batch[col], value_set=arr)
+            mask = cond if mask is None else pc.and_(mask, cond)
+        if mask is not None:
+            batch = batch.filter(mask)
+        if batch.num_rows:
+            yield batch.select(columns).to_pandas()
+
+
+def _pandas_chunks(path, filters: dict[str, list], columns: list[str],
+                   dtypes: dict[str, str], chunksize: int) -> Iterator[pd.DataFrame]:
+    usecols = list(dict.fromkeys(columns + list(filters)))
+    reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize,
+                         dtype={c: t for c, t in dtypes.items() if c in usecols})
+    for chunk in reader:
+        mask = pd.Series(True, index=chunk.index)
+        for col, values in filters.items():
+            mask &= chunk[col].isin(values)
+        if mask.any():
+            yield chunk.loc[mask, columns]
+
+
+def iter_filtered(path: Path | str, filters: dict[str, list], columns: list[str],
+                  dtypes: dict[str, str] | None = None, chunksize: int = CHUNK_ROWS,
+                  engine: str = "auto") -> Iterator[pd.DataFrame]:
+    """
+    Blocos de `path` com as linhas em que cada coluna de `filters` está na
+    lista de valores, projetados em `columns` (as que existirem no arquivo).
+    Sem nenhuma linha válida, gera um único DataFrame vazio com as colunas.
+    """
+    existing = header(path)
+    columns = [c for c in columns if c in existing]
+    dtypes = {c: t for c, t in (dtypes or {}).items() if c in existing}
+    if engine == "auto":
+        engine = "arrow" if pa is not None else "pandas"
+    read = _arrow_batches if engine == "arrow" else _pandas_chunks
+
+    empty = True
+    for block in read(path, filters, columns, dtypes, chunksize):
+        empty = False
+        yield block
+    if empty:
+        yield pd.DataFrame(columns=columns)
+
+
+def write_csv(blocks: Iterable[pd.DataFrame], path: Path | str) -> int:
+    """Grava os blocos em sequência (cabeçalho só no primeiro); devolve nº de linhas."""
+    rows = 0
+    with open(path, "w", newline="") as f:
+        for i, block in enumerate(blocks):
+            block.to_csv(f, index=False, header=(i == 0))
+            rows += len(block)
+    return rows
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Vazão da carga: backend síncrono × asyncpg
+------------------------------------------
+Carrega as cinco tabelas de indicadores (async_load.ASYNC_TABLES) com o
+escalonador do populate_db.py, uma vez com cada backend, e compara tempo
+total e linhas gravadas por segundo:
+
+  • sync    — ctx.write grava na thread do loader (COPY + merge, SQLAlchemy);
+  • asyncpg — ctx.write entrega o lote ao pool asyncpg e a thread segue para
+              a próxima etapa (async_load.py).
+
+Os dados vêm de synth_datasets.py (`--scale`) ou, com `--real`, da pasta
+Datasets. Num banco descartável (`--database`, no servidor de DB_URL) o
+populate_db.py --full cria o esquema e as dimensões uma vez; depois cada
+rodada (`--repeat` por backend, alternadas) esvazia as cinco tabelas e as
+recarrega num processo novo.
+
+Requer asyncpg (pip install asyncpg) e DB_URL com permissão de CREATE DATABASE.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_async_load.py [--scale 10 | --real] [--workers 2]
+                                          [--async-pool 4] [--repeat 3]
+                                          [--database first_db_bench_async] [--keep]
+"""
+
+from __future__ import annotations
+import argparse, json, os, shutil, statistics, sys, tempfile, time
+from dataclasses import replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+from bench_scale import admin_engine, recreate, result_line, spawn, table_rows  # noqa: E402
+
+POPULATE = ROOT / "populate_scripts" / "populate_db.py"
+STAGES = ("environmental", "development", "investment", "power_consumed", "demography")
+MARK = "BENCH_SCALE "   # mesmo prefixo de bench_scale.result_line
+
+
+# ───────────────────────────────────────────────────────────────
+# Processo filho: uma rodada
+# ───────────────────────────────────────────────────────────────
+def child_load(backend: str, workers: int, async_pool: int) -> None:
+    from sqlalchemy import text
+    import async_load
+    from populate_db import run_dag
+    from registry import import_loaders, new_context, setup_logging
+
+    setup_logging()
+    loaders = import_loaders()
+    stages = {n: replace(loaders[n], deps=()) for n in STAGES}   # Country já carregado
+    ctx = new_context(pool_size=workers, backend=backend, async_pool=async_pool)
+    with ctx.engine.begin() as conn:
+        tables = ", ".join(f'public."{t}"' for t in async_load.ASYNC_TABLES)
+        conn.execute(text(f"TRUNCATE {tables}"))
+
+    t0 = time.perf_counter()
+    try:
+        run_dag(stages, workers, "thread", ctx)
+    finally:
+        if ctx.writer is not None:
+            ctx.writer.close()
+    seconds = time.perf_counter() - t0
+    print(MARK + json.dumps({"seconds": seconds}), flush=True)
+
+
+# ───────────────────────────────────────────────────────────────
+# Main
+# ───────────────────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scale", type=float, default=10,
+                        help="fator de escala dos dados sintéticos (padrão: 10)")
+    source.add_argument("--real", action="store_true", help="usa a pasta Datasets")
+    parser.add_argument("--workers", type=int, default=2, help="etapas em paralelo")
+    parser.add_argument("--async-pool", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3, help="rodadas por backend")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default="first_db_bench_async",
+                        help="banco descartável criado e apagado ao final")
+    parser.add_argument("--keep", action="store_true", help="não apaga o banco ao final")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child_load(args.child[0], int(args.child[1]), int(args.child[2]))
+
+    import async_load
+    if not async_load.available():
+        sys.exit("💥  asyncpg não está instalado (pip install asyncpg)")
+    admin, url = admin_engine(args.database)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DB_URL": url.render_as_string(hide_password=False),
+               "SOURCE_CACHE_DIR": str(Path(tmp) / "sources"), "RESULT_CACHE": "0"}
+        if not args.real:
+            import synth_datasets
+            data = Path(tmp) / "data"
+            generated = synth_datasets.generate(data, args.scale, args.seed)
+            env["DATASETS_DIR"] = str(data)
+            print(f"⏱  {args.scale:g}×: {sum(generated.values()):,} linhas geradas", flush=True)
+
+        recreate(admin, args.database)
+        try:
+            spawn([sys.executable, str(POPULATE), "--full", "--workers", str(args.workers)], env)
+            rows = sum(table_rows(url)[t] for t in async_load.ASYNC_TABLES)
+
+            runs: dict[str, list[float]] = {b: [] for b in async_load.BACKENDS}
+            rss: dict[str, float] = {b: 0.0 for b in async_load.BACKENDS}
+            for i in range(args.repeat):
+                for backend in async_load.BACKENDS:
+                    out, _, peak = spawn([sys.executable, __file__, "--child", backend,
+                                          str(args.workers), str(args.async_pool)], env)
+                    runs[backend].append(result_line(out)["seconds"])
+                    rss[backend] = max(rss[backend], peak)
+                    print(f"   rodada {i + 1} {backend:<8}{runs[backend][-1]:>8.2f}s", flush=True)
+        finally:
+            shutil.rmtree(env["SOURCE_CACHE_DIR"], ignore_errors=True)
+            if not args.keep:
+                recreate(admin, args.database, drop_only=True)
+
+    print(f"\n{rows:,} linhas em {len(STAGES)} tabelas, {args.workers} worker(s), "
+          f"pool asyncpg de {args.async_pool}")
+    print(f"{'backend':<10}{'mediana':>10}{'linhas/s':>12}{'pico RSS':>10}{'ganho':>8}")
+    print("─" * 50)
+    base = statistics.median(runs["sync"])
+    for backend, secs in runs.items():
+        med = statistics.median(secs)
+        print(f"{backend:<10}{med:>9.2f}s{rows / med:>12,.0f}{rss[backend]:>7.0f} MB"
+              f"{base / med:>7.2f}×")
+
+
+if __name__ == "__main__":
+    main()
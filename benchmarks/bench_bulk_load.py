@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Relatório de tempos: UPSERT linha a linha × COPY + merge
+--------------------------------------------------------
+Roda cada script de indicador duas vezes, com BULK_LOAD_METHOD=rows (caminho
+antigo, um INSERT por linha) e BULK_LOAD_METHOD=copy (staging + merge), e
+compara o tempo de escrita informado por bulk_load.upsert_frame.
+
+Uso (a partir da raiz do repositório, com o banco já criado e as dimensões
+populadas):
+    python benchmarks/bench_bulk_load.py
+"""
+
+from __future__ import annotations
+import os, re, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "populate_scripts"
+
+LOADERS = (
+    "populate_environmental.py",
+    "populate_Development.py",
+    "populate_Investment.py",
+    "populate_power_consumed.py",
+    "populate_demography.py",
+    "populate_country_power_source.py",
+)
+
+TIMING_RE = re.compile(r"⏱  '(?P<table>[^']+)': (?P<rows>\d+) linhas em (?P<secs>[\d.]+)s")
+
+
+def run(script: str, method: str) -> tuple[str, int, float]:
+    env = {**os.environ, "BULK_LOAD_METHOD": method}
+    out = subprocess.run(
+        [sys.executable, str(SCRIPTS / script)],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    m = TIMING_RE.search(out)
+    if not m:
+        sys.exit(f"Tempo não encontrado na saída de {script}:\n{out}")
+    return m["table"], int(m["rows"]), float(m["secs"])
+
+
+def main() -> None:
+    print(f"{'Tabela':<26}{'Linhas':>8}{'rows (s)':>11}{'copy (s)':>11}{'Ganho':>8}")
+    print("─" * 64)
+    for script in LOADERS:
+        table, rows, before = run(script, "rows")
+        _, _, after = run(script, "copy")
+        gain = before / after if after else float("inf")
+        print(f"{table:<26}{rows:>8}{before:>11.3f}{after:>11.3f}{gain:>7.1f}×")
+
+
+if __name__ == "__main__":
+    main()
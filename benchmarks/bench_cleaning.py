@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark de populate_scripts/cleaning.py
+----------------------------------------------
+Mede o tempo dos helpers antigos (por célula, via Series.apply) e dos
+vetorizados exatamente nas colunas que os loaders limpam nos arquivos reais
+de Datasets/, com as colunas replicadas `--scale` vezes. A saída golden (as
+duas versões geram o mesmo CSV) é conferida em tests/test_cleaning.py.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_cleaning.py [--scale N]
+"""
+
+from __future__ import annotations
+import argparse, re, sys, time, unicodedata
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import cleaning  # noqa: E402
+
+DATASETS = ROOT / "Datasets"
+
+
+# ───────────────────────────────────────────────────────────────
+# Helpers antigos (referência, copiados dos populate_*.py)
+# ───────────────────────────────────────────────────────────────
+def clean_country(val) -> str:
+    if pd.isna(val):
+        return ''
+    return re.sub(r'\s+', ' ', str(val)).strip().casefold()
+
+def parse_number(val):
+    if pd.isna(val):
+        return None
+    m = re.search(r'[-+]?\d+(?:[.,]\d+)?', str(val).replace(',', '.'))
+    return float(m.group()) if m else None
+
+def parse_float(val):
+    if pd.isna(val):
+        return None
+    try:
+        return float(val)
+    except ValueError:
+        return None
+
+def scale10_to_int(x):
+    if x is None or (isinstance(x, float) and np.isnan(x)):
+        return pd.NA
+    return int(round(x * 10))
+
+def extract_year(text: str) -> int | None:
+    m = re.search(r'(19|20)\d{2}', str(text))
+    return int(m.group()) if m else None
+
+def py_int(v):
+    if pd.isna(v):
+        return None
+    return int(v)
+
+def normalize(val) -> str:
+    if pd.isna(val):
+        return ""
+    if not isinstance(val, str):
+        val = str(val)
+    return (
+        unicodedata.normalize("NFKD", val)
+        .encode("ascii", "ignore")
+        .decode()
+        .upper()
+        .strip()
+    )
+
+
+# ───────────────────────────────────────────────────────────────
+# Colunas reais limpas pelos loaders
+# ───────────────────────────────────────────────────────────────
+def gmpi(name: str) -> pd.DataFrame:
+    return pd.read_csv(DATASETS / name, skiprows=4).dropna(subset=["Country"])
+
+def cases() -> list[tuple[str, pd.Series, object, object]]:
+    env = pd.read_csv(DATASETS / "CombinandoEnviromental.csv")
+    hdi = pd.read_csv(DATASETS / "human-development-index-vs-gdp-per-capita.csv")
+    gdp = pd.read_csv(DATASETS / "country_year_gdp_energy_health.csv")
+    pwr = pd.read_csv(DATASETS / "PowerConsumid.csv")
+    wdi = pd.read_csv(DATASETS / "WDICountry.csv")
+    t1  = gmpi("2024_gMPI_Table1and2 - gMPI_Table1.csv")
+    t2  = gmpi("2024_gMPI_Table1and2 - Table2.csv")
+    edgar = pd.read_excel(DATASETS / "EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx",
+                          sheet_name="fossil_CO2_by_sector_country_su")
+
+    scale10_old = lambda s: s.apply(parse_number).apply(scale10_to_int).astype("Int64")
+    scale10_new = lambda s: cleaning.scale10_to_int(cleaning.parse_number(s))
+
+    out = []
+    for label, s in [("WDI Table Name", wdi["Table Name"]), ("env Country", env["Country"]),
+                     ("hdi Entity", hdi["Entity"]), ("gdp country_name", gdp["country_name"]),
+                     ("pwr Country", pwr["Country"]), ("gMPI T1 Country", t1["Country"]),
+                     ("gMPI T2 Country", t2["Country"])]:
+        out.append((f"clean_country · {label}", s,
+                    lambda s: s.apply(clean_country), cleaning.clean_country))
+    for label, s in [("env CO2 Emission", env["CO2 Emission"]), ("pwr GWH", pwr["GWH"]),
+                     ("pwr imports", pwr["Energy imports, net (% of energy use)"]),
+                     ("pwr renewable", pwr["Renewable energy consumption (% of total final energy consumption)"])]:
+        out.append((f"parse_number · {label}", s,
+                    lambda s: s.apply(parse_number), cleaning.parse_number))
+    for label, s in [("T1 Health", t1["Health"]), ("T1 Standard of living", t1["Standard of living"]),
+                     ("T2 Electricity", t2["Electricity "]), ("T2 Sanitation", t2["Sanitation "])]:
+        out.append((f"scale10_to_int · {label}", s, scale10_old, scale10_new))
+    for col in ("gdp", "investment_energy", "health_expenditure"):
+        out.append((f"parse_float · gdp {col}", gdp[col],
+                    lambda s: s.apply(parse_float), cleaning.parse_float))
+    for label, s in [("T1", t1["Year and survey"]), ("T2", t2["Year and survey"])]:
+        out.append((f"extract_year · {label}", s,
+                    lambda s: s.apply(extract_year), cleaning.extract_year))
+    # o loop antigo enviava int(row.population) para o banco
+    out.append(("py_int · hdi population", hdi["Population (historical)"],
+                lambda s: pd.Series([py_int(v) for v in s], dtype=object), cleaning.to_int))
+    for col in ("Country", "Sector"):
+        out.append((f"normalize · EDGAR {col}", edgar[col],
+                    lambda s: s.apply(normalize), cleaning.normalize_ascii))
+    return out
+
+
+def timed(fn, s: pd.Series) -> tuple[pd.Series, float]:
+    t0 = time.perf_counter()
+    r = fn(s)
+    return r, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=20,
+                        help="replica cada coluna N vezes no benchmark")
+    args = parser.parse_args()
+
+    tot_old = tot_new = 0.0
+    print(f"{'Coluna':<52}{'apply':>10}{'vetor.':>10}{'ganho':>8}")
+    print("─" * 80)
+    for label, s, old, new in cases():
+        big = pd.concat([s] * args.scale, ignore_index=True)
+        _, t_old = timed(old, big)
+        _, t_new = timed(new, big)
+        tot_old += t_old
+        tot_new += t_new
+        print(f"{label[:51]:<52}"
+              f"{t_old:>9.4f}s{t_new:>9.4f}s{t_old / t_new:>7.1f}×")
+    print("─" * 80)
+    print(f"{'Total (×' + str(args.scale) + ')':<52}{tot_old:>9.4f}s{tot_new:>9.4f}s"
+          f"{tot_old / tot_new:>7.1f}×")
+
+
+if __name__ == "__main__":
+    main()
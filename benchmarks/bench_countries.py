@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Cobertura e tempo de populate_scripts/countries.py
+--------------------------------------------------
+Monta o índice de países a partir do WDICountry.csv (nomes, ISO3 e os
+aliases de Modelos/country_aliases.csv, como faz a etapa `country`) e, para
+cada arquivo lido pelos loaders, compara quantas linhas o merge antigo por
+`clean_country` casava com quantas o resolvedor casa, por método (código,
+nome, alias), e quantas linhas sem país têm sugestão do fuzzy. Em seguida mede o tempo das duas versões com a coluna
+replicada `--scale` vezes. Não precisa de banco.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_countries.py [--scale N]
+"""
+
+from __future__ import annotations
+import argparse, sys, time
+from pathlib import Path
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import countries  # noqa: E402
+from cleaning import clean_country, country_key  # noqa: E402
+
+DATASETS = ROOT / "Datasets"
+
+# arquivo → (coluna de nome, coluna de código ISO3 ou None, skiprows)
+SOURCES = {
+    "CombinandoEnviromental.csv":                    ("Country", None, 0),
+    "PowerConsumid.csv":                             ("Country", None, 0),
+    "country_year_gdp_energy_health.csv":            ("country_name", "country_code", 0),
+    "human-development-index-vs-gdp-per-capita.csv": ("Entity", "Code", 0),
+    "2024_gMPI_Table1and2 - gMPI_Table1.csv":        ("Country", None, 4),
+    "2024_gMPI_Table1and2 - Table2.csv":             ("Country", None, 4),
+}
+
+
+def build_resolver() -> tuple[countries.CountryResolver, pd.DataFrame]:
+    wdi = pd.read_csv(DATASETS / "WDICountry.csv")
+    wdi = wdi[wdi["Table Name"] != "World"].drop_duplicates(subset=["Table Name"])
+    table = pd.DataFrame({"ID_Country": range(1, len(wdi) + 1),
+                          "Name": wdi["Table Name"].to_numpy(),
+                          "ISO3": wdi["Country Code"].to_numpy()})
+    seeds = pd.read_csv(countries.ALIASES_CSV)
+    by_code = countries.CountryResolver(table).by_code
+    aliases = pd.DataFrame({"Alias": country_key(seeds["Alias"]),
+                            "Country_ID": seeds["ISO3"].map(by_code)}).dropna()
+    return countries.CountryResolver(table, aliases), table
+
+
+def old_ids(names: pd.Series, table: pd.DataFrame) -> pd.Series:
+    """Merge antigo: clean_country dos dois lados, inner join."""
+    keys = dict(zip(clean_country(table["Name"]), table["ID_Country"]))
+    return clean_country(names).map(keys)
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=10, help="réplicas de cada coluna")
+    args = parser.parse_args()
+
+    _, table = build_resolver()
+    print(f"{'arquivo':<48}{'linhas':>8}{'antigo':>8}{'novo':>8}  código/nome/alias/sugeridas")
+    for name, (col, code, skip) in SOURCES.items():
+        df = pd.read_csv(DATASETS / name, skiprows=skip).dropna(subset=[col])
+        resolver, _ = build_resolver()     # índice novo: sem cache fuzzy de outro arquivo
+        ids, res = resolver.resolve(df[col], df[code] if code else None)
+        old = old_ids(df[col], table).notna().sum()
+        methods = "/".join(str(res.by_method[m]) for m in countries.METHODS)
+        methods += f"/{sum(res.unresolved[n] for n in res.suggested)}"
+        print(f"{name:<48}{len(df):>8}{old:>8}{ids.notna().sum():>8}  {methods}")
+
+    col, code, _ = SOURCES["human-development-index-vs-gdp-per-capita.csv"]
+    df = pd.read_csv(DATASETS / "human-development-index-vs-gdp-per-capita.csv")
+    names = pd.concat([df[col]] * args.scale, ignore_index=True)
+    codes = pd.concat([df[code]] * args.scale, ignore_index=True)
+    warm, _ = build_resolver()
+    warm.resolve(names.head(len(df)), codes.head(len(df)))   # candidatos fuzzy já em cache
+    print(f"\n{len(names)} linhas (OWID ×{args.scale}):")
+    print(f"  merge antigo (clean_country)   {timed(lambda: old_ids(names, table)):8.3f} s")
+    print(f"  resolvedor, índice frio        {timed(lambda: build_resolver()[0].resolve(names, codes)):8.3f} s")
+    print(f"  resolvedor, fuzzy em cache     {timed(lambda: warm.resolve(names, codes)):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
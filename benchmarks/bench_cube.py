@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cubo analítico (Consultas/cube.py)
+-----------------------------------------------
+Monta tabelas de fatos sintéticas com o esquema de modeloFisico.sql
+(`--countries` países, anos de 1960 a 2024, 8 setores, 9 fontes) e compara,
+para as mesmas perguntas, o caminho atual (DataFrame em formato longo +
+groupby/pivot, como os scripts de Consultas fazem com o resultado do
+read_sql) com as operações do cubo:
+  • top-10 países por CO2 de setores num ano;
+  • série anual da geração por fonte;
+  • gCO2_per_kWh (segunda consulta) de um ano;
+  • slice de um indicador país × ano.
+Confere que os dois caminhos dão os mesmos números. Em seguida salva o
+cubo e mede a abertura por memory-map num processo novo.
+
+Não precisa de banco.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_cube.py [--countries 250] [--repeat 50]
+
+Sai com código 1 se algum resultado divergir.
+"""
+
+from __future__ import annotations
+import argparse, subprocess, sys, tempfile, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+from cube import FACTS, Cube  # noqa: E402
+
+YEARS = range(1960, 2025)
+SECTORS = ["Agriculture", "Buildings", "Fuel Exploitation", "Industrial Combustion",
+           "Power Industry", "Processes", "Transport", "Waste"]
+SOURCES = ["Bioenergy", "Coal", "Gas", "Hydro", "Nuclear", "Oil",
+           "Other renewables excluding bioenergy", "Solar", "Wind"]
+
+
+def synthetic(n: int, rng) -> dict[str, pd.DataFrame]:
+    """Dimensões e fatos com ~10% de linhas ausentes e ~5% de nulos."""
+    countries = pd.DataFrame({"ID_Country": np.arange(1, n + 1),
+                              "Name": [f"País {i:05d}" for i in range(1, n + 1)]})
+    tables = {
+        "Country": countries,
+        "Sector": pd.DataFrame({"ID_Sector": np.arange(1, len(SECTORS) + 1), "Name": SECTORS}),
+        "Power Source": pd.DataFrame({"ID_Power": np.arange(1, len(SOURCES) + 1),
+                                      "Name": SOURCES,
+                                      "Renewable": [s not in ("Coal", "Gas", "Oil") for s in SOURCES]}),
+    }
+    extra = {"Sector_Country": SECTORS, "Power Source_Country": SOURCES}
+    for table, fact in FACTS.items():
+        grid = [countries["ID_Country"].to_numpy(), np.array(YEARS)]
+        if table in extra:
+            grid.append(np.arange(1, len(extra[table]) + 1))
+        keys = np.stack([g.ravel() for g in np.meshgrid(*grid, indexing="ij")], axis=1)
+        keys = keys[rng.random(len(keys)) < 0.9]
+        df = pd.DataFrame(keys, columns=list(fact.keys))
+        for col in fact.measures.values():
+            v = rng.lognormal(2, 1.5, len(df)).round(2)
+            v[rng.random(len(df)) < 0.05] = np.nan
+            df[col] = v
+        tables[table] = df
+    return tables
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+# ───────────────────────────────────────────────────────────────
+# Caminho atual: DataFrame longo com os nomes (resultado de um read_sql)
+# ───────────────────────────────────────────────────────────────
+def pandas_paths(t: dict[str, pd.DataFrame], year: int) -> dict:
+    names = t["Country"].set_index("ID_Country")["Name"]
+    sc = t["Sector_Country"].assign(Country=lambda d: d["Country_ID_Country"].map(names))
+    psc = (t["Power Source_Country"]
+           .assign(Country=lambda d: d["Country_ID_Country"].map(names),
+                   Source=lambda d: d["Power Source_ID_Power"].map(
+                       t["Power Source"].set_index("ID_Power")["Name"])))
+    env = t["Environmental Indicator"].assign(Country=lambda d: d["Country_ID"].map(names))
+
+    def top():
+        s = sc[sc["Year"] == year].groupby("Country")["CO2_Emission"].sum(min_count=1).dropna()
+        return s.sort_values(ascending=False, kind="stable").head(10)
+
+    def series():
+        return psc.pivot_table(index="Year", columns="Source", values="Power_Generation",
+                               aggfunc="sum")
+
+    def ratio():
+        d = psc[psc["Year"] == year]
+        g = 1000.0 * d["CO2_Emission"] / d["Power_Generation"].replace(0, np.nan)
+        return g.dropna()
+
+    def pivot():
+        return env.pivot(index="Country", columns="Year", values="CO2_Emision")
+
+    return {"top": top, "series": series, "ratio": ratio, "pivot": pivot}
+
+
+def cube_paths(cube: Cube, year: int) -> dict:
+    return {
+        "top":    lambda: cube.top("sector_co2", 10, by="country", year=year),
+        "series": lambda: cube.rollup("power_generation", keep=("year", "source")),
+        "ratio":  lambda: cube.ratio("power_co2", "power_generation", 1000, year=year),
+        "pivot":  lambda: cube.get("co2"),
+    }
+
+
+def same(name: str, old, new) -> bool:
+    if name == "top":
+        return (np.allclose(old.to_numpy(), new["sector_co2"].to_numpy())
+                and list(old.index) == list(new["country"]))
+    if name == "series":
+        ref = old.fillna(0.0).to_numpy()
+        got = new.values[:, np.argsort(new.labels["source"])]
+        got = got[np.isin(new.labels["year"], old.index)]
+        return np.allclose(ref, got)
+    if name == "ratio":
+        return np.isclose(np.sort(old.to_numpy()), np.sort(new.values[new.mask])).all()
+    ref = old.to_numpy()
+    got = np.where(new.mask, new.values, np.nan)[:, np.isin(new.labels["year"], old.columns)]
+    got = got[np.isin(new.labels["country"], old.index)]
+    return np.allclose(ref, got, equal_nan=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--countries", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    tables = synthetic(args.countries, np.random.default_rng(42))
+    rows = sum(len(tables[t]) for t in FACTS)
+    t_build, cube = timed(lambda: Cube.from_frames(tables), 1)
+    print(f"{rows} linhas de fatos, cubo montado em {t_build:.3f}s "
+          f"({sum(a.nbytes + m.nbytes for a, m in zip(cube.arrays.values(), cube.masks.values())) / 2**20:.1f} MiB)\n")
+
+    year, ok = 2020, True
+    old, new = pandas_paths(tables, year), cube_paths(cube, year)
+    print(f"{'pergunta':<10}{'pandas':>12}{'cubo':>12}{'ganho':>10}")
+    for name in old:
+        t_old, r_old = timed(old[name], max(1, args.repeat // 10))
+        t_new, r_new = timed(new[name], args.repeat)
+        match = same(name, r_old, r_new)
+        ok &= match
+        print(f"{name:<10}{t_old * 1e3:>10.2f}ms{t_new * 1e6:>10.0f}µs"
+              f"{t_old / t_new:>9.0f}×  " + ("ok" if match else "DIVERGE"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = cube.save(Path(tmp) / "cube")
+        probe = (f"import sys, time; sys.path.insert(0, {str(ROOT / 'Consultas')!r}); "
+                 f"t0 = time.perf_counter(); from cube import Cube; "
+                 f"c = Cube.open({str(path)!r}); t1 = time.perf_counter(); "
+                 f"c.top('sector_co2', 10, year={year}); t2 = time.perf_counter(); "
+                 f"print(f'{{(t1 - t0) * 1e3:.1f}} {{(t2 - t1) * 1e3:.2f}}')")
+        opened, first = subprocess.run([sys.executable, "-c", probe], capture_output=True,
+                                       text=True, check=True).stdout.split()
+        print(f"\nprocesso novo: import + Cube.open (memory-map) em {opened}ms, "
+              f"primeira consulta em {first}ms")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Latência das Consultas: PostgreSQL × DuckDB × SQLite
+----------------------------------------------------
+Copia o banco para um .duckdb e um .sqlite temporários
+(populate_scripts/embedded.py) e roda cada consulta registrada, e também as
+versões --views, nos três backends. O resultado é lido inteiro, sem gravar
+arquivo. Mostra a mediana de `--repeat` execuções e confere que os três
+backends devolvem as mesmas linhas (números com tolerância relativa de 1e-6).
+
+Sem PostgreSQL, `--synthetic N` monta as duas cópias embutidas direto de
+tabelas sintéticas com N países (benchmarks/bench_cube.py) e compara só
+DuckDB × SQLite.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_embedded.py [--repeat 5]
+    python benchmarks/bench_embedded.py --synthetic 250
+
+Sai com código 1 se algum resultado divergir.
+"""
+
+from __future__ import annotations
+import argparse, statistics, sys, tempfile, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import dialect, embedded  # noqa: E402
+from queries import QUERIES, VIEW_QUERIES, bind, sql_for  # noqa: E402
+from runner import _cursor, _plain  # noqa: E402
+
+# colunas serial (preenchidas pelo PostgreSQL; nas tabelas sintéticas, aqui)
+SERIAL_IDS = {"Environmental Indicator": "ID_Environmental", "Investment": "ID_Investment",
+              "Development": "ID_Development", "Power Consumed": "ID_Consumed",
+              "Demography": "ID"}
+
+
+def fetch(engine, name: str, use_views: bool) -> pd.DataFrame:
+    params = bind(name)
+    with _cursor(engine, sql_for(name, use_views), params, 10_000) as (cols, _, parts):
+        rows = [[_plain(v) for v in r] for part in parts for r in part]
+    return pd.DataFrame(rows, columns=cols)
+
+
+def same(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """Mesmo conjunto de linhas (a ordem de empates pode variar entre backends)."""
+    if a.shape != b.shape:
+        return False
+    a, b = (d.set_axis(range(d.shape[1]), axis=1) for d in (a, b))
+    cols = list(a.columns)
+    a = a.sort_values(cols, kind="stable", na_position="last").reset_index(drop=True)
+    b = b.sort_values(cols, kind="stable", na_position="last").reset_index(drop=True)
+    for c in cols:
+        x, y = pd.to_numeric(a[c], errors="coerce"), pd.to_numeric(b[c], errors="coerce")
+        if x.notna().sum() == a[c].notna().sum() and a[c].notna().any():
+            if not np.allclose(x, y, rtol=1e-6, equal_nan=True):
+                return False
+        elif not a[c].astype(str).equals(b[c].astype(str)):
+            return False
+    return True
+
+
+def synthetic_chunks(countries: int):
+    from bench_cube import synthetic
+    for table, df in synthetic(countries, np.random.default_rng(42)).items():
+        floats = df.select_dtypes("float").columns
+        df[floats] = df[floats] % 100     # cabe em numeric(6, 2) e numeric(7, 4)
+        if table in SERIAL_IDS:
+            df = df.assign(**{SERIAL_IDS[table]: np.arange(1, len(df) + 1)})
+        yield table, df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--synthetic", type=int, metavar="PAÍSES",
+                        help="sem PostgreSQL: cópias embutidas de tabelas sintéticas")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    tmp = Path(workdir.name)
+    backends: dict[str, object] = {}
+    if args.synthetic is None:
+        from queries import get_engine
+        pg = get_engine()
+        backends["postgres"] = pg
+        for kind in dialect.KINDS:
+            t0 = time.perf_counter()
+            rows = embedded.export(pg, tmp / f"copy.{kind}")
+            print(f"cópia {kind}: {sum(rows.values())} linhas em {time.perf_counter() - t0:.1f}s")
+    else:
+        for kind in dialect.KINDS:
+            rows = embedded.write(tmp / f"copy.{kind}", synthetic_chunks(args.synthetic))
+        print(f"tabelas sintéticas ({args.synthetic} países): {sum(rows.values())} linhas")
+    for kind in dialect.KINDS:
+        backends[kind] = dialect.EmbeddedDB(tmp / f"copy.{kind}")
+
+    runs = [(q, False) for q in QUERIES] + [(q, True) for q in VIEW_QUERIES]
+    print(f"\n{'consulta':<16}" + "".join(f"{b:>12}" for b in backends) + "   resultado")
+    ok = True
+    for name, use_views in runs:
+        label = name + (" --views" if use_views else "")
+        results, times = {}, {}
+        for backend, engine in backends.items():
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                results[backend] = fetch(engine, name, use_views)
+                samples.append(time.perf_counter() - t0)
+            times[backend] = statistics.median(samples)
+        ref = next(iter(results.values()))
+        match = all(same(ref, r) for r in results.values())
+        ok &= match
+        print(f"{label:<16}" + "".join(f"{times[b] * 1000:>10.1f}ms" for b in backends)
+              + f"   {len(ref)} linhas " + ("ok" if match else "DIVERGE"))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Terceira e quinta consultas: join direto × somas por país/ano
+------------------------------------------------------------
+As versões anteriores (queries.THIRD_FANOUT / FIFTH_FANOUT) juntavam
+Power Source_Country com Sector_Country no mesmo país/ano antes do SUM: cada
+linha de uma tabela era somada uma vez para cada linha da outra. As versões
+atuais (queries.THIRD / FIFTH e as de --views) somam cada tabela antes;
+tests/test_queries.py confere os totais delas com somas independentes.
+
+  • fan-out: quanto as versões anteriores inflavam as somas;
+  • plano: maior nº de linhas saindo de um join e total de linhas
+    processadas (EXPLAIN ANALYZE), e a mediana de `--repeat` execuções.
+
+Requer o banco populado por populate_db.py.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_fanout.py [--repeat 3] [--views]
+"""
+
+from __future__ import annotations
+import argparse, statistics, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+import queries  # noqa: E402
+from index_advisor import explain, walk  # noqa: E402
+
+# consulta → {coluna do resultado: (tabela, coluna somada)}
+TOTALS = {
+    "third": {"Emission Power": ("Power Source_Country", "CO2_Emission"),
+              "Emission Sector": ("Sector_Country", "CO2_Emission")},
+    "fifth": {"total_power_generation": ("Power Source_Country", "Power_Generation"),
+              "emission energy": ("Power Source_Country", "CO2_Emission"),
+              "sector emission": ("Sector_Country", "CO2_Emission")},
+}
+KEYS = {"third": ("Country", "Year"), "fifth": ("country", "Year")}
+LEGACY = {"third": queries.THIRD_FANOUT, "fifth": queries.FIFTH_FANOUT}
+
+
+def fetch(engine, sql: str, name: str) -> pd.DataFrame:
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=queries.bind(name, limit=None))
+
+
+def plan_rows(engine, sql: str, name: str) -> tuple[int, int, float]:
+    """(maior saída de um join, total de linhas processadas, ms de execução)."""
+    plan = explain(engine, sql, queries.bind(name, limit=None))
+    peak = total = 0
+    for node, _ in walk(plan["Plan"]):
+        rows = node.get("Actual Rows", 0) * node.get("Actual Loops", 1)
+        total += rows
+        if node["Node Type"] in {"Hash Join", "Merge Join", "Nested Loop"}:
+            peak = max(peak, rows)
+    return peak, total, plan["Execution Time"]
+
+
+def timed(engine, sql: str, name: str, repeat: int) -> float:
+    lat = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fetch(engine, sql, name)
+        lat.append(time.perf_counter() - t0)
+    return statistics.median(lat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--views", action="store_true",
+                        help="mede também as versões sobre as views materializadas")
+    args = parser.parse_args()
+
+    engine = queries.get_engine()
+    for name in TOTALS:
+        variants = {"join direto": LEGACY[name], "pré-agregada": queries.QUERIES[name]}
+        if args.views:
+            variants["views"] = queries.VIEW_QUERIES[name]
+        results = {k: fetch(engine, sql, name) for k, sql in variants.items()}
+
+        print(f"\n{name}")
+        print(f"   {'versão':<14}{'linhas':>8}{'pico join':>12}"
+              f"{'linhas proc.':>14}{'EXPLAIN':>10}{'mediana':>10}")
+        for k, sql in variants.items():
+            peak, total, exec_ms = plan_rows(engine, sql, name)
+            print(f"   {k:<14}{len(results[k]):>8}{peak:>12,}{total:>14,}"
+                  f"{exec_ms:>8.1f}ms{timed(engine, sql, name, args.repeat) * 1000:>8.1f}ms")
+
+        # quanto o join direto inflava cada soma
+        country, year = KEYS[name]
+        merged = results["join direto"].merge(results["pré-agregada"], on=[country, year],
+                                              suffixes=("_old", "_new"))
+        for col in TOTALS[name]:
+            ratio = (merged[f"{col}_old"].astype(float) / merged[f"{col}_new"].astype(float))
+            ratio = ratio[np.isfinite(ratio)]
+            if len(ratio):
+                print(f"   fan-out em {col!r}: mediana {ratio.median():.1f}×, máx {ratio.max():.1f}×")
+
+
+if __name__ == "__main__":
+    main()
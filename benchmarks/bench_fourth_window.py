@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Quarta consulta: subconsultas correlacionadas × funções de janela
+----------------------------------------------------------------
+Compara a versão anterior da quarta consulta (queries.FOURTH_CORRELATED,
+nove subconsultas por ano) com a reescrita em uma passada
+(queries.FOURTH, DISTINCT ON + SUM(...) OVER):
+
+  • equivalência: as duas devolvem as mesmas linhas (sem LIMIT). Onde dois
+    setores/fontes/países empatam no máximo de um ano, qualquer um dos
+    empatados é aceito, já que o `ORDER BY ... LIMIT 1` original também não
+    define qual deles vem. Sem servidor, tests/test_queries.py confere o
+    mesmo numa cópia embutida sintética;
+  • plano e latência: EXPLAIN ANALYZE (tempo de execução, buffers e nº de
+    execuções das subconsultas) e a mediana de `--repeat` execuções.
+
+Sem `--real`, roda num esquema sintético `bench_fourth` (apagado ao final)
+com 1×, 10× e 100× pares país/ano: o fator multiplica países e anos por √k
+cada (base: 200 países × 25 anos, 12 setores, 9 fontes). Com `--real`, usa
+as tabelas populadas por populate_db.py.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_fourth_window.py [--scales 1 10 100] [--repeat 3]
+    python benchmarks/bench_fourth_window.py --real
+
+Sai com código 1 se algum resultado divergir.
+"""
+
+from __future__ import annotations
+import argparse, math, statistics, sys, time
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+import queries  # noqa: E402
+from index_advisor import explain, summarize, walk  # noqa: E402
+
+SCHEMA = "bench_fourth"
+BASE_COUNTRIES, BASE_YEARS, SECTORS, SOURCES = 200, 25, 12, 9
+NAME_COLUMNS = ["sector_maior_emissao", "energia_maior_emissao", "country_maior_emissao"]
+
+DDL = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+CREATE TABLE {SCHEMA}."Country" ("ID_Country" integer PRIMARY KEY, "Name" varchar(100));
+CREATE TABLE {SCHEMA}."Sector" ("ID_Sector" integer PRIMARY KEY, "Name" varchar(100));
+CREATE TABLE {SCHEMA}."Power Source" ("ID_Power" integer PRIMARY KEY, "Name" varchar(100),
+                                     "Renewable" boolean);
+CREATE TABLE {SCHEMA}."Sector_Country" (
+    "Sector_ID_Sector" integer, "Country_ID_Country" integer,
+    "CO2_Emission" numeric(12, 4), "Year" integer,
+    PRIMARY KEY ("Sector_ID_Sector", "Country_ID_Country", "Year"));
+CREATE TABLE {SCHEMA}."Power Source_Country" (
+    "Power Source_ID_Power" integer, "Country_ID_Country" integer, "Year" integer,
+    "CO2_Emission" numeric(12, 4), "Power_Generation" numeric(12, 4),
+    PRIMARY KEY ("Power Source_ID_Power", "Country_ID_Country", "Year"));
+CREATE TABLE {SCHEMA}."Environmental Indicator" (
+    "Country_ID" integer, "Year" integer, "CO2_Emision" numeric(15, 10),
+    UNIQUE ("Country_ID", "Year"));
+CREATE TABLE {SCHEMA}."Development" (
+    "Country_ID" integer, "Ano" integer, "IDH" numeric(6, 2), UNIQUE ("Country_ID", "Ano"));
+CREATE TABLE {SCHEMA}."Investment" (
+    "Country_ID" integer, "Year" integer, "GDP" numeric(12, 2), UNIQUE ("Country_ID", "Year"))
+"""
+
+FILL = f"""
+SELECT setseed(0.42);
+INSERT INTO {SCHEMA}."Country" SELECT c, 'Country ' || c FROM generate_series(1, :countries) c;
+INSERT INTO {SCHEMA}."Sector" SELECT s, 'Sector ' || s FROM generate_series(1, {SECTORS}) s;
+INSERT INTO {SCHEMA}."Power Source"
+    SELECT p, 'Source ' || p, p <= 5 FROM generate_series(1, {SOURCES}) p;
+INSERT INTO {SCHEMA}."Sector_Country"
+    SELECT s, c, round((random() * 100)::numeric, 4), y
+    FROM generate_series(1, {SECTORS}) s, generate_series(1, :countries) c,
+         generate_series(:y0, 2023) y;
+INSERT INTO {SCHEMA}."Power Source_Country"
+    SELECT p, c, y, round((random() * 100)::numeric, 4), round((random() * 500)::numeric, 4)
+    FROM generate_series(1, {SOURCES}) p, generate_series(1, :countries) c,
+         generate_series(:y0, 2023) y;
+INSERT INTO {SCHEMA}."Environmental Indicator"
+    SELECT c, y, round((random() * 1000)::numeric, 10)
+    FROM generate_series(1, :countries) c, generate_series(:y0, 2023) y;
+INSERT INTO {SCHEMA}."Development"
+    SELECT c, y, round(random()::numeric, 2)
+    FROM generate_series(1, :countries) c, generate_series(:y0, 2023) y;
+INSERT INTO {SCHEMA}."Investment"
+    SELECT c, y, round((random() * 1e6)::numeric, 2)
+    FROM generate_series(1, :countries) c, generate_series(:y0, 2023) y;
+ANALYZE {SCHEMA}."Sector_Country", {SCHEMA}."Power Source_Country",
+        {SCHEMA}."Environmental Indicator", {SCHEMA}."Development", {SCHEMA}."Investment"
+"""
+
+# nomes empatados no máximo de cada ano (para aceitar qualquer um deles)
+TIES = """
+WITH sector AS (
+    SELECT CS."Year", S."Name" AS name, SUM(CS."CO2_Emission") AS v
+    FROM "Sector_Country" CS JOIN "Sector" S ON S."ID_Sector" = CS."Sector_ID_Sector"
+    GROUP BY S."Name", CS."Year"
+), energy AS (
+    SELECT PSC."Year", PS."Name" AS name, SUM(PSC."CO2_Emission") AS v
+    FROM "Power Source_Country" PSC JOIN "Power Source" PS ON PS."ID_Power" = PSC."Power Source_ID_Power"
+    GROUP BY PS."Name", PS."Renewable", PSC."Year"
+), country AS (
+    SELECT EI."Year", C."Name" AS name, EI."CO2_Emision" AS v
+    FROM "Country" C JOIN "Environmental Indicator" EI ON C."ID_Country" = EI."Country_ID"
+), all_kinds AS (
+    SELECT 'sector_maior_emissao' AS col, * FROM sector
+    UNION ALL SELECT 'energia_maior_emissao', * FROM energy
+    UNION ALL SELECT 'country_maior_emissao', * FROM country
+)
+SELECT col, "Year", name
+FROM (SELECT *, MAX(v) OVER (PARTITION BY col, "Year") AS m FROM all_kinds) t
+WHERE v = m
+"""
+
+
+def engine_for(schema: str | None):
+    engine = queries.get_engine()
+    if schema is None:
+        return engine
+    return create_engine(engine.url, connect_args={"options": f"-csearch_path={schema},public"})
+
+
+def build(engine, scale: int) -> tuple[int, int]:
+    countries = round(BASE_COUNTRIES * math.sqrt(scale))
+    years = round(BASE_YEARS * math.sqrt(scale))
+    with engine.begin() as conn:
+        for stmt in filter(str.strip, DDL.split(";")):
+            conn.execute(text(stmt))
+        for stmt in filter(str.strip, FILL.split(";")):
+            conn.execute(text(stmt), {"countries": countries, "y0": 2024 - years})
+    return countries, years
+
+
+def fetch(engine, sql: str) -> pd.DataFrame:
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=queries.bind("fourth", limit=None))
+
+
+def mismatches(engine, old: pd.DataFrame, new: pd.DataFrame) -> int:
+    """Nº de linhas diferentes, aceitando qualquer nome empatado no máximo."""
+    if list(old.columns) != list(new.columns) or len(old) != len(new):
+        return max(len(old), len(new))
+    with engine.connect() as conn:
+        ties = pd.read_sql(text(TIES), conn)
+    tied = ties.groupby(["col", "Year"])["name"].agg(set).to_dict()
+    old, new = (df.sort_values("Year").reset_index(drop=True) for df in (old, new))
+    bad = 0
+    for (_, a), (_, b) in zip(old.iterrows(), new.iterrows()):
+        for col in old.columns:
+            if pd.isna(a[col]) and pd.isna(b[col]) or a[col] == b[col]:
+                continue
+            if col in NAME_COLUMNS and {a[col], b[col]} <= tied.get((col, a["Year"]), set()):
+                continue
+            bad += 1
+            print(f"   ✗ {a['Year']}: {col} = {a[col]!r} (antes) × {b[col]!r} (janela)")
+            break
+    return bad
+
+
+def subplan_loops(plan: dict) -> int:
+    """Execuções somadas dos nós sob SubPlan (as subconsultas correlacionadas)."""
+    return sum(n.get("Actual Loops", 0) for n, _ in walk(plan["Plan"])
+               if n.get("Parent Relationship") == "SubPlan")
+
+
+def compare(engine, label: str, repeat: int) -> int:
+    variants = {"correlacionada": queries.FOURTH_CORRELATED, "janela": queries.FOURTH}
+    params = queries.bind("fourth", limit=None)
+    results = {k: fetch(engine, sql) for k, sql in variants.items()}
+    bad = mismatches(engine, results["correlacionada"], results["janela"])
+
+    print(f"\n{label}: {len(results['janela'])} anos no resultado — "
+          f"{'resultado igual' if not bad else f'{bad} linha(s) DIFERENTE(S)'}")
+    print(f"   {'versão':<16}{'mediana':>10}{'EXPLAIN':>10}{'hit':>9}{'read':>8}{'subplans':>10}")
+    for name, sql in variants.items():
+        lat = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fetch(engine, sql)
+            lat.append(time.perf_counter() - t0)
+        plan = explain(engine, sql, params)
+        s = summarize(plan)
+        print(f"   {name:<16}{statistics.median(lat) * 1000:>8.1f}ms{s['execution_ms']:>8.1f}ms"
+              f"{s['shared_hit']:>9}{s['shared_read']:>8}{subplan_loops(plan):>10}")
+    return bad
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--real", action="store_true", help="usa as tabelas do banco populado")
+    parser.add_argument("--keep", action="store_true", help="não apaga o esquema sintético")
+    args = parser.parse_args()
+
+    if args.real:
+        bad = compare(engine_for(None), "tabelas reais", args.repeat)
+    else:
+        bad = 0
+        engine = engine_for(SCHEMA)
+        try:
+            for scale in args.scales:
+                t0 = time.perf_counter()
+                countries, years = build(engine, scale)
+                print(f"\n⏱  {scale}×: {countries} países × {years} anos gerados em "
+                      f"{time.perf_counter() - t0:.1f}s")
+                bad += compare(engine, f"{scale}×", args.repeat)
+        finally:
+            if not args.keep:
+                with engine.begin() as conn:
+                    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    if bad:
+        sys.exit(f"\n{bad} linha(s) com resultado diferente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark do particionamento por ano (populate_scripts/partitions.py)
+--------------------------------------------------------------------
+Cria duas cópias sintéticas de Sector_Country no banco — uma tabela comum
+e uma particionada por RANGE ("Year") — com `--countries` × `--years` ×
+12 setores linhas cada, e compara:
+
+  • consultas: soma de um ano, de um intervalo de 5 anos e de todos os anos
+    por país (mediana de `--repeat` execuções e partições lidas no plano);
+  • recarga de um ano: upsert em lote (bulk_load.upsert_frame, COPY + merge)
+    na tabela comum × troca da partição (bulk_load.swap_partitions). Com
+    `--per decade` a troca substitui a década inteira pelas linhas do ano.
+
+As tabelas (bench_sc_heap, bench_sc_part e partições) ficam em public e são
+apagadas ao final.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_partitions.py [--countries 2000] [--years 60]
+                                          [--per year|decade] [--repeat 5]
+"""
+
+from __future__ import annotations
+import argparse, statistics, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+import partitions  # noqa: E402
+from bulk_load import swap_partitions, upsert_frame  # noqa: E402
+from db import get_engine  # noqa: E402
+from index_advisor import explain, walk  # noqa: E402
+
+HEAP, PART = "bench_sc_heap", "bench_sc_part"
+SECTORS = 12
+KEYS = ["Sector_ID_Sector", "Country_ID_Country", "Year"]
+COLUMNS = """
+    "Sector_ID_Sector" integer NOT NULL,
+    "Country_ID_Country" integer NOT NULL,
+    "CO2_Emission" numeric(12, 4),
+    "Year" integer NOT NULL,
+    PRIMARY KEY ("Sector_ID_Sector", "Country_ID_Country", "Year")
+"""
+FILL = """
+INSERT INTO public.{table}
+SELECT s, c, round((random() * 100)::numeric, 4), y
+FROM generate_series(1, {sectors}) s, generate_series(1, :countries) c,
+     generate_series(:y0, :y1) y
+"""
+QUERIES = {
+    "1 ano": 'SELECT "Country_ID_Country", SUM("CO2_Emission") FROM public.{t} '
+             'WHERE "Year" = :y1 GROUP BY 1',
+    "5 anos": 'SELECT "Country_ID_Country", "Year", SUM("CO2_Emission") FROM public.{t} '
+              'WHERE "Year" BETWEEN :y1 - 4 AND :y1 GROUP BY 1, 2',
+    "todos": 'SELECT "Year", SUM("CO2_Emission") FROM public.{t} GROUP BY 1',
+}
+
+
+def drop(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS public.{HEAP}, public.{PART} CASCADE"))
+
+
+def build(engine, countries: int, y0: int, y1: int, span: int) -> None:
+    drop(engine)
+    params = {"countries": countries, "y0": y0, "y1": y1}
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE public.{HEAP} ({COLUMNS})"))
+        conn.execute(text(f'CREATE TABLE public.{PART} ({COLUMNS}) PARTITION BY RANGE ("Year")'))
+        partitions.ensure(conn, PART, range(y0, y1 + 1), span)
+        for table in (HEAP, PART):
+            conn.execute(text("SELECT setseed(0.42)"))
+            conn.execute(text(FILL.format(table=table, sectors=SECTORS)), params)
+            conn.execute(text(f"ANALYZE public.{table}"))
+
+
+def relations_scanned(plan: dict) -> int:
+    return len({n["Relation Name"] for n, _ in walk(plan["Plan"]) if "Relation Name" in n})
+
+
+def time_query(engine, sql: str, params: dict, repeat: int) -> float:
+    lat = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text(sql), params).all()
+        lat.append(time.perf_counter() - t0)
+    return statistics.median(lat)
+
+
+def reload_frame(countries: int, year: int) -> pd.DataFrame:
+    rng = np.random.default_rng(year)
+    s, c = np.meshgrid(np.arange(1, SECTORS + 1), np.arange(1, countries + 1))
+    return pd.DataFrame({"Sector_ID_Sector": s.ravel(), "Country_ID_Country": c.ravel(),
+                         "CO2_Emission": rng.uniform(0, 100, s.size).round(4),
+                         "Year": year})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--countries", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=60)
+    parser.add_argument("--per", choices=list(partitions.SPANS), default="year")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = get_engine(pool_size=1)
+    y1 = 2023
+    y0 = y1 - args.years + 1
+    rows = args.countries * args.years * SECTORS
+    try:
+        t0 = time.perf_counter()
+        build(engine, args.countries, y0, y1, partitions.SPANS[args.per])
+        print(f"⏱  {rows:,} linhas por tabela geradas em {time.perf_counter() - t0:.1f}s "
+              f"(partição por {args.per})\n")
+
+        params = {"y1": y1}
+        print(f"{'consulta':<10}{'comum':>10}{'partic.':>10}{'ganho':>8}{'partições lidas':>18}")
+        print("─" * 56)
+        for label, sql in QUERIES.items():
+            heap = time_query(engine, sql.format(t=HEAP), params, args.repeat)
+            part = time_query(engine, sql.format(t=PART), params, args.repeat)
+            scanned = relations_scanned(explain(engine, sql.format(t=PART), params))
+            with engine.connect() as conn:
+                total = len(partitions.bounds(conn, PART))
+            print(f"{label:<10}{heap * 1000:>8.1f}ms{part * 1000:>8.1f}ms{heap / part:>7.1f}×"
+                  f"{scanned:>12} de {total}")
+
+        df = reload_frame(args.countries, y1 - 1)
+        print(f"\nRecarga de um ano ({len(df):,} linhas):")
+        for label, table, write in (("upsert", HEAP, upsert_frame),
+                                    ("swap", PART, swap_partitions)):
+            t0 = time.perf_counter()
+            with engine.begin() as conn:
+                write(conn, df, table, KEYS)
+            print(f"   {label:<8}{(time.perf_counter() - t0) * 1000:>10.1f}ms")
+    finally:
+        drop(engine)
+
+
+if __name__ == "__main__":
+    main()
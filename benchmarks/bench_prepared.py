@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark das consultas parametrizadas (Consultas/prepared.py)
+-------------------------------------------------------------
+Para cada consulta, pergunta a mesma coisa para anos diferentes de três jeitos:
+  • script   : um processo novo por pergunta (`python Consultas/runner.py`,
+               sem cache) — como era preciso editar e rodar um execute_*.py;
+  • texto    : mesmo processo e pool, SQL enviado a cada chamada (queries.run);
+  • prepared : mesmo processo e pool, PREPARE uma vez e EXECUTE por chamada.
+Mostra a mediana e o p95 da latência de cada chamada.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_prepared.py [--queries first third] [--calls 20]
+                                        [--script-runs 3] [--views]
+"""
+
+from __future__ import annotations
+import argparse, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+import prepared  # noqa: E402
+from queries import DEFAULTS, QUERIES, VIEW_QUERIES, get_engine, run  # noqa: E402
+
+YEARS = list(range(2023, 2013, -1))
+
+
+def params_for(name: str, i: int) -> dict:
+    """Parâmetros da i-ésima pergunta: um ano diferente a cada chamada."""
+    year = YEARS[i % len(YEARS)]
+    if "year" in DEFAULTS[name]:
+        return {"year": year}
+    return {"year_from": year, "year_to": year}
+
+
+def cli_args(params: dict) -> list[str]:
+    out = []
+    for k, v in params.items():
+        out += ["--" + k.replace("_", "-"), str(v)]
+    return out
+
+
+def script_latency(name: str, i: int, use_views: bool, out: Path) -> float:
+    cmd = [sys.executable, str(ROOT / "Consultas" / "runner.py"), name, "--no-cache",
+           "--head", "0", "--output", str(out), *cli_args(params_for(name, i))]
+    if use_views:
+        cmd.append("--views")
+    t0 = time.perf_counter()
+    subprocess.run(cmd, check=True, capture_output=True, cwd=ROOT)
+    return time.perf_counter() - t0
+
+
+def p95(xs: list[float]) -> float:
+    return sorted(xs)[max(0, round(0.95 * len(xs)) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", nargs="+", choices=list(QUERIES), default=list(QUERIES))
+    parser.add_argument("--calls", type=int, default=20, help="chamadas no mesmo processo")
+    parser.add_argument("--script-runs", type=int, default=3, help="processos novos")
+    parser.add_argument("--views", action="store_true", help="usa as versões sobre as views")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    names = [q for q in args.queries if not args.views or q in VIEW_QUERIES]
+    print(f"{'Consulta':<10}{'variante':<10}{'mediana':>10}{'p95':>10}{'chamadas':>10}")
+    print("─" * 50)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            variants = {
+                "script": [script_latency(name, i, args.views, Path(tmp) / "out.csv")
+                           for i in range(args.script_runs)],
+                "texto": [run(engine, name, args.views, **params_for(name, i))[1]
+                          for i in range(args.calls)],
+                "prepared": [prepared.execute(engine, name, args.views, **params_for(name, i))[1]
+                             for i in range(args.calls)],
+            }
+            for variant, lat in variants.items():
+                print(f"{name:<10}{variant:<10}{statistics.median(lat) * 1000:>8.1f}ms"
+                      f"{p95(lat) * 1000:>8.1f}ms{len(lat):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Custo da validação da carga (populate_scripts/quality.py)
+---------------------------------------------------------
+Monta as tabelas de fatos sintéticas de benchmarks/bench_cube.py (padrão:
+25 000 países, 100× os 250 do WDICountry.csv), injeta defeitos conhecidos
+em 0,1% das linhas (valor que estoura o numeric da coluna, chave nula e ano
+fora da faixa, cada um em linhas distintas) e, para cada tabela, mede:
+
+  • validate — quality.validate sobre o DataFrame inteiro;
+  • CSV      — a serialização em CSV que bulk_load.copy_frame faz antes do
+               COPY, em blocos de COPY_CHUNK_ROWS. É só parte da gravação
+               (sem rede, staging nem merge), então o percentual abaixo é
+               um limite superior do custo relativo da validação.
+
+Confere também que exatamente as linhas com defeito foram para a
+quarentena; sai com código 1 se não.
+
+Com `--metrics` (arquivo JSON lines de uma rodada do populate_db.py) mostra
+ainda, por etapa, o tempo da fase validate sobre o tempo total da etapa.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_quality.py [--countries 25000] [--repeat 3]
+    python benchmarks/bench_quality.py --metrics .cache/metrics/populate-<rodada>.jsonl
+"""
+
+from __future__ import annotations
+import argparse, io, statistics, sys, time
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import instrument, quality  # noqa: E402
+from bench_cube import synthetic  # noqa: E402
+from bulk_load import COPY_CHUNK_ROWS  # noqa: E402
+from cube import FACTS  # noqa: E402
+
+FAULT_SHARE = 0.001
+
+
+def inject(df, keys: tuple[str, ...], measure: str, rng) -> int:
+    """Estraga 3 grupos disjuntos de linhas; devolve quantas foram estragadas."""
+    n = max(3, int(len(df) * FAULT_SHARE)) // 3 * 3
+    rows = rng.choice(len(df), n, replace=False)
+    overflow, null_key, bad_year = np.split(rows, 3)
+    df[keys[0]] = df[keys[0]].astype(float)
+    df.iloc[overflow, df.columns.get_loc(measure)] = 1e15
+    df.iloc[null_key, df.columns.get_loc(keys[0])] = np.nan
+    df.iloc[bad_year, df.columns.get_loc(keys[1])] = 1600
+    return n
+
+
+def csv_seconds(df) -> float:
+    t0 = time.perf_counter()
+    for start in range(0, len(df), COPY_CHUNK_ROWS):
+        df.iloc[start:start + COPY_CHUNK_ROWS].to_csv(io.StringIO(), index=False,
+                                                      header=False, na_rep="")
+    return time.perf_counter() - t0
+
+
+def from_metrics(path: Path) -> None:
+    rows = instrument.read_metrics(path)
+    by_stage: dict[str, dict[str, float]] = {}
+    for r in rows:
+        if r["phase"] in ("validate", "total"):
+            by_stage.setdefault(r["loader"], {})[r["phase"]] = r["wall_s"]
+    print(f"\n{'etapa':<24}{'validate':>10}{'total':>10}{'custo':>8}   ({path})")
+    print("─" * 52)
+    for stage, t in by_stage.items():
+        if "validate" in t and t.get("total"):
+            print(f"{stage:<24}{t['validate']:>9.3f}s{t['total']:>9.2f}s"
+                  f"{t['validate'] / t['total']:>8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--countries", type=int, default=25_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--metrics", type=Path, help="métricas de uma rodada do populate_db.py")
+    args = parser.parse_args()
+    if args.metrics:
+        return from_metrics(args.metrics)
+
+    rng = np.random.default_rng(args.seed)
+    tables = synthetic(args.countries, rng)
+    print(f"{'tabela':<24}{'linhas':>12}{'validate':>10}{'CSV':>9}{'custo':>8}"
+          f"{'quarentena':>12}   resultado")
+    print("─" * 88)
+    ok = True
+    total_v = total_csv = 0.0
+    for table, fact in FACTS.items():
+        df = tables[table]
+        measures = list(fact.measures.values())
+        df[measures] = df[measures] % 100      # valores válidos em todas as faixas
+        ints = [c for c in measures if quality.schema()[table][c][0] != "numeric"]
+        df[ints] = df[ints].round()
+        faults = inject(df, fact.keys, measures[0], rng)
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            _, rep = quality.validate(df, table, list(fact.keys))
+            times.append(time.perf_counter() - t0)
+        v, csv = statistics.median(times), csv_seconds(df)
+        total_v, total_csv = total_v + v, total_csv + csv
+        match = rep.bad == faults
+        ok &= match
+        print(f"{table:<24}{len(df):>12,}{v:>9.3f}s{csv:>8.2f}s{v / csv:>8.1%}"
+              f"{rep.bad:>12,}   " + ("ok" if match else f"DIVERGE (esperado {faults:,})"))
+    print(f"{'total':<36}{total_v:>9.3f}s{total_csv:>8.2f}s{total_v / total_csv:>8.1%}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
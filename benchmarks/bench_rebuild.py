@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Recarga completa: upsert nas tabelas em uso × rebuild com troca
+---------------------------------------------------------------
+Recarrega o banco com `populate_db.py --full` (upsert direto nas tabelas em
+uso) e com `populate_db.py --rebuild` (COPY em tabelas-sombra sem índices,
+índices no fim e troca atômica; ver populate_scripts/rebuild.py) e compara:
+
+  • tempo total da recarga;
+  • tamanho das tabelas de fatos com índices ao final (inchaço do upsert);
+  • um leitor que, durante a recarga, conta as linhas das tabelas de fatos
+    numa única consulta: latência p95 e quantos totais diferentes viu (com
+    o rebuild, só o da geração anterior e o da nova).
+
+Os dados vêm de synth_datasets.py (`--scale`) ou, com `--real`, da pasta
+Datasets. Num banco descartável (`--database`, no servidor de DB_URL) a
+primeira carga cria o esquema e os dados; depois cada rodada (`--repeat`
+por modo, alternadas) recarrega tudo num processo novo.
+
+Requer DB_URL com permissão de CREATE DATABASE.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_rebuild.py [--scale 10 | --real] [--workers 2]
+                                       [--repeat 3] [--database first_db_bench_rebuild] [--keep]
+"""
+
+from __future__ import annotations
+import argparse, os, shutil, statistics, sys, tempfile, threading, time
+from pathlib import Path
+from sqlalchemy import create_engine, text
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+from bench_scale import admin_engine, p95, recreate, spawn  # noqa: E402
+from rebuild import FACT_TABLES  # noqa: E402
+
+POPULATE = ROOT / "populate_scripts" / "populate_db.py"
+MODES = {"full": "--full", "rebuild": "--rebuild"}
+COUNT_SQL = " + ".join(f'(SELECT count(*) FROM public."{t}")' for t in FACT_TABLES)
+SIZE_SQL = " + ".join(f"""pg_total_relation_size('public."{t}"')""" for t in FACT_TABLES)
+
+
+class Reader(threading.Thread):
+    """Conta as linhas das tabelas de fatos em laço até `stop`."""
+
+    def __init__(self, url):
+        super().__init__(daemon=True)
+        self.engine = create_engine(url, pool_size=1)
+        self.stop = threading.Event()
+        self.latency: list[float] = []
+        self.totals: set[int] = set()
+
+    def run(self) -> None:
+        with self.engine.connect() as conn:
+            while not self.stop.is_set():
+                t0 = time.perf_counter()
+                self.totals.add(conn.execute(text(f"SELECT {COUNT_SQL}")).scalar())
+                conn.commit()
+                self.latency.append(time.perf_counter() - t0)
+                time.sleep(0.05)
+
+    def finish(self) -> None:
+        self.stop.set()
+        self.join()
+        self.engine.dispose()
+
+
+def fact_size_mb(url) -> float:
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT {SIZE_SQL}")).scalar() / 1e6
+    finally:
+        engine.dispose()
+
+
+# ───────────────────────────────────────────────────────────────
+# Main
+# ───────────────────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scale", type=float, default=10,
+                        help="fator de escala dos dados sintéticos (padrão: 10)")
+    source.add_argument("--real", action="store_true", help="usa a pasta Datasets")
+    parser.add_argument("--workers", type=int, default=2, help="etapas em paralelo")
+    parser.add_argument("--repeat", type=int, default=3, help="rodadas por modo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default="first_db_bench_rebuild",
+                        help="banco descartável criado e apagado ao final")
+    parser.add_argument("--keep", action="store_true", help="não apaga o banco ao final")
+    args = parser.parse_args()
+    admin, url = admin_engine(args.database)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DB_URL": url.render_as_string(hide_password=False),
+               "SOURCE_CACHE_DIR": str(Path(tmp) / "sources"), "RESULT_CACHE": "0"}
+        if not args.real:
+            import synth_datasets
+            data = Path(tmp) / "data"
+            generated = synth_datasets.generate(data, args.scale, args.seed)
+            env["DATASETS_DIR"] = str(data)
+            print(f"⏱  {args.scale:g}×: {sum(generated.values()):,} linhas geradas", flush=True)
+
+        recreate(admin, args.database)
+        try:
+            base = [sys.executable, str(POPULATE), "--workers", str(args.workers)]
+            spawn(base + ["--full"], env)
+            runs: dict[str, list[float]] = {m: [] for m in MODES}
+            sizes: dict[str, float] = {}
+            reads: dict[str, list[float]] = {m: [] for m in MODES}
+            states: dict[str, int] = {m: 0 for m in MODES}
+            for i in range(args.repeat):
+                for mode, flag in MODES.items():
+                    reader = Reader(url)
+                    reader.start()
+                    try:
+                        _, seconds, _ = spawn(base + [flag], env)
+                    finally:
+                        reader.finish()
+                    runs[mode].append(seconds)
+                    reads[mode] += reader.latency
+                    states[mode] = max(states[mode], len(reader.totals))
+                    sizes[mode] = fact_size_mb(url)
+                    print(f"   rodada {i + 1} {mode:<8}{seconds:>8.2f}s", flush=True)
+        finally:
+            shutil.rmtree(env["SOURCE_CACHE_DIR"], ignore_errors=True)
+            if not args.keep:
+                recreate(admin, args.database, drop_only=True)
+
+    print(f"\n{len(FACT_TABLES)} tabelas de fatos, {args.workers} worker(s)")
+    print(f"{'modo':<10}{'mediana':>10}{'tabelas':>11}{'leitura p95':>13}{'totais vistos':>15}"
+          f"{'ganho':>8}")
+    print("─" * 67)
+    ref = statistics.median(runs["full"])
+    for mode, secs in runs.items():
+        med = statistics.median(secs)
+        print(f"{mode:<10}{med:>9.2f}s{sizes[mode]:>8.1f} MB{p95(reads[mode]) * 1000:>11.1f}ms"
+              f"{states[mode]:>15}{ref / med:>7.2f}×")
+
+
+if __name__ == "__main__":
+    main()
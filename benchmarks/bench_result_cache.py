@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cache de resultados (Consultas/result_cache.py)
+-----------------------------------------------------------
+Para cada consulta registrada mede:
+  • banco      : execução sem cache (--no-cache);
+  • 1ª leitura : cache vazio — consulta no banco + gravação da entrada;
+  • acerto     : mesma consulta de novo, lida do Parquet do cache;
+  • invalidada : depois de incrementar a versão de uma das tabelas lidas
+                 (como faria um loader), a entrada vence e volta ao banco.
+Confere também que o CSV gerado pelo cache é idêntico ao do banco.
+
+Usa um diretório de cache temporário (não mexe em .cache/results).
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_result_cache.py [--views] [--repeat 5]
+"""
+
+from __future__ import annotations
+import argparse, filecmp, os, statistics, sys, tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["RESULT_CACHE_DIR"] = _tmp.name
+
+import manifest  # noqa: E402
+import result_cache, runner  # noqa: E402
+from queries import QUERIES, VIEW_QUERIES, get_engine, sql_for  # noqa: E402
+
+
+def timed(engine, name: str, out: Path, use_views: bool, cache: bool) -> float:
+    stats, _ = runner.run_to_file(engine, name, out, "csv", use_views, cache=cache)
+    return stats.total_s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--views", action="store_true", help="usa as versões sobre as views")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    names = list(VIEW_QUERIES) if args.views else list(QUERIES)
+    print(f"{'Consulta':<10}{'banco':>10}{'1ª leitura':>12}{'acerto':>10}{'invalidada':>12}"
+          f"{'ganho':>8}  CSV igual")
+    print("─" * 74)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            ref, out = Path(tmp) / "ref.csv", Path(tmp) / "out.csv"
+            result_cache.clear()
+            db = statistics.median(timed(engine, name, ref, args.views, False)
+                                   for _ in range(args.repeat))
+            cold = timed(engine, name, out, args.views, True)
+            warm = statistics.median(timed(engine, name, out, args.views, True)
+                                     for _ in range(args.repeat))
+            same = filecmp.cmp(ref, out, shallow=False)
+
+            table = sorted(result_cache.tables_read(sql_for(name, args.views)))[0]
+            with engine.begin() as conn:
+                manifest.bump_version(conn, table)
+            stale = timed(engine, name, out, args.views, True)
+            print(f"{name:<10}{db * 1000:>8.1f}ms{cold * 1000:>10.1f}ms{warm * 1000:>8.1f}ms"
+                  f"{stale * 1000:>10.1f}ms{db / warm:>7.0f}×  {'sim' if same else 'NÃO'}")
+    result_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
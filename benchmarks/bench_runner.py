@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark do executor em streaming (Consultas/runner.py)
+-------------------------------------------------------
+Gera resultados sintéticos de tamanho crescente no próprio PostgreSQL
+(generate_series) e compara, cada um em um processo novo:
+  • read_sql : pd.read_sql + df.to_csv (como os scripts faziam antes);
+  • stream   : cursor do servidor + CSV gravado em lotes (runner.py).
+
+Mostra tempo total, tempo até a primeira linha, vazão e pico de memória
+(VmHWM) — no streaming o pico deve ficar constante com o tamanho.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_runner.py [--rows 100000 1000000 5000000]
+"""
+
+from __future__ import annotations
+import argparse, json, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+SQL = """
+SELECT g AS id, g % 250 AS country, 2000 + g % 25 AS year,
+       (g * 0.37)::numeric(12, 4) AS value, md5(g::text) AS label
+FROM generate_series(1, {rows}) AS g
+"""
+
+
+def peak_rss_mb() -> float:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(variant: str, rows: int, out: str) -> None:
+    import pandas as pd
+    from sqlalchemy import text
+    import runner
+    from queries import get_engine
+
+    engine = get_engine()
+    sql = SQL.format(rows=rows)
+    if variant == "read_sql":
+        t0 = time.perf_counter()
+        with engine.begin() as conn:
+            df = pd.read_sql(text(sql), conn)
+        first = time.perf_counter() - t0      # só há linhas depois de tudo carregado
+        df.to_csv(out)
+        stats = {"rows": len(df), "first_s": first, "total_s": time.perf_counter() - t0}
+    else:
+        st, _ = runner.stream_query(engine, sql, runner.CsvSink(Path(out)))
+        stats = {"rows": st.rows, "first_s": st.first_row_s, "total_s": st.total_s}
+    print(json.dumps({**stats, "rss_mb": peak_rss_mb()}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child[0], int(args.child[1]), args.child[2])
+
+    print(f"{'linhas':>10}  {'variante':<9}{'total':>9}{'1ª linha':>10}{'linhas/s':>12}{'pico RSS':>11}")
+    print("─" * 63)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for variant in ("read_sql", "stream"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", variant, str(rows), f"{tmp}/out.csv"],
+                    check=True, capture_output=True, text=True).stdout
+                r = json.loads(out.strip().splitlines()[-1])
+                print(f"{rows:>10}  {variant:<9}{r['total_s']:>8.2f}s{r['first_s'] * 1000:>8.0f}ms"
+                      f"{r['rows'] / r['total_s']:>12,.0f}{r['rss_mb']:>8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escala: carga completa + todas as consultas
+--------------------------------------------------------
+Para cada fator de escala:
+  1. gera os Datasets sintéticos (synth_datasets.py) numa pasta temporária;
+  2. cria um banco vazio (`--database`, no mesmo servidor de DB_URL) e roda
+     `populate_db.py --full` sobre ele, com DATASETS_DIR apontando para os
+     arquivos gerados e o cache de fontes vazio;
+  3. roda cada consulta de Consultas/queries.py (e as versões --views) pelo
+     runner.py, sem o cache de resultados, `--repeat` vezes;
+  4. apaga o banco (a menos que `--keep`).
+
+Carga e consultas rodam em processos novos, para medir o pico de memória
+(ru_maxrss, via wait4) de cada um. O relatório JSON guarda, por escala:
+tempo e linhas da geração; tempo, linhas gravadas por tabela, linhas/s e
+pico de RSS da carga; e, por consulta, mediana e p95 da latência, tempo até
+a primeira linha, linhas, linhas/s e pico de RSS. Com `--baseline`, mostra a razão de cada
+métrica em relação a um relatório anterior.
+
+Requer DB_URL (ou .env) com permissão de CREATE DATABASE.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_scale.py [--scales 1 10] [--repeat 3] [--workers N]
+                                     [--database first_db_bench] [--seed 42]
+                                     [--report scale_report.json] [--baseline antigo.json]
+                                     [--populate-args "--partitioned decade"] [--keep]
+"""
+
+from __future__ import annotations
+import argparse, datetime, json, os, platform, shlex, shutil, statistics, subprocess, \
+    sys, tempfile, time
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+sys.path.insert(0, str(ROOT / "Consultas"))
+
+import synth_datasets  # noqa: E402
+from queries import QUERIES, VIEW_QUERIES  # noqa: E402
+
+POPULATE = ROOT / "populate_scripts" / "populate_db.py"
+TABLES = ("Country", "Sector", "Power Source", "Sector_Country", "Power Source_Country",
+          "Environmental Indicator", "Development", "Investment", "Power Consumed",
+          "Demography")
+MARK = "BENCH_SCALE "   # prefixo da linha de resultado impressa pelo filho das consultas
+
+
+def p95(xs: list[float]) -> float:
+    return sorted(xs)[max(0, round(0.95 * len(xs)) - 1)]
+
+
+# ───────────────────────────────────────────────────────────────
+# Processos filhos
+# ───────────────────────────────────────────────────────────────
+def child_query(key: str, repeat: int, out: str) -> None:
+    import runner
+    from queries import get_engine
+    name, use_views = key.removesuffix("_views"), key.endswith("_views")
+    engine = get_engine()
+    runs = [runner.run_to_file(engine, name, Path(out), use_views=use_views, cache=False)[0]
+            for _ in range(repeat)]
+    print(MARK + json.dumps({
+        "latency_s": [r.total_s for r in runs],
+        "first_row_s": statistics.median(r.first_row_s or 0.0 for r in runs),
+        "rows": runs[-1].rows,
+    }), flush=True)
+
+
+def spawn(cmd: list[str], env: dict) -> tuple[str, float, float]:
+    """
+    Roda `cmd` num processo novo; devolve (saída, segundos, pico de RSS em MB).
+    O pico vem do wait4 do filho (o maior entre ele e os processos que ele
+    esperou, ex.: os workers de --executor process).
+    """
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True)
+    out = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - t0
+    proc.stdout.close()
+    code = os.waitstatus_to_exitcode(status)
+    proc.returncode = code
+    if code:
+        sys.stderr.write(out[-4000:])
+        sys.exit(f"💥  {Path(cmd[1]).name} {' '.join(cmd[2:4])} falhou (código {code})")
+    return out, elapsed, usage.ru_maxrss / 1024
+
+
+def result_line(out: str) -> dict:
+    return json.loads([l for l in out.splitlines() if l.startswith(MARK)][-1][len(MARK):])
+
+
+# ───────────────────────────────────────────────────────────────
+# Banco descartável
+# ───────────────────────────────────────────────────────────────
+def admin_engine(database: str):
+    load_dotenv()
+    if not os.getenv("DB_URL"):
+        sys.exit("💥  Defina DB_URL no ambiente ou no .env")
+    url = make_url(os.environ["DB_URL"])
+    if url.database == database:
+        sys.exit(f"💥  --database '{database}' é o banco de DB_URL; use um banco separado")
+    return create_engine(url, isolation_level="AUTOCOMMIT"), url.set(database=database)
+
+
+def recreate(admin, database: str, drop_only: bool = False) -> None:
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)'))
+        if not drop_only:
+            conn.execute(text(f'CREATE DATABASE "{database}"'))
+
+
+def table_rows(url) -> dict[str, int]:
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            return {t: conn.execute(text(f'SELECT count(*) FROM public."{t}"')).scalar()
+                    for t in TABLES}
+    finally:
+        engine.dispose()
+
+
+# ───────────────────────────────────────────────────────────────
+# Uma escala
+# ───────────────────────────────────────────────────────────────
+def run_scale(scale: float, args, admin, url, tmp: Path) -> dict:
+    data = tmp / f"scale_{scale:g}"
+    t0 = time.perf_counter()
+    generated = synth_datasets.generate(data, scale, args.seed)
+    gen_s = time.perf_counter() - t0
+    size = sum(f.stat().st_size for f in data.iterdir())
+    print(f"\n⏱  {scale:g}×: {sum(generated.values()):,} linhas geradas em {gen_s:.1f}s",
+          flush=True)
+
+    env = {**os.environ, "DB_URL": url.render_as_string(hide_password=False),
+           "DATASETS_DIR": str(data), "SOURCE_CACHE_DIR": str(tmp / f"sources_{scale:g}"),
+           "RESULT_CACHE": "0"}
+    recreate(admin, args.database)
+    try:
+        _, pop_s, pop_rss = spawn([sys.executable, str(POPULATE), "--full",
+                                   "--workers", str(args.workers),
+                                   *shlex.split(args.populate_args)], env)
+        rows = table_rows(url)
+        written = sum(rows.values())
+        print(f"   carga: {pop_s:.1f}s, {written:,} linhas ({written / pop_s:,.0f}/s), "
+              f"pico {pop_rss:.0f} MB", flush=True)
+
+        queries = {}
+        keys = list(QUERIES) + [f"{q}_views" for q in VIEW_QUERIES]
+        print(f"   {'consulta':<14}{'mediana':>10}{'p95':>10}{'1ª linha':>10}"
+              f"{'linhas':>10}{'pico RSS':>10}")
+        for key in keys:
+            out, _, rss = spawn([sys.executable, __file__, "--child", key, str(args.repeat),
+                                 str(tmp / "out.csv")], env)
+            r = result_line(out)
+            med = statistics.median(r["latency_s"])
+            queries[key] = {
+                "median_s": med, "p95_s": p95(r["latency_s"]), "first_row_s": r["first_row_s"],
+                "rows": r["rows"], "rows_per_s": r["rows"] / med if med else 0.0,
+                "peak_rss_mb": rss, "latency_s": r["latency_s"],
+            }
+            print(f"   {key:<14}{med * 1000:>8.1f}ms{p95(r['latency_s']) * 1000:>8.1f}ms"
+                  f"{r['first_row_s'] * 1000:>8.1f}ms{r['rows']:>10,}"
+                  f"{rss:>7.0f} MB", flush=True)
+    finally:
+        shutil.rmtree(data, ignore_errors=True)
+        shutil.rmtree(env["SOURCE_CACHE_DIR"], ignore_errors=True)
+        if not args.keep:
+            recreate(admin, args.database, drop_only=True)
+
+    return {
+        "scale": scale,
+        "countries": max(1, round(synth_datasets.BASE_COUNTRIES * scale)),
+        "generate": {"seconds": gen_s, "rows": sum(generated.values()), "files": generated,
+                     "bytes": size},
+        "populate": {"seconds": pop_s, "rows_written": written,
+                     "rows_per_s": written / pop_s, "input_rows_per_s":
+                         sum(generated.values()) / pop_s,
+                     "peak_rss_mb": pop_rss, "tables": rows},
+        "queries": queries,
+    }
+
+
+# ───────────────────────────────────────────────────────────────
+# Relatório
+# ───────────────────────────────────────────────────────────────
+def metadata(args, admin) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    with admin.connect() as conn:
+        server = conn.execute(text("SHOW server_version")).scalar()
+    return {
+        "created_at": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "git_commit": commit, "python": platform.python_version(), "postgres": server,
+        "host": platform.node(), "cpus": os.cpu_count(), "workers": args.workers,
+        "repeat": args.repeat, "seed": args.seed, "populate_args": args.populate_args,
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Razão atual/base das métricas principais, para as escalas em comum."""
+    old = {s["scale"]: s for s in baseline["scales"]}
+    print(f"\nComparação com {baseline['meta'].get('git_commit') or 'a base'} "
+          f"(atual ÷ base; < 1 é melhor em tempo e memória)")
+    for cur in report["scales"]:
+        base = old.get(cur["scale"])
+        if base is None:
+            continue
+        pop, old_pop = cur["populate"], base["populate"]
+        print(f"   {cur['scale']:g}×  carga: tempo {pop['seconds'] / old_pop['seconds']:.2f}"
+              f"  linhas/s {pop['rows_per_s'] / old_pop['rows_per_s']:.2f}"
+              f"  pico RSS {pop['peak_rss_mb'] / old_pop['peak_rss_mb']:.2f}")
+        for key, q in cur["queries"].items():
+            b = base["queries"].get(key)
+            if b and b["median_s"]:
+                print(f"        {key:<14}mediana {q['median_s'] / b['median_s']:.2f}"
+                      f"  pico RSS {q['peak_rss_mb'] / b['peak_rss_mb']:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3, help="execuções de cada consulta")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="--workers do populate_db.py")
+    parser.add_argument("--database", default="first_db_bench",
+                        help="banco descartável criado e apagado a cada escala")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", type=Path, default=Path("scale_report.json"))
+    parser.add_argument("--baseline", type=Path, help="relatório anterior para comparar")
+    parser.add_argument("--populate-args", default="",
+                        help='argumentos extras do populate_db.py, ex.: "--partitioned decade"')
+    parser.add_argument("--keep", action="store_true", help="não apaga o banco da última escala")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child_query(args.child[0], int(args.child[1]), args.child[2])
+
+    admin, url = admin_engine(args.database)
+    report = {"meta": metadata(args, admin), "scales": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            report["scales"].append(run_scale(scale, args, admin, url, Path(tmp)))
+            args.report.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"\n✅  Relatório em {args.report}")
+
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
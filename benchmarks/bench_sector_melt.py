@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Saída golden + benchmark da conversão largo → longo do Sector_Country
+---------------------------------------------------------------------
+Compara o laço antigo de populate_sector_country.py (iterrows + um dict por
+célula não nula) com `to_long` (vetorizado) na planilha real do EDGAR e numa
+planilha sintética `--scale` vezes maior (benchmarks/synth_datasets.py).
+Setores e países recebem IDs pela ordem de aparição, sem banco, então só a
+etapa de conversão é medida. Confere que as duas versões geram o mesmo
+conjunto de linhas (chaves e CO2_Emission) antes de mostrar os tempos.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_sector_melt.py [--scale 50] [--repeat 3]
+
+Sai com código 1 se alguma saída divergir.
+"""
+
+from __future__ import annotations
+import argparse, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import populate_sector_country as sector_country  # noqa: E402
+import synth_datasets  # noqa: E402
+from source_cache import read_source  # noqa: E402
+
+
+# ───────────────────────────────────────────────────────────────
+# Versão antiga (referência, copiada do loader)
+# ───────────────────────────────────────────────────────────────
+def legacy(df: pd.DataFrame, years: list) -> pd.DataFrame:
+    records = []
+    for _, row in df.iterrows():
+        sector_id, country_id = row["sector_id"], row["country_id"]
+        for year in years:
+            emission = row.get(year)
+            if pd.notnull(emission):
+                records.append({
+                    "Sector_ID_Sector":   int(sector_id),
+                    "Country_ID_Country": int(country_id),
+                    "Year":               int(year),
+                    "CO2_Emission":       round(float(emission), 2),
+                })
+    return pd.DataFrame(records)
+
+
+# ───────────────────────────────────────────────────────────────
+# Planilhas
+# ───────────────────────────────────────────────────────────────
+def prepare(df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
+    """Mesma limpeza do loader; IDs pela ordem de aparição."""
+    df = df.copy()
+    df.columns = df.columns.map(sector_country.clean_col)
+    df = df[~df["EDGAR Country Code"].str.upper().isin(sector_country.AGGREGATES)]
+    df = df.reset_index(drop=True)
+    df["sector_id"] = pd.Series(pd.factorize(df["Sector"])[0] + 1, dtype="Int64")
+    df["country_id"] = pd.Series(pd.factorize(df["EDGAR Country Code"])[0] + 1, dtype="Int64")
+    return df, [c for c in df.columns if sector_country.is_year_col(c)]
+
+
+def synthetic(scale: int) -> pd.DataFrame:
+    n = synth_datasets.BASE_COUNTRIES * scale
+    c = pd.DataFrame({"code": synth_datasets.country_codes(n),
+                      "name": synth_datasets.country_names(n)})
+    return synth_datasets.edgar(c, np.random.default_rng(42))
+
+
+def canonical(df: pd.DataFrame) -> pd.DataFrame:
+    return (df.astype({k: "int64" for k in sector_country.KEYS})
+              .sort_values(sector_country.KEYS).reset_index(drop=True))
+
+
+def timed(fn, repeat: int) -> tuple[float, pd.DataFrame]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def run(label: str, raw: pd.DataFrame, repeat: int) -> bool:
+    df, years = prepare(raw)
+    t_old, old = timed(lambda: legacy(df, years), 1)
+    t_new, new = timed(lambda: sector_country.to_long(df, years), repeat)
+    old, new = canonical(old), canonical(new)
+    same_keys = old[sector_country.KEYS].equals(new[sector_country.KEYS])
+    diff = int((old["CO2_Emission"] != new["CO2_Emission"]).sum()) if same_keys else -1
+    # round(x, 2) do Python e o arredondamento do numpy podem discordar no
+    # último dígito de valores exatamente no meio; tolera 0,01
+    close = same_keys and np.allclose(old["CO2_Emission"], new["CO2_Emission"], atol=0.01, rtol=0)
+    print(f"{label:<24}{len(df):>9}{len(new):>11}{t_old:>10.3f}{t_new:>10.3f}"
+          f"{t_old / t_new:>9.1f}×  " + ("ok" if close else "DIVERGE")
+          + (f" ({diff} no último dígito)" if diff > 0 else ""))
+    return close
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=50, help="multiplica o nº de países")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'planilha':<24}{'linhas':>9}{'saída':>11}{'iterrows':>10}{'to_long':>10}{'ganho':>10}")
+    ok = run("EDGAR real", read_source(sector_country.DATAFILE, sheet_name=sector_country.SHEET),
+             args.repeat)
+    ok &= run(f"sintética ×{args.scale}", synthetic(args.scale), args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cache colunar de fontes (populate_scripts/source_cache.py)
+----------------------------------------------------------------------
+Para cada leitura feita pelos loaders compara:
+  • direto : pd.read_csv / pd.read_excel (o que os loaders faziam antes);
+  • frio   : primeira leitura pelo cache (parse + conversão para Arrow);
+  • quente : leitura do arquivo Arrow por memory-map.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_source_cache.py [--repeat N]
+"""
+
+from __future__ import annotations
+import argparse, os, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+os.environ.setdefault("SOURCE_CACHE_DIR", tempfile.mkdtemp(prefix="source-cache-"))
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import source_cache  # noqa: E402
+
+DATASETS = ROOT / "Datasets"
+READS = (
+    ("EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx", {"sheet_name": "fossil_CO2_by_sector_country_su"}),
+    ("human-development-index-vs-gdp-per-capita.csv", {}),
+    ("country_year_gdp_energy_health.csv", {}),
+    ("PowerConsumid.csv", {}),
+    ("CombinandoEnviromental.csv", {}),
+    ("WDICountry.csv", {}),
+    ("2024_gMPI_Table1and2 - gMPI_Table1.csv", {"skiprows": 4}),
+    ("2024_gMPI_Table1and2 - Table2.csv", {"skiprows": 4}),
+)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if source_cache.pa is None:
+        sys.exit("pyarrow não instalado: o cache está desativado")
+    source_cache.clear()
+
+    print(f"{'Arquivo':<50}{'direto':>9}{'frio':>9}{'quente':>9}{'ganho':>8}")
+    print("─" * 85)
+    tot_direct = tot_warm = 0.0
+    for name, kwargs in READS:
+        path = DATASETS / name
+        if not path.exists():
+            print(f"{name:<50}{'(ausente)':>9}")
+            continue
+        direct = best_of(lambda: source_cache._read_raw(path, **kwargs), args.repeat)
+        t0 = time.perf_counter()
+        source_cache.read_source(path, **kwargs)
+        cold = time.perf_counter() - t0
+        warm = best_of(lambda: source_cache.read_source(path, **kwargs), args.repeat)
+        tot_direct += direct
+        tot_warm += warm
+        print(f"{name[:49]:<50}{direct:>8.3f}s{cold:>8.3f}s{warm:>8.4f}s{direct / warm:>7.0f}×")
+    print("─" * 85)
+    print(f"{'Total':<50}{tot_direct:>8.3f}s{'':>9}{tot_warm:>8.4f}s{tot_direct / tot_warm:>7.0f}×")
+
+
+if __name__ == "__main__":
+    main()
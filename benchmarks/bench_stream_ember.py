@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória/tempo dos pré-processadores do Ember (Scripts Extras/)
+--------------------------------------------------------------------------
+Gera um long format sintético no layout do Ember com `--rows` linhas e roda,
+cada um em um processo novo:
+  • legado : pd.read_csv do arquivo inteiro + filtros (scripts antigos);
+  • arrow  : streaming via pyarrow.csv.open_csv (stream_csv.py);
+  • pandas : streaming via pd.read_csv(chunksize=...).
+
+Para cada variante mostra o tempo e o pico de memória (VmHWM) do processo,
+e confere que o CSV gerado é byte a byte igual ao da versão legada. A linha
+"base" é o pico de um processo que só importa pandas/pyarrow.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_stream_ember.py [--rows N] [--chunksize N]
+
+Sai com código 1 se alguma saída divergir.
+"""
+
+from __future__ import annotations
+import argparse, importlib, json, resource, subprocess, sys, tempfile, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+EXTRAS = ROOT / "Scripts Extras"
+
+SCRIPTS = {"power": "CSVPowerConsumid", "energy": "limpacsv"}
+
+
+# ───────────────────────────────────────────────────────────────
+# Versões antigas (referência, copiadas dos scripts)
+# ───────────────────────────────────────────────────────────────
+def legacy_power(input_path: str, output_path: str) -> None:
+    df = pd.read_csv(input_path)
+    df_filtrado = df[df["Category"].isin(["Electricity generation", "Power sector emissions"])]
+    df_filtrado2 = df_filtrado[df_filtrado["Variable"].isin(
+        ["Bioenergy", "Coal", "Gas", "Hydro", "Nuclear", "Other Fossil",
+         "Other Renewables", "Solar", "Wind"])]
+    df_filtrado3 = df_filtrado2[df_filtrado2["Subcategory"].isin(["Fuel"])]
+    db_filtrado4 = df_filtrado3[df_filtrado3["Unit"].isin(["TWh", "mtCO2"])]
+    colunas_desejadas = ["Area", "Year", "Category", "Variable", "Value"] + [str(a) for a in range(2000, 2025)]
+    colunas_existentes = [c for c in colunas_desejadas if c in df_filtrado.columns]
+    db_filtrado4[colunas_existentes].to_csv(output_path, index=False)
+
+def legacy_energy(input_path: str, output_path: str) -> None:
+    df = pd.read_csv(input_path)
+    df_filtrado = df[df["Category"].isin(["Electricity generation", "Power sector emissions"])]
+    df_filtrado2 = df_filtrado[df_filtrado["Variable"].isin(
+        ["Other renewables excluding bioenergy", "Bioenergy", "Solar", "Wind",
+         "Hydro", "Nuclear", "Oil", "Gas", "Coal"])]
+    df_filtrado3 = df_filtrado2[df_filtrado2["Unit"].isin(["TWh", "mtCO2"])]
+    colunas_existentes = [c for c in ["Country", "Year", "Category", "Variable", "Value"]
+                          if c in df_filtrado3.columns]
+    pivoted_df = df_filtrado3[colunas_existentes].pivot_table(
+        index=['Country', 'Year', 'Variable'], columns='Category',
+        values='Value', aggfunc='first').reset_index()
+    pivoted_df.columns.name = None
+    pivoted_df.to_csv(output_path, index=False)
+
+LEGACY = {"power": legacy_power, "energy": legacy_energy}
+
+
+# ───────────────────────────────────────────────────────────────
+# Dados sintéticos
+# ───────────────────────────────────────────────────────────────
+CATEGORIES = {
+    "Electricity generation": (["Fuel", "Aggregate fuel", "Total"], ["TWh", "%"]),
+    "Power sector emissions": (["Fuel", "Aggregate fuel", "Total"], ["mtCO2"]),
+    "Capacity": (["Fuel", "Aggregate fuel"], ["GW"]),
+    "Electricity demand": (["Demand", "Demand per capita"], ["TWh", "MWh"]),
+    "Electricity imports": (["Electricity imports"], ["TWh"]),
+}
+VARIABLES = ["Bioenergy", "Coal", "Gas", "Hydro", "Nuclear", "Other Fossil", "Oil",
+             "Other Renewables", "Other renewables excluding bioenergy", "Solar",
+             "Wind", "Clean", "Fossil", "Renewables", "Total Generation"]
+
+
+def generate(path: Path, rows: int, seed: int = 0, block: int = 500_000) -> None:
+    """
+    Long format no layout do Ember. Traz as colunas "Area" (releases atuais,
+    lida por CSVPowerConsumid.py) e "Country" (releases antigas, lida por
+    limpacsv.py) para que os dois scripts tenham o que processar.
+    """
+    rng = np.random.default_rng(seed)
+    areas = [f"Country {i:03d}" for i in range(250)]
+    cats = list(CATEGORIES)
+    with open(path, "w", newline="") as f:
+        for start in range(0, rows, block):
+            n = min(block, rows - start)
+            area = rng.choice(areas, n)
+            cat = rng.choice(cats, n)
+            sub = np.array([CATEGORIES[c][0][0] for c in cat])
+            sub = np.where(rng.random(n) < 0.6, sub, "Aggregate fuel")
+            unit = np.array([CATEGORIES[c][1][0] for c in cat])
+            unit = np.where(rng.random(n) < 0.8, unit, "%")
+            pd.DataFrame({
+                "Area": area, "ISO 3 code": [a[-3:] for a in area],
+                "Year": rng.integers(2000, 2025, n), "Area type": "Country",
+                "Continent": "Europe", "Ember region": "EU", "EU": 1, "OECD": 0,
+                "G20": 0, "G7": 0, "ASEAN": 0,
+                "Category": cat, "Subcategory": sub,
+                "Variable": rng.choice(VARIABLES, n), "Unit": unit,
+                # como no Ember, valores com até 2 casas decimais
+                "Value": np.where(rng.random(n) < 0.05, np.nan, np.round(rng.random(n) * 1000, 2)),
+                "YoY absolute change": rng.random(n), "YoY % change": rng.random(n),
+                "Country": area,
+            }).to_csv(f, index=False, header=(start == 0))
+
+
+# ───────────────────────────────────────────────────────────────
+# Execução de cada variante em um processo próprio
+# ───────────────────────────────────────────────────────────────
+def peak_rss_mb() -> float:
+    """
+    Pico de memória do processo. No Linux usa VmHWM, que zera no exec; o
+    ru_maxrss herdaria o pico do processo pai (que gerou os dados).
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(script: str, variant: str, input_path: str, output_path: str, chunksize: int) -> None:
+    t0 = time.perf_counter()
+    if variant == "legado":
+        LEGACY[script](input_path, output_path)
+    elif variant != "base":
+        sys.path.insert(0, str(EXTRAS))
+        mod = importlib.import_module(SCRIPTS[script])
+        sys.argv = [mod.__file__, "--input", input_path, "--output", output_path,
+                    "--chunksize", str(chunksize), "--engine", variant]
+        mod.main()
+    else:
+        import pyarrow  # noqa: F401  (só para a linha de base)
+    secs = time.perf_counter() - t0
+    print(json.dumps({"secs": secs, "rss_mb": peak_rss_mb()}))
+
+
+def run_child(chunksize: int, *args: str) -> dict:
+    out = subprocess.run([sys.executable, __file__, "--chunksize", str(chunksize), "--child", *args],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--child", nargs=4, metavar=("SCRIPT", "VARIANT", "IN", "OUT"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(*args.child, chunksize=args.chunksize)
+
+    with tempfile.TemporaryDirectory(prefix="ember-") as tmp:
+        src = Path(tmp) / "yearly_full_release_long_format.csv"
+        generate(src, args.rows)
+        size_mb = src.stat().st_size / 2**20
+        print(f"Entrada sintética: {args.rows} linhas, {size_mb:.0f} MB\n")
+
+        base = run_child(args.chunksize, "power", "base", str(src), "-")
+        print(f"{'Script':<20}{'variante':<10}{'tempo':>9}{'pico RSS':>11}{'  saída'}")
+        print("─" * 62)
+        print(f"{'(imports)':<20}{'base':<10}{'':>9}{base['rss_mb']:>8.0f} MB")
+        failures = 0
+        for script, module in SCRIPTS.items():
+            ref = None
+            for variant in ("legado", "arrow", "pandas"):
+                out = Path(tmp) / f"{script}-{variant}.csv"
+                r = run_child(args.chunksize, script, variant, str(src), str(out))
+                data = out.read_bytes()
+                ref = data if ref is None else ref
+                same = data == ref
+                failures += not same
+                print(f"{module + '.py':<20}{variant:<10}{r['secs']:>8.2f}s{r['rss_mb']:>8.0f} MB"
+                      f"  {'ok' if same else 'DIFERE'}")
+        print("─" * 62)
+
+    if failures:
+        sys.exit(f"\n{failures} saída(s) diferente(s) da versão legada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark das consultas: tabelas de fatos × views materializadas
+---------------------------------------------------------------
+Para cada consulta com versão em views (Consultas/queries.py) mede o melhor
+tempo de `--repeat` execuções das duas versões e confere que os resultados
+são iguais. Requer o banco populado por populate_db.py (que cria e atualiza
+as views).
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_views.py [--repeat N] [--refresh]
+
+`--refresh` também mede um REFRESH CONCURRENTLY de cada view.
+Sai com código 1 se algum resultado divergir.
+"""
+
+from __future__ import annotations
+import argparse, sys
+from pathlib import Path
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import queries, views  # noqa: E402
+
+
+def same_rows(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """Mesmo conteúdo, ignorando a ordem entre linhas empatadas no ORDER BY."""
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    key = list(a.columns)
+    a = a.astype(str).sort_values(key).reset_index(drop=True)
+    b = b.astype(str).sort_values(key).reset_index(drop=True)
+    return a.equals(b)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--refresh", action="store_true")
+    args = parser.parse_args()
+
+    engine = queries.get_engine()
+    if args.refresh:
+        views.refresh(engine, list(views.VIEW_SOURCES))
+        print()
+
+    failures = 0
+    print(f"{'Consulta':<10}{'linhas':>8}{'tabelas':>11}{'views':>11}{'ganho':>8}  resultado")
+    print("─" * 60)
+    for name in queries.VIEW_QUERIES:
+        raw = [queries.run(engine, name) for _ in range(args.repeat)]
+        mv = [queries.run(engine, name, use_views=True) for _ in range(args.repeat)]
+        t_raw = min(t for _, t in raw)
+        t_mv = min(t for _, t in mv)
+        same = same_rows(raw[0][0], mv[0][0])
+        failures += not same
+        print(f"{name:<10}{len(raw[0][0]):>8}{t_raw:>10.3f}s{t_mv:>10.3f}s"
+              f"{t_raw / t_mv:>7.1f}×  {'igual' if same else 'DIFERE'}")
+
+    if failures:
+        sys.exit(f"\n{failures} consulta(s) com resultado diferente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Gerador de Datasets sintéticos para os loaders
+----------------------------------------------
+Escreve, numa pasta, todos os arquivos que os populate_*.py leem, com os
+mesmos nomes, colunas, cabeçalhos e formatos (vírgula decimal no
+CombinandoEnviromental.csv, 4 linhas de preâmbulo nas tabelas do gMPI,
+planilha do EDGAR com anos de 1970 a 2023, agregados como "World" e
+"GLOBAL TOTAL" que os loaders descartam, linhas duplicadas no
+PowerConsumid.csv, valores faltantes ...). Os valores respeitam os tipos
+de Modelos/modeloFisico.sql.
+
+O fator de escala multiplica o nº de países (base: 250, como o
+WDICountry.csv); setores, fontes e anos são fixos, já que os loaders só
+aceitam as faixas de anos reais. Os dados são determinísticos para a mesma
+escala e semente.
+
+Para carregar os arquivos gerados, aponte DATASETS_DIR para a pasta:
+    DATASETS_DIR=/tmp/ds python populate_scripts/populate_db.py --full
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/synth_datasets.py --out /tmp/ds [--scale 10] [--seed 42]
+"""
+
+from __future__ import annotations
+import argparse, csv, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+# nomes de arquivo, planilha e fontes vêm dos próprios loaders
+import populate_Development as development  # noqa: E402
+import populate_country_power_source as country_power_source  # noqa: E402
+import populate_environmental as environmental  # noqa: E402
+import populate_Investment as investment  # noqa: E402
+import populate_power_consumed as power_consumed  # noqa: E402
+import populate_sector_country as sector_country  # noqa: E402
+from registry import DATASETS  # noqa: E402
+
+try:
+    import xlsxwriter  # noqa: F401
+    XLSX_ENGINE = "xlsxwriter"
+except ImportError:  # dependência opcional (mais rápida que o openpyxl)
+    XLSX_ENGINE = "openpyxl"
+
+BASE_COUNTRIES = 250
+SECTORS = ["Agriculture", "Buildings", "Fuel Exploitation", "Industrial Combustion",
+           "Power Industry", "Processes", "Transport", "Waste"]
+EDGAR_YEARS = range(1970, 2024)
+HDI_YEARS = range(1990, 2024)
+GDP_YEARS = range(1990, 2024)
+YEARS = range(2000, 2024)
+EMBER_YEARS = range(2000, 2025)
+
+# fração dos países presente em cada fonte (como nos arquivos reais)
+COVERAGE = {"edgar": 0.85, "ember": 0.9, "env": 0.95, "hdi": 0.8,
+            "gmpi": 0.45, "gdp": 0.9, "pwr": 0.9}
+
+
+# ───────────────────────────────────────────────────────────────
+# Helpers
+# ───────────────────────────────────────────────────────────────
+def country_names(n: int) -> pd.Series:
+    """Nomes com acento, para exercitar a normalização dos loaders."""
+    return pd.Series([f"País Sintético {i:05d}" for i in range(1, n + 1)])
+
+
+def country_codes(n: int) -> pd.Series:
+    def code(i: int) -> str:
+        out = ""
+        while i or len(out) < 3:
+            i, r = divmod(i, 26)
+            out = chr(65 + r) + out
+        return out
+    return pd.Series([code(i) for i in range(n)])
+
+
+def cover(df: pd.DataFrame, key: str, rng) -> pd.DataFrame:
+    return df[rng.random(len(df)) < COVERAGE[key]].reset_index(drop=True)
+
+
+def product(countries: pd.DataFrame, **axes) -> pd.DataFrame:
+    """Produto cartesiano países × eixos (ex.: anos)."""
+    df = countries
+    for name, values in axes.items():
+        df = df.merge(pd.DataFrame({name: list(values)}), how="cross")
+    return df
+
+
+def holes(x, frac: float, rng) -> np.ndarray:
+    x = np.array(x, dtype=float)
+    x[rng.random(len(x)) < frac] = np.nan
+    return x
+
+
+def lognormal(n: int, mean: float, sigma: float, hi: float, rng) -> np.ndarray:
+    return np.clip(rng.lognormal(np.log(mean), sigma, n), 1e-3, hi)
+
+
+def decimal_comma(x: np.ndarray, digits: int) -> pd.Series:
+    """Números em texto com vírgula decimal; NaN vira vazio."""
+    s = pd.Series(np.round(x, digits))
+    txt = s.map(lambda v: f"{v:.{digits}f}".rstrip("0").rstrip(".")).str.replace(".", ",")
+    return txt.where(s.notna(), "")
+
+
+# ───────────────────────────────────────────────────────────────
+# Arquivos
+# ───────────────────────────────────────────────────────────────
+def wdi_country(c: pd.DataFrame) -> pd.DataFrame:
+    df = pd.concat([c, pd.DataFrame({"code": ["WLD"], "name": ["World"]})], ignore_index=True)
+    return pd.DataFrame({
+        "Country Code": df["code"], "Short Name": df["name"], "Table Name": df["name"],
+        "Long Name": "República de " + df["name"], "2-alpha code": df["code"].str[:2],
+        "Currency Unit": "Synthetic dollar", "Region": "Synthetic Region",
+        "Income Group": "Upper middle income",
+    })
+
+
+def edgar(c: pd.DataFrame, rng) -> pd.DataFrame:
+    aggregates = pd.DataFrame({"code": sorted(sector_country.AGGREGATES),
+                               "name": sorted(sector_country.AGGREGATES)})
+    df = product(pd.concat([cover(c, "edgar", rng), aggregates], ignore_index=True),
+                 Sector=SECTORS)
+    df = df.sort_values(["Sector", "code"], kind="stable").reset_index(drop=True)
+    base = lognormal(len(df), 2.0, 2.0, 5e4, rng)
+    growth = rng.normal(0.01, 0.02, len(df))
+    t = np.arange(len(EDGAR_YEARS))
+    values = base[:, None] * np.exp(growth[:, None] * (t - t[-1]))
+    values[rng.random(values.shape) < 0.02] = np.nan
+    out = pd.DataFrame({"Substance": "CO2", "Sector": df["Sector"],
+                        "EDGAR Country Code": df["code"], "Country": df["name"]})
+    return pd.concat([out, pd.DataFrame(values, columns=list(EDGAR_YEARS))], axis=1)
+
+
+def power_generation(c: pd.DataFrame, rng) -> pd.DataFrame:
+    df = product(cover(c, "ember", rng), Year=EMBER_YEARS,
+                 Variable=list(country_power_source.var_to_power))
+    gen = lognormal(len(df), 5.0, 2.0, 1e6, rng)
+    factor = df["Variable"].isin(["Coal", "Gas", "Other Fossil"]) * rng.uniform(0.4, 1.0, len(df))
+    out = []
+    for category, value in (("Electricity generation", holes(gen, 0.05, rng)),
+                            ("Power sector emissions", holes(gen * factor, 0.05, rng))):
+        out.append(pd.DataFrame({"Area": df["name"], "Year": df["Year"], "Category": category,
+                                 "Variable": df["Variable"], "Value": np.round(value, 2)}))
+    return pd.concat(out, ignore_index=True).sort_values(["Area", "Year"], kind="stable")
+
+
+def environmental_csv(c: pd.DataFrame, rng) -> pd.DataFrame:
+    df = product(cover(c, "env", rng), Year=YEARS)
+    co2 = holes(lognormal(len(df), 20.0, 2.0, 9e4, rng), 0.03, rng)
+    eluc = holes(rng.normal(0, 5, len(df)), 0.1, rng)
+    return pd.DataFrame({"Country": df["name"], "Year": df["Year"],
+                         "CO2 Emission": decimal_comma(co2, 9),
+                         "ELUC": decimal_comma(eluc, 5)}).sort_values(["Year", "Country"])
+
+
+def hdi(c: pd.DataFrame, rng) -> pd.DataFrame:
+    c = cover(c, "hdi", rng)
+    df = product(c, Year=HDI_YEARS)
+    t = df["Year"].to_numpy() - HDI_YEARS[0]
+    level = rng.uniform(0.25, 0.9, len(c))[np.arange(len(df)) // len(HDI_YEARS)]
+    return pd.DataFrame({
+        "Entity": df["name"], "Code": df["code"], "Year": df["Year"],
+        "Human Development Index": holes(np.round(np.minimum(level + 0.003 * t, 0.99), 3),
+                                         0.05, rng),
+        "GDP per capita, PPP (constant 2021 international $)":
+            holes(np.round(lognormal(len(df), 12000, 1.0, 2e5, rng), 2), 0.2, rng),
+        "Population (historical)": np.round(lognormal(len(df), 5e6, 1.5, 2e9, rng)).astype(np.int64),
+        "World regions according to OWID": "",
+    })
+
+
+def gmpi_rows(c: pd.DataFrame, rng) -> pd.DataFrame:
+    """Países × pesquisas (uma ou duas por país), com ano e letra da pesquisa."""
+    c = cover(c, "gmpi", rng)
+    df = c.loc[c.index.repeat(rng.integers(1, 3, len(c)))].reset_index(drop=True)
+    start = rng.integers(2005, 2022, len(df))
+    survey = np.where(rng.random(len(df)) < 0.5, "D", "M")
+    df["survey"] = [f"{y}/{y + 1} {s}" if y % 2 else f"{y} {s}" for y, s in zip(start, survey)]
+    return df
+
+
+def pct(n: int, rng, missing: float = 0.05) -> pd.Series:
+    """Percentuais como no gMPI ("24,1"), com ".." onde falta o dado."""
+    txt = decimal_comma(rng.uniform(0, 80, n), 1)
+    return txt.where(rng.random(n) >= missing, "..")
+
+
+def write_gmpi(path: Path, title: str, header: list[str], rows: list[list]) -> None:
+    """Quatro linhas de preâmbulo + cabeçalho + linha de unidades + dados."""
+    width = len(header)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow([title] + [""] * (width - 1))
+        for _ in range(3):
+            w.writerow([""] * width)
+        w.writerow(header)
+        w.writerow([""] + ["(%)"] * (width - 1))
+        w.writerow(["Estimates based on surveys for 2018-2023"] + [""] * (width - 1))
+        w.writerows(rows)
+
+
+def gmpi_table1(path: Path, c: pd.DataFrame, rng) -> int:
+    df = gmpi_rows(c, rng)
+    header = ["Country", "Year and survey", "b", "", "Value", "", "(thousands)", "",
+              "Intensity of deprivation", "", "Health", "", "Education", "",
+              "Standard of living", ""]
+    n = len(df)
+    cols = [df["name"], df["survey"], "", "", decimal_comma(rng.uniform(0, 0.6, n), 3), "",
+            pd.Series(rng.integers(1, 90_000, n)).map("{:,}".format).str.replace(",", "."), "",
+            pct(n, rng), "", pct(n, rng), "", pct(n, rng), "", pct(n, rng), ""]
+    cols = [col if isinstance(col, pd.Series) else pd.Series([col] * n) for col in cols]
+    write_gmpi(path, "Table 1: Multidimensional Poverty Index: developing countries",
+               header, pd.concat(cols, axis=1).values.tolist())
+    return n
+
+
+def gmpi_table2(path: Path, c: pd.DataFrame, rng) -> int:
+    df = gmpi_rows(c, rng)
+    header = ["Country", "", "Year and survey", "b", "Value", "", "(%)", "",
+              "Nutrition ", "", "Cooking fuel ", "", "Sanitation ", "", "Drinking water", "",
+              "Electricity ", "", "Housing ", ""]
+    n = len(df)
+    cols = [df["name"], "", df["survey"], "", decimal_comma(rng.uniform(0, 0.6, n), 3), "",
+            pct(n, rng), "", pct(n, rng), "", pct(n, rng), "", pct(n, rng), "",
+            pct(n, rng), "", pct(n, rng), "", pct(n, rng), ""]
+    cols = [col if isinstance(col, pd.Series) else pd.Series([col] * n) for col in cols]
+    write_gmpi(path, "Table 2: Multidimensional Poverty Index: changes over time "
+                     "based on harmonized estimates",
+               header, pd.concat(cols, axis=1).values.tolist())
+    return n
+
+
+def gdp(c: pd.DataFrame, rng) -> pd.DataFrame:
+    df = product(cover(c, "gdp", rng), year=GDP_YEARS)
+    n = len(df)
+    invest = np.round(lognormal(n, 2e8, 1.5, 4e10, rng), -4)
+    invest[rng.random(n) < 0.85] = np.nan
+    return pd.DataFrame({
+        "country_name": df["name"], "country_code": df["code"], "year": df["year"],
+        "gdp": np.round(lognormal(n, 12000, 1.0, 1.8e5, rng), 4),
+        "investment_energy": invest,
+        "health_expenditure": holes(np.round(rng.uniform(1, 25, n), 8), 0.45, rng),
+    })
+
+
+def power_consumid(c: pd.DataFrame, rng) -> pd.DataFrame:
+    # duas linhas por país/ano, como no arquivo real (o loader fica com a primeira)
+    df = product(cover(c, "pwr", rng), Year=EMBER_YEARS, dup=(0, 1))
+    n = len(df)
+    return pd.DataFrame({
+        "Year": df["Year"], "Country": df["name"],
+        "Energy imports, net (% of energy use)":
+            holes(np.round(rng.uniform(-300, 100, n), 2), 0.6, rng),
+        "Renewable energy consumption (% of total final energy consumption)":
+            holes(np.round(rng.uniform(0, 100, n), 1), 0.3, rng),
+        "GWH": holes(np.round(lognormal(n, 4.0, 2.0, 1e6, rng), 2), 0.15, rng),
+    }).sort_values(["Year", "Country"], kind="stable")
+
+
+# ───────────────────────────────────────────────────────────────
+# Geração
+# ───────────────────────────────────────────────────────────────
+def generate(out: Path, scale: float = 1.0, seed: int = 42) -> dict[str, int]:
+    """Escreve todos os arquivos em `out`; devolve {arquivo: nº de linhas}."""
+    out.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    n = max(1, round(BASE_COUNTRIES * scale))
+    c = pd.DataFrame({"code": country_codes(n), "name": country_names(n)})
+    rows = {}
+
+    def save_csv(path: Path, df: pd.DataFrame) -> None:
+        df.to_csv(out / path.name, index=False)
+        rows[path.name] = len(df)
+
+    save_csv(DATASETS / "WDICountry.csv", wdi_country(c))
+    df = edgar(c, rng)
+    with pd.ExcelWriter(out / sector_country.DATAFILE.name, engine=XLSX_ENGINE) as xw:
+        df.to_excel(xw, sheet_name=sector_country.SHEET, index=False)
+    rows[sector_country.DATAFILE.name] = len(df)
+    save_csv(country_power_source.CSV_PATH, power_generation(c, rng))
+    save_csv(environmental.PATH_ENV, environmental_csv(c, rng))
+    save_csv(development.PATH_IDH, hdi(c, rng))
+    rows[development.PATH_GMPI_T1.name] = gmpi_table1(out / development.PATH_GMPI_T1.name, c, rng)
+    rows[development.PATH_GMPI_T2.name] = gmpi_table2(out / development.PATH_GMPI_T2.name, c, rng)
+    save_csv(investment.PATH_GDP, gdp(c, rng))
+    save_csv(power_consumed.PATH_PWR, power_consumid(c, rng))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera Datasets sintéticos para os loaders.")
+    parser.add_argument("--out", type=Path, required=True, help="pasta de saída")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help=f"multiplica o nº de países (base: {BASE_COUNTRIES})")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rows = generate(args.out, args.scale, args.seed)
+    for name, n in rows.items():
+        print(f"   {name:<55}{n:>12,} linhas")
+    print(f"✅  {sum(rows.values()):,} linhas geradas em {args.out} "
+          f"({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Gravação assíncrona com asyncpg
+-------------------------------
+Backend opcional de `LoadContext.write` (populate_db.py --backend asyncpg)
+para as tabelas de indicadores, que não dependem umas das outras:
+Environmental Indicator, Development, Investment, Power Consumed e
+Demography (ASYNC_TABLES). As demais continuam no caminho síncrono.
+
+Um event loop roda numa thread própria com um pool pequeno de conexões
+asyncpg. `ctx.write` converte o DataFrame em registros na thread do loader
+(trabalho de CPU) e entrega a gravação ao loop, que devolve um Future: a
+thread do loader fica livre para ler e limpar a próxima tabela enquanto o
+COPY da anterior ainda corre, e as gravações de tabelas diferentes rodam ao
+mesmo tempo, cada uma numa conexão do pool.
+
+Cada gravação usa o mesmo SQL do caminho síncrono (bulk_load.py), numa única
+transação:
+  • modo completo: `copy_records_to_table` para a staging temporária e o
+    merge INSERT ... ON CONFLICT com COALESCE (BULK_LOAD_METHOD=rows usa
+    `executemany` com o INSERT linha a linha);
+  • modo incremental: o mesmo DELETE + INSERT da diferença de sync_frame;
+  • versão da tabela e hash da saída no manifesto.
+
+O pool asyncpg segue a configuração de db.py: application_name
+`<prefixo>/async-writer`, DB_STATEMENT_TIMEOUT e, no modo PgBouncer, sem
+cache de prepared statements. O tempo das gravações entra nas métricas do
+pool (db.metrics()).
+
+Dependência opcional: pip install asyncpg
+"""
+
+from __future__ import annotations
+import asyncio, os, re, threading, time
+from concurrent.futures import Future
+from dataclasses import asdict
+from typing import Callable
+import pandas as pd
+
+import db, instrument, manifest
+from bulk_load import keep_name, merge_sql, staging_name, staging_sql, sync_sql, values_sql
+
+try:
+    import asyncpg
+except ImportError:  # dependência opcional (só para --backend asyncpg)
+    asyncpg = None
+
+BACKENDS = ("sync", "asyncpg")
+ASYNC_TABLES = ("Environmental Indicator", "Development", "Investment",
+                "Power Consumed", "Demography")
+
+
+def available() -> bool:
+    return asyncpg is not None
+
+
+def dsn(url) -> str:
+    """URL do SQLAlchemy (postgresql+psycopg2://...) no formato do asyncpg."""
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def pool_options(cfg: db.PoolConfig) -> dict:
+    """Mesmas opções de sessão do engine (db.py) para o pool asyncpg."""
+    settings = {"application_name": f"{cfg.app_name}/async-writer"[:63]}
+    if cfg.pgbouncer:
+        # transaction pooling: sem cache de prepared statements nem SET de sessão
+        return {"server_settings": settings, "statement_cache_size": 0}
+    if cfg.statement_timeout_ms:
+        settings["statement_timeout"] = str(cfg.statement_timeout_ms)
+    return {"server_settings": settings}
+
+
+def _positional(sql: str) -> str:
+    """Troca os parâmetros :nome do SQL do manifesto por $1, $2, ... na ordem."""
+    names: list[str] = []
+    def repl(m: re.Match) -> str:
+        if m.group(1) not in names:
+            names.append(m.group(1))
+        return f"${names.index(m.group(1)) + 1}"
+    return re.sub(r"(?<!:):(\w+)", repl, sql)
+
+RECORD_SQL = _positional(manifest.RECORD_SQL)
+BUMP_SQL = _positional(manifest.BUMP_SQL)
+ENTRY_SQL = ('SELECT "Content_Hash" FROM public.load_manifest '
+             'WHERE "Loader" = $1 AND "Source" = $2')
+
+
+def frame_records(df: pd.DataFrame) -> list[tuple]:
+    """Linhas de `df` como tuplas de tipos Python (NaN/NA → None)."""
+    obj = df.astype(object)
+    return list(obj.where(df.notna(), None).itertuples(index=False, name=None))
+
+
+# ───────────────────────────────────────────────────────────────
+# Gravador
+# ───────────────────────────────────────────────────────────────
+class AsyncWriter:
+    """Event loop + pool asyncpg numa thread; `submit` devolve um Future."""
+
+    def __init__(self, dsn: str, pool_size: int = 4):
+        if asyncpg is None:
+            raise RuntimeError("💥  asyncpg não está instalado (pip install asyncpg)")
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name="async-writer", daemon=True)
+        self._thread.start()
+        self.pool = self._call(asyncpg.create_pool(dsn, min_size=1, max_size=pool_size,
+                                                   **pool_options(db.config())))
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def submit(self, stage: str, df: pd.DataFrame, table: str, keys: list[str],
+               digest: str, incremental: bool = False,
+               keep: pd.DataFrame | None = None) -> Future:
+        """
+        Agenda a gravação de `df` em `table`; o Future devolve as linhas
+        gravadas. No modo incremental as chaves de `keep` não são apagadas.
+        """
+        records = frame_records(df)
+        kept = frame_records(keep[keys]) if keep is not None and len(keep) else []
+        return asyncio.run_coroutine_threadsafe(
+            self._write(stage, records, list(df.columns), table, keys, digest, incremental,
+                        kept),
+            self.loop)
+
+    def then(self, futures: list[Future], callback: Callable[[], object]) -> Future:
+        """
+        Future que termina quando todos os `futures` terminarem, com o
+        resultado de `callback()` (rodado fora do loop, pode bloquear).
+        """
+        async def wait_all():
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+            return await self.loop.run_in_executor(None, callback)
+        return asyncio.run_coroutine_threadsafe(wait_all(), self.loop)
+
+    def close(self) -> None:
+        self._call(self.pool.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    async def _write(self, stage: str, records: list[tuple], columns: list[str],
+                     table: str, keys: list[str], digest: str, incremental: bool,
+                     kept: list[tuple]) -> int:
+        t0, trips = time.perf_counter(), 0
+        source = f"table:{table}"
+        async with self.pool.acquire() as conn, conn.transaction():
+            if incremental:
+                trips += 1
+                if await conn.fetchval(ENTRY_SQL, stage, source) == digest:
+                    print(f"⏭  '{table}': saída inalterada, nada a gravar")
+                    return 0
+                if not records:     # como em sync_frame: o DELETE esvaziaria a tabela
+                    print(f"⚠️  '{table}': lote vazio, nada gravado nem apagado (confira a fonte)")
+                    return 0
+                delete, insert = sync_sql(table, columns, keys, bool(kept))
+                await conn.execute(staging_sql(table, columns))
+                await conn.copy_records_to_table(staging_name(table), records=records,
+                                                 columns=columns)
+                if kept:
+                    await conn.execute(staging_sql(table, keys, keep_name(table)))
+                    await conn.copy_records_to_table(keep_name(table), records=kept,
+                                                     columns=keys)
+                    trips += 2
+                deleted = int((await conn.execute(delete)).split()[-1])
+                inserted = [r["inserted"] for r in await conn.fetch(insert)]
+                written = len(inserted) + deleted
+                trips += 4
+                detail = f"+{sum(inserted)} ~{len(inserted) - sum(inserted)} -{deleted}"
+                method = "sync"
+            elif os.getenv("BULK_LOAD_METHOD", "copy").lower() == "rows":
+                params = [f"${i}" for i in range(1, len(columns) + 1)]
+                await conn.executemany(values_sql(table, columns, keys, params), records)
+                written, detail, method = len(records), f"{len(records)} linhas", "rows"
+                trips += 1
+            else:
+                await conn.execute(staging_sql(table, columns))
+                await conn.copy_records_to_table(staging_name(table), records=records,
+                                                 columns=columns)
+                await conn.execute(merge_sql(table, columns, keys))
+                written, detail, method = len(records), f"{len(records)} linhas", "copy"
+                trips += 3
+            await conn.execute(BUMP_SQL, table)
+            if stage:
+                await conn.execute(RECORD_SQL, stage, source, "output", digest, len(records))
+            trips += 2
+
+        elapsed = time.perf_counter() - t0
+        db.record_query(elapsed, trips)
+        print(f"⏱  '{table}': {detail} em {elapsed:.3f}s ({method}, asyncpg)", flush=True)
+        # a fase write da etapa é medida aqui, no loop (ctx.write só agenda)
+        instrument.emit(asdict(instrument.Phase(
+            stage or "standalone", "write", len(records), written, elapsed, 0.0,
+            *instrument.memory_mb(), trips, time.time() - elapsed)))
+        return written
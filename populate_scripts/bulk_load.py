@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Carga em lote via COPY + merge set-based
+----------------------------------------
+Substitui os loops `INSERT ... ON CONFLICT` linha a linha dos scripts de
+indicadores. O DataFrame final é enviado por `COPY` para uma tabela de
+staging temporária e mesclado no destino com um único
+`INSERT ... SELECT ... ON CONFLICT DO UPDATE`, mantendo a semântica COALESCE
+(valor nulo no arquivo não apaga valor já existente no banco).
+
+As colunas do DataFrame devem ter os mesmos nomes das colunas da tabela.
+
+`sync_frame` é a variante incremental: além do merge, grava apenas as linhas
+que realmente mudaram e remove do destino as chaves que sumiram da fonte
+(menos as que a validação barrou, ver quality.check).
+
+`swap_partitions` é a recarga de tabelas particionadas por ano (partitions.py):
+cada partição tocada pelo DataFrame é montada ao lado e trocada por
+DETACH/ATTACH, sem upsert linha a linha.
+
+Variável de ambiente:
+    BULK_LOAD_METHOD = copy (padrão) | rows
+        "rows" mantém o caminho antigo (um INSERT por linha), útil apenas
+        para o relatório de tempos em benchmarks/bench_bulk_load.py.
+"""
+
+from __future__ import annotations
+import io, os, re, time
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+import db, instrument, partitions
+
+COPY_CHUNK_ROWS = 50_000
+
+
+# ───────────────────────────────────────────────────────────────
+# Helpers
+# ───────────────────────────────────────────────────────────────
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _py(v):
+    """Converte tipos numpy/NA para tipos Python/None."""
+    if v is None or v is pd.NA or (not isinstance(v, str) and pd.isna(v)):
+        return None
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+def _set_clause(table: str, values: list[str]) -> str:
+    t = quote_ident(table)
+    return ", ".join(
+        f"{quote_ident(c)} = COALESCE(EXCLUDED.{quote_ident(c)}, {t}.{quote_ident(c)})"
+        for c in values
+    )
+
+def _conflict_clause(table: str, keys: list[str], values: list[str]) -> str:
+    target = ", ".join(quote_ident(k) for k in keys)
+    if not values:
+        return f"ON CONFLICT ({target}) DO NOTHING"
+    return f"ON CONFLICT ({target}) DO UPDATE SET {_set_clause(table, values)}"
+
+
+# ───────────────────────────────────────────────────────────────
+# COPY → staging → merge
+# ───────────────────────────────────────────────────────────────
+def copy_frame(conn, df: pd.DataFrame, table: str) -> None:
+    """Envia `df` por COPY (CSV) para `table`, em blocos de COPY_CHUNK_ROWS."""
+    col_list = ", ".join(quote_ident(c) for c in df.columns)
+    copy_sql = f"COPY {table} ({col_list}) FROM STDIN WITH (FORMAT csv)"
+    with conn.connection.cursor() as cur:
+        for start in range(0, len(df), COPY_CHUNK_ROWS):
+            buf = io.StringIO()
+            df.iloc[start:start + COPY_CHUNK_ROWS].to_csv(
+                buf, index=False, header=False, na_rep=""
+            )
+            buf.seek(0)
+            instrument.round_trip()
+            t0 = time.perf_counter()
+            if hasattr(cur, "copy_expert"):    # psycopg2
+                cur.copy_expert(copy_sql, buf)
+            else:                              # psycopg 3
+                with cur.copy(copy_sql) as cp:
+                    cp.write(buf.getvalue())
+            db.record_query(time.perf_counter() - t0)
+
+def staging_name(table: str, prefix: str = "_stg_") -> str:
+    return prefix + re.sub(r"\W+", "_", table).lower()
+
+def keep_name(table: str) -> str:
+    """Staging das chaves que o sync não apaga (linhas em quarentena)."""
+    return staging_name(table, "_keep_")
+
+def staging_sql(table: str, columns: list[str], name: str | None = None) -> str:
+    """CREATE da staging temporária `name` (padrão: a de `table`) com as colunas dadas."""
+    cols = ", ".join(quote_ident(c) for c in columns)
+    return (f"CREATE TEMP TABLE {name or staging_name(table)} ON COMMIT DROP AS "
+            f"SELECT {cols} FROM public.{quote_ident(table)} WITH NO DATA")
+
+def merge_sql(table: str, columns: list[str], keys: list[str]) -> str:
+    """INSERT ... SELECT da staging para o destino, com a semântica COALESCE."""
+    cols = ", ".join(quote_ident(c) for c in columns)
+    key_list = ", ".join(quote_ident(k) for k in keys)
+    values = [c for c in columns if c not in keys]
+    # DISTINCT ON protege o ON CONFLICT contra chaves repetidas no lote
+    return f"""
+        INSERT INTO public.{quote_ident(table)} ({cols})
+        SELECT DISTINCT ON ({key_list}) {cols}
+        FROM {staging_name(table)}
+        ORDER BY {key_list}
+        {_conflict_clause(table, keys, values)}
+    """
+
+def sync_sql(table: str, columns: list[str], keys: list[str],
+             keep: bool = False) -> tuple[str, str]:
+    """
+    (DELETE das chaves que sumiram, INSERT das linhas novas ou alteradas)
+    da staging para o destino; o INSERT devolve `inserted` por linha gravada.
+    Com `keep`, o DELETE poupa as chaves da staging keep_name(table).
+    """
+    values = [c for c in columns if c not in keys]
+    t, stg = f"public.{quote_ident(table)}", staging_name(table)
+    cols = ", ".join(quote_ident(c) for c in columns)
+    join_on = " AND ".join(f"s.{quote_ident(k)} = t.{quote_ident(k)}" for k in keys)
+    changed = " OR ".join(
+        f"(s.{quote_ident(c)} IS NOT NULL AND s.{quote_ident(c)} IS DISTINCT FROM t.{quote_ident(c)})"
+        for c in values
+    ) or "FALSE"
+    spare = ""
+    if keep:
+        keep_on = " AND ".join(f"k.{quote_ident(k)} = t.{quote_ident(k)}" for k in keys)
+        spare = f"\n          AND NOT EXISTS (SELECT 1 FROM {keep_name(table)} k WHERE {keep_on})"
+    delete = f"""
+        DELETE FROM {t} t
+        WHERE NOT EXISTS (SELECT 1 FROM {stg} s WHERE {join_on}){spare}
+    """
+    insert = f"""
+        INSERT INTO {t} ({cols})
+        SELECT DISTINCT ON ({", ".join(f"s.{quote_ident(k)}" for k in keys)})
+               {", ".join(f"s.{quote_ident(c)}" for c in columns)}
+        FROM {stg} s
+        LEFT JOIN {t} t ON {join_on}
+        WHERE t.{quote_ident(keys[0])} IS NULL OR {changed}
+        ORDER BY {", ".join(f"s.{quote_ident(k)}" for k in keys)}
+        {_conflict_clause(table, keys, values)}
+        RETURNING (xmax = 0) AS inserted
+    """
+    return delete, insert
+
+def _stage(conn, df: pd.DataFrame, table: str, name: str | None = None) -> str:
+    """Cria a staging temporária com as colunas de `df` e a preenche por COPY."""
+    stg = name or staging_name(table)
+    conn.execute(text(f"DROP TABLE IF EXISTS {stg}"))
+    conn.execute(text(staging_sql(table, list(df.columns), stg)))
+    copy_frame(conn, df, stg)
+    return stg
+
+def _upsert_copy(conn, df: pd.DataFrame, table: str, keys: list[str]) -> None:
+    _stage(conn, df, table)
+    conn.execute(text(merge_sql(table, list(df.columns), keys)))
+
+def values_sql(table: str, columns: list[str], keys: list[str], placeholders: list[str]) -> str:
+    """INSERT ... VALUES de uma linha com ON CONFLICT (placeholders do driver)."""
+    values = [c for c in columns if c not in keys]
+    return f"""
+        INSERT INTO public.{quote_ident(table)} ({", ".join(quote_ident(c) for c in columns)})
+        VALUES ({", ".join(placeholders)})
+        {_conflict_clause(table, keys, values)}
+    """
+
+def _upsert_rows(conn, df: pd.DataFrame, table: str, keys: list[str]) -> None:
+    """Caminho antigo: um INSERT ... ON CONFLICT por linha (só para comparação)."""
+    params = [re.sub(r"\W+", "_", c).lower() for c in df.columns]
+    stmt = text(values_sql(table, list(df.columns), keys, [f":{p}" for p in params]))
+    for row in df.itertuples(index=False, name=None):
+        conn.execute(stmt, {p: _py(v) for p, v in zip(params, row)})
+
+def upsert_frame(conn, df: pd.DataFrame, table: str, keys: list[str],
+                 method: str | None = None) -> int:
+    """
+    UPSERT de `df` em public.`table` usando `keys` como alvo do ON CONFLICT.
+    As demais colunas são mescladas com COALESCE(EXCLUDED.col, atual.col).
+    Deve ser chamado dentro de uma transação (`engine.begin()`).
+    """
+    method = (method or os.getenv("BULK_LOAD_METHOD", "copy")).lower()
+
+    t0 = time.perf_counter()
+    if not df.empty:
+        if method == "rows":
+            _upsert_rows(conn, df, table, keys)
+        else:
+            _upsert_copy(conn, df, table, keys)
+    elapsed = time.perf_counter() - t0
+
+    print(f"⏱  '{table}': {len(df)} linhas em {elapsed:.3f}s ({method})")
+    return len(df)
+
+
+def sync_frame(conn, df: pd.DataFrame, table: str, keys: list[str],
+               keep: pd.DataFrame | None = None) -> dict[str, int]:
+    """
+    Sincroniza public.`table` com `df` gravando só a diferença:
+      • insere chaves novas;
+      • atualiza linhas em que algum valor não nulo da fonte difere do banco
+        (valores nulos continuam preservando o existente, como no upsert);
+      • apaga chaves que não estão mais na fonte, menos as de `keep` (colunas
+        `keys`; as linhas que a validação barrou).
+    Um `df` vazio não grava nada: sem linhas, o DELETE esvaziaria a tabela,
+    e uma fonte vazia é quase sempre arquivo truncado ou países não resolvidos.
+    Devolve {"inserted": n, "updated": n, "deleted": n}.
+    """
+    if df.empty:
+        print(f"⚠️  '{table}': lote vazio, nada gravado nem apagado (confira a fonte)")
+        return {"inserted": 0, "updated": 0, "deleted": 0}
+    keep = keep if keep is not None and len(keep) else None
+    delete, insert = sync_sql(table, list(df.columns), keys, keep is not None)
+
+    t0 = time.perf_counter()
+    _stage(conn, df, table)
+    if keep is not None:
+        _stage(conn, keep[keys], table, keep_name(table))
+    deleted = conn.execute(text(delete)).rowcount
+    written = conn.execute(text(insert)).scalars().all()
+
+    stats = {"inserted": sum(written), "updated": len(written) - sum(written),
+             "deleted": deleted}
+    print(f"⏱  '{table}': +{stats['inserted']} ~{stats['updated']} -{stats['deleted']} "
+          f"em {time.perf_counter() - t0:.3f}s (sync)")
+    return stats
+
+
+def swap_partitions(conn, df: pd.DataFrame, table: str, keys: list[str]) -> int:
+    """
+    Recarrega public.`table` (particionada por "Year") trocando partições:
+    para cada partição que contém anos de `df`, cria uma tabela nova com as
+    linhas de `df` daquele intervalo, faz DETACH da antiga e ATTACH da nova.
+    A partição passa a ter exatamente as linhas de `df` (sem o COALESCE do
+    upsert): é a recarga completa daqueles anos.
+    """
+    t = f"public.{quote_ident(table)}"
+    cols = ", ".join(quote_ident(c) for c in df.columns)
+    key_list = ", ".join(quote_ident(k) for k in keys)
+
+    t0 = time.perf_counter()
+    stg = _stage(conn, df, table)
+    covering = partitions.ensure(conn, table, df["Year"].unique())
+    for name, lo, hi in covering:
+        part, new = quote_ident(name), quote_ident(name + "__swap")
+        # o CHECK igual ao intervalo evita que o ATTACH varra a tabela nova
+        conn.execute(text(f"""
+            CREATE TABLE public.{new} (LIKE {t} INCLUDING DEFAULTS,
+                CONSTRAINT "ck_swap_year" CHECK ("Year" >= {lo} AND "Year" < {hi}))
+        """))
+        conn.execute(text(f"""
+            INSERT INTO public.{new} ({cols})
+            SELECT DISTINCT ON ({key_list}) {cols}
+            FROM {stg}
+            WHERE "Year" >= {lo} AND "Year" < {hi}
+            ORDER BY {key_list}
+        """))
+        conn.execute(text(f"ALTER TABLE {t} DETACH PARTITION public.{part}"))
+        conn.execute(text(f"DROP TABLE public.{part}"))
+        conn.execute(text(f"ALTER TABLE public.{new} RENAME TO {part}"))
+        conn.execute(text(f"ALTER TABLE {t} ATTACH PARTITION public.{part} "
+                          f"FOR VALUES FROM ({lo}) TO ({hi})"))
+        conn.execute(text(f'ALTER TABLE public.{part} DROP CONSTRAINT "ck_swap_year"'))
+
+    print(f"⏱  '{table}': {len(df)} linhas em {len(covering)} partição(ões) trocada(s) "
+          f"em {time.perf_counter() - t0:.3f}s (swap)")
+    return len(df)
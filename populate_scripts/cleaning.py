@@ -0,0 +1,110 @@
+"""
+Limpeza vetorizada das colunas das fontes
+-----------------------------------------
+Versões por coluna (Series → Series) dos antigos helpers por célula
+(`clean_country`, `parse_number`, `parse_float`, `scale10_to_int`,
+`extract_year`, `py_int`), usando o acessor `.str`, `pd.to_numeric` e
+inteiros anuláveis em vez de `Series.apply`.
+
+Os resultados são idênticos aos dos helpers antigos: a conferência (saída
+golden) está em tests/test_cleaning.py e o microbenchmark em
+benchmarks/bench_cleaning.py.
+"""
+
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+NUMBER_RE = r'([-+]?\d+(?:[.,]\d+)?)'
+YEAR_RE   = r'((?:19|20)\d{2})'
+
+
+def _as_str(s: pd.Series) -> pd.Series:
+    """
+    str(val) por célula, mantendo os nulos. O resultado fica em dtype object
+    para que `.str` use o `re` do Python (espaços e dígitos Unicode, como nos
+    helpers antigos) e não o RE2 das strings Arrow, que só conhece ASCII.
+    """
+    return s.astype(str).where(s.notna()).astype(object)
+
+
+def clean_country(s: pd.Series) -> pd.Series:
+    """Espaços colapsados + strip + casefold; nulo vira ''."""
+    out = (
+        _as_str(s)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip(' ')
+        .str.casefold()
+    )
+    return out.fillna('').astype(object)
+
+
+def normalize_ascii(s: pd.Series) -> pd.Series:
+    """NFKD → ASCII → maiúsculas → strip; nulo vira ''."""
+    out = (
+        _as_str(s)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.upper()
+        .str.strip()
+    )
+    return out.fillna('').astype(object)
+
+
+def country_key(s: pd.Series) -> pd.Series:
+    """
+    Chave de nome de país usada por countries.py: ASCII, minúsculas, '&' como
+    'and', sem apóstrofos, pontuação nem a palavra 'the'
+    ("Gambia, The", "The Gambia" e "Gambia (the)" → "gambia"); nulo vira ''.
+    """
+    out = (
+        normalize_ascii(s.astype(object).where(s.notna()))
+        .str.casefold()
+        .str.replace('&', ' and ', regex=False)
+        .str.replace(r"['`]", '', regex=True)
+        .str.replace(r'[^0-9a-z]+', ' ', regex=True)
+        .str.replace(r'\bthe\b', ' ', regex=True)
+        .str.split()
+        .str.join(' ')
+    )
+    return out.fillna('').astype(object)
+
+
+def parse_number(s: pd.Series) -> pd.Series:
+    """Primeiro número (com . ou ,) de cada célula, como float; senão NaN."""
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        # colunas já numéricas: só valores em notação científica ou infinitos
+        # ("1e-05" → 1.0) precisam do caminho por texto para ficarem iguais
+        x = s.astype(float)
+        a = x.abs()
+        odd = ~np.isfinite(x) | ((a != 0) & (a < 1e-4)) | (a >= 1e16)
+        odd &= x.notna()
+        if odd.any():
+            x = x.copy()
+            x[odd] = parse_number(s[odd].astype(object))
+        return x
+    txt = _as_str(s).str.replace(',', '.', regex=False)
+    return pd.to_numeric(txt.str.extract(NUMBER_RE, expand=False), errors="coerce").astype(float)
+
+
+def parse_float(s: pd.Series) -> pd.Series:
+    """float(val) por célula; o que não converte vira NaN."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    return pd.to_numeric(_as_str(s).str.strip(), errors="coerce").astype(float)
+
+
+def scale10_to_int(s: pd.Series) -> pd.Series:
+    """round(x * 10) como Int64 (arredondamento bancário, igual ao round())."""
+    return pd.Series(np.round(s.astype(float) * 10), index=s.index).astype("Int64")
+
+
+def extract_year(s: pd.Series) -> pd.Series:
+    """Primeiro ano 19xx/20xx do texto (int; float com NaN se faltar algum)."""
+    return pd.to_numeric(_as_str(s).str.extract(YEAR_RE, expand=False))
+
+
+def to_int(s: pd.Series) -> pd.Series:
+    """int(val) por célula, com nulos preservados (Int64)."""
+    return pd.to_numeric(s).astype("Int64")
@@ -0,0 +1,316 @@
+"""
+Resolução de nomes de país
+--------------------------
+Um único componente troca nomes (e códigos) de país das fontes pelo
+ID_Country, para todos os loaders (`ctx.country_ids`). O índice é montado
+uma vez por contexto a partir de public."Country" e public.country_alias, e
+cada nome distinto da fonte é resolvido por busca em dicionário, na ordem:
+
+  1. código ISO3, quando a fonte traz (OWID `Code`, `country_code`, EDGAR);
+  2. chave do nome (cleaning.country_key: ASCII, minúsculas, sem pontuação);
+  3. alias (seed de Modelos/country_aliases.csv ou manual).
+
+Para o que sobrou, a semelhança por trigramas (como o pg_trgm) contra nomes e
+aliases só sugere um país: o candidato com semelhança ≥ FUZZY_MIN e sem
+empate fica como sugestão do nome em country_unresolved, e as linhas seguem
+sem país até alguém aprovar com `countries.py alias`. Nomes parecidos nem
+sempre são o mesmo agregado ('East Asia and the Pacific (UNDP)' × 'East
+Asia & Pacific'), então a sugestão é descartada quando o país já foi casado
+exatamente por outro nome do mesmo lote ou quando mais de um nome do lote
+aponta para ele.
+
+Um alias manual sem país (`alias "East Germany" none`) marca um nome que não
+deve ser resolvido, nem pelo fuzzy.
+
+Os nomes que nenhuma regra resolve são impressos ao final da etapa e gravados
+em public.country_unresolved (por loader e arquivo, com a sugestão quando
+houver), em vez de sumirem calados no merge.
+
+Uso (a partir da raiz do repositório):
+    python populate_scripts/countries.py resolve "Russia" "Côte d’Ivoire"
+    python populate_scripts/countries.py alias "Türkiye" TUR
+    python populate_scripts/countries.py alias "East Germany" none
+    python populate_scripts/countries.py aliases [--source manual]
+    python populate_scripts/countries.py unresolved [--loader development]
+
+Aliases novos valem a partir da próxima carga: o conteúdo de country_alias
+entra no manifesto das etapas que dependem de `country`, então a carga
+incremental refaz só essas etapas.
+"""
+
+from __future__ import annotations
+import argparse, threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from cleaning import country_key
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+ALIASES_CSV = ROOT / "../Modelos/country_aliases.csv"
+FUZZY_MIN = 0.75      # semelhança mínima por trigramas (0–1)
+MAX_KEY_LEN = 100     # chaves maiores não são nomes de país (notas de rodapé)
+METHODS = ("code", "name", "alias")
+
+
+def trigrams(key: str) -> set[str]:
+    """Trigramas de cada palavra, com dois espaços antes e um depois (pg_trgm)."""
+    out = set()
+    for word in key.split():
+        w = f"  {word} "
+        out.update(w[i:i + 3] for i in range(len(w) - 2))
+    return out
+
+
+@dataclass
+class Resolution:
+    """Resumo de uma chamada a `CountryResolver.resolve`."""
+    rows: int = 0
+    by_method: dict[str, int] = field(default_factory=lambda: dict.fromkeys(METHODS, 0))
+    unresolved: dict[str, int] = field(default_factory=dict)       # nome → linhas
+    suggested: dict[str, tuple[int, float]] = field(default_factory=dict)  # nome → (ID, semelhança)
+
+
+# ───────────────────────────────────────────────────────────────
+# Índice
+# ───────────────────────────────────────────────────────────────
+class CountryResolver:
+    def __init__(self, countries: pd.DataFrame, aliases: pd.DataFrame | None = None):
+        """
+        `countries`: ID_Country, Name, ISO3; `aliases`: Alias (chave) e
+        Country_ID (nulo = não é país).
+        """
+        ids = countries["ID_Country"].astype(int)
+        self.names = dict(zip(ids, countries["Name"]))
+        codes = countries["ISO3"].astype(object).where(countries["ISO3"].notna())
+        self.by_code = {c.strip().upper(): i for c, i in zip(codes, ids) if isinstance(c, str)}
+        self.by_name = dict(zip(country_key(countries["Name"]), ids))
+        self.by_name.pop("", None)
+        self.by_alias: dict[str, int] = {}
+        self._misses: set[str] = set()     # chaves sem candidato fuzzy (cache negativo)
+        self._hits: dict[str, tuple[int, float]] = {}
+        if aliases is not None and len(aliases):
+            known = aliases["Country_ID"].notna()
+            self.by_alias = dict(zip(aliases["Alias"][known], aliases["Country_ID"][known].astype(int)))
+            self._misses.update(aliases["Alias"][~known])
+        self._grams: dict[str, list[str]] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_db(cls, engine) -> "CountryResolver":
+        with engine.connect() as conn:
+            countries = pd.read_sql(
+                text('SELECT "ID_Country", "Name", "ISO3" FROM public."Country"'), conn)
+            aliases = pd.read_sql(
+                text('SELECT "Alias", "Country_ID" FROM public.country_alias'), conn)
+        return cls(countries, aliases)
+
+    def _index(self) -> dict[str, list[str]]:
+        """trigrama → chaves (nomes e aliases) que o contêm; montado no primeiro miss."""
+        if self._grams is None:
+            grams: dict[str, list[str]] = {}
+            for key in {**self.by_name, **self.by_alias}:
+                for g in trigrams(key):
+                    grams.setdefault(g, []).append(key)
+            self._grams = grams
+        return self._grams
+
+    def _lookup(self, key: str) -> int | None:
+        return self.by_name.get(key, self.by_alias.get(key))
+
+    def fuzzy(self, key: str) -> tuple[int, float] | None:
+        """Melhor (ID, semelhança) por trigramas; None se abaixo do limite ou empatado."""
+        if not key or len(key) > MAX_KEY_LEN or key in self._misses:
+            return None
+        if key in self._hits:
+            return self._hits[key]
+        mine = trigrams(key)
+        shared = Counter(k for g in mine for k in self._index().get(g, ()))
+        scored = sorted(((n / (len(mine) + len(trigrams(k)) - n), k) for k, n in shared.items()),
+                        reverse=True)
+        if scored and scored[0][0] >= FUZZY_MIN:
+            best, cand = scored[0]
+            rival = next((s for s, k in scored[1:] if self._lookup(k) != self._lookup(cand)), 0.0)
+            if rival < best:
+                self._hits[key] = self._lookup(cand), best
+                return self._hits[key]
+        self._misses.add(key)
+        return None
+
+    def resolve(self, names: pd.Series,
+                codes: pd.Series | None = None) -> tuple[pd.Series, Resolution]:
+        """
+        ID_Country (Int64, mesmo índice de `names`) de cada linha, e o resumo.
+        Cada par (nome, código) distinto é resolvido uma única vez. O fuzzy
+        não resolve linhas: só preenche `Resolution.suggested`.
+        """
+        frame = pd.DataFrame({"name": names.astype(object),
+                              "code": codes.astype(object) if codes is not None else None},
+                             index=names.index)
+        group = frame.groupby(["name", "code"], dropna=False, sort=False).ngroup().to_numpy()
+        uniq = frame.drop_duplicates().reset_index(drop=True)
+        rows = np.bincount(group, minlength=len(uniq))
+
+        code = uniq["code"].where(uniq["code"].map(lambda c: isinstance(c, str)))
+        keys = country_key(uniq["name"])
+        res = Resolution(rows=len(frame))
+        with self._lock:   # o fuzzy acrescenta aos caches do índice compartilhado
+            ids = code.str.strip().str.upper().map(self.by_code)
+            method = pd.Series(np.where(ids.notna(), "code", None), dtype=object)
+            for label, table in (("name", self.by_name), ("alias", self.by_alias)):
+                miss = ids.isna()
+                ids[miss] = keys[miss].map(table)
+                method[miss & ids.notna()] = label
+
+            hits = {}
+            for i in np.flatnonzero(ids.isna().to_numpy()):
+                name = uniq["name"][i]
+                if pd.notna(name) and str(name).strip():
+                    name = str(name)
+                    res.unresolved[name] = res.unresolved.get(name, 0) + int(rows[i])
+                    hit = self.fuzzy(keys[i])
+                    if hit is not None:
+                        hits[name] = hit
+
+        # sugestão só para país que nenhum outro nome do lote já ocupa
+        claimed = set(ids.dropna().astype(int))
+        targets = Counter(cid for cid, _ in hits.values())
+        res.suggested = {name: hit for name, hit in hits.items()
+                         if hit[0] not in claimed and targets[hit[0]] == 1}
+
+        for label, n in zip(method, rows):
+            if label is not None:
+                res.by_method[label] += int(n)
+        return pd.Series(ids.to_numpy()[group], index=names.index).astype("Int64"), res
+
+
+# ───────────────────────────────────────────────────────────────
+# Persistência
+# ───────────────────────────────────────────────────────────────
+def seed_aliases(conn, resolver: CountryResolver, path: Path = ALIASES_CSV) -> int:
+    """
+    Grava os aliases do CSV (Alias, ISO3) como Source = 'seed'. Aliases
+    manuais com a mesma chave não são sobrescritos. Devolve quantos gravou.
+    """
+    seeds = pd.read_csv(path)
+    seeds["key"] = country_key(seeds["Alias"])
+    seeds["id"] = seeds["ISO3"].str.upper().map(resolver.by_code)
+    seeds = seeds.dropna(subset=["id"])
+    for row in seeds.itertuples(index=False):
+        conn.execute(text("""
+            INSERT INTO public.country_alias ("Alias", "Name", "Country_ID", "Source")
+            VALUES (:a, :n, :c, 'seed')
+            ON CONFLICT ("Alias") DO UPDATE
+            SET "Name" = EXCLUDED."Name", "Country_ID" = EXCLUDED."Country_ID",
+                "Source" = 'seed', "Score" = NULL
+            WHERE public.country_alias."Source" <> 'manual'
+        """), {"a": row.key, "n": row.Alias, "c": int(row.id)})
+    return len(seeds)
+
+
+def record(engine, loader: str, source: str, res: Resolution) -> None:
+    """Substitui os não resolvidos de (loader, source), com as sugestões do fuzzy."""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            DELETE FROM public.country_unresolved WHERE "Loader" = :l AND "Source" = :s
+        """), {"l": loader, "s": source})
+        for name, rows in res.unresolved.items():
+            cid, score = res.suggested.get(name, (None, None))
+            conn.execute(text("""
+                INSERT INTO public.country_unresolved
+                    ("Loader", "Source", "Name", "Rows", "Suggested_ID", "Score")
+                VALUES (:l, :s, :n, :r, :c, :sc)
+            """), {"l": loader, "s": source, "n": name, "r": rows,
+                   "c": None if cid is None else int(cid),
+                   "sc": None if score is None else round(score, 3)})
+
+
+def report(loader: str, source: str, res: Resolution, names: dict[int, str],
+           limit: int = 8) -> None:
+    """Resumo no terminal: nomes sem país e as sugestões do fuzzy."""
+    for name, (cid, score) in res.suggested.items():
+        print(f"🔎  {loader}: '{name}' → '{names.get(cid, cid)}'? (trigramas {score:.2f}; "
+              f"aprove com countries.py alias)")
+    if res.unresolved:
+        worst = sorted(res.unresolved.items(), key=lambda kv: -kv[1])
+        shown = ", ".join(f"{n[:40]} ({r})" for n, r in worst[:limit])
+        more = f" e mais {len(worst) - limit}" if len(worst) > limit else ""
+        print(f"⚠️  {loader}: {len(worst)} nome(s) sem país em {source}, "
+              f"{sum(res.unresolved.values())} linha(s): {shown}{more}")
+
+
+# ───────────────────────────────────────────────────────────────
+# CLI
+# ───────────────────────────────────────────────────────────────
+def main() -> None:
+    from db import get_engine
+    parser = argparse.ArgumentParser(description="Resolução de nomes de país.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_resolve = sub.add_parser("resolve", help="mostra o ID de cada nome")
+    p_resolve.add_argument("names", nargs="+")
+    p_alias = sub.add_parser("alias", help="grava um alias manual")
+    p_alias.add_argument("name")
+    p_alias.add_argument("country", help="ISO3, ID_Country, nome já conhecido ou 'none'")
+    p_list = sub.add_parser("aliases", help="lista os aliases")
+    p_list.add_argument("--source", choices=("seed", "manual"))
+    p_unres = sub.add_parser("unresolved", help="nomes sem país da última carga")
+    p_unres.add_argument("--loader")
+    args = parser.parse_args()
+
+    engine = get_engine(pool_size=1)
+    if args.cmd == "resolve":
+        resolver = CountryResolver.from_db(engine)
+        ids, _ = resolver.resolve(pd.Series(args.names))
+        for name, cid in zip(args.names, ids):
+            print(f"{name:<40} → " + (f"{cid} ({resolver.names[cid]})" if pd.notna(cid) else "—"))
+    elif args.cmd == "alias":
+        resolver = CountryResolver.from_db(engine)
+        target = args.country
+        if target.lower() == "none":
+            cid = None
+        else:
+            cid = (int(target) if target.isdigit() else resolver.by_code.get(target.upper())
+                   or resolver._lookup(country_key(pd.Series([target]))[0]))
+            if cid is None or cid not in resolver.names:
+                raise SystemExit(f"💥  País '{target}' não encontrado")
+        key = country_key(pd.Series([args.name]))[0]
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO public.country_alias ("Alias", "Name", "Country_ID", "Source")
+                VALUES (:a, :n, :c, 'manual')
+                ON CONFLICT ("Alias") DO UPDATE
+                SET "Name" = EXCLUDED."Name", "Country_ID" = EXCLUDED."Country_ID",
+                    "Source" = 'manual', "Score" = NULL, "Created_At" = now()
+            """), {"a": key, "n": args.name, "c": cid})
+        label = f"{cid} ({resolver.names[cid]})" if cid is not None else "nenhum país"
+        print(f"✅ '{args.name}' → {label}; vale a partir da próxima carga (populate_db.py)")
+    elif args.cmd == "aliases":
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT a."Name", COALESCE(c."Name", '—'), a."Source", a."Score"
+                FROM public.country_alias a
+                LEFT JOIN public."Country" c ON c."ID_Country" = a."Country_ID"
+                WHERE CAST(:s AS text) IS NULL OR a."Source" = :s
+                ORDER BY a."Source", a."Name"
+            """), {"s": args.source}).all()
+        for alias, name, source, score in rows:
+            print(f"{alias:<40} → {name:<32} {source}" + (f" ({score})" if score else ""))
+    else:
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT u."Loader", u."Source", u."Name", u."Rows", c."ISO3", c."Name", u."Score"
+                FROM public.country_unresolved u
+                LEFT JOIN public."Country" c ON c."ID_Country" = u."Suggested_ID"
+                WHERE CAST(:l AS text) IS NULL OR u."Loader" = :l
+                ORDER BY u."Loader", u."Source", u."Rows" DESC, u."Name"
+            """), {"l": args.loader}).all()
+        for loader, source, name, n, iso3, country, score in rows:
+            hint = f"  → {iso3 or country}? ({country}, {score})" if country else ""
+            print(f"{loader:<22}{source:<48}{n:>7}  {name[:60]}{hint}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Acesso ao banco compartilhado pelos loaders e pelas Consultas
+-------------------------------------------------------------
+Um único engine (com pool de conexões) por processo, criado a partir de
+`DB_URL` no ambiente ou no `.env`. O pool é configurado por variáveis de
+ambiente (todas opcionais):
+
+    DB_POOL_SIZE          conexões mantidas abertas (padrão: 5 ou o pedido pelo script)
+    DB_MAX_OVERFLOW       conexões extras em pico (padrão: igual a DB_POOL_SIZE)
+    DB_POOL_RECYCLE       segundos até reabrir uma conexão (padrão: 1800)
+    DB_POOL_TIMEOUT       espera máxima por uma conexão livre, em s (padrão: 30)
+    DB_STATEMENT_TIMEOUT  statement_timeout da sessão, em ms (padrão: 0, sem limite)
+    DB_APPLICATION_NAME   prefixo do application_name (padrão: first-database)
+    DB_PGBOUNCER          1 = modo compatível com PgBouncer (transaction pooling)
+    DB_ECHO               1 = imprime o SQL executado
+
+O application_name de cada conexão é `<prefixo>/<etapa>` (`with stage(...)`),
+então pg_stat_activity mostra qual loader ou consulta está em cada sessão.
+A troca é feita na retirada da conexão do pool, só quando a etapa muda.
+
+No modo PgBouncer o pool local é desligado (NullPool: o PgBouncer já faz o
+pool) e nada é configurado na sessão, que é compartilhada entre clientes:
+o application_name vai só na abertura da conexão, DB_STATEMENT_TIMEOUT é
+ignorado (configure no PgBouncer ou com ALTER ROLE ... SET) e as Consultas
+não usam PREPARE (prepared.py executa o SQL direto).
+
+Métricas do pool (`metrics()`): retiradas, tempo de espera por conexão
+(inclui abrir e testar a conexão), conexões criadas, pico de conexões em
+uso, nº de instruções e tempo total no banco (o execute do cursor; as
+linhas buscadas depois num cursor do servidor não entram). Os scripts
+imprimem `report()` ao final da rodada.
+"""
+
+from __future__ import annotations
+import os, threading, time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+from dotenv import load_dotenv
+
+_engine: Engine | None = None
+_config: PoolConfig | None = None
+_local = threading.local()          # .stage: etapa em execução nesta thread
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() in {"1", "true", "yes"}
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    size: int = 5
+    overflow: int = 5
+    recycle_s: int = 1800
+    timeout_s: float = 30.0
+    statement_timeout_ms: int = 0
+    app_name: str = "first-database"
+    pgbouncer: bool = False
+
+    @classmethod
+    def from_env(cls, pool_size: int | None = None) -> "PoolConfig":
+        size = pool_size or int(os.getenv("DB_POOL_SIZE", cls.size))
+        return cls(
+            size=size,
+            overflow=int(os.getenv("DB_MAX_OVERFLOW", size)),
+            recycle_s=int(os.getenv("DB_POOL_RECYCLE", cls.recycle_s)),
+            timeout_s=float(os.getenv("DB_POOL_TIMEOUT", cls.timeout_s)),
+            statement_timeout_ms=int(os.getenv("DB_STATEMENT_TIMEOUT", 0)),
+            app_name=os.getenv("DB_APPLICATION_NAME", cls.app_name),
+            pgbouncer=_flag("DB_PGBOUNCER"),
+        )
+
+
+# ───────────────────────────────────────────────────────────────
+# Métricas
+# ───────────────────────────────────────────────────────────────
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    wait_s: float = 0.0
+    max_wait_s: float = 0.0
+    connections: int = 0        # conexões abertas com o servidor
+    in_use: int = 0
+    peak_in_use: int = 0
+    queries: int = 0
+    db_s: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {k: getattr(self, k) for k in METRIC_FIELDS}
+
+    def drain(self) -> dict:
+        """Snapshot e zera os contadores (workers de --executor process)."""
+        with self._lock:
+            out = {k: getattr(self, k) for k in METRIC_FIELDS}
+            for k, v in out.items():
+                setattr(self, k, type(v)())
+        return out
+
+    def absorb(self, other: dict) -> None:
+        """Soma as métricas de outro processo."""
+        with self._lock:
+            for k, v in other.items():
+                if k.startswith(("max_", "peak_")):
+                    setattr(self, k, max(getattr(self, k), v))
+                else:
+                    setattr(self, k, getattr(self, k) + v)
+
+    def __str__(self) -> str:
+        s = self.snapshot()
+        avg = s["wait_s"] / s["checkouts"] * 1000 if s["checkouts"] else 0.0
+        return (f"{s['checkouts']} retiradas (espera média {avg:.1f}ms, máx. "
+                f"{s['max_wait_s'] * 1000:.1f}ms), {s['connections']} conexões criadas, "
+                f"pico de {s['peak_in_use']} em uso, {s['queries']} instruções, "
+                f"{s['db_s']:.2f}s no banco")
+
+METRIC_FIELDS = tuple(f.name for f in fields(PoolMetrics) if f.name not in ("in_use", "_lock"))
+_metrics = PoolMetrics()
+
+
+def metrics() -> PoolMetrics:
+    return _metrics
+
+
+def report() -> str:
+    """Linha com as métricas do pool do processo (vazia se não houve engine)."""
+    return f"🔌 Pool: {_metrics}" if _engine is not None else ""
+
+
+def _timed(pool_cls):
+    """Pool que mede o tempo até entregar a conexão (fila + abertura + ping)."""
+    class Timed(pool_cls):
+        def connect(self):
+            t0 = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                waited = time.perf_counter() - t0
+                with _metrics._lock:
+                    _metrics.wait_s += waited
+                    _metrics.max_wait_s = max(_metrics.max_wait_s, waited)
+    Timed.__name__ = f"Timed{pool_cls.__name__}"
+    return Timed
+
+
+# ───────────────────────────────────────────────────────────────
+# Etapa (application_name)
+# ───────────────────────────────────────────────────────────────
+@contextmanager
+def stage(name: str):
+    """Marca as conexões retiradas nesta thread com a etapa `name`."""
+    prev = getattr(_local, "stage", "")
+    _local.stage = name
+    try:
+        yield
+    finally:
+        _local.stage = prev
+
+
+def application_name(config: PoolConfig) -> str:
+    name = getattr(_local, "stage", "")
+    return (f"{config.app_name}/{name}" if name else config.app_name)[:63]
+
+
+def _instrument(engine: Engine, config: PoolConfig) -> None:
+    postgres = engine.dialect.name == "postgresql"
+
+    @event.listens_for(engine, "do_connect")
+    def do_connect(dialect, conn_rec, cargs, cparams):
+        if postgres:
+            cparams["application_name"] = application_name(config)
+            conn_rec.info["application_name"] = cparams["application_name"]
+
+    @event.listens_for(engine.pool, "connect")
+    def on_connect(dbapi_conn, conn_rec):
+        with _metrics._lock:
+            _metrics.connections += 1
+
+    @event.listens_for(engine.pool, "checkout")
+    def on_checkout(dbapi_conn, conn_rec, proxy):
+        with _metrics._lock:
+            _metrics.checkouts += 1
+            _metrics.in_use += 1
+            _metrics.peak_in_use = max(_metrics.peak_in_use, _metrics.in_use)
+        name = application_name(config)
+        if postgres and not config.pgbouncer and conn_rec.info.get("application_name") != name:
+            with dbapi_conn.cursor() as cur:
+                cur.execute("SELECT set_config('application_name', %s, false)", (name,))
+            dbapi_conn.commit()
+            conn_rec.info["application_name"] = name
+
+    @event.listens_for(engine.pool, "checkin")
+    def on_checkin(dbapi_conn, conn_rec):
+        with _metrics._lock:
+            _metrics.in_use = max(0, _metrics.in_use - 1)
+
+    # o início fica no contexto da execução: se a instrução falha o after não
+    # roda, e nada sobra na conexão para desalinhar a próxima medida
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_t0 = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        t0 = getattr(context, "_query_t0", None)
+        if t0 is None:
+            return
+        elapsed = time.perf_counter() - t0
+        with _metrics._lock:
+            _metrics.queries += 1
+            _metrics.db_s += elapsed
+
+
+def record_query(seconds: float, n: int = 1) -> None:
+    """Conta instruções enviadas fora do SQLAlchemy (ex.: blocos de COPY)."""
+    with _metrics._lock:
+        _metrics.queries += n
+        _metrics.db_s += seconds
+
+
+# ───────────────────────────────────────────────────────────────
+# Engine
+# ───────────────────────────────────────────────────────────────
+def config() -> PoolConfig:
+    """Configuração do pool do processo (a do ambiente, antes do primeiro get_engine)."""
+    return _config or PoolConfig.from_env()
+
+
+def get_engine(pool_size: int | None = None) -> Engine:
+    """Devolve o engine do processo, criando-o na primeira chamada."""
+    global _engine, _config
+    if _engine is None:
+        load_dotenv()
+        db_url = os.getenv("DB_URL")
+        if not db_url:
+            raise RuntimeError("💥  Defina DB_URL no ambiente ou no .env")
+        cfg = PoolConfig.from_env(pool_size)
+        if cfg.pgbouncer:
+            pool_args = dict(poolclass=_timed(NullPool))
+            connect_args = {}
+        else:
+            pool_args = dict(poolclass=_timed(QueuePool), pool_pre_ping=True,
+                             pool_size=cfg.size, max_overflow=cfg.overflow,
+                             pool_recycle=cfg.recycle_s, pool_timeout=cfg.timeout_s)
+            connect_args = ({"options": f"-c statement_timeout={cfg.statement_timeout_ms}"}
+                            if cfg.statement_timeout_ms else {})
+        engine = create_engine(
+            db_url,
+            echo=_flag("DB_ECHO"),
+            connect_args=connect_args,
+            **pool_args,
+        )
+        _instrument(engine, cfg)
+        _engine, _config = engine, cfg
+    return _engine
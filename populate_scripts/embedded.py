@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cópia do banco num arquivo embutido (DuckDB ou SQLite)
+------------------------------------------------------
+Cria num arquivo local o mesmo esquema de Modelos/modeloFisico.sql, copia
+as tabelas do PostgreSQL e grava as views de Modelos/views.sql como tabelas
+(o equivalente às views materializadas, já calculadas). As Consultas rodam
+sobre o arquivo sem servidor:
+    python Consultas/runner.py fourth --db .cache/analytics.duckdb
+
+O DDL e as views passam pela mesma tradução das consultas
+(Consultas/dialect.py) mais os ajustes de DDL: `serial` vira inteiro,
+`now()` vira CURRENT_TIMESTAMP e as chaves estrangeiras saem (a cópia é só
+leitura e já vem consistente do PostgreSQL).
+
+O arquivo é montado ao lado e trocado no fim, então quem estiver lendo a
+cópia anterior não vê uma cópia pela metade.
+
+Uso (a partir da raiz do repositório):
+    python populate_scripts/embedded.py [--path .cache/analytics.duckdb]
+ou, ao fim da carga:
+    python populate_scripts/populate_db.py --embedded .cache/analytics.duckdb
+"""
+
+from __future__ import annotations
+import argparse, os, re, sqlite3, sys, time
+from pathlib import Path
+from typing import Iterable
+import pandas as pd
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+sys.path.insert(0, str(ROOT.parent / "Consultas"))
+
+import dialect  # noqa: E402
+from views import VIEWS_SQL  # noqa: E402
+
+MODEL_SQL = ROOT / "../Modelos/modeloFisico.sql"
+DEFAULT_PATH = Path(os.getenv("EMBEDDED_DB", ROOT.parent / ".cache" / "analytics.duckdb"))
+CHUNK_ROWS = 100_000
+
+TABLE_RE = re.compile(r'CREATE TABLE IF NOT EXISTS public\.(?:"([^"]+)"|(\w+))', re.I)
+FK_RE = re.compile(r',\s*CONSTRAINT\s+"[^"]+"\s+FOREIGN KEY[^,]*?REFERENCES[^,)]*\([^)]*\)', re.I)
+VIEW_RE = re.compile(r"CREATE MATERIALIZED VIEW IF NOT EXISTS (?:public\.)?(\w+) AS(.*?)WITH DATA",
+                     re.I | re.S)
+
+
+def statements(path: Path) -> list[str]:
+    sql = dialect.COMMENT_RE.sub(" ", path.read_text(encoding="utf-8"))
+    return [s.strip() for s in sql.split(";")
+            if s.strip() and s.strip().upper() not in ("BEGIN", "END", "COMMIT")]
+
+
+def table_ddl(kind: str) -> dict[str, str]:
+    """Tabela → CREATE TABLE no dialeto embutido, na ordem de modeloFisico.sql."""
+    out = {}
+    for stmt in statements(MODEL_SQL):
+        m = TABLE_RE.match(stmt)
+        if not m:
+            continue
+        ddl = FK_RE.sub("", stmt)
+        ddl = re.sub(r"\bserial\b", "INTEGER", ddl, flags=re.I)
+        ddl = re.sub(r"\bnow\(\)", "CURRENT_TIMESTAMP", ddl, flags=re.I)
+        out[m.group(1) or m.group(2)] = ddl.replace("public.", "")
+    return out
+
+
+def view_ddl(kind: str) -> dict[str, str]:
+    """View materializada → CREATE TABLE ... AS no dialeto embutido."""
+    text_ = VIEWS_SQL.read_text(encoding="utf-8")
+    return {name: f"CREATE TABLE {name} AS {dialect.translate(body, kind)}"
+            for name, body in VIEW_RE.findall(text_)}
+
+
+# ───────────────────────────────────────────────────────────────
+# Escrita
+# ───────────────────────────────────────────────────────────────
+class _Writer:
+    def __init__(self, path: Path, kind: str):
+        self.kind = kind
+        if kind == "duckdb":
+            if dialect.duckdb is None:
+                raise SystemExit("💥  duckdb não está instalado (pip install duckdb) "
+                                 "ou use um arquivo .sqlite")
+            self.conn = dialect.duckdb.connect(str(path))
+        else:
+            self.conn = sqlite3.connect(path)
+
+    def execute(self, sql: str) -> None:
+        self.conn.execute(sql)
+
+    def count(self, table: str) -> int:
+        return int(self.conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0])
+
+    def append(self, table: str, df: pd.DataFrame) -> None:
+        if self.kind == "duckdb":
+            self.conn.register("_chunk", df)
+            self.conn.execute(f'INSERT INTO "{table}" BY NAME SELECT * FROM _chunk')
+            self.conn.unregister("_chunk")
+        else:
+            cols = ", ".join(f'"{c}"' for c in df.columns)
+            marks = ", ".join("?" * len(df.columns))
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            self.conn.executemany(f'INSERT INTO "{table}" ({cols}) VALUES ({marks})', rows)
+
+    def close(self) -> None:
+        if self.kind == "sqlite":
+            self.conn.commit()
+        self.conn.close()
+
+
+def write(path: Path, chunks: Iterable[tuple[str, pd.DataFrame]]) -> dict[str, int]:
+    """
+    Recria `path` com o esquema de modeloFisico.sql, os lotes (tabela,
+    DataFrame) de `chunks` e as views; devolve {tabela ou view: linhas}.
+    """
+    path = Path(path)
+    kind = dialect.kind_of(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    out = _Writer(tmp, kind)
+    try:
+        tables = table_ddl(kind)
+        for ddl in tables.values():
+            out.execute(ddl)
+        for table, df in chunks:
+            out.append(table, df)
+        rows = {t: out.count(t) for t in tables}
+        for name, ddl in view_ddl(kind).items():
+            out.execute(ddl)
+            rows[name] = out.count(name)
+    except BaseException:
+        out.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    out.close()
+    os.replace(tmp, path)
+    return rows
+
+
+def export(engine, path: Path = DEFAULT_PATH) -> dict[str, int]:
+    """Copia todas as tabelas de modeloFisico.sql do PostgreSQL para `path`."""
+    def chunks():
+        with engine.connect() as conn:
+            for table in table_ddl("duckdb"):
+                for chunk in pd.read_sql(f'SELECT * FROM public."{table}"', conn,
+                                         chunksize=CHUNK_ROWS):
+                    yield table, chunk
+    return write(path, chunks())
+
+
+def main() -> None:
+    from db import get_engine
+    parser = argparse.ArgumentParser(description="Copia o banco para um arquivo DuckDB/SQLite.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH,
+                        help=f"arquivo .duckdb ou .sqlite (padrão: {DEFAULT_PATH})")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rows = export(get_engine(pool_size=1), args.path)
+    print(f"✅ {len(rows)} tabelas/views, {sum(rows.values())} linhas em {args.path} "
+          f"({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Instrumentação das etapas de carga
+----------------------------------
+Cada loader marca as fases do seu trabalho com `ctx.phase(...)`:
+
+    with ctx.phase("read") as ph:
+        df = read_source(PATH)
+        ph.rows_out = len(df)
+
+As fases usadas são read (leitura do arquivo), clean (limpeza das
+colunas), map (troca de nomes por IDs), merge (junção de fontes e
+deduplicação), validate (regras de quality.py) e write (gravação); as duas
+últimas são abertas pelo próprio `ctx.write`. O runner
+envolve cada etapa numa fase "total".
+
+Para cada fase são medidos: tempo de parede, tempo de CPU da thread, linhas
+de entrada/saída, RSS ao final e pico de RSS, e nº de idas ao banco
+(instruções executadas pelo SQLAlchemy e blocos de COPY). Cada fase vira uma
+linha JSON no arquivo de `POPULATE_METRICS` (o populate_db.py define um por
+rodada; sem a variável nada é gravado).
+
+O pico de RSS é o do processo: com uma etapa por vez (--workers 1) o pico é
+zerado no início de cada fase (/proc/self/clear_refs) e mede só a fase; com
+etapas em paralelo inclui o que as outras threads alocaram.
+
+Com `POPULATE_PROFILE=cprofile` (ou `pyinstrument`, se instalado) cada fase
+também é perfilada e o resultado vai para PROFILE_DIR/<rodada>/.
+"""
+
+from __future__ import annotations
+import json, os, threading, time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    from pyinstrument import Profiler as _Pyinstrument
+except ImportError:  # dependência opcional (só para POPULATE_PROFILE=pyinstrument)
+    _Pyinstrument = None
+
+PHASES = ("read", "clean", "map", "merge", "validate", "write")
+PROFILERS = ("cprofile", "pyinstrument")
+PROFILE_DIR = Path(os.getenv("POPULATE_PROFILE_DIR", ".cache/profiles"))
+
+_local = threading.local()          # .stack: fases abertas nesta thread
+_write_lock = threading.Lock()
+
+
+@dataclass
+class Phase:
+    loader: str
+    phase: str
+    rows_in: int | None = None
+    rows_out: int | None = None
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rss_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+    db_round_trips: int = 0
+    started_at: float = field(default_factory=time.time)
+
+
+# ───────────────────────────────────────────────────────────────
+# Medidas
+# ───────────────────────────────────────────────────────────────
+def memory_mb() -> tuple[float, float]:
+    """(RSS atual, pico de RSS) do processo, em MB."""
+    try:
+        fields = dict(line.split(":", 1) for line in
+                      Path("/proc/self/status").read_text().splitlines() if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+
+
+def _reset_peak() -> None:
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _stack() -> list[Phase]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def round_trip(n: int = 1) -> None:
+    """Conta `n` idas ao banco nas fases abertas desta thread."""
+    for ph in _stack():
+        ph.db_round_trips += n
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _on_execute(conn, cursor, statement, parameters, context, executemany):
+    round_trip()
+
+
+# ───────────────────────────────────────────────────────────────
+# Fases
+# ───────────────────────────────────────────────────────────────
+def run_id() -> str:
+    return os.getenv("POPULATE_RUN_ID", "")
+
+
+def emit(record: dict) -> None:
+    """Acrescenta uma linha ao arquivo de métricas (se houver)."""
+    path = os.getenv("POPULATE_METRICS")
+    if not path:
+        return
+    line = json.dumps({"run": run_id(), **record}, ensure_ascii=False) + "\n"
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def available(profiler: str) -> bool:
+    return profiler != "pyinstrument" or _Pyinstrument is not None
+
+
+def _start_profiler(kind: str):
+    if kind == "pyinstrument":
+        if _Pyinstrument is None:
+            return None
+        prof = _Pyinstrument()
+        prof.start()
+        return prof
+    import cProfile
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:       # outro profiler já ativo (Python 3.12+)
+        return None
+    return prof
+
+
+def _dump_profiler(prof, kind: str, ph: Phase) -> None:
+    out = PROFILE_DIR / (run_id() or "standalone")
+    out.mkdir(parents=True, exist_ok=True)
+    stem = f"{ph.loader}.{ph.phase}"
+    if kind == "pyinstrument":
+        prof.stop()
+        (out / f"{stem}.txt").write_text(prof.output_text(), encoding="utf-8")
+        (out / f"{stem}.html").write_text(prof.output_html(), encoding="utf-8")
+    else:
+        prof.disable()
+        prof.dump_stats(out / f"{stem}.prof")
+
+
+@contextmanager
+def phase(loader: str, name: str, rows_in: int | None = None):
+    """
+    Mede uma fase de `loader`. Com POPULATE_EXCLUSIVE=1 (uma etapa por vez)
+    o pico de RSS é zerado no início da fase.
+    """
+    ph = Phase(loader, name, rows_in)
+    stack = _stack()
+    if os.getenv("POPULATE_EXCLUSIVE") == "1":
+        _reset_peak()
+    kind = os.getenv("POPULATE_PROFILE", "").lower()
+    prof = _start_profiler(kind) if kind in PROFILERS and name != "total" else None
+    stack.append(ph)
+    t0, c0 = time.perf_counter(), time.thread_time()
+    try:
+        yield ph
+    finally:
+        ph.wall_s = time.perf_counter() - t0
+        ph.cpu_s = time.thread_time() - c0
+        stack.pop()
+        if prof is not None:
+            _dump_profiler(prof, kind, ph)
+        rss, peak = memory_mb()
+        ph.rss_mb, ph.peak_rss_mb = rss, max(peak, ph.peak_rss_mb)
+        if stack:
+            stack[-1].peak_rss_mb = max(stack[-1].peak_rss_mb, ph.peak_rss_mb)
+        emit(asdict(ph))
+
+
+def read_metrics(path: Path | str, run: str | None = None) -> list[dict]:
+    """Linhas do arquivo de métricas (só as da rodada `run`, se dada)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    rows = [json.loads(l) for l in path.read_text(encoding="utf-8").splitlines() if l.strip()]
+    return [r for r in rows if run is None or r.get("run") == run]
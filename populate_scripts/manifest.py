@@ -0,0 +1,137 @@
+"""
+Manifesto de carga (public.load_manifest)
+-----------------------------------------
+Guarda, para cada loader:
+  • kind = 'input'  → hash SHA-256 e nº de linhas de cada arquivo lido
+                      (inclui o próprio .py do loader e os módulos comuns
+                      da carga, para que mudanças de código também disparem
+                      a recarga) e o hash do conteúdo das tabelas do banco
+                      que o loader lê como entrada (TABLE_DIGESTS, por ex.
+                      os aliases de país);
+  • kind = 'output' → hash do conjunto de linhas entregue a cada tabela.
+
+O runner pula um loader cujas entradas não mudaram (e cujas dependências
+também foram puladas); quando algo mudou, `ctx.write` compara o hash da
+saída e grava apenas as linhas que diferem (ver bulk_load.sync_frame).
+
+Cada gravação efetiva também incrementa a versão da tabela em
+public.table_versions, usada para invalidar o cache de resultados das
+Consultas (Consultas/result_cache.py).
+"""
+
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import text
+
+CHUNK = 1 << 20
+REPO: Path = Path(__file__).resolve().parents[1]   # raiz do repositório
+
+
+def file_digest(path: Path) -> tuple[str, int | None]:
+    """SHA-256 do conteúdo e nº de linhas de dados (apenas para CSV)."""
+    h, lines = hashlib.sha256(), 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            h.update(chunk)
+            lines += chunk.count(b"\n")
+    rows = max(lines - 1, 0) if path.suffix.lower() == ".csv" else None
+    return h.hexdigest(), rows
+
+
+def frame_digest(df: pd.DataFrame, keys: list[str]) -> str:
+    """Hash do conjunto de linhas, independente da ordem."""
+    ordered = df.sort_values(keys).reset_index(drop=True)
+    h = hashlib.sha256(",".join(ordered.columns).encode())
+    h.update(pd.util.hash_pandas_object(ordered, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def load_entries(conn, loader: str) -> dict[str, str]:
+    """{source: content_hash} já registrados para o loader."""
+    rows = conn.execute(text(
+        'SELECT "Source", "Content_Hash" FROM public.load_manifest WHERE "Loader" = :l'
+    ), {"l": loader})
+    return {src: digest for src, digest in rows}
+
+
+RECORD_SQL = """
+        INSERT INTO public.load_manifest
+            ("Loader", "Source", "Kind", "Content_Hash", "Row_Count")
+        VALUES (:l, :s, :k, :h, :n)
+        ON CONFLICT ("Loader", "Source") DO UPDATE
+        SET "Kind" = EXCLUDED."Kind",
+            "Content_Hash" = EXCLUDED."Content_Hash",
+            "Row_Count" = EXCLUDED."Row_Count",
+            "Loaded_At" = now()
+"""
+
+BUMP_SQL = """
+        INSERT INTO public.table_versions ("Table") VALUES (:t)
+        ON CONFLICT ("Table") DO UPDATE
+        SET "Version" = public.table_versions."Version" + 1,
+            "Updated_At" = now()
+"""
+
+
+def record(conn, loader: str, source: str, kind: str, digest: str, rows: int | None) -> None:
+    conn.execute(text(RECORD_SQL), {"l": loader, "s": source, "k": kind, "h": digest, "n": rows})
+
+
+def bump_version(conn, table: str) -> None:
+    """Incrementa a versão de `table` (na mesma transação da gravação)."""
+    conn.execute(text(BUMP_SQL), {"t": table})
+
+
+# tabela → (hash, linhas) do conteúdo que importa para as etapas que a leem
+TABLE_DIGESTS = {
+    "country_alias": """
+        SELECT encode(sha256(convert_to(COALESCE(string_agg(
+                   "Alias" || '=' || COALESCE(CAST("Country_ID" AS text), ''),
+                   ',' ORDER BY "Alias"), ''), 'UTF8')), 'hex'),
+               count(*)
+        FROM public.country_alias
+    """,
+}
+
+
+def table_digest(conn, table: str) -> tuple[str, int]:
+    digest, rows = conn.execute(text(TABLE_DIGESTS[table])).one()
+    return digest, rows
+
+
+def input_key(path: Path) -> str:
+    """Caminho relativo à raiz do repositório (absoluto se estiver fora dela)."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def input_digests(paths: tuple[Path, ...], engine=None,
+                  tables: tuple[str, ...] = ()) -> dict[str, tuple[str, int | None]]:
+    """
+    Digests das entradas por input_key; arquivo ausente nunca bate com o
+    manifesto. As tabelas de `tables` entram como "db:<tabela>" (precisa de
+    `engine`).
+    """
+    out = {input_key(p): file_digest(Path(p)) if Path(p).exists() else ("missing", None)
+           for p in paths}
+    if tables:
+        with engine.connect() as conn:
+            out.update({f"db:{t}": table_digest(conn, t) for t in tables})
+    return out
+
+
+def inputs_unchanged(engine, loader: str, digests: dict[str, tuple[str, int | None]]) -> bool:
+    with engine.begin() as conn:
+        known = load_entries(conn, loader)
+    return all(known.get(src) == digest for src, (digest, _) in digests.items())
+
+
+def record_inputs(engine, loader: str, digests: dict[str, tuple[str, int | None]]) -> None:
+    with engine.begin() as conn:
+        for src, (digest, rows) in digests.items():
+            record(conn, loader, src, "input", digest, rows)
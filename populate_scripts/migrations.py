@@ -0,0 +1,90 @@
+"""
+Migrações versionadas do esquema físico
+---------------------------------------
+Cada arquivo Modelos/migrations/NNN_descricao.sql é aplicado uma única vez,
+em ordem, dentro de uma transação, e registrado em public.schema_migrations
+(com o SHA-256 do conteúdo). O arquivo é enviado inteiro ao banco, então
+blocos DO $$ ... $$ são permitidos.
+
+Uso (a partir da raiz do repositório):
+    python populate_scripts/migrations.py [--list]
+"""
+
+from __future__ import annotations
+import argparse, hashlib
+from pathlib import Path
+from sqlalchemy import text
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+MIGRATIONS_DIR = ROOT / "../Modelos/migrations"
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS public.schema_migrations
+(
+    "Version" character varying(10) PRIMARY KEY,
+    "Name" character varying(255) NOT NULL,
+    "Checksum" character(64) NOT NULL,
+    "Applied_At" timestamp with time zone DEFAULT now()
+)
+"""
+
+
+def available() -> list[Path]:
+    return sorted(MIGRATIONS_DIR.glob("[0-9]*.sql"))
+
+
+def applied(engine) -> dict[str, str]:
+    """{versão: checksum} das migrações já aplicadas."""
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_TABLE))
+        rows = conn.execute(text('SELECT "Version", "Checksum" FROM public.schema_migrations'))
+        return {v: c for v, c in rows}
+
+
+def pending(engine) -> list[Path]:
+    done = applied(engine)
+    for path in available():
+        version = path.name.split("_", 1)[0]
+        if version in done and done[version] != _checksum(path):
+            print(f"⚠️  migração {path.name} foi alterada depois de aplicada")
+    return [p for p in available() if p.name.split("_", 1)[0] not in done]
+
+
+def _checksum(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def apply(engine) -> list[str]:
+    """Aplica as migrações pendentes; devolve os nomes aplicados."""
+    names = []
+    for path in pending(engine):
+        with engine.begin() as conn:
+            # cursor do driver: o arquivo vai inteiro, sem tratamento de parâmetros
+            with conn.connection.cursor() as cur:
+                cur.execute(path.read_text(encoding="utf-8"))
+            conn.execute(text("""
+                INSERT INTO public.schema_migrations ("Version", "Name", "Checksum")
+                VALUES (:v, :n, :c)
+            """), {"v": path.name.split("_", 1)[0], "n": path.name, "c": _checksum(path)})
+        print(f"✅ migração {path.name} aplicada")
+        names.append(path.name)
+    return names
+
+
+def main() -> None:
+    from db import get_engine
+    parser = argparse.ArgumentParser(description="Aplica as migrações pendentes.")
+    parser.add_argument("--list", action="store_true", help="só lista as pendentes")
+    args = parser.parse_args()
+
+    engine = get_engine(pool_size=1)
+    if args.list:
+        for path in pending(engine):
+            print(path.name)
+        return
+    if not apply(engine):
+        print("Nenhuma migração pendente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Particionamento das tabelas de fatos por ano
+--------------------------------------------
+Opcional: `enable` converte Sector_Country e Power Source_Country em tabelas
+particionadas por RANGE ("Year"), com uma partição por década ou por ano.
+Chaves, FKs e índices (inclusive os das migrações) são recriados na tabela
+particionada e as views materializadas que dependem dela são recriadas.
+
+Depois disso os loaders continuam gravando na tabela de sempre:
+`LoadContext.write` cria antes as partições que faltam para os anos do lote
+(`ensure`). Com `--swap-partitions` no populate_db (modo --full), cada
+partição tocada pela carga é substituída inteira por DETACH/ATTACH
+(bulk_load.swap_partitions) em vez do upsert linha a linha.
+
+Nas consultas, filtros em "Year" fazem o PostgreSQL ler só as partições do
+intervalo (partition pruning).
+
+Uso (a partir da raiz do repositório):
+    python populate_scripts/partitions.py enable [--per decade|year]
+    python populate_scripts/partitions.py status
+"""
+
+from __future__ import annotations
+import argparse, re
+from sqlalchemy import text
+
+import views
+
+FACT_TABLES = ("Sector_Country", "Power Source_Country")
+SPANS = {"decade": 10, "year": 1}
+BOUND_RE = re.compile(r"FROM \('?(-?\d+)'?\) TO \('?(-?\d+)'?\)")
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ───────────────────────────────────────────────────────────────
+# Catálogo
+# ───────────────────────────────────────────────────────────────
+def is_partitioned(conn, table: str, schema: str = "public") -> bool:
+    return bool(conn.execute(text("""
+        SELECT c.relkind = 'p' FROM pg_class c
+        WHERE c.relnamespace = to_regnamespace(:s) AND c.relname = :t
+    """), {"s": schema, "t": table}).scalar())
+
+
+def bounds(conn, table: str, schema: str = "public") -> list[tuple[str, int, int]]:
+    """Partições de `table`: (nome, ano inicial, ano final exclusivo), em ordem."""
+    rows = conn.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relnamespace = to_regnamespace(:s) AND p.relname = :t
+    """), {"s": schema, "t": table})
+    out = []
+    for name, expr in rows:
+        m = BOUND_RE.search(expr or "")
+        if m:
+            out.append((name, int(m.group(1)), int(m.group(2))))
+    return sorted(out, key=lambda b: b[1])
+
+
+def span_of(conn, table: str, schema: str = "public") -> int:
+    """Anos por partição de `table` (década se ainda não houver partições)."""
+    existing = bounds(conn, table, schema)
+    return existing[0][2] - existing[0][1] if existing else SPANS["decade"]
+
+
+def definitions(conn, table: str, schema: str = "public") -> tuple[list[tuple[str, str]], list[str]]:
+    """
+    ([(nome, definição)] das chaves/CHECKs, [CREATE INDEX] dos demais índices)
+    de `table`, para recriá-los noutra tabela depois da cópia dos dados.
+    """
+    rel = f"{schema}.{_q(table)}"
+    constraints = conn.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = CAST(:rel AS regclass) AND contype IN ('p', 'u', 'f', 'c')
+        ORDER BY contype DESC
+    """), {"rel": rel}).all()
+    indexes = conn.execute(text("""
+        SELECT indexdef FROM pg_indexes
+        WHERE schemaname = :s AND tablename = :t
+          AND indexname NOT IN (SELECT conname FROM pg_constraint
+                                WHERE conrelid = CAST(:rel AS regclass))
+    """), {"s": schema, "t": table, "rel": rel}).scalars().all()
+    return [tuple(c) for c in constraints], list(indexes)
+
+
+def partition_name(table: str, lo: int, span: int) -> str:
+    return f"{table}_{lo}s" if span > 1 else f"{table}_{lo}"
+
+
+def ensure(conn, table: str, years, span: int | None = None,
+           parent: str | None = None, schema: str = "public") -> list[tuple[str, int, int]]:
+    """
+    Cria as partições que faltam para `years`; devolve as partições que cobrem
+    esses anos. `span` vem das partições existentes (década se não houver).
+    `parent` permite criar partições numa tabela temporária com o nome final
+    de `table` (usado por `enable`); `schema`, numa tabela-sombra (rebuild.py).
+    """
+    parent = parent or table
+    existing = bounds(conn, parent, schema)
+    if span is None:
+        span = existing[0][2] - existing[0][1] if existing else SPANS["decade"]
+    covering = {}
+    for year in sorted({int(y) for y in years if y is not None}):
+        hit = next((b for b in existing if b[1] <= year < b[2]), None)
+        if hit is None:
+            lo = year - year % span
+            hit = (partition_name(table, lo, span), lo, lo + span)
+            conn.execute(text(
+                f"CREATE TABLE {schema}.{_q(hit[0])} PARTITION OF {schema}.{_q(parent)} "
+                f"FOR VALUES FROM ({lo}) TO ({lo + span})"))
+            existing.append(hit)
+        covering[hit[0]] = hit
+    return sorted(covering.values(), key=lambda b: b[1])
+
+
+# ───────────────────────────────────────────────────────────────
+# Conversão
+# ───────────────────────────────────────────────────────────────
+def _convert(conn, table: str, span: int) -> int:
+    t, tmp = _q(table), _q(table + "__part")
+    constraints, indexes = definitions(conn, table)
+    years = conn.execute(text(f'SELECT DISTINCT "Year" FROM public.{t}')).scalars().all()
+
+    conn.execute(text(f"CREATE TABLE public.{tmp} (LIKE public.{t} INCLUDING DEFAULTS) "
+                      f'PARTITION BY RANGE ("Year")'))
+    ensure(conn, table, years, span, parent=table + "__part")
+    n = conn.execute(text(f"INSERT INTO public.{tmp} SELECT * FROM public.{t}")).rowcount
+    conn.execute(text(f"DROP TABLE public.{t}"))
+    conn.execute(text(f"ALTER TABLE public.{tmp} RENAME TO {t}"))
+    # chaves e índices só depois da cópia (mais rápido que manter durante o INSERT)
+    for name, definition in constraints:
+        conn.execute(text(f"ALTER TABLE public.{t} ADD CONSTRAINT {_q(name)} {definition}"))
+    for ddl in indexes:
+        conn.execute(text(ddl))
+    conn.execute(text(f"ANALYZE public.{t}"))
+    return n
+
+
+def enable(engine, per: str = "decade") -> list[str]:
+    """Converte as tabelas de fatos ainda não particionadas; devolve as convertidas."""
+    converted = []
+    with engine.begin() as conn:
+        todo = [t for t in FACT_TABLES if not is_partitioned(conn, t)]
+        if not todo:
+            return []
+        # as views dependem das tabelas e são recriadas ao final
+        for view, sources in views.VIEW_SOURCES.items():
+            if sources & set(todo):
+                conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS public.{view}"))
+        for table in todo:
+            n = _convert(conn, table, SPANS[per])
+            print(f"✅ '{table}' particionada por {per} ({n} linhas)")
+            converted.append(table)
+    views.create(engine)
+    return converted
+
+
+def main() -> None:
+    from db import get_engine
+    parser = argparse.ArgumentParser(description="Particiona as tabelas de fatos por ano.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_enable = sub.add_parser("enable", help="converte as tabelas de fatos")
+    p_enable.add_argument("--per", choices=list(SPANS), default="decade")
+    sub.add_parser("status", help="lista as partições")
+    args = parser.parse_args()
+
+    engine = get_engine(pool_size=1)
+    if args.cmd == "enable":
+        if not enable(engine, args.per):
+            print("As tabelas de fatos já são particionadas")
+        return
+    with engine.connect() as conn:
+        for table in FACT_TABLES:
+            if not is_partitioned(conn, table):
+                print(f"{table}: não particionada")
+                continue
+            print(f"{table}:")
+            for name, lo, hi in bounds(conn, table):
+                print(f"   {name:<32} [{lo}, {hi})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,57 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-DB_URL = os.getenv("DB_URL")
-engine = create_engine(DB_URL)
-
-countries = pd.read_csv("Datasets/WDICountry.csv")
-
-df_country = countries[['Table Name']].rename(columns={
-    'Table Name': 'Name',
-})
-
-# Filtrar para remover a linha onde Name == "World"
-df_country = df_country[df_country['Name'] != 'World']
-
-df_country['Name'] = df_country['Name'].str.slice(0, 100)
-
-with engine.begin() as conn:
-    df_country.to_sql('Country', conn, if_exists='append', index=False)
-
-print("Tabela 'Country' populada com sucesso!")
+from sqlalchemy import text
+import countries, manifest
+from registry import DATASETS, LoadContext, loader, run_standalone
+from source_cache import read_source
+
+
+@loader("country", inputs=(DATASETS / "WDICountry.csv", countries.ALIASES_CSV))
+def load_country(ctx: LoadContext) -> int:
+    with ctx.phase("read") as ph:
+        wdi = read_source(DATASETS / "WDICountry.csv")
+        ph.rows_out = len(wdi)
+
+    with ctx.phase("clean", rows_in=len(wdi)) as ph:
+        df_country = wdi[['Table Name', 'Country Code']].rename(columns={
+            'Table Name': 'Name',
+            'Country Code': 'ISO3',
+        })
+
+        # Filtrar para remover a linha onde Name == "World"
+        df_country = df_country[df_country['Name'] != 'World']
+
+        df_country['Name'] = df_country['Name'].str.slice(0, 100)
+
+        df_country['ISO3'] = df_country['ISO3'].str.strip().str.upper()
+
+        # Só insere nomes novos (a etapa pode ser executada de novo)
+        df_country = df_country.drop_duplicates(subset=['Name'])
+        codes = df_country
+        df_country = df_country[~df_country['Name'].isin(ctx.country_map['Name'])]
+        ph.rows_out = len(df_country)
+
+    with ctx.phase("write", rows_in=len(df_country)) as ph, ctx.engine.begin() as conn:
+        df_country.to_sql('Country', conn, if_exists='append', index=False)
+        # Bancos criados antes da coluna ISO3: preenche os códigos que faltam
+        backfill = codes.dropna(subset=['ISO3'])
+        if len(backfill):
+            conn.execute(text("""
+                UPDATE public."Country" SET "ISO3" = :ISO3
+                WHERE "Name" = :Name AND "ISO3" IS NULL
+            """), backfill.to_dict("records"))
+        if len(df_country):
+            manifest.bump_version(conn, "Country")
+        ph.rows_out = len(df_country)
+    ctx.invalidate("country", "resolver")
+
+    # Aliases de Modelos/country_aliases.csv, resolvidos pelos códigos ISO3
+    with ctx.engine.begin() as conn:
+        seeded = countries.seed_aliases(conn, ctx.countries)
+    ctx.invalidate("resolver")
+    print(f"{seeded} aliases de país gravados em 'country_alias'")
+
+    print("Tabela 'Country' populada com sucesso!")
+    return len(df_country)
+
+
+if __name__ == "__main__":
+    run_standalone(load_country)
@@ -5,29 +5,13 @@ Popula a tabela Power Source_Country (modelo v3)
 Fonte de dados: PowerGenerationEmission.csv
 """
 
-from pathlib import Path
-import os, pandas as pd, unicodedata, logging
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+import pandas as pd
+from registry import DATASETS, LoadContext, loader, run_standalone
+from source_cache import read_source
 
-CSV_PATH = Path("Datasets/PowerGenerationEmission.csv")
+CSV_PATH = DATASETS / "PowerGenerationEmission.csv"
 YEAR_MIN, YEAR_MAX = 2000, 2024
 
-load_dotenv()
-DB_URL = os.getenv("DB_URL")
-if not DB_URL:
-    raise RuntimeError("💥  Defina DB_URL no ambiente ou no .env")
-engine = create_engine(DB_URL, pool_pre_ping=True)
-
-# ─────────────────────────────
-# Mapeamento de entidades
-# ─────────────────────────────
-with engine.begin() as conn:
-    country_df = pd.read_sql('SELECT "ID_Country", "Name" FROM "Country";', conn)
-    power_df   = pd.read_sql('SELECT "ID_Power", "Name" FROM "Power Source";', conn)
-
-country_map = dict(zip(country_df["Name"], country_df["ID_Country"]))
-
 # Mapeia nomes do CSV → nomes oficiais no banco
 var_to_power = {
     "Bioenergy":        "Bioenergy",
@@ -40,85 +24,83 @@ var_to_power = {
     "Solar":            "Solar",
     "Wind":             "Wind",
 }
-power_map = {k: power_df.loc[power_df["Name"] == v, "ID_Power"].squeeze()
-             for k, v in var_to_power.items()}
-
-# ─────────────────────────────
-# Leitura e processamento do CSV
-# ─────────────────────────────
-raw = pd.read_csv(CSV_PATH)
-raw = raw[raw["Year"].between(YEAR_MIN, YEAR_MAX)].copy()
-
-df_gen = raw[raw["Category"] == "Electricity generation"]
-df_em  = raw[raw["Category"] == "Power sector emissions"]
-
-df = (
-    df_gen.merge(
-        df_em,
-        on=["Area", "Year", "Variable"],
-        how="outer",
-        suffixes=("_gen", "_em")
+
+
+@loader("country_power_source", deps=("country", "power_source"), inputs=(CSV_PATH,))
+def load_country_power_source(ctx: LoadContext) -> int:
+    # ─────────────────────────────
+    # Leitura e processamento do CSV
+    # ─────────────────────────────
+    with ctx.phase("read") as ph:
+        raw = read_source(CSV_PATH)
+        ph.rows_out = len(raw)
+        # CSVs gerados antes de CSVPowerConsumid.py manter o código ISO3 não têm a coluna
+        code_col = ["ISO 3 code"] if "ISO 3 code" in raw.columns else []
+
+    with ctx.phase("clean", rows_in=len(raw)) as ph:
+        raw = raw[raw["Year"].between(YEAR_MIN, YEAR_MAX)].copy()
+
+        df_gen = raw[raw["Category"] == "Electricity generation"]
+        df_em  = raw[raw["Category"] == "Power sector emissions"]
+        ph.rows_out = len(df_gen) + len(df_em)
+
+    with ctx.phase("merge", rows_in=ph.rows_out) as ph:
+        df = (
+            df_gen.merge(
+                df_em,
+                on=["Area", *code_col, "Year", "Variable"],
+                how="outer",
+                suffixes=("_gen", "_em")
+            )
+            .rename(columns={
+                "Area":     "country",
+                "ISO 3 code": "code",
+                "Variable": "power_source",
+                "Value_gen": "power_generation",
+                "Value_em":  "co2_emission"
+            })
+        )
+        ph.rows_out = len(df)
+
+    # ─────────────────────────────
+    # Mapeamento de entidades
+    # ─────────────────────────────
+    with ctx.phase("map", rows_in=len(df)) as ph:
+        power_map = {k: ctx.power_map.get(v) for k, v in var_to_power.items()}
+
+        df["country_id"]  = ctx.country_ids(df["country"], df.get("code"), source=CSV_PATH)
+        df["power_id"]    = df["power_source"].map(power_map)
+        df["year"]        = df["Year"].astype(int)
+
+        df = df.dropna(subset=["country_id", "power_id", "year"])
+        df = df.astype({"country_id": int, "power_id": int})
+
+        for col in ["power_generation", "co2_emission"]:
+            df[col] = pd.to_numeric(df[col], errors="coerce").round(2)
+
+        df_cp = (
+            df[["country_id", "power_id", "year", "power_generation", "co2_emission"]]
+            .dropna(subset=["power_generation", "co2_emission"], how="all")
+            .drop_duplicates()
+        )
+        ph.rows_out = len(df_cp)
+
+    # ─────────────────────────────
+    # UPSERT em lote (COPY + merge) na Power Source_Country
+    # ─────────────────────────────
+    ctx.write(
+        df_cp.rename(columns={"country_id": "Country_ID_Country",
+                              "power_id": "Power Source_ID_Power",
+                              "year": "Year",
+                              "power_generation": "Power_Generation",
+                              "co2_emission": "CO2_Emission"}),
+        "Power Source_Country",
+        keys=["Country_ID_Country", "Power Source_ID_Power", "Year"],
     )
-    .rename(columns={
-        "Area":     "country",
-        "Variable": "power_source",
-        "Value_gen": "power_generation",
-        "Value_em":  "co2_emission"
-    })
-)
-
-# Normalize
-def normalize(txt):
-    return unicodedata.normalize("NFKD", txt).encode("ascii", "ignore").decode().strip()
-
-df["country_id"]  = df["country"].map(country_map)
-df["power_id"]    = df["power_source"].map(power_map)
-df["year"]        = df["Year"].astype(int)
-
-df = df.dropna(subset=["country_id", "power_id", "year"])
-
-for col in ["power_generation", "co2_emission"]:
-    df[col] = pd.to_numeric(df[col], errors="coerce").round(2)
-
-df_cp = (
-    df[["country_id", "power_id", "year", "power_generation", "co2_emission"]]
-    .dropna(subset=["power_generation", "co2_emission"], how="all")
-    .drop_duplicates()
-)
-
-# ─────────────────────────────
-# UPSERT direto na Power Source_Country
-# ─────────────────────────────
-with engine.begin() as conn:
-    for row in df_cp.itertuples(index=False):
-        col_map = {}
-        if row.power_generation is not None:
-            col_map['"Power_Generation"'] = row.power_generation
-        if row.co2_emission is not None:
-            col_map['"CO2_Emission"'] = row.co2_emission
-
-        if not col_map:
-            continue
-
-        col_names    = ", ".join(col_map.keys())
-        placeholders = ", ".join(f":{k.strip('\"').lower()}" for k in col_map)
-        params       = {k.strip('\"').lower(): v for k, v in col_map.items()}
-
-        # Campos obrigatórios
-        params.update({
-            "country_id": int(row.country_id),
-            "power_id":   int(row.power_id),
-            "yr":         int(row.year)
-        })
-
-        insert_sql = text(f"""
-            INSERT INTO "Power Source_Country"
-                ("Country_ID_Country", "Power Source_ID_Power", "Year", {col_names})
-            VALUES
-                (:country_id, :power_id, :yr, {placeholders})
-            ON CONFLICT ("Country_ID_Country", "Power Source_ID_Power", "Year") DO UPDATE
-            SET {', '.join(f'{k} = COALESCE(EXCLUDED.{k}, "Power Source_Country".{k})' for k in col_map)}
-        """)
-        conn.execute(insert_sql, params)
-
-print(f"{len(df_cp)} registros inseridos/atualizados em 'Power Source_Country'")
+
+    print(f"{len(df_cp)} registros inseridos/atualizados em 'Power Source_Country'")
+    return len(df_cp)
+
+
+if __name__ == "__main__":
+    run_standalone(load_country_power_source)
@@ -1,49 +1,121 @@
 #!/usr/bin/env python3
 """
-Script mestre para criar e popular todo o banco de dados  (versão 3)
+Script mestre para criar e popular todo o banco de dados  (versão 5)
 --------------------------------------------------------------------
 Fluxo:
-1. Cria as tabelas a partir de Modelos/model_db.sql.
-2. Executa scripts de dimensões básicas:
-      • populate_country.py
-      • populate_sector.py
-3. Insere os registros‐semente de Power Source.
-4. Executa scripts de fatos / pontes:
-      • populate_sector_country.py
-      • populate_country_power_source.py
-5. Executa scripts de indicadores:
-      • populate_environmental.py
-      • populate_Development.py
-      • populate_Investment.py
-      • populate_power_consumed.py
-      • populate_demography.py
+1. Cria as tabelas a partir de Modelos/modeloFisico.sql e aplica as
+   migrações pendentes de Modelos/migrations/ (chaves e índices).
+2. Importa os loaders registrados (registry.LOADER_MODULES) e os executa
+   como um DAG de dependências. Etapas cujas dependências já terminaram
+   rodam ao mesmo tempo:
+
+      country ─┬─ environmental / development / investment /
+               │  power_consumed / demography
+               ├─ sector_country ◄── sector
+               └─ country_power_source ◄── power_source
+
+   Todas as etapas recebem o mesmo LoadContext: um engine com pool e os
+   mapas de Country / Sector / Power Source, consultados uma única vez.
+3. Carga incremental: o manifesto (public.load_manifest) guarda o hash de
+   cada arquivo lido, do código comum da carga e dos aliases de país
+   (country_alias). Uma etapa cujas entradas não mudaram, e cujas
+   dependências também foram puladas, não é executada; nas demais só as
+   linhas que diferem são gravadas. `--full` ignora o manifesto e refaz o
+   upsert completo de todas as etapas.
+4. Cria as views materializadas de Modelos/views.sql e, ao final, faz o
+   REFRESH CONCURRENTLY só das views cujas tabelas de origem foram gravadas
+   nesta rodada (ver views.py).
+5. Imprime a linha do tempo de cada etapa, o caminho crítico, o tempo de
+   cada fase (read, clean, map, merge, validate, write) de cada etapa e as
+   métricas do pool de conexões (db.py; com --executor process, somadas as
+   dos workers). As linhas barradas pela validação (quality.py) ficam em
+   public.load_quarantine.
+
+Uso:
+    python populate_scripts/populate_db.py [--workers N] [--executor thread|process] [--full]
+                                           [--partitioned decade|year] [--swap-partitions]
+                                           [--metrics arquivo.jsonl]
+                                           [--profile cprofile|pyinstrument]
+                                           [--backend sync|asyncpg] [--async-pool N]
+                                           [--embedded arquivo.duckdb|arquivo.sqlite]
+                                           [--rebuild]
+
+`--partitioned` converte Sector_Country e Power Source_Country em tabelas
+particionadas por "Year" (uma vez; ver partitions.py). Com
+`--swap-partitions --full`, essas tabelas são recarregadas trocando partições
+inteiras (DETACH/ATTACH) em vez do upsert.
+
+As fases de cada etapa são medidas por instrument.py (tempo de parede e de
+CPU, linhas, memória e idas ao banco) e gravadas em JSON lines em
+`--metrics` (padrão: .cache/metrics/populate-<rodada>.jsonl). `--profile`
+grava também um perfil (cProfile ou pyinstrument) de cada fase em
+.cache/profiles/<rodada>/.
+
+`--backend asyncpg` (requer asyncpg; ver async_load.py) grava as tabelas de
+indicadores por um pool asyncpg em paralelo: a etapa entrega o DataFrame ao
+loop assíncrono e o worker já passa à leitura e limpeza da próxima etapa; a
+etapa só conta como concluída quando as suas gravações terminam.
+
+`--rebuild` faz uma recarga completa das tabelas de fatos em tabelas-sombra
+(esquema `rebuild`): COPY sem índices, chaves e índices criados no fim e uma
+troca atômica de esquemas; as Consultas seguem lendo a geração anterior até
+a troca (ver rebuild.py, que também faz `status` e `rollback`).
+
+`--embedded` copia, ao final, o esquema e os dados para um arquivo DuckDB
+(ou SQLite) em que as Consultas rodam sem servidor (ver embedded.py e
+Consultas/dialect.py).
+
+`--workers` (ou a variável POPULATE_WORKERS) define quantas etapas rodam ao
+mesmo tempo; com 1 worker elas rodam em sequência. O pool do engine tem
+`--workers` conexões; as demais opções do pool (overflow, recycle,
+statement_timeout, modo PgBouncer) vêm das variáveis DB_* de db.py, e cada
+conexão aparece no pg_stat_activity com o nome da etapa. O executor "thread"
+(padrão) compartilha engine e mapas no mesmo processo; "process" usa um pool
+de processos em que cada worker monta o seu contexto uma única vez.
 """
 
 from __future__ import annotations
-import os, sys, subprocess
+import argparse, multiprocessing, os, sys, time
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
 from pathlib import Path
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from sqlalchemy import text
+
+import async_load, db, embedded, instrument, manifest, migrations, partitions, rebuild, views
+from registry import LoadContext, Loader, import_loaders, new_context, setup_logging
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+MODEL_SQL = ROOT / "../Modelos/modeloFisico.sql"
+
 
 # ───────────────────────────────────────────────────────────────
-# 0. Conexão
+# DAG de etapas
 # ───────────────────────────────────────────────────────────────
-load_dotenv()
-DB_URL = os.getenv("DB_URL")
-if not DB_URL:
-    sys.exit("Variável de ambiente DB_URL não definida!")
-
-engine = create_engine(
-    DB_URL,
-    echo=os.getenv("DB_ECHO", "false").lower() in {"1", "true", "yes"},
-    pool_pre_ping=True,
-)
-ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+def check_dag(stages: dict[str, Loader]) -> None:
+    """Garante que toda dependência existe e que não há ciclos."""
+    for s in stages.values():
+        for d in s.deps:
+            if d not in stages:
+                sys.exit(f"Etapa '{s.name}' depende de '{d}', que não existe")
+
+    state: dict[str, int] = {}  # 1 = visitando, 2 = ok
+    def visit(name: str, path: tuple[str, ...]) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            sys.exit("Ciclo no DAG de carga: " + " → ".join(path + (name,)))
+        state[name] = 1
+        for d in stages[name].deps:
+            visit(d, path + (name,))
+        state[name] = 2
+    for name in stages:
+        visit(name, ())
+
 
 # ───────────────────────────────────────────────────────────────
 # Helpers
 # ───────────────────────────────────────────────────────────────
-def run_sql_file(path: Path) -> None:
+def run_sql_file(engine, path: Path) -> None:
     """Executa todas as instruções de um .sql (separadas por ';')."""
     sql_text = path.read_text(encoding="utf-8")
     stmts = [s.strip() for s in sql_text.split(";") if s.strip()]
@@ -52,68 +124,261 @@ def run_sql_file(path: Path) -> None:
             conn.execute(text(stmt))
     print(f"{path.name}: {len(stmts)} statements executados")
 
-def run_sql(sql: str | list[str]) -> None:
-    if isinstance(sql, str):
-        sql = [sql]
-    with engine.begin() as conn:
-        for stmt in sql:
-            conn.execute(text(stmt))
+def run_stage(ctx: LoadContext, stage: Loader) -> tuple[float, float] | Future:
+    """
+    Executa o loader da etapa e registra suas entradas; devolve (início, fim).
+    Com gravações assíncronas pendentes devolve um Future com o mesmo par,
+    resolvido quando elas terminam (as entradas só são registradas depois).
+    """
+    start = time.time()
+    print(f"\n🚀  {stage.name}", flush=True)
+    digests = manifest.input_digests(stage.inputs, ctx.engine, stage.tables)
+    with db.stage(stage.name), instrument.phase(stage.name, "total") as ph:
+        ph.rows_out = stage.func(ctx.for_stage(stage.name))
 
-def run_script(py_file: str | Path) -> None:
-    """Executa outro script Python com o mesmo interpretador."""
-    path = (ROOT / py_file) if not Path(py_file).is_absolute() else Path(py_file)
-    if not path.exists():
-        sys.exit(f"Script não encontrado: {py_file}")
-    print(f"\n🚀  {path.name}")
-    subprocess.run([sys.executable, str(path)], check=True)
+    def finish() -> tuple[float, float]:
+        if ctx.deferred is not None:     # --rebuild: gravado só na troca
+            ctx.deferred.extend((stage.name, src, "input", digest, rows)
+                                for src, (digest, rows) in digests.items())
+        else:
+            manifest.record_inputs(ctx.engine, stage.name, digests)
+        return start, time.time()
 
-# ───────────────────────────────────────────────────────────────
-# 1. Criação das tabelas
-# ───────────────────────────────────────────────────────────────
-MODEL_SQL = ROOT / "../Modelos/modeloFisico.sql"
-if not MODEL_SQL.exists():
-    sys.exit("modeloFisico.sql não encontrado!")
-run_sql_file(MODEL_SQL)
+    writes = ctx.pending_writes(stage.name)
+    return ctx.writer.then(writes, finish) if writes else finish()
+
+def can_skip(ctx: LoadContext, stage: Loader, ran: set[str]) -> bool:
+    """Entradas inalteradas e nenhuma dependência executada nesta rodada."""
+    if not ctx.incremental or any(d in ran for d in stage.deps):
+        return False
+    digests = manifest.input_digests(stage.inputs, ctx.engine, stage.tables)
+    return manifest.inputs_unchanged(ctx.engine, stage.name, digests)
+
+# Executor "process": cada worker monta o seu contexto uma única vez
+_worker_ctx: LoadContext | None = None
+
+def _init_worker(incremental: bool, swap: bool) -> None:
+    global _worker_ctx
+    sys.path.insert(0, str(ROOT))
+    setup_logging()
+    import_loaders()
+    _worker_ctx = new_context(pool_size=1, incremental=incremental, swap=swap)
+
+def _run_in_worker(name: str) -> tuple[tuple[float, float], dict]:
+    """(início, fim) da etapa e as métricas do pool do worker desde a anterior."""
+    from registry import LOADERS
+    return run_stage(_worker_ctx, LOADERS[name]), db.metrics().drain()
 
-# ───────────────────────────────────────────────────────────────
-# 2. Dimensões básicas
-# ───────────────────────────────────────────────────────────────
-for script in (
-    "populate_country.py",
-    "populate_sector.py",
-):
-    run_script(script)
 
 # ───────────────────────────────────────────────────────────────
-# 3. Power Source (dimensão fixa) + tabelas‐ponte
+# Escalonador
 # ───────────────────────────────────────────────────────────────
-run_sql("""
-INSERT INTO public."Power Source" ("Name", "Renewable") VALUES
- ('Other renewables excluding bioenergy', true),
- ('Bioenergy', true),
- ('Solar', true),
- ('Wind', true),
- ('Hydro', true),
- ('Nuclear', false),
- ('Oil', false),
- ('Gas', false),
- ('Coal', false)
-ON CONFLICT DO NOTHING;
-""")
-
-run_script("populate_sector_country.py")
-run_script("populate_country_power_source.py")
+def run_dag(stages: dict[str, Loader], workers: int, executor: str = "thread",
+            ctx: LoadContext | None = None) -> tuple[dict[str, tuple[float, float]], set[str]]:
+    """
+    Roda as etapas respeitando as dependências.
+    Devolve ({etapa: (início, fim)}, etapas puladas pelo manifesto).
+    """
+    check_dag(stages)
+    ctx = ctx or new_context(pool_size=workers)
+    pending = dict(stages)
+    done: dict[str, tuple[float, float]] = {}
+    ran: set[str] = set()
+    skipped: set[str] = set()
+
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(ctx.incremental, ctx.swap),
+                                   mp_context=multiprocessing.get_context("spawn"))
+        submit = lambda st: pool.submit(_run_in_worker, st.name)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        submit = lambda st: pool.submit(run_stage, ctx, st)
+
+    with pool:
+        running = {}
+        while pending or running:
+            ready = [s for s in pending.values() if all(d in done for d in s.deps)]
+            for stage in ready:
+                del pending[stage.name]
+                if can_skip(ctx, stage, ran):
+                    print(f"\n⏭  {stage.name}: entradas inalteradas, etapa pulada")
+                    done[stage.name] = (time.time(), time.time())
+                    skipped.add(stage.name)
+                else:
+                    running[submit(stage)] = stage
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                stage = running.pop(fut)
+                try:
+                    result = fut.result()
+                    if executor == "process":
+                        result, pool_stats = result
+                        db.metrics().absorb(pool_stats)
+                    if isinstance(result, Future):   # gravações ainda em andamento
+                        running[result] = stage
+                        continue
+                    done[stage.name] = result
+                    ran.add(stage.name)
+                except Exception as exc:
+                    for other in running:
+                        other.cancel()
+                    sys.exit(f"💥  Etapa '{stage.name}' falhou: {exc}")
+    return done, skipped
+
+def critical_path(stages: dict[str, Loader], times: dict[str, tuple[float, float]]) -> list[str]:
+    """Cadeia de dependências com a maior soma de durações."""
+    best: dict[str, tuple[float, list[str]]] = {}
+    def longest(name: str) -> tuple[float, list[str]]:
+        if name not in best:
+            dur = times[name][1] - times[name][0]
+            prev = max((longest(d) for d in stages[name].deps),
+                       key=lambda t: t[0], default=(0.0, []))
+            best[name] = (prev[0] + dur, prev[1] + [name])
+        return best[name]
+    return max((longest(name) for name in stages), key=lambda t: t[0])[1]
+
+def print_timeline(stages: dict[str, Loader], times: dict[str, tuple[float, float]],
+                   width: int = 40) -> None:
+    t0 = min(s for s, _ in times.values())
+    total = max(e for _, e in times.values()) - t0 or 1.0
+    path = set(critical_path(stages, times))
+
+    print(f"\n{'Etapa':<22}{'início':>8}{'fim':>8}{'dur.':>8}  linha do tempo")
+    print("─" * (48 + width))
+    for name, (start, end) in sorted(times.items(), key=lambda kv: kv[1][0]):
+        a = int((start - t0) / total * width)
+        b = max(a + 1, int((end - t0) / total * width))
+        bar = " " * a + ("█" if name in path else "▒") * (b - a)
+        print(f"{name:<22}{start - t0:>7.1f}s{end - t0:>7.1f}s{end - start:>7.1f}s  |{bar:<{width}}|")
+    print(f"\nCaminho crítico (█): {' → '.join(critical_path(stages, times))}")
+    print(f"Tempo total: {total:.1f}s")
+
+def print_phases(metrics: Path) -> None:
+    """Tempo de parede de cada fase por etapa, a partir das métricas da rodada."""
+    rows = instrument.read_metrics(metrics, instrument.run_id())
+    by_stage: dict[str, dict[str, dict]] = {}
+    for r in rows:
+        by_stage.setdefault(r["loader"], {})[r["phase"]] = r
+    cols = instrument.PHASES
+    print(f"\n{'Etapa':<22}" + "".join(f"{c:>8}" for c in cols)
+          + f"{'total':>8}{'CPU':>8}{'linhas':>10}{'idas BD':>9}{'pico MB':>9}")
+    print("─" * (22 + 8 * len(cols) + 44))
+    for name, phases in by_stage.items():
+        total = phases.get("total")
+        if total is None:
+            continue
+        cells = "".join(f"{phases[c]['wall_s']:>7.2f}s" if c in phases else f"{'':>8}"
+                        for c in cols)
+        print(f"{name:<22}{cells}{total['wall_s']:>7.2f}s{total['cpu_s']:>7.2f}s"
+              f"{total['rows_out'] or 0:>10,}{total['db_round_trips']:>9}"
+              f"{total['peak_rss_mb']:>9.0f}")
+    print(f"Métricas por fase em {metrics}")
+
 
 # ───────────────────────────────────────────────────────────────
-# 4. Indicadores
+# Main
 # ───────────────────────────────────────────────────────────────
-for script in (
-    "populate_environmental.py",
-    "populate_Development.py",
-    "populate_Investment.py",
-    "populate_power_consumed.py",
-    "populate_demography.py",
-):
-    run_script(script)
-
-print("\nBanco de dados criado e populado com sucesso!")
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cria e popula o banco de dados.")
+    parser.add_argument("--workers", type=int,
+                        default=int(os.getenv("POPULATE_WORKERS", os.cpu_count() or 1)),
+                        help="etapas em paralelo (padrão: nº de CPUs)")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread",
+                        help="thread: contexto único compartilhado (padrão); "
+                             "process: um contexto por processo worker")
+    parser.add_argument("--full", action="store_true",
+                        help="ignora o manifesto e recarrega todas as etapas")
+    parser.add_argument("--partitioned", choices=list(partitions.SPANS),
+                        help="particiona as tabelas de fatos por ano (década ou ano)")
+    parser.add_argument("--swap-partitions", action="store_true",
+                        help="com --full, recarrega tabelas particionadas trocando partições")
+    parser.add_argument("--metrics", type=Path,
+                        help="arquivo JSON lines das fases (padrão: .cache/metrics/populate-<rodada>.jsonl)")
+    parser.add_argument("--profile", choices=instrument.PROFILERS,
+                        help="grava um perfil de cada fase em .cache/profiles/<rodada>/")
+    parser.add_argument("--backend", choices=async_load.BACKENDS, default="sync",
+                        help="asyncpg: grava as tabelas de indicadores em paralelo "
+                             "por um pool assíncrono")
+    parser.add_argument("--async-pool", type=int, default=4,
+                        help="conexões do pool asyncpg (padrão: 4)")
+    parser.add_argument("--embedded", type=Path,
+                        help="ao final, copia o banco para este arquivo .duckdb ou .sqlite")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recarga completa em tabelas-sombra com troca atômica (implica --full)")
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+    if args.profile and not instrument.available(args.profile):
+        sys.exit("💥  pyinstrument não está instalado (pip install pyinstrument)")
+    if args.backend == "asyncpg":
+        if not async_load.available():
+            sys.exit("💥  asyncpg não está instalado (pip install asyncpg)")
+        if args.executor == "process":
+            sys.exit("💥  --backend asyncpg só funciona com --executor thread")
+    if args.rebuild and (args.executor == "process" or args.backend != "sync"):
+        sys.exit("💥  --rebuild só funciona com --executor thread e --backend sync")
+
+    # Instrumentação: variáveis herdadas também pelos workers de --executor process
+    setup_logging()
+    run = time.strftime("%Y%m%d-%H%M%S")
+    metrics = args.metrics or Path(f".cache/metrics/populate-{run}.jsonl")
+    metrics.parent.mkdir(parents=True, exist_ok=True)
+    os.environ.update(POPULATE_RUN_ID=run, POPULATE_METRICS=str(metrics),
+                      POPULATE_EXCLUSIVE="1" if workers == 1 else "0",
+                      POPULATE_PROFILE=args.profile or "")
+
+    # 1. Criação das tabelas
+    if not MODEL_SQL.exists():
+        sys.exit("modeloFisico.sql não encontrado!")
+    ctx = new_context(pool_size=workers, incremental=not (args.full or args.rebuild),
+                      swap=args.swap_partitions, backend=args.backend,
+                      async_pool=max(1, args.async_pool), rebuild=args.rebuild)
+    with instrument.phase("populate_db", "schema"):
+        run_sql_file(ctx.engine, MODEL_SQL)
+        migrations.apply(ctx.engine)
+        if args.partitioned:
+            partitions.enable(ctx.engine, args.partitioned)
+        run_sql_file(ctx.engine, views.VIEWS_SQL)
+    if args.rebuild:
+        with instrument.phase("populate_db", "rebuild"):
+            rebuild.prepare(ctx.engine)
+
+    # 2. Etapas de carga
+    stages = import_loaders()
+    since = views.db_clock(ctx.engine)
+    try:
+        times, skipped = run_dag(stages, workers, args.executor, ctx)
+    finally:
+        if ctx.writer is not None:
+            ctx.writer.close()
+
+    # 3. Views materializadas afetadas pela carga (no --rebuild, montadas nas
+    #    sombras, que então entram no lugar das tabelas em uso)
+    print()
+    if args.rebuild:
+        with instrument.phase("populate_db", "indexes"):
+            rebuild.finish(ctx.engine)
+        with instrument.phase("populate_db", "swap"):
+            rebuild.swap(ctx.engine, ctx.deferred)
+    else:
+        with instrument.phase("populate_db", "refresh"):
+            views.refresh_changed(ctx.engine, since)
+    if args.embedded:
+        with instrument.phase("populate_db", "embedded"):
+            rows = embedded.export(ctx.engine, args.embedded)
+        print(f"Cópia embutida: {sum(rows.values())} linhas em {args.embedded}")
+    print_timeline(stages, times)
+    print_phases(metrics)
+    instrument.emit({"loader": "populate_db", "phase": "pool", **db.metrics().snapshot()})
+    print(db.report())
+    if skipped:
+        print(f"Etapas puladas (entradas inalteradas): {', '.join(sorted(skipped))}")
+
+    print("\nBanco de dados criado e populado com sucesso!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,65 @@
-import re, os
-from pathlib import Path
-import numpy as np
-import pandas as pd
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+from cleaning import to_int
+from registry import DATASETS, LoadContext, loader, run_standalone
+from source_cache import read_source
 
-
-load_dotenv()
-engine = create_engine(os.getenv("DB_URL"))
-
-PATH_POP = Path("Datasets/human-development-index-vs-gdp-per-capita.csv")
+PATH_POP = DATASETS / "human-development-index-vs-gdp-per-capita.csv"
 YEAR_MIN, YEAR_MAX = 2000, 2025           
 
-def clean_country(val) -> str:
-    if pd.isna(val):
-        return ''
-    return re.sub(r'\s+', ' ', str(val)).strip().casefold()
 
-def py_int(v):
-    if pd.isna(v):
-        return None
-    return int(v)
+@loader("demography", deps=("country",), inputs=(PATH_POP,))
+def load_demography(ctx: LoadContext) -> int:
+    # ─────────────────────────────────
+    # Leitura e processamento do CSV
+    # ─────────────────────────────────
+    with ctx.phase("read") as ph:
+        pop = (
+            read_source(PATH_POP)
+              .rename(columns={
+                  "Entity"     : "country",
+                  "Code"       : "code",
+                  "Year"       : "year",
+                  "Population (historical)" : "population"
+              })
+              [["country", "code", "year", "population"]]
+        )
+        ph.rows_out = len(pop)
 
-# ─────────────────────────────────
-# Mapeamento dos países
-# ─────────────────────────────────
-with engine.begin() as conn:
-    country_map = (
-        pd.read_sql('SELECT "ID_Country", "Name" FROM public."Country"', conn)
-          .assign(country_key=lambda d: d["Name"].apply(clean_country))
-    )
+    with ctx.phase("clean", rows_in=len(pop)) as ph:
+        pop = pop[pop["year"].between(YEAR_MIN, YEAR_MAX)].copy()
+        pop["population"]  = to_int(pop["population"])
+        ph.rows_out = len(pop)
 
-# ─────────────────────────────────
-# Leitura e processamento do CSV
-# ─────────────────────────────────
-pop = (
-    pd.read_csv(PATH_POP)
-      .rename(columns={
-          "Entity"     : "country",
-          "Year"       : "year",
-          "Population (historical)" : "population"
-      })
-      [["country", "year", "population"]]
-)
-pop = pop[pop["year"].between(YEAR_MIN, YEAR_MAX)].copy()
-pop["country_key"] = pop["country"].apply(clean_country)
-pop["population"]  = pop["population"].apply(py_int)
+    # ─────────────────────────────────
+    # Merge com ID do país
+    # ─────────────────────────────────
+    with ctx.phase("map", rows_in=len(pop)) as ph:
+        pop["ID_Country"] = ctx.country_ids(pop["country"], pop["code"], source=PATH_POP)
+        df = pop.dropna(subset=["ID_Country"])
+        ph.rows_out = len(df)
 
-# ─────────────────────────────────
-# Merge com ID do país
-# ─────────────────────────────────
-df = (
-    pop
-    .merge(country_map[["ID_Country", "country_key"]], on="country_key", how="inner")
-)
+    with ctx.phase("merge", rows_in=len(df)) as ph:
+        df_final = (
+            df[["ID_Country", "year", "population"]]
+              .dropna(subset=["population"])
+              .drop_duplicates(subset=["ID_Country", "year"])
+              .reset_index(drop=True)
+        )
+        ph.rows_out = len(df_final)
+
+    # ─────────────────────────────────
+    # UPSERT em lote (COPY + merge) em Demography
+    # ─────────────────────────────────
+    ctx.write(
+        df_final.rename(columns={"ID_Country": "Country_ID",
+                                 "year": "Year",
+                                 "population": "Population"}),
+        "Demography",
+        keys=["Country_ID", "Year"],
+    )
 
-df_final = (
-    df[["ID_Country", "year", "population"]]
-      .dropna(subset=["population"])
-      .drop_duplicates(subset=["ID_Country", "year"])
-      .reset_index(drop=True)
-)
+    print(f"{len(df_final)} registros inseridos/atualizados em 'Demography'")
+    return len(df_final)
 
-# ─────────────────────────────────
-# UPSERT direto em Demography
-# ─────────────────────────────────
-with engine.begin() as conn:
-    for row in df_final.itertuples(index=False):
-        insert_sql = text("""
-            INSERT INTO "Demography"
-                ("Country_ID", "Year", "Population")
-            VALUES
-                (:country_id, :year, :population)
-            ON CONFLICT ("Country_ID", "Year") DO UPDATE
-            SET "Population" = EXCLUDED."Population"
-        """)
-        conn.execute(insert_sql, {
-            "country_id": int(row.ID_Country),
-            "year":       int(row.year),
-            "population": int(row.population),
-        })
 
-print(f"{len(df_final)} registros inseridos/atualizados em 'Demography'")
+if __name__ == "__main__":
+    run_standalone(load_demography)
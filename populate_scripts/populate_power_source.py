@@ -0,0 +1,39 @@
+from sqlalchemy import text
+import manifest
+from registry import LoadContext, loader, run_standalone
+
+# Power Source é uma dimensão fixa: registros-semente
+SEED = """
+INSERT INTO public."Power Source" ("Name", "Renewable")
+SELECT v."Name", v."Renewable"
+FROM (VALUES
+ ('Other renewables excluding bioenergy', true),
+ ('Bioenergy', true),
+ ('Solar', true),
+ ('Wind', true),
+ ('Hydro', true),
+ ('Nuclear', false),
+ ('Oil', false),
+ ('Gas', false),
+ ('Coal', false)
+) AS v("Name", "Renewable")
+WHERE NOT EXISTS (
+    SELECT 1 FROM public."Power Source" p WHERE p."Name" = v."Name"
+);
+"""
+
+
+@loader("power_source")
+def load_power_source(ctx: LoadContext) -> int:
+    with ctx.phase("write") as ph, ctx.engine.begin() as conn:
+        ph.rows_out = n = conn.execute(text(SEED)).rowcount
+        if n:
+            manifest.bump_version(conn, "Power Source")
+    ctx.invalidate("power")
+
+    print("Tabela 'Power Source' populada com sucesso!")
+    return n
+
+
+if __name__ == "__main__":
+    run_standalone(load_power_source)
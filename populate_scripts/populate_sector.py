@@ -1,21 +1,36 @@
-import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os
+import manifest
+from registry import DATASETS, LoadContext, loader, run_standalone
+from source_cache import read_source
 
-load_dotenv()
+EDGAR = DATASETS / "EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx"
 
-DB_URL = os.getenv("DB_URL")
-engine = create_engine(DB_URL)
 
-edgar = pd.read_excel("./Datasets/EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx", sheet_name="fossil_CO2_by_sector_country_su")
+@loader("sector", inputs=(EDGAR,))
+def load_sector(ctx: LoadContext) -> int:
+    with ctx.phase("read") as ph:
+        edgar = read_source(EDGAR, sheet_name="fossil_CO2_by_sector_country_su")
+        ph.rows_out = len(edgar)
 
-df_setor = edgar[['Sector']].dropna().drop_duplicates()
-df_setor = df_setor.rename(columns={'Sector': 'Name'})
+    with ctx.phase("clean", rows_in=len(edgar)) as ph:
+        df_setor = edgar[['Sector']].dropna().drop_duplicates()
+        df_setor = df_setor.rename(columns={'Sector': 'Name'})
 
-df_setor['Name'] = df_setor['Name'].str.slice(0, 100)
+        df_setor['Name'] = df_setor['Name'].str.slice(0, 100)
 
-with engine.begin() as conn:
-    df_setor.to_sql('Sector', conn, if_exists='append', index=False)
+        # Só insere nomes novos (a etapa pode ser executada de novo)
+        df_setor = df_setor[~df_setor['Name'].isin(ctx.sector_map['Name'])]
+        ph.rows_out = len(df_setor)
 
-print("Tabela 'Setor' populada com sucesso!")
+    with ctx.phase("write", rows_in=len(df_setor)) as ph, ctx.engine.begin() as conn:
+        df_setor.to_sql('Sector', conn, if_exists='append', index=False)
+        if len(df_setor):
+            manifest.bump_version(conn, "Sector")
+        ph.rows_out = len(df_setor)
+    ctx.invalidate("sector")
+
+    print("Tabela 'Setor' populada com sucesso!")
+    return len(df_setor)
+
+
+if __name__ == "__main__":
+    run_standalone(load_sector)
@@ -2,29 +2,24 @@
 """
 Popula public."Sector_Country" a partir do EDGAR
 -----------------------------------------------
-Atualizado para o modelo sem tabela Year
+Atualizado para o modelo sem tabela Year. A planilha (um ano por coluna) é
+convertida para o formato longo de forma vetorizada e gravada em lote.
 """
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os, unicodedata, logging
-from pathlib import Path
+import logging
+from cleaning import normalize_ascii
+from registry import DATASETS, LoadContext, loader, run_standalone
+from source_cache import read_source
 
-load_dotenv()
-DB_URL = os.getenv("DB_URL")
-if not DB_URL:
-    raise RuntimeError("💥  Defina DB_URL no ambiente ou no .env")
-
-engine = create_engine(DB_URL, pool_pre_ping=True)
-
-DATAFILE = Path("./Datasets/EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx")
+DATAFILE = DATASETS / "EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx"
 SHEET    = "fossil_CO2_by_sector_country_su"
 
-# ────────────────
-# Leitura e limpeza do DataFrame
-# ────────────────
-df = pd.read_excel(DATAFILE, sheet_name=SHEET)
+# Remove agregações globais
+AGGREGATES = {"GLOBAL TOTAL", "OECD TOTAL", "NON-OECD TOTAL", "EU27"}
+KEYS = ["Sector_ID_Sector", "Country_ID_Country", "Year"]
+
 
 def clean_col(col):
     if isinstance(col, str):
@@ -32,34 +27,6 @@ def clean_col(col):
     if isinstance(col, float) and col.is_integer():
         return int(col)
     return col
-df.columns = df.columns.map(clean_col)
-
-# Remove agregações globais
-AGGREGATES = {"GLOBAL TOTAL", "OECD TOTAL", "NON-OECD TOTAL", "EU27"}
-df = df[~df["EDGAR Country Code"].str.upper().isin(AGGREGATES)].copy()
-
-# ────────────────
-# Normalização de textos
-# ────────────────
-def normalize(val) -> str:
-    if pd.isna(val):
-        return ""
-    if not isinstance(val, str):
-        val = str(val)
-    return (
-        unicodedata.normalize("NFKD", val)
-        .encode("ascii", "ignore")
-        .decode()
-        .upper()
-        .strip()
-    )
-
-with engine.begin() as conn:
-    countries = pd.read_sql('SELECT "ID_Country", "Name" FROM public."Country";', conn)
-    country_id_map = dict(zip(countries["Name"].apply(normalize), countries["ID_Country"]))
-
-    sectors = pd.read_sql('SELECT "ID_Sector", "Name" FROM public."Sector";', conn)
-    sector_id_map = dict(zip(sectors["Name"].apply(normalize), sectors["ID_Sector"]))
 
 # ────────────────
 # Identifica colunas de ano válidas
@@ -71,59 +38,80 @@ def is_year_col(col):
     except (TypeError, ValueError):
         return False
 
-available_years = [
-    int(float(c)) for c in df.columns if is_year_col(c)
-]
 
-# ────────────────
-# Geração dos registros prontos para inserção
-# ────────────────
-records, missing_countries, missing_sectors = [], set(), set()
-
-for _, row in df.iterrows():
-    sector_key  = normalize(row["Sector"])
-    country_key = normalize(row["Country"])
-
-    sector_id  = sector_id_map.get(sector_key)
-    country_id = country_id_map.get(country_key)
-
-    if not sector_id:
-        missing_sectors.add(row["Sector"])
-        continue
-    if not country_id:
-        missing_countries.add(row["Country"])
-        continue
-
-    for year in available_years:
-        emission = row.get(year)
-        if pd.notnull(emission):
-            records.append({
-                "Sector_ID_Sector":   int(sector_id),
-                "Country_ID_Country": int(country_id),
-                "Year":               int(year),
-                "CO2_Emission":       round(float(emission), 2),
-            })
+def to_long(df: pd.DataFrame, year_cols: list) -> pd.DataFrame:
+    """
+    Uma linha por (setor, país, ano) com emissão não nula, a partir das
+    colunas sector_id, country_id e das colunas de ano da planilha.
+    Pares (setor, país) repetidos na planilha ficam com a última linha.
+    """
+    values = df[year_cols].to_numpy(dtype=float)
+    row, col = np.nonzero(~np.isnan(values))
+    years = np.array([int(float(c)) for c in year_cols], dtype=np.int64)
+    return (
+        pd.DataFrame({
+            "Sector_ID_Sector":   df["sector_id"].to_numpy(dtype=np.int64)[row],
+            "Country_ID_Country": df["country_id"].to_numpy(dtype=np.int64)[row],
+            "Year":               years[col],
+            "CO2_Emission":       values[row, col].round(2),
+        })
+        .drop_duplicates(subset=KEYS, keep="last")
+        .reset_index(drop=True)
+    )
 
-# ────────────────
-# Inserção em lote
-# ────────────────
-if records:
-    df_final = pd.DataFrame(records)
-    with engine.begin() as conn:
-        df_final.to_sql(
-            "Sector_Country",
-            conn,
-            schema="public",
-            if_exists="append",
-            index=False,
-            method="multi"
-        )
-    logging.info("✅ Inseridas %d linhas em Sector_Country", len(df_final))
-else:
-    logging.warning("⚠️  Nada a inserir")
-
-# Dica de debugging se quiser ver faltantes:
-if missing_countries:
-    print("Países não encontrados:", sorted(missing_countries))
-if missing_sectors:
-    print("Setores não encontrados:", sorted(missing_sectors))
+
+@loader("sector_country", deps=("country", "sector"), inputs=(DATAFILE,))
+def load_sector_country(ctx: LoadContext) -> int:
+    # ────────────────
+    # Leitura e limpeza do DataFrame
+    # ────────────────
+    with ctx.phase("read") as ph:
+        df = read_source(DATAFILE, sheet_name=SHEET)
+        ph.rows_out = len(df)
+
+    with ctx.phase("clean", rows_in=len(df)) as ph:
+        df.columns = df.columns.map(clean_col)
+        df = df[~df["EDGAR Country Code"].str.upper().isin(AGGREGATES)].copy()
+        df["sector_key"]  = normalize_ascii(df["Sector"])
+
+        available_years = [c for c in df.columns if is_year_col(c)]
+        ph.rows_out = len(df)
+
+    # ────────────────
+    # IDs de setor e país por linha da planilha
+    # ────────────────
+    with ctx.phase("map", rows_in=len(df)) as ph:
+        df["country_id"] = ctx.country_ids(df["Country"], df["EDGAR Country Code"], source=DATAFILE)
+        sectors = ctx.sector_map
+        sector_id_map = dict(zip(normalize_ascii(sectors["Name"]), sectors["ID_Sector"]))
+        df["sector_id"] = df["sector_key"].map(sector_id_map).astype("Int64")
+
+        missing_sectors = df.loc[df["sector_id"].isna(), "Sector"].dropna().unique()
+        df = df.dropna(subset=["sector_id", "country_id"])
+        ph.rows_out = len(df)
+
+    # ────────────────
+    # Formato largo (um ano por coluna) → longo (uma linha por ano)
+    # ────────────────
+    with ctx.phase("merge", rows_in=len(df)) as ph:
+        df_final = to_long(df, available_years)
+        ph.rows_out = len(df_final)
+
+    # ────────────────
+    # UPSERT em lote (COPY + merge) na chave (setor, país, ano)
+    # ────────────────
+    if len(df_final):
+        ctx.write(df_final, "Sector_Country", keys=KEYS)
+        logging.info("✅ Inseridas %d linhas em Sector_Country", len(df_final))
+    else:
+        logging.warning("⚠️  Nada a inserir")
+
+    # Dica de debugging se quiser ver faltantes (países: ver countries.py unresolved)
+    if len(missing_sectors):
+        print("Setores não encontrados:", sorted(missing_sectors))
+
+    return len(df_final)
+
+
+if __name__ == "__main__":
+    run_standalone(load_sector_country)
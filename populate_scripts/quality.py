@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Validação dos dados antes da gravação
+-------------------------------------
+`ctx.write` passa cada DataFrame final por regras declarativas antes de
+gravá-lo (fase "validate" da etapa). As regras de tipo vêm das colunas de
+Modelos/modeloFisico.sql; as de plausibilidade, de RANGES:
+
+  • type      — valor que não é número numa coluna numérica;
+  • numeric   — não cabe em numeric(p, s) depois de arredondado para s
+                casas (o COPY falharia no fim da etapa), ou é infinito;
+  • integer   — fora da faixa de integer/bigint ou com parte fracionária;
+  • not null  — nulo numa coluna NOT NULL ou numa chave do upsert;
+  • year      — "Year"/"Ano" fora de YEAR_FIRST até o ano corrente;
+  • range     — fora da faixa plausível do indicador (RANGES);
+  • unique    — chave repetida entre as linhas que passaram nas demais
+                regras (fica a última ocorrência, como no merge).
+
+Cada regra é avaliada sobre a coluna inteira (numpy), sem laço por linha.
+As linhas que violam alguma regra saem do lote e vão para
+public.load_quarantine, com as regras violadas e a linha em JSON. A
+quarentena é substituída a cada gravação de (loader, tabela), então
+mostra sempre a última carga. Na carga incremental (bulk_load.sync_frame)
+as chaves das linhas barradas não são apagadas do banco: a linha gravada por
+uma carga anterior fica até a fonte voltar a ser válida. A etapa segue com as linhas válidas e imprime
+quantas linhas cada regra barrou; as contagens também vão para o arquivo
+de métricas (fase "quality").
+
+Uso (a partir da raiz do repositório):
+    python populate_scripts/quality.py rules [--table Investment]
+    python populate_scripts/quality.py quarantine [--loader investment] [--limit 20]
+"""
+
+from __future__ import annotations
+import argparse, re, time, warnings
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+import instrument
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+MODEL_SQL = ROOT / "../Modelos/modeloFisico.sql"
+
+YEAR_FIRST = 1750                # início das séries históricas de CO2
+YEAR_COLUMNS = ("Year", "Ano")
+INT_BOUNDS = {"integer": (-2**31, 2**31 - 1), "bigint": (-2**63, 2**63 - 1)}
+
+# Faixas plausíveis por tabela e coluna: (mínimo, máximo); None = sem limite.
+# IDH e os indicadores do gMPI são gravados ×1000 e ×10 (populate_Development.py);
+# PowerImport (importação líquida, % do uso) passa de 100 e fica negativa nos dados reais.
+RANGES: dict[str, dict[str, tuple[float | None, float | None]]] = {
+    "Environmental Indicator": {"CO2_Emision": (0, None)},
+    "Investment": {"GDP": (0, None), "Investment_Energy": (0, None),
+                   "Health_Expenditure": (0, 100)},
+    "Development": {"IDH": (0, 1000), "Electricity": (0, 1000), "Sanitation": (0, 1000),
+                    "Health": (0, 1000), "Standard_Living": (0, 1000)},
+    "Power Consumed": {"GWH": (0, None), "Renewable_Energy": (0, 100)},
+    "Power Source_Country": {"CO2_Emission": (0, None), "Power_Generation": (0, None)},
+    "Demography": {"Population": (0, 10**10)},
+}
+
+TABLE_RE = re.compile(r'CREATE TABLE IF NOT EXISTS public\.(?:"([^"]+)"|(\w+))\s*\((.*?)\n\);',
+                      re.S)
+COLUMN_RE = re.compile(r'^\s*"([^"]+)"\s+'
+                       r'(numeric\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)|integer|bigint|serial)([^,]*)',
+                       re.I | re.M)
+
+
+# ───────────────────────────────────────────────────────────────
+# Regras
+# ───────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Rule:
+    kind: str                     # type, numeric, integer, not null, year, range, unique
+    columns: tuple[str, ...]
+    lo: float | None = None
+    hi: float | None = None
+    label: str = ""
+
+
+@lru_cache(maxsize=1)
+def schema() -> dict[str, dict[str, tuple]]:
+    """{tabela: {coluna: (tipo, precisão, escala, not null)}} de modeloFisico.sql."""
+    out: dict[str, dict[str, tuple]] = {}
+    for m in TABLE_RE.finditer(MODEL_SQL.read_text(encoding="utf-8")):
+        cols = out.setdefault(m.group(1) or m.group(2), {})
+        for c in COLUMN_RE.finditer(m.group(3)):
+            kind = "numeric" if c.group(3) else c.group(2).lower()
+            precision = int(c.group(3)) if c.group(3) else None
+            scale = int(c.group(4)) if c.group(4) else None
+            not_null = "NOT NULL" in c.group(5).upper() or "PRIMARY KEY" in c.group(5).upper()
+            cols[c.group(1)] = (kind, precision, scale, not_null)
+    return out
+
+
+@lru_cache(maxsize=None)
+def rules_for(table: str, keys: tuple[str, ...] = ()) -> tuple[Rule, ...]:
+    """Regras de `table`: tipos do esquema, anos, faixas plausíveis e a chave do upsert."""
+    rules: list[Rule] = []
+    for col, (kind, precision, scale, not_null) in schema().get(table, {}).items():
+        if kind == "serial":        # preenchida pelo banco
+            continue
+        rules.append(Rule("type", (col,), label=f"{col} numérico"))
+        if kind == "numeric":
+            # |x| arredondado para `scale` casas precisa ficar abaixo de 10^(p - s)
+            limit = 10.0 ** (precision - scale) - 0.5 * 10.0 ** -scale
+            rules.append(Rule("numeric", (col,), hi=limit,
+                              label=f"{col} numeric({precision},{scale})"))
+        else:
+            lo, hi = INT_BOUNDS[kind]
+            rules.append(Rule("integer", (col,), lo, hi, label=f"{col} {kind}"))
+        if not_null or col in keys:
+            rules.append(Rule("not null", (col,), label=f"{col} não nulo"))
+        if col in YEAR_COLUMNS:
+            last = date.today().year
+            rules.append(Rule("year", (col,), YEAR_FIRST, last, label=f"{col} {YEAR_FIRST}–{last}"))
+    for col, (lo, hi) in RANGES.get(table, {}).items():
+        bounds = (f"≥ {lo:g}" if hi is None else f"≤ {hi:g}" if lo is None
+                  else f"{lo:g}–{hi:g}")
+        rules.append(Rule("range", (col,), lo, hi, label=f"{col} {bounds}"))
+    if keys:
+        rules.append(Rule("unique", tuple(keys), label=f"único ({', '.join(keys)})"))
+    return tuple(rules)
+
+
+def _numeric(s: pd.Series) -> tuple[np.ndarray, np.ndarray, bool]:
+    """
+    (valores, máscara dos valores que não são números, exato). Colunas de
+    inteiros numpy (sem nulos) ficam como estão e marcadas como exatas; as
+    demais viram float com NaN.
+    """
+    if pd.api.types.is_integer_dtype(s) and isinstance(s.dtype, np.dtype):
+        return s.to_numpy(), np.zeros(len(s), dtype=bool), True
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s.to_numpy(dtype=float, na_value=np.nan), np.zeros(len(s), dtype=bool), False
+    x = pd.to_numeric(s, errors="coerce")
+    return (x.to_numpy(dtype=float, na_value=np.nan), (x.isna() & s.notna()).to_numpy(),
+            False)
+
+
+def _outside(x: np.ndarray, lo: float | None, hi: float | None) -> np.ndarray:
+    """x < lo ou x > hi; min/max antes, para só varrer a coluna se algo sai da faixa."""
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)    # coluna toda nula
+        low, high = (np.nanmin(x), np.nanmax(x)) if len(x) else (0, 0)
+    out = np.zeros(len(x), dtype=bool)
+    if lo is not None and low < lo:
+        out |= x < lo
+    if hi is not None and high > hi:
+        out |= x > hi
+    return out
+
+
+def _key_codes(keys: list[tuple[np.ndarray, np.ndarray, bool]]) -> tuple[np.ndarray, int] | None:
+    """
+    Chave composta de inteiros num único int64 (base mista) e o nº de códigos
+    possíveis, para deduplicar por uma coluna só; valores nulos, não inteiros
+    ou não numéricos ficam todos num mesmo código extra. None se a combinação
+    não couber em 62 bits.
+    """
+    code, mult = np.zeros(len(keys[0][0]), dtype=np.int64), 1
+    for x, bad_type, exact in keys:
+        ok = None if exact else np.isfinite(x) & (x == np.trunc(x)) & ~bad_type
+        valid = x if ok is None else x[ok]
+        lo, hi = (int(valid.min()), int(valid.max())) if len(valid) else (0, 0)
+        span = hi - lo + 2
+        if mult * span >= 2**62:
+            return None
+        part = x - lo if ok is None else np.where(ok, x - lo, span - 1)
+        code += part.astype(np.int64, copy=False) * mult
+        mult *= span
+    return code, mult
+
+
+def _duplicated(keys: list[tuple[np.ndarray, np.ndarray, bool]],
+                frame: Callable[[], pd.DataFrame], columns: list[str]) -> np.ndarray:
+    """
+    Chaves repetidas, menos a última ocorrência de cada uma (keep="last").
+    `frame` só é chamado se a chave não couber num int64.
+    """
+    coded = _key_codes(keys)
+    if coded is None:
+        return frame().duplicated(columns, keep="last").to_numpy()
+    code, n_codes = coded
+    if n_codes > 4 * len(code) + 1024:
+        return pd.Series(code).duplicated(keep="last").to_numpy()
+    # códigos densos: contagem por código e hash só nas linhas repetidas
+    repeated = np.bincount(code, minlength=n_codes)[code] > 1
+    out = np.zeros(len(code), dtype=bool)
+    if repeated.any():
+        rows = np.flatnonzero(repeated)
+        out[rows] = pd.Series(code[rows]).duplicated(keep="last").to_numpy()
+    return out
+
+
+def _violations(rule: Rule, df: pd.DataFrame, values: dict) -> np.ndarray:
+    """Máscara das linhas de `df` que violam `rule` (nulos só contam em "not null")."""
+    if rule.kind == "unique":
+        return _duplicated([values[c] for c in rule.columns], lambda: df, list(rule.columns))
+    x, bad_type, exact = values[rule.columns[0]]
+    if rule.kind == "type":
+        return bad_type
+    if rule.kind == "not null":
+        return np.zeros(len(x), dtype=bool) if exact else np.isnan(x) & ~bad_type
+    if rule.kind == "numeric":
+        out = _outside(x, -rule.hi, rule.hi)
+        return out if exact else out | np.isinf(x)
+    if rule.kind == "integer":
+        out = _outside(x, rule.lo, rule.hi)
+        if not exact:
+            with np.errstate(invalid="ignore"):
+                out |= np.isinf(x) | ((x != np.trunc(x)) & ~np.isnan(x))
+        return out
+    return _outside(x, rule.lo, rule.hi)    # year, range
+
+
+# ───────────────────────────────────────────────────────────────
+# Validação
+# ───────────────────────────────────────────────────────────────
+@dataclass
+class Report:
+    table: str
+    rows: int = 0
+    violations: dict[str, int] = field(default_factory=dict)   # regra → linhas
+    quarantined: pd.DataFrame | None = None                    # linhas + coluna "_rules"
+    keys: pd.DataFrame | None = None                           # chaves válidas das barradas
+    seconds: float = 0.0
+
+    @property
+    def bad(self) -> int:
+        return 0 if self.quarantined is None else len(self.quarantined)
+
+
+def _key_frame(rows: pd.DataFrame, table: str, keys: list[str]) -> pd.DataFrame:
+    """Chaves distintas de `rows`, com os tipos das colunas da tabela."""
+    out = rows[keys].drop_duplicates()
+    for col in keys:
+        if schema().get(table, {}).get(col, ("numeric",))[0] in INT_BOUNDS:
+            out[col] = out[col].astype("int64")
+    return out.reset_index(drop=True)
+
+
+def validate(df: pd.DataFrame, table: str,
+             keys: list[str] | tuple[str, ...] = ()) -> tuple[pd.DataFrame, Report]:
+    """Separa as linhas válidas de `df` das que violam alguma regra de `table`."""
+    t0 = time.perf_counter()
+    rules = [r for r in rules_for(table, tuple(keys)) if all(c in df.columns for c in r.columns)]
+    key_rules = {r.label for r in rules if r.kind != "unique" and set(r.columns) <= set(keys)}
+    columns = dict.fromkeys(c for r in rules for c in r.columns)
+    values = {c: _numeric(df[c]) for c in columns}
+    rep = Report(table, rows=len(df))
+    bad = np.zeros(len(df), dtype=bool)
+    hits: dict[str, np.ndarray] = {}        # só as regras violadas (em geral, poucas)
+    for rule in sorted(rules, key=lambda r: r.kind == "unique"):
+        if rule.kind == "unique" and bad.any():
+            # repetições só entre as linhas que passaram nas demais regras
+            rows = np.flatnonzero(~bad)
+            keys_ok = [tuple(v[rows] if isinstance(v, np.ndarray) else v for v in values[c])
+                       for c in rule.columns]
+            mask = np.zeros(len(df), dtype=bool)
+            mask[rows] = _duplicated(keys_ok, lambda: df.iloc[rows], list(rule.columns))
+        else:
+            mask = _violations(rule, df, values)
+        if mask.any():
+            hits[rule.label] = mask
+            bad |= mask
+    if hits:
+        rep.violations = {label: int(m.sum()) for label, m in hits.items()}
+        rows = np.flatnonzero(bad)
+        which = {label: m[rows] for label, m in hits.items()}
+        rep.quarantined = df.iloc[rows].assign(_rules=[
+            ", ".join(l for l, m in which.items() if m[i]) for i in range(len(rows))])
+        if keys:
+            key_bad = np.zeros(len(rows), dtype=bool)
+            for label in key_rules & which.keys():
+                key_bad |= which[label]
+            rep.keys = _key_frame(df.iloc[rows[~key_bad]], table, list(keys))
+        df = df[~bad]
+    rep.seconds = time.perf_counter() - t0
+    return df, rep
+
+
+def quarantine(engine, loader: str, rep: Report) -> None:
+    """Substitui a quarentena de (loader, tabela) pelas linhas barradas agora."""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            DELETE FROM public.load_quarantine WHERE "Loader" = :l AND "Table" = :t
+        """), {"l": loader, "t": rep.table})
+        if rep.bad:
+            rows = rep.quarantined.drop(columns="_rules")
+            payload = rows.to_json(orient="records", lines=True, double_precision=15).splitlines()
+            conn.execute(text("""
+                INSERT INTO public.load_quarantine ("Loader", "Table", "Rules", "Row")
+                VALUES (:l, :t, :r, :j)
+            """), [{"l": loader, "t": rep.table, "r": r, "j": j}
+                   for r, j in zip(rep.quarantined["_rules"], payload)])
+
+
+def report(loader: str, rep: Report, limit: int = 6) -> None:
+    """Resumo no terminal e linha "quality" no arquivo de métricas."""
+    instrument.emit({"loader": loader, "phase": "quality", "table": rep.table,
+                     "rows_in": rep.rows, "rows_out": rep.rows - rep.bad,
+                     "wall_s": round(rep.seconds, 6), "violations": rep.violations})
+    if rep.bad:
+        worst = sorted(rep.violations.items(), key=lambda kv: -kv[1])
+        shown = ", ".join(f"{label} ({n})" for label, n in worst[:limit])
+        more = f" e mais {len(worst) - limit}" if len(worst) > limit else ""
+        print(f"🧪  {loader}: {rep.bad} de {rep.rows} linha(s) de '{rep.table}' em "
+              f"quarentena: {shown}{more}")
+
+
+def check(engine, loader: str, df: pd.DataFrame, table: str,
+          keys: list[str]) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    validate + quarentena + resumo; devolve as linhas válidas e as chaves das
+    linhas barradas (None se nenhuma), que a sincronização incremental não
+    apaga do banco: a linha já gravada vale até a fonte voltar a ser válida.
+    """
+    df, rep = validate(df, table, keys)
+    quarantine(engine, loader, rep)
+    report(loader, rep)
+    return df, rep.keys
+
+
+# ───────────────────────────────────────────────────────────────
+# CLI
+# ───────────────────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Regras de validação e quarentena da carga.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_rules = sub.add_parser("rules", help="lista as regras de cada tabela")
+    p_rules.add_argument("--table")
+    p_quar = sub.add_parser("quarantine", help="linhas barradas na última carga")
+    p_quar.add_argument("--loader")
+    p_quar.add_argument("--limit", type=int, default=20, help="linhas por (loader, tabela)")
+    args = parser.parse_args()
+
+    if args.cmd == "rules":
+        for table in schema():
+            if args.table in (None, table):
+                labels = [r.label for r in rules_for(table)]
+                print(f"{table}:\n  " + "\n  ".join(labels))
+        return
+
+    from db import get_engine
+    with get_engine(pool_size=1).connect() as conn:
+        rows = conn.execute(text("""
+            SELECT "Loader", "Table", "Rules", "Row" FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY "Loader", "Table" ORDER BY "Rules") AS rn
+                FROM public.load_quarantine
+                WHERE CAST(:l AS text) IS NULL OR "Loader" = :l
+            ) q WHERE rn <= :n
+            ORDER BY "Loader", "Table", rn
+        """), {"l": args.loader, "n": args.limit}).all()
+    for loader, table, rules, row in rows:
+        print(f"{loader:<22}{table:<26}{rules:<40}  {row[:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Recarga completa em tabelas-sombra com troca atômica
+----------------------------------------------------
+`populate_db.py --rebuild` recarrega as tabelas de fatos sem tocar nas que
+as Consultas estão lendo:
+
+  1. `prepare` recria o esquema `rebuild` com uma cópia vazia de cada tabela
+     de fatos: mesmas colunas e sequências próprias, sem chaves nem índices
+     (particionada do mesmo jeito, se a tabela em uso for);
+  2. os loaders rodam como sempre; `ctx.write` só deduplica o DataFrame
+     pelas chaves e o envia por COPY direto para a sombra (`load`);
+  3. `finish` cria na sombra as chaves (PK, UNIQUE, FK, CHECK) e os índices
+     da tabela em uso (inclusive os das migrações), roda ANALYZE e monta as
+     views materializadas de Modelos/views.sql sobre as sombras;
+  4. `swap`, numa única transação, move a geração em uso para o esquema
+     `previous` e a sombra para `public`, incrementa as versões das tabelas
+     (cache das Consultas) e grava o manifesto da rodada.
+
+As Consultas leem `public."..."` pelo nome: veem a geração antiga até o
+COMMIT da troca e a nova depois, nunca uma carga pela metade. O manifesto
+só é gravado na troca; se a recarga falhar antes, nada muda em `public`.
+
+As dimensões (Country, Sector, Power Source) só recebem nomes novos, com
+IDs estáveis, e continuam sendo gravadas direto em `public`; as FKs das
+sombras apontam para elas.
+
+A geração anterior fica em `previous` até a próxima troca.
+`rollback` a devolve para `public` (e a atual vai para `previous`), também
+numa transação; o manifesto das tabelas de fatos é apagado, então a próxima
+carga incremental recalcula todas elas.
+
+Variável de ambiente:
+    REBUILD_LOCK_TIMEOUT  espera máxima pelos locks da troca (padrão: 30s);
+                          uma consulta longa em andamento adia a troca, e
+                          passado o limite a troca desiste sem mudar nada
+
+Uso (a partir da raiz do repositório):
+    python populate_scripts/populate_db.py --rebuild
+    python populate_scripts/rebuild.py status
+    python populate_scripts/rebuild.py rollback
+"""
+
+from __future__ import annotations
+import argparse, os, re, time
+import pandas as pd
+from sqlalchemy import text
+
+import manifest, partitions, views
+from bulk_load import copy_frame, quote_ident
+
+LIVE, SHADOW, PREVIOUS = "public", "rebuild", "previous"
+FACT_TABLES = ("Environmental Indicator", "Investment", "Development", "Power Consumed",
+               "Sector_Country", "Power Source_Country", "Demography")
+VIEWS = tuple(views.VIEW_SOURCES)
+LOCK_TIMEOUT = os.getenv("REBUILD_LOCK_TIMEOUT", "30s")
+
+
+def _rel(schema: str, name: str) -> str:
+    return f"{schema}.{quote_ident(name)}"
+
+
+def exists(conn, schema: str, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:r) IS NOT NULL"),
+                        {"r": _rel(schema, name)}).scalar()
+
+
+def _serial_columns(conn, table: str) -> list[tuple[str, str]]:
+    """(coluna, nome da sequência) das colunas serial da tabela em uso."""
+    return [tuple(r) for r in conn.execute(text("""
+        SELECT a.attname, s.relname
+        FROM pg_attribute a
+        JOIN pg_class s
+          ON s.oid = CAST(pg_get_serial_sequence(CAST(:rel AS regclass)::text, a.attname)
+                          AS regclass)
+        WHERE a.attrelid = CAST(:rel AS regclass) AND a.attnum > 0 AND NOT a.attisdropped
+    """), {"rel": _rel(LIVE, table)})]
+
+
+def _children(conn, schema: str, table: str) -> list[str]:
+    """Partições de schema.`table` (vazio se não for particionada)."""
+    return [name for name, _, _ in partitions.bounds(conn, table, schema)]
+
+
+# ───────────────────────────────────────────────────────────────
+# Sombras
+# ───────────────────────────────────────────────────────────────
+def prepare(engine) -> None:
+    """Recria o esquema `rebuild` com uma sombra vazia de cada tabela de fatos."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SHADOW} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SHADOW}"))
+        for table in FACT_TABLES:
+            shadow = _rel(SHADOW, table)
+            partitioned = partitions.is_partitioned(conn, table)
+            by_year = ' PARTITION BY RANGE ("Year")' if partitioned else ""
+            # LIKE sem INCLUDING: colunas e NOT NULL, sem chaves, índices ou defaults
+            conn.execute(text(f"CREATE TABLE {shadow} (LIKE {_rel(LIVE, table)}){by_year}"))
+            for col, seq in _serial_columns(conn, table):
+                seq = _rel(SHADOW, seq)
+                conn.execute(text(f"CREATE SEQUENCE {seq} AS integer "
+                                  f"OWNED BY {shadow}.{quote_ident(col)}"))
+                conn.execute(text(f"ALTER TABLE {shadow} ALTER COLUMN {quote_ident(col)} "
+                                  f"SET DEFAULT nextval('{seq}')"))
+    print(f"Esquema '{SHADOW}': {len(FACT_TABLES)} tabelas-sombra criadas")
+
+
+def load(conn, df: pd.DataFrame, table: str, keys: list[str]) -> int:
+    """
+    Grava `df` na sombra de `table` por COPY. Chaves repetidas ficam só com a
+    última linha (o merge do upsert também grava uma linha por chave).
+    """
+    t0 = time.perf_counter()
+    complete = df[keys].notna().all(axis=1)
+    df = df[~(df.duplicated(keys, keep="last") & complete)]
+    if partitions.is_partitioned(conn, table, SHADOW):
+        partitions.ensure(conn, table, df["Year"].unique(),
+                          span=partitions.span_of(conn, table), schema=SHADOW)
+    copy_frame(conn, df, _rel(SHADOW, table))
+    print(f"⏱  '{table}': {len(df)} linhas em {time.perf_counter() - t0:.3f}s (rebuild)")
+    return len(df)
+
+
+def _view_statements() -> list[str]:
+    """Modelos/views.sql lendo das sombras e criando as views no esquema `rebuild`."""
+    sql = views.VIEWS_SQL.read_text(encoding="utf-8")
+    for table in FACT_TABLES:
+        sql = sql.replace(_rel(LIVE, table), _rel(SHADOW, table))
+    sql = re.sub(rf"\b{LIVE}\.(mv_\w+)", rf"{SHADOW}.\1", sql)
+    return [s.strip() for s in sql.split(";") if s.strip()]
+
+
+def finish(engine) -> None:
+    """Chaves, índices e ANALYZE de cada sombra; depois as views sobre elas."""
+    for table in FACT_TABLES:
+        t0 = time.perf_counter()
+        shadow = _rel(SHADOW, table)
+        with engine.begin() as conn:
+            constraints, indexes = partitions.definitions(conn, table)
+            for name, definition in constraints:
+                conn.execute(text(f"ALTER TABLE {shadow} ADD CONSTRAINT "
+                                  f"{quote_ident(name)} {definition}"))
+            for ddl in indexes:
+                conn.execute(text(re.sub(rf" ON (ONLY )?{LIVE}\.", f" ON {SHADOW}.", ddl, count=1)))
+            conn.execute(text(f"ANALYZE {shadow}"))
+        print(f"⏱  '{table}': {len(constraints)} chaves e {len(indexes)} índices "
+              f"em {time.perf_counter() - t0:.3f}s")
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        for stmt in _view_statements():
+            conn.execute(text(stmt))
+    print(f"⏱  views materializadas montadas em {time.perf_counter() - t0:.3f}s")
+
+
+# ───────────────────────────────────────────────────────────────
+# Troca
+# ───────────────────────────────────────────────────────────────
+def _move(conn, source: str, target: str) -> None:
+    """Move as tabelas de fatos (com as partições) e as views de `source` para `target`."""
+    for view in VIEWS:
+        if exists(conn, source, view):
+            conn.execute(text(f"ALTER MATERIALIZED VIEW {source}.{view} SET SCHEMA {target}"))
+    for table in FACT_TABLES:
+        if not exists(conn, source, table):
+            continue
+        for child in _children(conn, source, table):
+            conn.execute(text(f"ALTER TABLE {_rel(source, child)} SET SCHEMA {target}"))
+        conn.execute(text(f"ALTER TABLE {_rel(source, table)} SET SCHEMA {target}"))
+
+
+def _bump_all(conn) -> None:
+    for name in (*FACT_TABLES, *VIEWS):
+        manifest.bump_version(conn, name)
+
+
+def swap(engine, records: list[tuple]) -> None:
+    """
+    Numa transação: descarta a geração em `previous`, move a atual para lá e
+    as sombras para `public`; grava os registros do manifesto da rodada
+    (argumentos de manifest.record).
+    """
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        missing = [t for t in FACT_TABLES if not exists(conn, SHADOW, t)]
+        if missing:
+            raise RuntimeError(f"💥  sem tabela-sombra para: {', '.join(missing)}")
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {PREVIOUS}"))
+        for view in VIEWS:
+            conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {PREVIOUS}.{view}"))
+        for table in FACT_TABLES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {_rel(PREVIOUS, table)}"))
+        _move(conn, LIVE, PREVIOUS)
+        _move(conn, SHADOW, LIVE)
+        conn.execute(text(f"DROP SCHEMA {SHADOW}"))
+        _bump_all(conn)
+        for record in records:
+            manifest.record(conn, *record)
+    print(f"🔀  troca concluída em {time.perf_counter() - t0:.3f}s: nova geração em "
+          f"'{LIVE}', anterior em '{PREVIOUS}'")
+
+
+def rollback(engine) -> None:
+    """Devolve a geração de `previous` para `public` (a atual vai para `previous`)."""
+    with engine.begin() as conn:
+        missing = [t for t in FACT_TABLES if not exists(conn, PREVIOUS, t)]
+        if missing:
+            raise SystemExit(f"Não há geração anterior completa em '{PREVIOUS}' "
+                             f"(faltam: {', '.join(missing)})")
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        # o esquema da sombra serve de passagem; uma recarga pela metade é descartada
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SHADOW} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SHADOW}"))
+        _move(conn, LIVE, SHADOW)
+        _move(conn, PREVIOUS, LIVE)
+        _move(conn, SHADOW, PREVIOUS)
+        conn.execute(text(f"DROP SCHEMA {SHADOW}"))
+        _bump_all(conn)
+        # o manifesto descreve a geração que saiu: os loaders das tabelas de fatos rodam de novo
+        conn.execute(text("""
+            DELETE FROM public.load_manifest WHERE "Loader" IN (
+                SELECT "Loader" FROM public.load_manifest WHERE "Source" = ANY(:sources))
+        """), {"sources": [f"table:{t}" for t in FACT_TABLES]})
+    print(f"↩️  geração anterior restaurada em '{LIVE}'; a que estava em uso foi para '{PREVIOUS}'")
+
+
+def status(engine) -> list[tuple[str, int, float, float]]:
+    """(esquema, tabelas/views, linhas estimadas, MB) de cada geração existente."""
+    out = []
+    with engine.connect() as conn:
+        for schema in (LIVE, PREVIOUS, SHADOW):
+            row = conn.execute(text("""
+                SELECT COUNT(*), COALESCE(SUM(t.rows), 0), COALESCE(SUM(t.bytes), 0)
+                FROM pg_class c
+                CROSS JOIN LATERAL (   -- a tabela e, se particionada, as partições
+                    SELECT SUM(GREATEST(p.reltuples, 0)) AS rows,
+                           SUM(pg_total_relation_size(p.oid)) AS bytes
+                    FROM pg_class p
+                    WHERE p.oid = c.oid OR p.oid IN (SELECT relid FROM pg_partition_tree(c.oid))
+                ) t
+                WHERE c.relnamespace = to_regnamespace(:s) AND c.relname = ANY(:names)
+            """), {"s": schema, "names": [*FACT_TABLES, *VIEWS]}).one()
+            if row[0]:
+                out.append((schema, int(row[0]), float(row[1]), row[2] / 2**20))
+    return out
+
+
+def main() -> None:
+    from db import get_engine
+    parser = argparse.ArgumentParser(description="Gerações das tabelas de fatos (--rebuild).")
+    parser.add_argument("cmd", choices=("status", "rollback"))
+    args = parser.parse_args()
+
+    engine = get_engine(pool_size=1)
+    if args.cmd == "rollback":
+        rollback(engine)
+        return
+    labels = {LIVE: "em uso", PREVIOUS: "anterior", SHADOW: "em construção"}
+    for schema, n, rows, mb in status(engine):
+        print(f"{schema:<10}{labels[schema]:<15}{n:>3} tabelas/views{rows:>14,.0f} linhas"
+              f"{mb:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Registro de loaders e contexto compartilhado
+--------------------------------------------
+Cada populate_*.py expõe uma função `load_*(ctx)` registrada com
+`@loader(nome, deps=...)`. O runner (populate_db.py) importa os módulos,
+monta o DAG a partir das dependências declaradas e passa a todos o mesmo
+`LoadContext`: o engine com pool de db.py e os mapas de dimensão (Country,
+Sector, Power Source), consultados uma única vez e reaproveitados. Os nomes de país
+das fontes viram ID_Country por `ctx.country_ids` (countries.py), o mesmo
+índice para todos os loaders.
+
+Cada loader declara os arquivos que lê (`inputs`); junto com o próprio .py,
+os módulos comuns da carga (SHARED_MODULES) e, para quem depende de
+`country`, o conteúdo de country_alias, eles formam a chave do manifesto de
+carga (manifest.py), que permite ao runner pular etapas cujas entradas não
+mudaram.
+
+Antes de gravar, `ctx.write` valida o DataFrame (quality.py): as linhas que
+violam alguma regra vão para public.load_quarantine e o resto segue.
+
+Com `rebuild` (populate_db.py --rebuild; ver rebuild.py), `ctx.write` das
+tabelas de fatos grava por COPY nas tabelas-sombra e os registros do
+manifesto ficam em `deferred` até a troca das gerações.
+
+Com o backend asyncpg (async_load.py), `ctx.write` das tabelas de
+indicadores só agenda a gravação; o runner espera os Futures da etapa
+(`pending_writes`) antes de considerá-la concluída.
+
+Os scripts continuam executáveis sozinhos:
+    python populate_scripts/populate_demography.py
+"""
+
+from __future__ import annotations
+import inspect, logging, os, threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+import async_load, countries, db, instrument, manifest, partitions, quality, rebuild, views
+from bulk_load import swap_partitions, sync_frame, upsert_frame
+from cleaning import clean_country
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+DATASETS: Path = Path(os.getenv("DATASETS_DIR", ROOT.parent / "Datasets"))
+
+# Módulos que registram loaders (importados pelo runner)
+LOADER_MODULES = (
+    "populate_country",
+    "populate_sector",
+    "populate_power_source",
+    "populate_sector_country",
+    "populate_country_power_source",
+    "populate_environmental",
+    "populate_Development",
+    "populate_Investment",
+    "populate_power_consumed",
+    "populate_demography",
+)
+
+# Código comum a todas as etapas (leitura com cache, limpeza, resolução de
+# países, hash e gravação, validação, cujas regras de tipo vêm do
+# modeloFisico.sql): entra no manifesto de cada loader, então mudar um deles
+# refaz as etapas na carga incremental
+SHARED_MODULES = tuple(ROOT / m for m in (
+    "source_cache.py", "cleaning.py", "countries.py", "manifest.py", "bulk_load.py",
+    "quality.py", "registry.py", "../Modelos/modeloFisico.sql",
+))
+
+
+# ───────────────────────────────────────────────────────────────
+# Contexto compartilhado
+# ───────────────────────────────────────────────────────────────
+@dataclass
+class LoadContext:
+    engine: Engine
+    stage: str = ""             # nome da etapa em execução
+    incremental: bool = False   # grava só a diferença (sync_frame)
+    swap: bool = False          # tabelas particionadas: troca partições (modo completo)
+    deferred: list | None = None   # modo rebuild: argumentos de manifest.record da rodada
+    writer: async_load.AsyncWriter | None = None   # backend asyncpg
+    _writes: dict = field(default_factory=dict, repr=False)   # etapa → Futures
+    _cache: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _cached(self, key: str, build: Callable[[], object]):
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = build()
+            return self._cache[key]
+
+    def for_stage(self, name: str) -> "LoadContext":
+        """Cópia do contexto para uma etapa (engine e mapas compartilhados)."""
+        return replace(self, stage=name)
+
+    def invalidate(self, *keys: str) -> None:
+        """Descarta mapas em cache (chamado pelos loaders de dimensão)."""
+        with self._lock:
+            for k in keys:
+                self._cache.pop(k, None)
+
+    @property
+    def country_map(self) -> pd.DataFrame:
+        """Colunas ID_Country, Name e country_key (nome normalizado)."""
+        def build():
+            df = pd.read_sql('SELECT "ID_Country", "Name" FROM public."Country"', self.engine)
+            df["country_key"] = clean_country(df["Name"])
+            return df
+        return self._cached("country", build)
+
+    @property
+    def countries(self) -> countries.CountryResolver:
+        """Índice de resolução de nomes de país (nomes, ISO3 e aliases)."""
+        return self._cached("resolver", lambda: countries.CountryResolver.from_db(self.engine))
+
+    def country_ids(self, names: pd.Series, codes: pd.Series | None = None,
+                    source: Path | str = "") -> pd.Series:
+        """
+        ID_Country (Int64, nulo se não resolvido) de cada linha de `names`,
+        usando os códigos ISO3 de `codes` quando a fonte traz. Os nomes sem
+        país são impressos e gravados em country_unresolved.
+        """
+        resolver = self.countries
+        ids, res = resolver.resolve(names, codes)
+        label = Path(source).name if source else ""
+        countries.report(self.stage or "standalone", label, res, resolver.names)
+        countries.record(self.engine, self.stage or "standalone", label, res)
+        return ids
+
+    @property
+    def sector_map(self) -> pd.DataFrame:
+        """Colunas ID_Sector e Name."""
+        return self._cached("sector", lambda: pd.read_sql(
+            'SELECT "ID_Sector", "Name" FROM public."Sector"', self.engine))
+
+    @property
+    def power_map(self) -> dict[str, int]:
+        """Nome da fonte de energia → ID_Power."""
+        def build():
+            df = pd.read_sql('SELECT "ID_Power", "Name" FROM public."Power Source"', self.engine)
+            return dict(zip(df["Name"], df["ID_Power"].astype(int)))
+        return self._cached("power", build)
+
+    def phase(self, name: str, rows_in: int | None = None):
+        """Mede uma fase da etapa (read, clean, map, merge; ver instrument.py)."""
+        return instrument.phase(self.stage or "standalone", name, rows_in)
+
+    def write(self, df: pd.DataFrame, table: str, keys: list[str]) -> int:
+        with self.phase("validate", rows_in=len(df)) as ph:
+            df, keep = quality.check(self.engine, self.stage or "standalone", df, table, keys)
+            ph.rows_out = len(df)
+        if self.writer is not None and table in async_load.ASYNC_TABLES:
+            return self._submit(df, table, keys, keep)
+        with self.phase("write", rows_in=len(df)) as ph:
+            ph.rows_out = self._write(df, table, keys, keep)
+        return ph.rows_out
+
+    def _write(self, df: pd.DataFrame, table: str, keys: list[str],
+               keep: pd.DataFrame | None = None) -> int:
+        """
+        Grava o DataFrame final da etapa em `table`.
+        Modo completo: upsert de todas as linhas. Modo incremental: se o hash
+        da saída for igual ao do manifesto nada é gravado; senão só as linhas
+        que diferem são inseridas/atualizadas/apagadas, menos as chaves de
+        `keep` (em quarentena), que não são apagadas.
+        Se `table` for particionada por ano (partitions.py), as partições dos
+        anos do lote são criadas antes; com `swap`, o modo completo troca as
+        partições inteiras em vez do upsert. No modo rebuild as tabelas de
+        fatos vão por COPY para a sombra e o manifesto espera a troca.
+        """
+        digest = manifest.frame_digest(df, keys)
+        source = f"table:{table}"
+        if self.deferred is not None and table in rebuild.FACT_TABLES:
+            with self.engine.begin() as conn:
+                written = rebuild.load(conn, df, table, keys)
+            self.deferred.append((self.stage, source, "output", digest, len(df)))
+            return written
+        with self.engine.begin() as conn:
+            partitioned = "Year" in df.columns and partitions.is_partitioned(conn, table)
+            if partitioned:
+                partitions.ensure(conn, table, df["Year"].unique())
+            if self.incremental:
+                if manifest.load_entries(conn, self.stage).get(source) == digest:
+                    print(f"⏭  '{table}': saída inalterada, nada a gravar")
+                    return 0
+                written = sum(sync_frame(conn, df, table, keys, keep).values())
+            elif partitioned and self.swap:
+                written = swap_partitions(conn, df, table, keys)
+            else:
+                written = upsert_frame(conn, df, table, keys)
+            manifest.bump_version(conn, table)
+            if self.stage:
+                manifest.record(conn, self.stage, source, "output", digest, len(df))
+        return written
+
+    def _submit(self, df: pd.DataFrame, table: str, keys: list[str],
+                keep: pd.DataFrame | None = None) -> int:
+        """Backend asyncpg: agenda a gravação e devolve as linhas entregues."""
+        fut = self.writer.submit(self.stage, df, table, keys,
+                                 manifest.frame_digest(df, keys), self.incremental, keep)
+        with self._lock:
+            self._writes.setdefault(self.stage, []).append(fut)
+        return len(df)
+
+    def pending_writes(self, stage: str) -> list[Future]:
+        """Gravações assíncronas agendadas pela etapa (esvazia a lista)."""
+        with self._lock:
+            return self._writes.pop(stage, [])
+
+
+def new_context(pool_size: int = 5, incremental: bool = False, swap: bool = False,
+                backend: str = "sync", async_pool: int = 4,
+                rebuild: bool = False) -> LoadContext:
+    engine = db.get_engine(pool_size)
+    writer = (async_load.AsyncWriter(async_load.dsn(engine.url), async_pool)
+              if backend == "asyncpg" else None)
+    return LoadContext(engine=engine, incremental=incremental, swap=swap, writer=writer,
+                       deferred=[] if rebuild else None)
+
+
+# ───────────────────────────────────────────────────────────────
+# Registro
+# ───────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Loader:
+    name: str
+    func: Callable[[LoadContext], int]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()   # arquivos lidos + o próprio módulo + SHARED_MODULES
+    tables: tuple[str, ...] = ()    # tabelas do banco lidas como entrada (manifest.TABLE_DIGESTS)
+
+LOADERS: dict[str, Loader] = {}
+
+
+def loader(name: str, deps: tuple[str, ...] = (), inputs: tuple[Path, ...] = ()):
+    """Registra `func(ctx) -> linhas gravadas` como etapa de carga."""
+    def decorator(func: Callable[[LoadContext], int]):
+        source = Path(inspect.getsourcefile(func))
+        # quem depende de country resolve nomes de país pelos aliases
+        tables = ("country_alias",) if "country" in deps else ()
+        LOADERS[name] = Loader(name, func, tuple(deps),
+                               tuple(inputs) + (source,) + SHARED_MODULES, tables)
+        return func
+    return decorator
+
+
+def import_loaders() -> dict[str, Loader]:
+    """Importa todos os módulos de carga e devolve o registro completo."""
+    import importlib
+    for mod in LOADER_MODULES:
+        importlib.import_module(mod)
+    return LOADERS
+
+
+def setup_logging() -> None:
+    """Mensagens `logging` dos loaders no terminal, como os prints."""
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
+
+def run_standalone(func: Callable[[LoadContext], int]) -> int:
+    """Ponto de entrada dos scripts executados diretamente."""
+    setup_logging()
+    os.environ.setdefault("POPULATE_EXCLUSIVE", "1")
+    name = next((l.name for l in LOADERS.values() if l.func is func), "")
+    ctx = new_context(pool_size=1).for_stage(name)
+    try:
+        since = views.db_clock(ctx.engine)
+        with db.stage(name), instrument.phase(name, "total") as ph:
+            ph.rows_out = written = func(ctx)
+        views.refresh_changed(ctx.engine, since)
+        return written
+    finally:
+        print(db.report())
+        ctx.engine.dispose()
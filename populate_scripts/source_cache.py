@@ -0,0 +1,133 @@
+"""
+Cache colunar das fontes de dados
+---------------------------------
+`read_source(path, **kwargs)` substitui `pd.read_csv` / `pd.read_excel` nos
+loaders. Na primeira leitura o arquivo é convertido uma única vez para um
+arquivo Arrow IPC (Feather v2, sem compressão) tipado; as leituras seguintes
+abrem esse arquivo por memory-map, sem passar de novo pelo parser de CSV ou
+pelo openpyxl.
+
+A entrada do cache é identificada pelo arquivo + argumentos de leitura e
+validada por mtime/tamanho; se o mtime mudou, o SHA-256 do conteúdo decide
+se o cache ainda vale.
+
+Variáveis de ambiente:
+    SOURCE_CACHE_DIR = diretório do cache (padrão: <repo>/.cache/sources)
+    SOURCE_CACHE     = 0 desativa o cache
+
+Sem `pyarrow` instalado a leitura é feita diretamente pelo pandas.
+"""
+
+from __future__ import annotations
+import hashlib, json, numbers, os, tempfile
+from pathlib import Path
+import pandas as pd
+
+from manifest import file_digest
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # dependência opcional
+    pa = None
+
+CACHE_DIR = Path(os.getenv("SOURCE_CACHE_DIR",
+                           Path(__file__).resolve().parent.parent / ".cache" / "sources"))
+
+
+# ───────────────────────────────────────────────────────────────
+# Helpers
+# ───────────────────────────────────────────────────────────────
+def _read_raw(path: Path, **kwargs) -> pd.DataFrame:
+    if path.suffix.lower() in {".xlsx", ".xls"}:
+        return pd.read_excel(path, **kwargs)
+    return pd.read_csv(path, **kwargs)
+
+def _entry(path: Path, kwargs: dict) -> Path:
+    key = hashlib.sha256(
+        json.dumps([str(path.resolve()), kwargs], sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    return CACHE_DIR / f"{path.stem}-{key}.arrow"
+
+def _encode_columns(columns: pd.Index) -> list:
+    """Arrow só aceita nomes de coluna str: guarda o tipo original (ex.: anos int)."""
+    def kind(c) -> str:
+        if isinstance(c, numbers.Integral):
+            return "int"
+        return "float" if isinstance(c, numbers.Real) else "str"
+    return [[kind(c), str(c)] for c in columns]
+
+def _decode_columns(encoded: list) -> list:
+    cast = {"int": int, "float": float}
+    return [cast.get(t, str)(v) for t, v in encoded]
+
+def _write_atomic(dest: Path, write) -> None:
+    # loaders paralelos podem converter a mesma fonte ao mesmo tempo
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, suffix=".tmp")
+    os.close(fd)
+    write(tmp)
+    os.replace(tmp, dest)
+
+def _write_meta(meta_path: Path, meta: dict) -> None:
+    _write_atomic(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(meta)))
+
+
+# ───────────────────────────────────────────────────────────────
+# API
+# ───────────────────────────────────────────────────────────────
+def is_fresh(path: Path, **kwargs) -> bool:
+    """O cache de `path` (com estes argumentos) pode ser usado?"""
+    entry = _entry(path, kwargs)
+    meta_path = entry.with_suffix(".json")
+    if not entry.exists() or not meta_path.exists():
+        return False
+    meta = json.loads(meta_path.read_text())
+    st = path.stat()
+    if meta["mtime_ns"] == st.st_mtime_ns and meta["size"] == st.st_size:
+        return True
+    if meta["sha256"] != file_digest(path)[0]:
+        return False
+    meta.update(mtime_ns=st.st_mtime_ns, size=st.st_size)   # só o mtime mudou
+    _write_meta(meta_path, meta)
+    return True
+
+
+def read_source(path: Path | str, **kwargs) -> pd.DataFrame:
+    """Lê um CSV/XLSX pelo cache colunar (criando-o se preciso)."""
+    path = Path(path)
+    if pa is None or os.getenv("SOURCE_CACHE", "1") == "0":
+        return _read_raw(path, **kwargs)
+
+    entry = _entry(path, kwargs)
+    if is_fresh(path, **kwargs):
+        table = feather.read_table(entry, memory_map=True)
+        df = table.to_pandas()
+        df.columns = _decode_columns(json.loads(table.schema.metadata[b"columns"]))
+        return df
+
+    df = _read_raw(path, **kwargs)
+    try:
+        table = pa.Table.from_pandas(
+            df.set_axis([str(c) for c in df.columns], axis=1), preserve_index=False
+        )
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df  # colunas com tipos mistos: segue sem cache
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"columns": json.dumps(_encode_columns(df.columns)).encode(),
+    })
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(entry, lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+    st = path.stat()
+    _write_meta(entry.with_suffix(".json"), {
+        "source": str(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+        "sha256": file_digest(path)[0], "rows": len(df),
+    })
+    return df
+
+
+def clear() -> None:
+    """Remove todas as entradas do cache."""
+    for f in CACHE_DIR.glob("*"):
+        f.unlink()
@@ -0,0 +1,89 @@
+"""
+Views materializadas das Consultas
+----------------------------------
+Modelos/views.sql cria os rollups por país/ano de Sector_Country e de
+Power Source_Country e o resumo global por ano. Cada view tem um índice
+único, então o refresh é CONCURRENTLY: as consultas continuam lendo a versão
+anterior durante o refresh e o PostgreSQL só reescreve as linhas que mudaram.
+
+O PostgreSQL não atualiza uma view materializada por partes; o que se evita
+é o refresh de views cujas tabelas de origem não mudaram. `refresh_changed`
+consulta o manifesto (saídas gravadas por `ctx.write` desde o início da
+rodada) e atualiza só as views afetadas.
+"""
+
+from __future__ import annotations
+import time
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import text
+
+import manifest
+
+ROOT: Path = Path(__file__).resolve().parent  # pasta populate_scripts
+VIEWS_SQL = ROOT / "../Modelos/views.sql"
+
+# view → tabelas das quais ela depende (na ordem de refresh)
+VIEW_SOURCES: dict[str, set[str]] = {
+    "mv_sector_country_year": {"Sector_Country"},
+    "mv_power_country_year":  {"Power Source_Country"},
+    "mv_global_year":         {"Sector_Country", "Power Source_Country",
+                               "Environmental Indicator", "Development", "Investment"},
+}
+
+
+def create(engine) -> None:
+    """Cria as views que faltam (Modelos/views.sql usa IF NOT EXISTS)."""
+    stmts = [s.strip() for s in VIEWS_SQL.read_text(encoding="utf-8").split(";") if s.strip()]
+    with engine.begin() as conn:
+        for stmt in stmts:
+            conn.execute(text(stmt))
+
+
+def db_clock(engine) -> datetime:
+    """Hora do servidor (o manifesto usa now() do banco, não do cliente)."""
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT clock_timestamp()")).scalar_one()
+
+
+def changed_tables(engine, since: datetime) -> set[str]:
+    """Tabelas com saída gravada no manifesto a partir de `since`."""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT DISTINCT substr("Source", 7)
+            FROM public.load_manifest
+            WHERE "Kind" = 'output' AND "Source" LIKE 'table:%' AND "Loaded_At" >= :since
+        """), {"since": since})
+        return {r[0] for r in rows}
+
+
+def existing_views(engine) -> set[str]:
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT matviewname FROM pg_matviews WHERE schemaname = 'public'"))
+        return {r[0] for r in rows}
+
+
+def refresh(engine, views: list[str]) -> dict[str, float]:
+    """REFRESH MATERIALIZED VIEW CONCURRENTLY em cada view; devolve os tempos."""
+    times = {}
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for view in views:
+            t0 = time.perf_counter()
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY public.{view}"))
+            manifest.bump_version(conn, view)   # invalida o cache das Consultas
+            times[view] = time.perf_counter() - t0
+            print(f"⏱  view '{view}' atualizada em {times[view]:.3f}s")
+    return times
+
+
+def refresh_changed(engine, since: datetime) -> list[str]:
+    """Atualiza as views cujas tabelas de origem foram gravadas desde `since`."""
+    changed = changed_tables(engine, since)
+    available = existing_views(engine)
+    stale = [v for v, sources in VIEW_SOURCES.items() if v in available and sources & changed]
+    if stale:
+        refresh(engine, stale)
+    elif available:
+        print("⏭  views materializadas: nenhuma tabela de origem mudou")
+    return stale
@@ -0,0 +1,74 @@
+"""
+Saída golden da limpeza vetorizada (populate_scripts/cleaning.py)
+-----------------------------------------------------------------
+Cada função de cleaning.py, aplicada a uma coluna real de Datasets/ que os
+loaders limpam, gera o mesmo CSV (o que vai para o COPY), byte a byte, que o
+helper antigo por célula (Series.apply) de benchmarks/bench_cleaning.py.
+Um arquivo ausente de Datasets/ pula o caso.
+
+Uso (a partir da raiz do repositório):
+    python -m pytest -q tests
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import cleaning  # noqa: E402
+import bench_cleaning as old  # noqa: E402
+
+DATASETS = ROOT / "Datasets"
+GMPI_T1 = "2024_gMPI_Table1and2 - gMPI_Table1.csv"
+EDGAR = "EDGAR_2024_GHG_booklet_2024_fossilCO2only.xlsx"
+
+
+@lru_cache(maxsize=None)
+def read(name: str) -> pd.DataFrame:
+    if not (DATASETS / name).exists():
+        pytest.skip(f"Datasets/{name} ausente")
+    if name == EDGAR:
+        pytest.importorskip("openpyxl")
+        return pd.read_excel(DATASETS / name, sheet_name="fossil_CO2_by_sector_country_su")
+    if name.startswith("2024_gMPI"):
+        return old.gmpi(name)
+    return pd.read_csv(DATASETS / name)
+
+
+def as_bytes(s: pd.Series) -> bytes:
+    return s.to_csv(index=False, header=False, na_rep="").encode()
+
+
+# (arquivo, coluna, helper antigo, função vetorizada)
+CASES = {
+    "clean_country": ("human-development-index-vs-gdp-per-capita.csv", "Entity",
+                      lambda s: s.apply(old.clean_country), cleaning.clean_country),
+    "parse_number": ("PowerConsumid.csv", "GWH",
+                     lambda s: s.apply(old.parse_number), cleaning.parse_number),
+    "parse_float": ("country_year_gdp_energy_health.csv", "investment_energy",
+                    lambda s: s.apply(old.parse_float), cleaning.parse_float),
+    "scale10_to_int": (GMPI_T1, "Health",
+                       lambda s: s.apply(old.parse_number).apply(old.scale10_to_int)
+                                  .astype("Int64"),
+                       lambda s: cleaning.scale10_to_int(cleaning.parse_number(s))),
+    "extract_year": (GMPI_T1, "Year and survey",
+                     lambda s: s.apply(old.extract_year), cleaning.extract_year),
+    # o loop antigo enviava int(row.population) para o banco
+    "to_int": ("human-development-index-vs-gdp-per-capita.csv", "Population (historical)",
+               lambda s: pd.Series([old.py_int(v) for v in s], dtype=object), cleaning.to_int),
+    "normalize_ascii": (EDGAR, "Country",
+                        lambda s: s.apply(old.normalize), cleaning.normalize_ascii),
+}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_vectorized_matches_apply_helper(name):
+    path, col, before, after = CASES[name]
+    s = read(path)[col]
+    assert s.notna().any()
+    assert as_bytes(after(s)) == as_bytes(before(s))
@@ -0,0 +1,111 @@
+"""
+Cubo analítico (Consultas/cube.py)
+----------------------------------
+Fatias com listas em eixos não vizinhos e a revalidação do cubo salvo pelas
+versões das tabelas, sobre as tabelas sintéticas de benchmarks/bench_cube.py
+(sem PostgreSQL: o `from_db` lê de um SQLite em memória).
+
+Uso (a partir da raiz do repositório):
+    python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "Consultas"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import result_cache  # noqa: E402
+from bench_cube import synthetic  # noqa: E402
+from cube import FACTS, TABLES, Cube  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return synthetic(6, np.random.default_rng(7))
+
+
+@pytest.fixture(scope="module")
+def cube(tables):
+    return Cube.from_frames(tables)
+
+
+def cell(tables, table, **keys):
+    """Valor de uma célula direto no DataFrame da tabela de fatos (NaN se ausente)."""
+    fact, df = FACTS[table], tables[table]
+    hit = np.ones(len(df), dtype=bool)
+    for col, value in zip(fact.keys, keys.values()):
+        hit &= df[col].to_numpy() == value
+    measure = next(iter(fact.measures.values()))
+    return df.loc[hit, measure].iloc[0] if hit.any() else np.nan
+
+
+@pytest.mark.parametrize("measure, axis, table, dim", [
+    ("sector_co2", "sector", "Sector_Country", "Sector"),
+    ("power_generation", "source", "Power Source_Country", "Power Source"),
+])
+def test_lists_on_country_and_third_axis_keep_axis_order(cube, tables, measure, axis, table, dim):
+    names = tables["Country"]["Name"].tolist()
+    countries, others = [names[3], names[0]], tables[dim]["Name"].tolist()[:3]
+    part = cube.get(measure, country=countries, **{axis: others})
+    assert part.axes == ("country", "year", axis)
+    assert part.values.shape == (2, len(cube.years), 3)
+    assert part.labels[axis].tolist() == others
+
+    ids = {"country": [4, 1], axis: [1, 2, 3]}
+    for c, cid in enumerate(ids["country"]):
+        for y, year in enumerate(cube.years[:5]):
+            for o, oid in enumerate(ids[axis]):
+                expected = cell(tables, table, country=cid, year=year, other=oid)
+                assert part.mask[c, y, o] == (not np.isnan(expected))
+                if part.mask[c, y, o]:
+                    assert part.values[c, y, o] == pytest.approx(expected)
+
+    frame = part.frame()
+    assert len(frame) == part.mask.sum()
+    total = cube.rollup(measure, keep=(axis,), country=countries, **{axis: others})
+    assert total.axes == (axis,)
+    assert total.values == pytest.approx(np.where(part.mask, part.values, 0).sum(axis=(0, 1)))
+
+
+def test_single_label_and_list_mix(cube, tables):
+    names = tables["Country"]["Name"].tolist()
+    part = cube.get("sector_co2", country=names[:2], year=int(cube.years[0]), sector=["Waste"])
+    assert part.axes == ("country", "sector")
+    assert part.values.shape == (2, 1)
+
+
+@pytest.fixture
+def engine(tables):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    event.listen(engine, "connect", lambda conn, _: conn.execute("ATTACH ':memory:' AS public"))
+    for name, df in tables.items():
+        df.to_sql(name, engine, schema="public", index=False)
+    return engine
+
+
+def test_cube_without_table_versions_is_rebuilt(engine, tmp_path, monkeypatch):
+    builds = []
+    from_db = Cube.from_db.__func__
+    monkeypatch.setattr(Cube, "from_db",
+                        classmethod(lambda cls, e: builds.append(1) or from_db(cls, e)))
+    current = {"v": None}
+    monkeypatch.setattr(result_cache, "versions", lambda e, tables: current["v"])
+    path = tmp_path / "cube"
+
+    assert Cube.load(engine, path).versions == dict.fromkeys(TABLES, 0)
+    Cube.load(engine, path)                     # ainda sem table_versions: remonta
+    assert len(builds) == 2
+
+    current["v"] = dict.fromkeys(TABLES, 0)     # versões iguais às salvas: reaproveita
+    Cube.load(engine, path)
+    assert len(builds) == 2
+
+    current["v"] = {**dict.fromkeys(TABLES, 0), "Sector_Country": 1}
+    assert Cube.load(engine, path).versions["Sector_Country"] == 1
+    assert len(builds) == 3
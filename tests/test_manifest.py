@@ -0,0 +1,39 @@
+"""
+Chaves do manifesto de carga (populate_scripts/manifest.py)
+-----------------------------------------------------------
+Entradas com o mesmo nome de arquivo em pastas diferentes não podem dividir
+uma chave, e o código comum da carga entra no manifesto de todos os loaders.
+
+Uso (a partir da raiz do repositório):
+    python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import manifest, registry  # noqa: E402
+
+
+def test_same_file_name_in_two_folders_gets_two_keys(tmp_path):
+    a, b = tmp_path / "a" / "data.csv", tmp_path / "b" / "data.csv"
+    for path, body in ((a, "x\n1\n"), (b, "x\n2\n")):
+        path.parent.mkdir()
+        path.write_text(body)
+    digests = manifest.input_digests((a, b))
+    assert len(digests) == 2
+    assert len({digest for digest, _ in digests.values()}) == 2
+
+
+def test_keys_are_relative_to_the_repository():
+    key = manifest.input_key(registry.ROOT / "../Modelos/modeloFisico.sql")
+    assert key == "Modelos/modeloFisico.sql"
+
+
+def test_every_loader_fingerprints_the_shared_modules():
+    keys = {manifest.input_key(p) for p in registry.SHARED_MODULES}
+    assert {"populate_scripts/source_cache.py", "populate_scripts/manifest.py"} <= keys
+    for stage in registry.import_loaders().values():
+        assert keys <= {manifest.input_key(p) for p in stage.inputs}
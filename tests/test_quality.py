@@ -0,0 +1,93 @@
+"""
+Quarentena × carga incremental (populate_scripts/quality.py, bulk_load.sync_sql)
+--------------------------------------------------------------------------------
+Uma linha já gravada não pode sumir do banco porque a fonte passou a trazê-la
+com um valor inválido (a chave dela fica fora do DELETE do sync) nem porque
+o loader entregou um lote vazio. O DELETE é o mesmo SQL do
+bulk_load.sync_frame, rodado num DuckDB em memória (sem PostgreSQL).
+
+Uso (a partir da raiz do repositório):
+    python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "populate_scripts"))
+
+import bulk_load, quality  # noqa: E402
+
+duckdb = pytest.importorskip("duckdb")
+
+TABLE, KEYS = "Development", ["Country_ID", "Ano"]
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=KEYS + ["IDH"])
+
+
+def sync_delete(conn, df, keep):
+    """Staging + keep + o DELETE do sync; devolve as linhas restantes."""
+    delete, _ = bulk_load.sync_sql(TABLE, list(df.columns), KEYS, keep is not None)
+    stages = [(df, None)] + ([(keep, bulk_load.keep_name(TABLE))] if keep is not None else [])
+    for data, name in stages:
+        stg = name or bulk_load.staging_name(TABLE)
+        conn.execute(bulk_load.staging_sql(TABLE, list(data.columns), name))
+        conn.register("_data", data)
+        conn.execute(f"INSERT INTO {stg} SELECT * FROM _data")
+        conn.unregister("_data")
+    conn.execute(delete)
+    return sorted(conn.execute(f'SELECT * FROM public."{TABLE}"').fetchall())
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("CREATE SCHEMA IF NOT EXISTS public")
+    conn.execute(f'CREATE TABLE public."{TABLE}" ("Country_ID" integer, "Ano" integer, '
+                 '"IDH" numeric(6, 2))')
+    conn.execute(f'INSERT INTO public."{TABLE}" VALUES (1, 2000, 500), (2, 2000, 600), '
+                 '(3, 2000, 700)')
+    yield conn
+    conn.close()
+
+
+def test_check_returns_keys_of_quarantined_rows(monkeypatch):
+    monkeypatch.setattr(quality, "quarantine", lambda *args: None)
+    df = frame([(1, 2000, 510.0), (2, 2000, 5000.0), (4, None, 100.0)])
+    valid, keep = quality.check(None, "test", df, TABLE, KEYS)
+    assert valid["Country_ID"].tolist() == [1]
+    # a linha sem ano também foi barrada, mas a chave dela não existe no banco
+    assert keep.to_dict("records") == [{"Country_ID": 2, "Ano": 2000}]
+
+
+def test_check_without_quarantine_returns_no_keys(monkeypatch):
+    monkeypatch.setattr(quality, "quarantine", lambda *args: None)
+    _, keep = quality.check(None, "test", frame([(1, 2000, 510.0)]), TABLE, KEYS)
+    assert keep is None
+
+
+def test_previously_loaded_key_survives_quarantined_update(conn, monkeypatch):
+    monkeypatch.setattr(quality, "quarantine", lambda *args: None)
+    # país 2 chega com IDH fora da faixa; país 3 sumiu da fonte
+    valid, keep = quality.check(None, "test", frame([(1, 2000, 510.0), (2, 2000, 5000.0)]),
+                                TABLE, KEYS)
+    rows = sync_delete(conn, valid, keep)
+    assert [r[:2] for r in rows] == [(1, 2000), (2, 2000)]
+    assert float(rows[1][2]) == 600            # o valor bom da carga anterior
+
+
+def test_sync_without_keep_deletes_missing_keys(conn):
+    rows = sync_delete(conn, frame([(1, 2000, 510.0)]), None)
+    assert [r[:2] for r in rows] == [(1, 2000)]
+
+
+def test_sync_frame_with_empty_frame_deletes_nothing(conn):
+    # contra a staging vazia o DELETE do sync apagaria a tabela inteira
+    before = sorted(conn.execute(f'SELECT * FROM public."{TABLE}"').fetchall())
+    stats = bulk_load.sync_frame(conn, frame([]), TABLE, KEYS)
+    assert stats == {"inserted": 0, "updated": 0, "deleted": 0}
+    assert sorted(conn.execute(f'SELECT * FROM public."{TABLE}"').fetchall()) == before